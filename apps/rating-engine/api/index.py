@@ -3,24 +3,61 @@ FastAPI application for OpenSkill rating calculations.
 Vercel serverless function endpoint.
 """
 
+import asyncio
+import json
 import os
+import time
+from collections.abc import AsyncIterator
 from datetime import datetime
+from typing import TYPE_CHECKING, Any, Literal
 
-from dotenv import load_dotenv
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import PlainTextResponse, StreamingResponse
 from pydantic import BaseModel
-from supabase import create_client
 
 # Import from the proper package location
-from rating_engine.materialization import materialize_data_for_config
+# Only light modules are imported here; supabase and openskill are imported
+# on first use so cold starts (and GET / health checks) don't pay for them.
+from rating_engine import metrics, server_timing
+from rating_engine.events import MaterializationEvent
+from rating_engine.matchmaking import Attendee, assign_tables, predict_table
+from rating_engine.materialization import (
+    MaterializationConfig,
+    MaterializationEngine,
+    compute_config_hash,
+    materialize_data_for_config,
+)
+from rating_engine.responses import FastJSONResponse
+from rating_engine.result_cache import ResultCache
+
+if TYPE_CHECKING:
+    from supabase import Client
+
+# Vercel injects environment variables directly; .env files are for local dev
+if not os.getenv("VERCEL"):
+    from dotenv import load_dotenv
+
+    load_dotenv()
+
+
+def create_client(url: str, key: str) -> "Client":
+    """Create a Supabase client, importing the SDK on first use.
+
+    The client is wrapped so every PostgREST round trip shows up on /metrics.
+    """
+    with server_timing.timer("db-setup"):
+        from supabase import create_client as create_supabase_client
+
+        return metrics.instrument_client(create_supabase_client(url, key))
 
-load_dotenv()
 
 app = FastAPI(
     title="Riichi Mahjong Rating Engine",
     description="OpenSkill-based rating calculations for mahjong games",
     version="0.1.0",
+    default_response_class=FastJSONResponse,
 )
 
 # Configure CORS for Next.js frontend
@@ -43,10 +80,63 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Compress large payloads (leaderboards, game history); small ones aren't worth it
+app.add_middleware(
+    GZipMiddleware, minimum_size=int(os.getenv("GZIP_MINIMUM_SIZE", "1024"))
+)
+
+# Per-route request counts and latency for /metrics
+app.add_middleware(metrics.MetricsMiddleware)
+
+# Server-Timing breakdown (db, compute, serialize) when SERVER_TIMING=1
+app.add_middleware(server_timing.ServerTimingMiddleware)
+
+# Ad-hoc configuration results, reused across requests on a warm instance
+configuration_ratings_cache = ResultCache(
+    max_entries=int(os.getenv("CONFIG_RESULT_CACHE_ENTRIES", "64")),
+    max_bytes=int(os.getenv("CONFIG_RESULT_CACHE_BYTES", str(32 * 1024 * 1024))),
+)
+
 
 class MaterializationRequest(BaseModel):
     config_hash: str
     force_refresh: bool = False
+    validate_scores: bool = False
+    exclude_mismatched_games: bool = False
+
+
+class BatchMaterializationRequest(BaseModel):
+    config_hashes: list[str]
+    force_refresh: bool = False
+
+
+class BatchMaterializationResult(BaseModel):
+    status: str
+    config_hash: str
+    players_count: int | None = None
+    games_count: int | None = None
+    source_data_hash: str | None = None
+    duration_ms: float | None = None
+    error: str | None = None
+
+
+class BatchMaterializationResponse(BaseModel):
+    status: str
+    games_loaded: int = 0
+    load_ms: float | None = None
+    duration_ms: float | None = None
+    results: list[BatchMaterializationResult] = []
+    error: str | None = None
+
+
+class ConfigurationRatingsRequest(BaseModel):
+    configuration: dict[str, Any]
+
+
+class MatchmakingRequest(BaseModel):
+    config_hash: str
+    player_ids: list[str]
+    objective: Literal["balance", "competitive"] = "balance"
 
 
 class MaterializationResponse(BaseModel):
@@ -55,6 +145,7 @@ class MaterializationResponse(BaseModel):
     players_count: int | None = None
     games_count: int | None = None
     source_data_hash: str | None = None
+    score_reconciliation: dict[str, Any] | None = None
     error: str | None = None
 
 
@@ -83,6 +174,19 @@ async def debug_env():
     }
 
 
+@app.get("/metrics", response_class=PlainTextResponse)
+async def get_metrics() -> PlainTextResponse:
+    """
+    Prometheus metrics for this instance.
+
+    Includes per-phase materialization histograms, request latency per route,
+    Supabase round trips per table and in-memory result cache usage. Values are
+    per process and reset on cold start.
+    """
+    metrics.record_result_cache_stats(configuration_ratings_cache.stats())
+    return PlainTextResponse(metrics.REGISTRY.render(), media_type=metrics.CONTENT_TYPE)
+
+
 @app.post("/")
 async def materialize_ratings(
     request: MaterializationRequest,
@@ -110,7 +214,11 @@ async def materialize_ratings(
 
         # Run materialization
         result = await materialize_data_for_config(
-            supabase, request.config_hash, force_refresh=request.force_refresh
+            supabase,
+            request.config_hash,
+            force_refresh=request.force_refresh,
+            validate_scores=request.validate_scores,
+            exclude_mismatched_games=request.exclude_mismatched_games,
         )
 
         return MaterializationResponse(**result)
@@ -143,6 +251,137 @@ async def materialize_ratings_endpoint(
     return await materialize_ratings(request)
 
 
+@app.post("/materialize/stream")
+async def materialize_stream_endpoint(
+    request: MaterializationRequest, format: str = "sse"
+) -> StreamingResponse:
+    """
+    Materialize ratings while streaming progress events.
+
+    Emits one event per engine phase (config loaded, games loaded, hash
+    computed, cache hit/miss, games processed, rows written) with timestamps
+    and phase durations, followed by a final ``result`` event carrying the
+    same body as POST /materialize.
+
+    Use ``format=sse`` (default, Server-Sent Events) or ``format=ndjson``.
+    """
+    if format not in ("sse", "ndjson"):
+        raise HTTPException(status_code=400, detail="format must be sse or ndjson")
+
+    url = os.getenv("SUPABASE_URL")
+    key = os.getenv("SUPABASE_SECRET_KEY")
+
+    if not url or not key:
+        raise HTTPException(
+            status_code=500, detail="Database connection not configured"
+        )
+
+    supabase = create_client(url, key)
+
+    loop = asyncio.get_running_loop()
+    queue: asyncio.Queue[dict[str, Any] | None] = asyncio.Queue()
+
+    def on_event(event: MaterializationEvent) -> None:
+        loop.call_soon_threadsafe(queue.put_nowait, event.to_dict())
+
+    def run_materialization() -> dict[str, Any]:
+        # Supabase calls are blocking, so the engine runs in a worker thread
+        # with its own event loop while this one keeps flushing events.
+        return asyncio.run(
+            materialize_data_for_config(
+                supabase,
+                request.config_hash,
+                force_refresh=request.force_refresh,
+                hooks=[on_event],
+                validate_scores=request.validate_scores,
+                exclude_mismatched_games=request.exclude_mismatched_games,
+            )
+        )
+
+    async def produce() -> None:
+        try:
+            result = await asyncio.to_thread(run_materialization)
+            response = MaterializationResponse(**result)
+        except (ValueError, KeyError) as e:
+            response = MaterializationResponse(
+                status="error", config_hash=request.config_hash, error=str(e)
+            )
+        except Exception as e:
+            import logging
+
+            logging.exception(f"Unexpected error in streamed materialization: {e}")
+            response = MaterializationResponse(
+                status="error",
+                config_hash=request.config_hash,
+                error="Internal server error - check logs",
+            )
+        await queue.put({"event": "result", **response.model_dump()})
+        await queue.put(None)
+
+    async def stream() -> AsyncIterator[str]:
+        task = asyncio.create_task(produce())
+        try:
+            while (item := await queue.get()) is not None:
+                payload = json.dumps(item)
+                if format == "sse":
+                    yield f"event: {item['event']}\ndata: {payload}\n\n"
+                else:
+                    yield payload + "\n"
+        finally:
+            await task
+
+    media_type = "text/event-stream" if format == "sse" else "application/x-ndjson"
+    return StreamingResponse(
+        stream(),
+        media_type=media_type,
+        # identity encoding keeps GZipMiddleware from buffering NDJSON events
+        headers={
+            "Cache-Control": "no-cache",
+            "Content-Encoding": "identity",
+            "X-Accel-Buffering": "no",
+        },
+    )
+
+
+@app.post("/materialize/batch")
+async def materialize_batch_endpoint(
+    request: BatchMaterializationRequest,
+) -> BatchMaterializationResponse:
+    """
+    Materialize several configurations with one shared game load.
+
+    Games for the union of all requested time ranges are fetched once and
+    sliced per configuration in memory. Each configuration reports its own
+    status and timing.
+    """
+    try:
+        # Connect to Supabase
+        url = os.getenv("SUPABASE_URL")
+        key = os.getenv("SUPABASE_SECRET_KEY")
+
+        if not url or not key:
+            raise HTTPException(
+                status_code=500, detail="Database connection not configured"
+            )
+
+        supabase = create_client(url, key)
+
+        engine = MaterializationEngine(supabase)
+        result = await engine.materialize_batch(
+            request.config_hashes, force_refresh=request.force_refresh
+        )
+
+        return BatchMaterializationResponse(**result)
+
+    except Exception as e:
+        import logging
+
+        logging.exception(f"Unexpected error in batch materialization: {e}")
+        return BatchMaterializationResponse(
+            status="error", error="Internal server error - check logs"
+        )
+
+
 @app.get("/leaderboard")
 async def get_current_leaderboard() -> dict:
     """Get current leaderboard with ratings and statistics."""
@@ -612,8 +851,28 @@ async def get_season_statistics() -> dict:
 
 
 @app.post("/ratings/configuration")
-async def calculate_configuration_ratings(request: dict) -> dict:
-    """Calculate ratings with a custom configuration."""
+async def calculate_configuration_ratings(
+    request: ConfigurationRatingsRequest,
+) -> dict:
+    """
+    Calculate ratings with a custom configuration.
+
+    Runs the rating engine for the posted configuration against the games in
+    its time range. Results are kept in an in-memory LRU keyed by
+    (config hash, source data hash), so repeated requests skip recalculation.
+    """
+    configuration = request.configuration
+
+    try:
+        config_hash = compute_config_hash(configuration)
+        config = MaterializationConfig.from_config_data(
+            config_hash,
+            configuration["timeRange"].get("name") or "Custom Configuration",
+            configuration,
+        )
+    except (ValueError, KeyError, TypeError, AttributeError) as e:
+        raise HTTPException(status_code=400, detail=f"Invalid configuration: {e}")
+
     try:
         # Connect to Supabase
         url = os.getenv("SUPABASE_URL")
@@ -626,67 +885,178 @@ async def calculate_configuration_ratings(request: dict) -> dict:
 
         supabase = create_client(url, key)
 
-        # For now, return same data structure as leaderboard
-        # In a real implementation, this would recalculate with the custom config
-        result = (
-            supabase.table("current_leaderboard")
-            .select("*")
-            .order("display_rating", desc=True)
-            .execute()
+        engine = MaterializationEngine(supabase)
+        result = await engine.calculate_for_config(
+            config, cache=configuration_ratings_cache
         )
 
-        if not result.data:
-            return {
-                "seasonName": "Custom Configuration",
-                "players": [],
-                "totalGames": 0,
-                "lastUpdated": datetime.now().isoformat(),
-            }
-
-        # Transform data (simplified - would actually recalculate)
-        config = request.get("configuration", {})
-        mu_offset = config.get("mu", 25) - 25
-        sigma_factor = config.get("sigma", 8.33) / 8.33
+        ratings = result["player_ratings"]
+        names: dict[str, str] = {}
+        if ratings:
+            players_result = (
+                supabase.table("players")
+                .select("id, display_name")
+                .in_("id", [rating.player_id for rating in ratings])
+                .execute()
+            )
+            names = {row["id"]: row["display_name"] for row in players_result.data}
 
         players = []
-        for row in result.data:
-            # Simulate different ratings based on config
-            # Since view doesn't have mu/sigma, we'll approximate
-            # Assuming standard values for demonstration
-            base_mu = 25.0
-            base_sigma = 8.33
-            adjusted_mu = base_mu + mu_offset
-            adjusted_sigma = base_sigma * sigma_factor
-            adjusted_rating = adjusted_mu - 3 * adjusted_sigma
-
+        for rating in ratings:
+            name = names.get(rating.player_id, rating.player_id)
             players.append(
                 {
-                    "id": row["display_name"].lower().replace(" ", "_"),
-                    "name": row["display_name"],
-                    "rating": adjusted_rating,
-                    "mu": adjusted_mu,
-                    "sigma": adjusted_sigma,
-                    "games": row["games_played"],
-                    "lastGameDate": row["last_game_date"]
-                    if row["last_game_date"]
+                    "id": name.lower().replace(" ", "_"),
+                    "name": name,
+                    "rating": rating.display_rating,
+                    "mu": rating.mu,
+                    "sigma": rating.sigma,
+                    "games": rating.games_played,
+                    "lastGameDate": rating.last_game_date.isoformat()
+                    if rating.last_game_date
                     else "2024-01-01T00:00:00Z",
-                    "totalPlusMinus": row["total_plus_minus"] or 0,
-                    "averagePlusMinus": float(row["avg_plus_minus"] or 0),
-                    "bestGame": row.get("best_game_plus", 0) or 0,
-                    "worstGame": row.get("worst_game_minus", 0) or 0,
+                    "totalPlusMinus": rating.total_plus_minus,
+                    "averagePlusMinus": float(
+                        rating.total_plus_minus / max(rating.games_played, 1)
+                    ),
+                    "bestGame": rating.best_game_plus or 0,
+                    "worstGame": rating.worst_game_minus or 0,
                 }
             )
 
-        # Sort by adjusted rating
         players.sort(key=lambda p: p["rating"], reverse=True)
 
         return {
-            "seasonName": "Custom Configuration",
+            "seasonName": config.name,
+            "configHash": config_hash,
             "players": players,
-            "totalGames": max([p["games"] for p in players], default=0),
+            "totalGames": result["games_count"],
+            "cacheHit": result["status"] == "cache_hit",
             "lastUpdated": datetime.now().isoformat(),
         }
 
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@app.post("/matchmaking")
+async def assign_game_night_tables(request: MatchmakingRequest) -> dict:
+    """
+    Split attendees into 4-player tables using their current ratings.
+
+    Ratings come from ``cached_player_ratings`` for the configuration; players
+    without a cached rating start at the configuration's initial mu/sigma.
+    ``balance`` evens out table strength, ``competitive`` groups players so
+    each table is as close as possible (see rating_engine/matchmaking.py).
+    When the count is not a multiple of four, the last attendees listed sit
+    out.
+    """
+    player_ids = request.player_ids
+    if len(set(player_ids)) != len(player_ids):
+        raise HTTPException(status_code=400, detail="Duplicate player ids")
+    if len(player_ids) < 4:
+        raise HTTPException(status_code=400, detail="Need at least 4 attendees")
+
+    try:
+        # Connect to Supabase
+        url = os.getenv("SUPABASE_URL")
+        key = os.getenv("SUPABASE_SECRET_KEY")
+
+        if not url or not key:
+            raise HTTPException(
+                status_code=500, detail="Database connection not configured"
+            )
+
+        supabase = create_client(url, key)
+
+        try:
+            config = await MaterializationEngine(supabase)._load_configuration(
+                request.config_hash
+            )
+        except ValueError as e:
+            raise HTTPException(status_code=404, detail=str(e))
+
+        players_result = (
+            supabase.table("players")
+            .select("id, display_name")
+            .in_("id", player_ids)
+            .execute()
+        )
+        names = {row["id"]: row["display_name"] for row in players_result.data}
+        unknown = [player_id for player_id in player_ids if player_id not in names]
+        if unknown:
+            raise HTTPException(
+                status_code=400, detail=f"Unknown player ids: {', '.join(unknown)}"
+            )
+
+        ratings_result = (
+            supabase.table("cached_player_ratings")
+            .select("player_id, mu, sigma")
+            .eq("config_hash", request.config_hash)
+            .in_("player_id", player_ids)
+            .execute()
+        )
+        ratings = {row["player_id"]: row for row in ratings_result.data}
+        attendees = [
+            Attendee(
+                player_id=player_id,
+                mu=float(ratings[player_id]["mu"])
+                if player_id in ratings
+                else config.initial_mu,
+                sigma=float(ratings[player_id]["sigma"])
+                if player_id in ratings
+                else config.initial_sigma,
+            )
+            for player_id in player_ids
+        ]
+
+        with server_timing.timer("compute", "matchmaking"):
+            started = time.perf_counter()
+            assignment = assign_tables(attendees, request.objective)
+            search_ms = (time.perf_counter() - started) * 1000
+
+            tables = []
+            for number, table in enumerate(assignment.tables, start=1):
+                win_probabilities, draw_probability = predict_table(table)
+                tables.append(
+                    {
+                        "table": number,
+                        "averageMu": sum(a.mu for a in table) / len(table),
+                        "drawProbability": draw_probability,
+                        "players": [
+                            {
+                                "id": attendee.player_id,
+                                "name": names[attendee.player_id],
+                                "mu": attendee.mu,
+                                "sigma": attendee.sigma,
+                                "rating": attendee.mu
+                                - config.confidence_factor * attendee.sigma,
+                                "rated": attendee.player_id in ratings,
+                                "winProbability": probability,
+                            }
+                            for attendee, probability in zip(
+                                table, win_probabilities, strict=True
+                            )
+                        ],
+                    }
+                )
+
+        return {
+            "configHash": request.config_hash,
+            "objective": request.objective,
+            "tables": tables,
+            "sittingOut": [
+                {"id": a.player_id, "name": names[a.player_id]}
+                for a in assignment.sitting_out
+            ],
+            "exact": assignment.exact,
+            "searchMs": search_ms,
+        }
+
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+"""
+Engine Throughput Benchmark
+
+Replays synthetic leagues (tests/synthetic.py) through MaterializationEngine
+and reports games/sec, peak memory and time per engine phase (hash, compute,
+clear, insert) for increasing league sizes.
+
+Each size runs in a fresh subprocess so peak RSS is per size. Database calls
+go to a null client, so only the engine's own work is measured.
+
+Usage:
+    # 1k, 10k and 100k games
+    uv run python benchmarks/engine_throughput.py
+
+    # Include 1M games and save results for later comparison
+    uv run python benchmarks/engine_throughput.py \\
+        --sizes 1000,10000,100000,1000000 --output results.json
+
+    # Compare against a previous run
+    uv run python benchmarks/engine_throughput.py --compare results.json
+
+Notes:
+    - Leagues are generated with simulate_hands=False (generation time is
+      reported separately and not counted)
+    - ``engine_rss_delta_mb`` is the growth in peak RSS during the engine run
+"""
+
+import argparse
+import asyncio
+import json
+import platform
+import resource
+import subprocess
+import sys
+import time
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import Any
+
+RATING_ENGINE_DIR = Path(__file__).parent.parent
+sys.path.insert(0, str(RATING_ENGINE_DIR))
+
+DEFAULT_SIZES = "1000,10000,100000"
+
+
+class _NullQuery:
+    """PostgREST builder stand-in that accepts any chain and returns no rows."""
+
+    data: list = []
+
+    def __getattr__(self, name: str):
+        return lambda *args, **kwargs: self
+
+    def execute(self) -> "_NullQuery":
+        return self
+
+
+class NullSupabase:
+    """Supabase client stand-in; every query succeeds and returns nothing."""
+
+    def table(self, name: str) -> _NullQuery:
+        return _NullQuery()
+
+
+def peak_rss_mb() -> float:
+    """Peak resident set size of this process in MiB."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is KiB on Linux and bytes on macOS
+    return peak / 1024 / 1024 if sys.platform == "darwin" else peak / 1024
+
+
+def run_size(games: int, players: int, seed: int) -> dict[str, Any]:
+    """Generate one league and time a forced materialization of it."""
+    from rating_engine.materialization import (
+        MaterializationConfig,
+        MaterializationEngine,
+    )
+    from rating_engine.profiling import PhaseTimer
+    from tests.synthetic import generate_league
+
+    generate_start = time.perf_counter()
+    league = generate_league(
+        games=games, players=players, seed=seed, simulate_hands=False
+    )
+    game_data = league.game_data()
+    generate_s = time.perf_counter() - generate_start
+    del league
+
+    config = MaterializationConfig(
+        config_hash="benchmark",
+        name="benchmark",
+        start_date="2000-01-01",
+        end_date="2100-01-01",
+    )
+    timer = PhaseTimer()
+    engine = MaterializationEngine(
+        NullSupabase(), hooks=[timer], progress_interval=games
+    )
+
+    rss_before = peak_rss_mb()
+    start = time.perf_counter()
+    asyncio.run(engine._materialize_games(config, game_data, force_refresh=True))
+    total_s = time.perf_counter() - start
+
+    return {
+        "games": games,
+        "players": players,
+        "generate_s": round(generate_s, 3),
+        "total_ms": round(total_s * 1000, 1),
+        "games_per_sec": round(games / total_s, 1),
+        "phases_ms": {phase: round(ms, 1) for phase, ms in timer.phases.items()},
+        "peak_rss_mb": round(peak_rss_mb(), 1),
+        "engine_rss_delta_mb": round(peak_rss_mb() - rss_before, 1),
+    }
+
+
+def run_in_subprocess(games: int, players: int, seed: int) -> dict[str, Any]:
+    """Run one size in a fresh interpreter so peak RSS is isolated."""
+    completed = subprocess.run(
+        [
+            sys.executable,
+            __file__,
+            "--run-one",
+            str(games),
+            "--players",
+            str(players),
+            "--seed",
+            str(seed),
+        ],
+        cwd=RATING_ENGINE_DIR,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def compare(results: list[dict], baseline: dict) -> list[dict]:
+    """Throughput ratio vs. a previous run, per league size."""
+    previous = {r["games"]: r for r in baseline.get("results", [])}
+    comparisons = []
+    for result in results:
+        before = previous.get(result["games"])
+        if before:
+            comparisons.append(
+                {
+                    "games": result["games"],
+                    "games_per_sec": result["games_per_sec"],
+                    "baseline_games_per_sec": before["games_per_sec"],
+                    "ratio": round(
+                        result["games_per_sec"] / before["games_per_sec"], 3
+                    ),
+                }
+            )
+    return comparisons
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description="Benchmark engine throughput")
+    parser.add_argument(
+        "--sizes",
+        default=DEFAULT_SIZES,
+        help=f"Comma-separated game counts (default: {DEFAULT_SIZES})",
+    )
+    parser.add_argument("--players", type=int, default=200, help="Player pool size")
+    parser.add_argument("--seed", type=int, default=0, help="Generator seed")
+    parser.add_argument("--output", type=Path, help="Also write JSON results here")
+    parser.add_argument("--compare", type=Path, help="Previous JSON results file")
+    parser.add_argument("--run-one", type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.run_one:
+        print(json.dumps(run_size(args.run_one, args.players, args.seed)))
+        return
+
+    sizes = [int(size) for size in args.sizes.split(",")]
+    results = []
+    for games in sizes:
+        print(f"⏱️  {games:,} games...", file=sys.stderr)
+        results.append(run_in_subprocess(games, args.players, args.seed))
+
+    from importlib.metadata import version
+
+    output: dict[str, Any] = {
+        "benchmark": "engine_throughput",
+        "timestamp": datetime.now(UTC).isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "openskill": version("openskill"),
+        "seed": args.seed,
+        "results": results,
+    }
+    if args.compare:
+        output["comparison"] = compare(results, json.loads(args.compare.read_text()))
+
+    text = json.dumps(output, indent=2)
+    print(text)
+    if args.output:
+        args.output.write_text(text + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,367 @@
+#!/usr/bin/env python3
+"""
+HTTP Load Test
+
+Drives a mixed league-night workload against the rating-engine API with
+concurrent httpx clients and reports throughput, p50/p95/p99 latency and
+error rate per endpoint.
+
+By default the app (api/index.py) is served by uvicorn on a free local port,
+backed by the in-memory Supabase stand-in (tests/fake_supabase.py) seeded with
+a synthetic league, with ``--db-latency-ms`` of simulated latency per query.
+Pass ``--url`` to load-test a running server (``npm run dev``, a preview
+deployment) instead.
+
+Workload (weights via ``--mix``):
+    leaderboard  GET  /leaderboard
+    player       GET  /players/{id}         (random player from the leaderboard)
+    games        GET  /games?limit=20
+    materialize  POST /materialize          (force_refresh, full recompute)
+
+Usage:
+    uv run python benchmarks/load_test.py
+    uv run python benchmarks/load_test.py --users 100 --duration 30 \\
+        --mix leaderboard=70,player=15,games=10,materialize=5 --json
+
+Notes:
+    - A request counts as an error on a transport failure, HTTP status >= 400,
+      or a JSON body with an ``error`` field (several handlers report
+      failures as 200 responses)
+    - Latency percentiles are nearest-rank over all requests of an endpoint
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import os
+import random
+import socket
+import sys
+import threading
+import time
+from collections import defaultdict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+import httpx
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+ENDPOINTS = ("leaderboard", "player", "games", "materialize")
+DEFAULT_MIX = "leaderboard=60,player=20,games=15,materialize=5"
+
+CONFIG_DATA = {
+    "timeRange": {"startDate": "2024-01-01", "endDate": "2024-12-31"},
+    "rating": {
+        "initialMu": 25.0,
+        "initialSigma": 8.33,
+        "confidenceFactor": 2.0,
+        "decayRate": 0.02,
+    },
+    "scoring": {"oka": 20000, "uma": [10000, 5000, -5000, -10000]},
+    "weights": {"divisor": 40, "min": 0.5, "max": 1.5},
+    "qualification": {"minGames": 8, "dropWorst": 2},
+}
+
+
+@dataclass
+class Sample:
+    """One request's outcome."""
+
+    endpoint: str
+    latency_ms: float
+    status: int | None
+    error: str | None
+
+
+@dataclass
+class Target:
+    """What the virtual users hit."""
+
+    base_url: str
+    config_hash: str
+    player_ids: list[str]
+
+
+def percentile(sorted_values: list[float], pct: float) -> float:
+    """Nearest-rank percentile of an ascending list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(pct / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+def parse_mix(text: str) -> dict[str, float]:
+    """Parse ``name=weight,...`` into endpoint weights."""
+    mix = {}
+    for part in text.split(","):
+        name, _, weight = part.partition("=")
+        if name.strip() not in ENDPOINTS:
+            raise ValueError(f"Unknown endpoint '{name}' (choose from {ENDPOINTS})")
+        mix[name.strip()] = float(weight or 1)
+    return mix
+
+
+def _request_for(
+    endpoint: str, target: Target, rng: random.Random
+) -> tuple[str, str, dict | None]:
+    if endpoint == "leaderboard":
+        return "GET", "/leaderboard", None
+    if endpoint == "player":
+        return "GET", f"/players/{rng.choice(target.player_ids)}", None
+    if endpoint == "games":
+        return "GET", "/games?limit=20", None
+    return (
+        "POST",
+        "/materialize",
+        {"config_hash": target.config_hash, "force_refresh": True},
+    )
+
+
+async def virtual_user(
+    client: httpx.AsyncClient,
+    target: Target,
+    mix: dict[str, float],
+    deadline: float,
+    think_ms: float,
+    seed: int,
+    samples: list[Sample],
+) -> None:
+    """Send weighted random requests until the deadline."""
+    rng = random.Random(seed)
+    names, weights = list(mix), list(mix.values())
+    while time.perf_counter() < deadline:
+        endpoint = rng.choices(names, weights=weights)[0]
+        method, path, body = _request_for(endpoint, target, rng)
+
+        start = time.perf_counter()
+        status = error = None
+        try:
+            response = await client.request(method, path, json=body)
+            status = response.status_code
+            if status >= 400:
+                error = f"HTTP {status}"
+            else:
+                payload = response.json()
+                if isinstance(payload, dict) and payload.get("error"):
+                    error = str(payload["error"])[:200]
+        except httpx.HTTPError as e:
+            error = type(e).__name__
+        samples.append(
+            Sample(endpoint, (time.perf_counter() - start) * 1000, status, error)
+        )
+
+        if think_ms:
+            await asyncio.sleep(rng.expovariate(1 / think_ms) / 1000)
+
+
+async def run_load(
+    target: Target,
+    users: int,
+    duration_s: float,
+    mix: dict[str, float],
+    think_ms: float,
+    timeout_s: float,
+) -> tuple[list[Sample], float]:
+    """Run all virtual users concurrently; returns samples and elapsed seconds."""
+    samples: list[Sample] = []
+    limits = httpx.Limits(max_connections=users, max_keepalive_connections=users)
+    async with httpx.AsyncClient(
+        base_url=target.base_url, timeout=timeout_s, limits=limits
+    ) as client:
+        start = time.perf_counter()
+        deadline = start + duration_s
+        await asyncio.gather(
+            *(
+                virtual_user(client, target, mix, deadline, think_ms, seed, samples)
+                for seed in range(users)
+            )
+        )
+        elapsed = time.perf_counter() - start
+    return samples, elapsed
+
+
+def summarize(samples: list[Sample], elapsed_s: float) -> dict[str, Any]:
+    """Per-endpoint and overall throughput, latency percentiles, error rates."""
+    by_endpoint: dict[str, list[Sample]] = defaultdict(list)
+    for sample in samples:
+        by_endpoint[sample.endpoint].append(sample)
+
+    def stats(group: list[Sample]) -> dict[str, Any]:
+        latencies = sorted(s.latency_ms for s in group)
+        errors = [s for s in group if s.error]
+        error_kinds: dict[str, int] = defaultdict(int)
+        for sample in errors:
+            error_kinds[sample.error or ""] += 1
+        return {
+            "requests": len(group),
+            "throughput_rps": round(len(group) / elapsed_s, 1),
+            "p50_ms": round(percentile(latencies, 50), 1),
+            "p95_ms": round(percentile(latencies, 95), 1),
+            "p99_ms": round(percentile(latencies, 99), 1),
+            "max_ms": round(latencies[-1], 1) if latencies else 0.0,
+            "errors": len(errors),
+            "error_rate": round(len(errors) / len(group), 4) if group else 0.0,
+            "top_errors": dict(sorted(error_kinds.items(), key=lambda kv: -kv[1])[:3]),
+        }
+
+    return {
+        "elapsed_s": round(elapsed_s, 2),
+        "total": stats(samples),
+        "endpoints": {
+            name: stats(by_endpoint[name]) for name in ENDPOINTS if name in by_endpoint
+        },
+    }
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_local_server(args: argparse.Namespace) -> tuple[Any, Target]:
+    """Serve api/index.py with uvicorn in a thread, backed by the fake database."""
+    import uvicorn
+
+    import api.index
+    from rating_engine import metrics
+    from rating_engine.materialization import compute_config_hash
+    from tests.fake_supabase import FakeSupabase
+    from tests.synthetic import generate_league
+
+    os.environ.setdefault("SUPABASE_URL", "http://fake-supabase.local")
+    os.environ.setdefault("SUPABASE_SECRET_KEY", "load-test")
+
+    league = generate_league(
+        games=args.games, players=args.players, seed=args.seed, days=360
+    )
+    fake = FakeSupabase(latency=args.db_latency_ms / 1000)
+    fake.seed(league.tables())
+    config_hash = compute_config_hash(CONFIG_DATA)
+    fake.seed(
+        {
+            "rating_configurations": [
+                {
+                    "config_hash": config_hash,
+                    "name": "Load Test",
+                    "config_data": CONFIG_DATA,
+                    "is_official": True,
+                    "created_at": "2024-01-01T00:00:00+00:00",
+                }
+            ]
+        }
+    )
+    api.index.create_client = lambda url, key: metrics.instrument_client(fake)
+
+    port = _free_port()
+    server = uvicorn.Server(
+        uvicorn.Config(api.index.app, host="127.0.0.1", port=port, log_level="warning")
+    )
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    while not server.started:
+        if not thread.is_alive():
+            raise RuntimeError("uvicorn failed to start")
+        time.sleep(0.05)
+
+    player_ids = [
+        player["display_name"].lower().replace(" ", "_") for player in league.players
+    ]
+    return server, Target(f"http://127.0.0.1:{port}", config_hash, player_ids)
+
+
+async def prepare_target(target: Target, timeout_s: float) -> Target:
+    """Materialize once so reads have data, and discover player ids if needed."""
+    async with httpx.AsyncClient(base_url=target.base_url, timeout=timeout_s) as c:
+        if target.config_hash:
+            response = await c.post(
+                "/materialize", json={"config_hash": target.config_hash}
+            )
+            response.raise_for_status()
+        if not target.player_ids:
+            leaderboard = (await c.get("/leaderboard")).json()
+            target.player_ids = [p["id"] for p in leaderboard.get("players", [])]
+    if not target.player_ids:
+        raise RuntimeError("No players on the leaderboard to request profiles for")
+    return target
+
+
+def print_report(report: dict[str, Any], args: argparse.Namespace) -> None:
+    print("\n" + "=" * 88)
+    print(
+        f"Load test: {args.users} users, {report['elapsed_s']}s, "
+        f"{report['total']['requests']} requests "
+        f"({report['total']['throughput_rps']} req/s)"
+    )
+    print("=" * 88)
+    print(
+        f"{'endpoint':<13} {'reqs':>6} {'req/s':>7} {'p50':>8} {'p95':>8} "
+        f"{'p99':>8} {'max':>8} {'errors':>7}"
+    )
+    print("-" * 88)
+    for name, entry in [*report["endpoints"].items(), ("total", report["total"])]:
+        print(
+            f"{name:<13} {entry['requests']:>6} {entry['throughput_rps']:>7} "
+            f"{entry['p50_ms']:>6.1f}ms {entry['p95_ms']:>6.1f}ms "
+            f"{entry['p99_ms']:>6.1f}ms {entry['max_ms']:>6.1f}ms "
+            f"{entry['error_rate']:>6.1%}"
+        )
+    print("=" * 88)
+    for name, entry in report["endpoints"].items():
+        for error, count in entry["top_errors"].items():
+            print(f"❌ {name}: {count}x {error}")
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description="Load-test the rating-engine API")
+    parser.add_argument("--url", help="Test a running server instead of a local one")
+    parser.add_argument("--config-hash", help="Configuration to materialize (--url)")
+    parser.add_argument("--users", type=int, default=50, help="Concurrent users")
+    parser.add_argument("--duration", type=float, default=15, help="Seconds to run")
+    parser.add_argument("--mix", default=DEFAULT_MIX, help=f"(default: {DEFAULT_MIX})")
+    parser.add_argument(
+        "--think-ms", type=float, default=0, help="Mean pause between requests"
+    )
+    parser.add_argument("--timeout", type=float, default=30, help="Request timeout")
+    parser.add_argument("--games", type=int, default=600, help="Local: league games")
+    parser.add_argument("--players", type=int, default=40, help="Local: players")
+    parser.add_argument(
+        "--db-latency-ms", type=float, default=15, help="Local: latency per query"
+    )
+    parser.add_argument("--seed", type=int, default=0, help="Local: league seed")
+    parser.add_argument("--json", action="store_true", help="Print JSON output")
+    args = parser.parse_args()
+    mix = parse_mix(args.mix)
+
+    server = None
+    if args.url:
+        target = Target(args.url.rstrip("/"), args.config_hash or "", [])
+        if not args.config_hash:
+            mix.pop("materialize", None)
+    else:
+        server, target = start_local_server(args)
+
+    try:
+        target = asyncio.run(prepare_target(target, args.timeout))
+        samples, elapsed = asyncio.run(
+            run_load(
+                target, args.users, args.duration, mix, args.think_ms, args.timeout
+            )
+        )
+    finally:
+        if server is not None:
+            server.should_exit = True
+
+    report = summarize(samples, elapsed)
+    if args.json:
+        print(json.dumps({"users": args.users, "mix": mix, **report}))
+    else:
+        print_report(report, args)
+
+
+if __name__ == "__main__":
+    main()
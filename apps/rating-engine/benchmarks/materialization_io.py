@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+Materialization I/O Benchmark
+
+Runs materializations against the in-memory Supabase stand-in
+(tests/fake_supabase.py) with injected per-call latency, so changes to query
+shape and round-trip count can be measured without a live project.
+
+Reports wall time, round trips per table/operation and how much of the run
+was spent waiting on (simulated) network, for:
+    - one forced materialization
+    - K configurations materialized one by one
+    - the same K configurations via materialize_batch
+
+Usage:
+    uv run python benchmarks/materialization_io.py
+    uv run python benchmarks/materialization_io.py --games 800 --latency-ms 40 \\
+        --configs 4 --json
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+import time
+from pathlib import Path
+from typing import Any
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from rating_engine.materialization import (  # noqa: E402
+    MaterializationEngine,
+    compute_config_hash,
+)
+from tests.fake_supabase import FakeSupabase  # noqa: E402
+from tests.synthetic import generate_league  # noqa: E402
+
+BASE_CONFIG = {
+    "timeRange": {"startDate": "2024-01-01", "endDate": "2024-12-31"},
+    "rating": {
+        "initialMu": 25.0,
+        "initialSigma": 8.33,
+        "confidenceFactor": 2.0,
+        "decayRate": 0.02,
+    },
+    "scoring": {"oka": 20000, "uma": [10000, 5000, -5000, -10000]},
+    "weights": {"divisor": 40, "min": 0.5, "max": 1.5},
+    "qualification": {"minGames": 8, "dropWorst": 2},
+}
+
+
+def build_fake(args: argparse.Namespace) -> tuple[FakeSupabase, list[str]]:
+    """Seed a fake with a synthetic league and K configuration variants."""
+    fake = FakeSupabase(max_rows=args.max_rows, latency=args.latency_ms / 1000)
+    league = generate_league(
+        games=args.games, players=args.players, seed=args.seed, days=360
+    )
+    fake.seed(league.tables())
+
+    hashes = []
+    for i in range(args.configs):
+        config_data = json.loads(json.dumps(BASE_CONFIG))
+        config_data["weights"]["divisor"] = 40 + 10 * i
+        config_hash = compute_config_hash(config_data)
+        hashes.append(config_hash)
+        fake.seed(
+            {
+                "rating_configurations": [
+                    {
+                        "config_hash": config_hash,
+                        "name": f"variant-{i}",
+                        "config_data": config_data,
+                    }
+                ]
+            }
+        )
+    return fake, hashes
+
+
+async def measure(fake: FakeSupabase, latency_ms: float, run) -> dict[str, Any]:
+    """Time one scenario and summarize its round trips."""
+    fake.reset_calls()
+    start = time.perf_counter()
+    result = await run()
+    wall_ms = (time.perf_counter() - start) * 1000
+
+    return {
+        "wall_ms": round(wall_ms, 1),
+        "round_trips": fake.round_trips,
+        "network_wait_ms": round(fake.round_trips * latency_ms, 1),
+        "calls": {
+            f"{table}.{operation}": count
+            for (table, operation), count in sorted(fake.call_counts.items())
+        },
+        "result": result,
+    }
+
+
+async def run_benchmark(args: argparse.Namespace) -> dict[str, Any]:
+    fake, hashes = build_fake(args)
+    engine = MaterializationEngine(fake)
+
+    single = await measure(
+        fake,
+        args.latency_ms,
+        lambda: engine.materialize_for_config(hashes[0], force_refresh=True),
+    )
+
+    async def sequential():
+        return [
+            await engine.materialize_for_config(h, force_refresh=True) for h in hashes
+        ]
+
+    one_by_one = await measure(fake, args.latency_ms, sequential)
+    batch = await measure(
+        fake,
+        args.latency_ms,
+        lambda: engine.materialize_batch(hashes, force_refresh=True),
+    )
+
+    games_loaded = single["result"].get("games_count", 0)
+    return {
+        "benchmark": "materialization_io",
+        "games_seeded": args.games,
+        "games_loaded": games_loaded,
+        "max_rows": args.max_rows,
+        "latency_ms": args.latency_ms,
+        "configs": args.configs,
+        "single": {k: v for k, v in single.items() if k != "result"},
+        "sequential": {k: v for k, v in one_by_one.items() if k != "result"},
+        "batch": {k: v for k, v in batch.items() if k != "result"},
+    }
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description="Benchmark materialization I/O")
+    parser.add_argument("--games", type=int, default=500, help="Games to seed")
+    parser.add_argument("--players", type=int, default=40, help="Player pool size")
+    parser.add_argument("--configs", type=int, default=3, help="Config variants")
+    parser.add_argument(
+        "--latency-ms", type=float, default=25.0, help="Latency per round trip"
+    )
+    parser.add_argument(
+        "--max-rows", type=int, default=1000, help="PostgREST response row cap"
+    )
+    parser.add_argument("--seed", type=int, default=0, help="Generator seed")
+    parser.add_argument("--json", action="store_true", help="Print JSON output")
+    args = parser.parse_args()
+
+    output = asyncio.run(run_benchmark(args))
+
+    if args.json:
+        print(json.dumps(output))
+        return
+
+    print("\n" + "=" * 60)
+    print(
+        f"Materialization I/O: {args.games} games, {args.latency_ms}ms/round trip, "
+        f"{args.configs} configs"
+    )
+    print("=" * 60)
+    for scenario in ("single", "sequential", "batch"):
+        entry = output[scenario]
+        print(
+            f"{scenario:<11} {entry['wall_ms']:>9.1f}ms  "
+            f"{entry['round_trips']:>3} round trips "
+            f"(~{entry['network_wait_ms']:.0f}ms waiting)"
+        )
+        for call, count in entry["calls"].items():
+            print(f"    {call:<40} {count:>3}")
+    print("=" * 60)
+    if output["games_loaded"] < output["games_seeded"]:
+        print(
+            f"⚠️  Only {output['games_loaded']} of {output['games_seeded']} games "
+            f"were loaded (row cap {args.max_rows})"
+        )
+
+
+if __name__ == "__main__":
+    main()
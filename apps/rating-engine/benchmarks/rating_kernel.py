@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+"""
+Rating Kernel Benchmark
+
+Times the engine's rating pass (MaterializationEngine._calculate_ratings)
+against the plain openskill PlackettLuce replay in tests/rating_reference.py
+on the same game sets, checks the two agree (mu/sigma within tolerance,
+identical leaderboard order) and compares the speed ratio with the tracked
+baseline in benchmarks/rating_kernel_baseline.json.
+
+The gated number is ``engine_vs_reference``: engine time divided by reference
+time on the same machine, so the baseline holds across hardware. Lower is
+faster; a faster rating path shows up as a ratio below the baseline.
+
+Usage:
+    # Report timings, ratio and equivalence
+    uv run python benchmarks/rating_kernel.py
+
+    # Fail (exit 1) on a mismatch or if the ratio regresses past the threshold
+    uv run python benchmarks/rating_kernel.py --check
+
+    # Record the current ratio as the new baseline (after a deliberate change)
+    uv run python benchmarks/rating_kernel.py --update-baseline
+
+Notes:
+    - Each timing is the best of ``--repeat`` interleaved runs
+    - Game sets: a synthetic league plus the league logs at the repository root
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+import time
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from rating_engine.materialization import (  # noqa: E402
+    GameData,
+    MaterializationConfig,
+)
+from tests.rating_reference import (  # noqa: E402
+    FIXTURE_CSVS,
+    MU_SIGMA_TOLERANCE,
+    leaderboard_order,
+    load_fixture_games,
+    max_difference,
+    replay_engine,
+    replay_reference,
+)
+from tests.synthetic import generate_league  # noqa: E402
+
+BASELINE_PATH = Path(__file__).parent / "rating_kernel_baseline.json"
+
+CONFIG = MaterializationConfig(
+    config_hash="rating-kernel",
+    name="rating-kernel",
+    start_date="2000-01-01",
+    end_date="2100-01-01",
+)
+
+
+def best_of(repeat: int, funcs: list[Callable[[], Any]]) -> list[tuple[float, Any]]:
+    """Fastest of ``repeat`` runs per function, with its last result.
+
+    Runs are interleaved so machine load drifts affect every function alike.
+    """
+    best = [float("inf")] * len(funcs)
+    results: list[Any] = [None] * len(funcs)
+    for _ in range(repeat):
+        for index, func in enumerate(funcs):
+            start = time.perf_counter()
+            results[index] = func()
+            best[index] = min(best[index], time.perf_counter() - start)
+    return list(zip(best, results, strict=True))
+
+
+def game_sets(games: int, players: int, seed: int) -> dict[str, list[GameData]]:
+    """Synthetic league plus whichever league logs are checked out."""
+    sets = {
+        f"synthetic-{games}": generate_league(
+            games=games, players=players, seed=seed, simulate_hands=False
+        ).game_data()
+    }
+    for path in FIXTURE_CSVS:
+        if path.exists():
+            sets[path.stem] = load_fixture_games(path)
+    return sets
+
+
+def run_benchmark(games: int, players: int, seed: int, repeat: int) -> dict:
+    """Time both paths on every game set and check they agree."""
+    results = []
+    engine_total = reference_total = 0.0
+
+    for name, game_set in game_sets(games, players, seed).items():
+        (reference_s, expected), (engine_s, actual) = best_of(
+            repeat,
+            [
+                lambda g=game_set: replay_reference(CONFIG, g),
+                lambda g=game_set: asyncio.run(replay_engine(CONFIG, g)),
+            ],
+        )
+        engine_total += engine_s
+        reference_total += reference_s
+
+        difference = max_difference(actual, expected)
+        same_order = leaderboard_order(
+            actual, CONFIG.confidence_factor
+        ) == leaderboard_order(expected, CONFIG.confidence_factor)
+        results.append(
+            {
+                "game_set": name,
+                "games": len(game_set),
+                "players": len(expected),
+                "reference_ms": round(reference_s * 1000, 1),
+                "engine_ms": round(engine_s * 1000, 1),
+                "engine_games_per_sec": round(len(game_set) / engine_s, 1),
+                "max_difference": difference,
+                "equivalent": difference <= MU_SIGMA_TOLERANCE and same_order,
+            }
+        )
+
+    return {
+        "repeat": repeat,
+        "tolerance": MU_SIGMA_TOLERANCE,
+        "engine_vs_reference": round(engine_total / reference_total, 3),
+        "results": results,
+    }
+
+
+def check_baseline(result: dict, baseline: dict) -> list[str]:
+    """Return violations (empty if equivalent and within the threshold)."""
+    violations = [
+        f"{entry['game_set']}: engine differs from reference "
+        f"(max |Δ| {entry['max_difference']:.3g} or leaderboard order)"
+        for entry in result["results"]
+        if not entry["equivalent"]
+    ]
+
+    limit = baseline["engine_vs_reference"] * (1 + baseline["threshold"])
+    if result["engine_vs_reference"] > limit:
+        violations.append(
+            f"engine/reference time ratio {result['engine_vs_reference']} exceeds "
+            f"baseline {baseline['engine_vs_reference']} "
+            f"+{baseline['threshold']:.0%} ({limit:.3f})"
+        )
+    return violations
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description="Benchmark the rating pass")
+    parser.add_argument("--games", type=int, default=5000, help="Synthetic games")
+    parser.add_argument("--players", type=int, default=200, help="Player pool size")
+    parser.add_argument("--seed", type=int, default=0, help="Generator seed")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per timing")
+    parser.add_argument(
+        "--check", action="store_true", help="Exit 1 on mismatch or regression"
+    )
+    parser.add_argument(
+        "--update-baseline",
+        action="store_true",
+        help="Write the measured ratio to the baseline file",
+    )
+    parser.add_argument("--json", action="store_true", help="Print JSON output")
+    args = parser.parse_args()
+
+    baseline = json.loads(BASELINE_PATH.read_text())
+    result = run_benchmark(args.games, args.players, args.seed, args.repeat)
+    violations = check_baseline(result, baseline)
+
+    if args.update_baseline:
+        baseline["engine_vs_reference"] = result["engine_vs_reference"]
+        BASELINE_PATH.write_text(json.dumps(baseline, indent=2) + "\n")
+
+    if args.json:
+        print(json.dumps({**result, "baseline": baseline, "violations": violations}))
+    else:
+        print("\n" + "=" * 72)
+        print(f"Rating kernel: engine vs. openskill reference (best of {args.repeat})")
+        print("=" * 72)
+        for entry in result["results"]:
+            status = "✅" if entry["equivalent"] else "❌"
+            print(
+                f"{status} {entry['game_set']:<32} {entry['games']:>6} games  "
+                f"ref {entry['reference_ms']:>8.1f}ms  "
+                f"engine {entry['engine_ms']:>8.1f}ms  "
+                f"max |Δ| {entry['max_difference']:.1e}"
+            )
+        print("-" * 72)
+        print(
+            f"engine/reference: {result['engine_vs_reference']} "
+            f"(baseline {baseline['engine_vs_reference']}, "
+            f"threshold +{baseline['threshold']:.0%})"
+        )
+        print("=" * 72)
+        for violation in violations:
+            print(f"❌ {violation}")
+        if not violations:
+            print("✅ Equivalent and within baseline")
+
+    if args.check and violations:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+"""
+Response Serialization Benchmark
+
+Compares the stdlib JSONResponse with FastJSONResponse (orjson when installed)
+on representative payloads, and reports bytes on the wire with and without
+compression.
+
+Payloads:
+    - leaderboard: 200 players, shaped like GET /leaderboard
+    - games: 1,000 games with four seats each, shaped like a game history
+
+Usage:
+    uv run python benchmarks/serialization.py
+    uv run python benchmarks/serialization.py --iterations 500 --json
+
+Notes:
+    - Brotli sizes are reported only if the ``brotli`` package is installed;
+      the app itself only ships GZip compression
+"""
+
+import argparse
+import gzip
+import json
+import os
+import sys
+import time
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from fastapi.responses import JSONResponse  # noqa: E402
+
+from rating_engine.responses import FastJSONResponse, orjson  # noqa: E402
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+
+def leaderboard_payload(players: int = 200) -> dict:
+    """A leaderboard response with the given number of players."""
+    base = datetime(2024, 1, 1, tzinfo=UTC)
+    return {
+        "players": [
+            {
+                "id": f"player-{i:04d}",
+                "name": f"Player {i}",
+                "rating": round(35.0 - i * 0.07, 6),
+                "mu": round(30.0 - i * 0.05, 6),
+                "sigma": round(4.5 + (i % 7) * 0.11, 6),
+                "gamesPlayed": 10 + i % 40,
+                "totalPlusMinus": (i * 3719) % 20000 - 10000,
+                "averagePlusMinus": round(((i * 3719) % 20000 - 10000) / 25, 2),
+                "bestGame": 45000 + i * 10,
+                "worstGame": -20000 + i * 10,
+                "lastPlayed": (base + timedelta(days=i)).isoformat(),
+                "ratingChange": round((i % 11 - 5) * 0.37, 2),
+            }
+            for i in range(players)
+        ],
+        "totalGames": players * 5,
+        "lastUpdated": base.isoformat(),
+        "debug": f"Found {players} players",
+    }
+
+
+def games_payload(games: int = 1000) -> dict:
+    """A game history response with the given number of games."""
+    base = datetime(2024, 1, 1, tzinfo=UTC)
+    return {
+        "games": [
+            {
+                "id": f"game-{g:05d}",
+                "date": (base + timedelta(hours=g)).isoformat(),
+                "results": [
+                    {
+                        "playerId": f"player-{(g + seat * 7) % 200:04d}",
+                        "playerName": f"Player {(g + seat * 7) % 200}",
+                        "seat": ["east", "south", "west", "north"][seat],
+                        "placement": seat + 1,
+                        "finalScore": 40000 - seat * 10000 + g % 1000,
+                        "plusMinus": 15000 - seat * 10000 + g % 1000,
+                        "ratingBefore": round(30.0 + (g % 13) * 0.1, 6),
+                        "ratingAfter": round(30.0 + (g % 13) * 0.1 - seat * 0.2, 6),
+                        "ratingChange": round(0.3 - seat * 0.2, 6),
+                    }
+                    for seat in range(4)
+                ],
+            }
+            for g in range(games)
+        ],
+        "totalGames": games,
+        "debug": f"Loaded {games} games",
+    }
+
+
+def time_render(response_class: type, payload: dict, iterations: int) -> float:
+    """Mean render time in milliseconds."""
+    response = response_class(content=None)
+    start = time.perf_counter()
+    for _ in range(iterations):
+        response.render(payload)
+    return (time.perf_counter() - start) * 1000 / iterations
+
+
+def measure(payload: dict, iterations: int) -> dict:
+    """Render time and encoded sizes for both response classes.
+
+    ``fast`` is measured in production mode, so debug fields are trimmed.
+    """
+    os.environ["VERCEL_ENV"] = "production"
+    os.environ.pop("RATING_ENGINE_INCLUDE_DEBUG", None)
+
+    results = {}
+    for label, response_class in (
+        ("stdlib", JSONResponse),
+        ("fast", FastJSONResponse),
+    ):
+        body = response_class(content=None).render(payload)
+        entry = {
+            "render_ms": round(time_render(response_class, payload, iterations), 3),
+            "bytes": len(body),
+            "gzip_bytes": len(gzip.compress(body, compresslevel=9)),
+        }
+        if brotli is not None:
+            entry["brotli_bytes"] = len(brotli.compress(body))
+        results[label] = entry
+
+    results["speedup"] = round(
+        results["stdlib"]["render_ms"] / results["fast"]["render_ms"], 2
+    )
+    return results
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description="Benchmark response serialization")
+    parser.add_argument(
+        "--iterations", type=int, default=200, help="Renders per measurement"
+    )
+    parser.add_argument("--json", action="store_true", help="Print JSON output")
+    args = parser.parse_args()
+
+    payloads = {
+        "leaderboard_200_players": leaderboard_payload(),
+        "games_1000": games_payload(),
+    }
+    output = {
+        "orjson": orjson is not None,
+        "brotli": brotli is not None,
+        "iterations": args.iterations,
+        "payloads": {
+            name: measure(payload, args.iterations)
+            for name, payload in payloads.items()
+        },
+    }
+
+    if args.json:
+        print(json.dumps(output))
+        return
+
+    print("\n" + "=" * 60)
+    print(
+        f"Response serialization (orjson: {output['orjson']}, "
+        f"{args.iterations} iterations)"
+    )
+    print("=" * 60)
+    for name, result in output["payloads"].items():
+        print(f"{name}  (fast is {result['speedup']}x stdlib)")
+        for label in ("stdlib", "fast"):
+            entry = result[label]
+            sizes = f"{entry['bytes']:>9} B raw {entry['gzip_bytes']:>8} B gzip"
+            if "brotli_bytes" in entry:
+                sizes += f" {entry['brotli_bytes']:>8} B br"
+            print(f"  {label:<7} {entry['render_ms']:>8.3f}ms  {sizes}")
+        print("-" * 60)
+
+
+if __name__ == "__main__":
+    main()
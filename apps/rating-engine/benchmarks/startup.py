@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+"""
+Cold-Start Import Benchmark
+
+Measures how long it takes to import the Vercel function entry point
+(api/index.py) using ``python -X importtime`` in fresh interpreters, and checks
+the result against the tracked budget in benchmarks/startup_budget.json.
+
+Usage:
+    # Report median import time and the slowest top-level imports
+    uv run python benchmarks/startup.py
+
+    # Fail (exit 1) if the budget is exceeded or a deferred module is imported
+    uv run python benchmarks/startup.py --check
+
+    # Machine-readable output
+    uv run python benchmarks/startup.py --runs 10 --json
+
+Notes:
+    - Runs with VERCEL=1 so the import path matches production (no .env loading)
+    - One warm-up run is discarded so .pyc compilation is not measured
+    - ``forbidden_modules`` must not be imported until a handler needs them
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+
+RATING_ENGINE_DIR = Path(__file__).parent.parent
+BUDGET_PATH = Path(__file__).parent / "startup_budget.json"
+
+
+@dataclass
+class ImportRecord:
+    """One line of ``-X importtime`` output."""
+
+    module: str
+    depth: int
+    self_us: int
+    cumulative_us: int
+
+
+def parse_importtime(stderr: str) -> list[ImportRecord]:
+    """Parse ``-X importtime`` output into records."""
+    records = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+
+        # "import time:   self |  cumulative | <indent>module"
+        self_us, cumulative_us, name = line.split(":", 1)[1].split("|")
+        name = name[1:]  # drop the separator space, keep indentation
+        depth = (len(name) - len(name.lstrip(" "))) // 2
+        records.append(
+            ImportRecord(
+                module=name.strip(),
+                depth=depth,
+                self_us=int(self_us),
+                cumulative_us=int(cumulative_us),
+            )
+        )
+    return records
+
+
+def direct_children(records: list[ImportRecord], module: str) -> list[ImportRecord]:
+    """Return the modules imported directly by a top-level module.
+
+    importtime prints children before their parent, so the entry's children
+    are the depth-1 records between it and the previous top-level record.
+    """
+    entry_index = next(
+        i for i, r in enumerate(records) if r.module == module and r.depth == 0
+    )
+    children = []
+    for record in reversed(records[:entry_index]):
+        if record.depth == 0:
+            break
+        if record.depth == 1:
+            children.append(record)
+    return children
+
+
+def measure_once(module: str) -> list[ImportRecord]:
+    """Import module in a fresh interpreter and return its import records."""
+    env = {**os.environ, "VERCEL": "1"}
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=RATING_ENGINE_DIR,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return parse_importtime(completed.stderr)
+
+
+def run_benchmark(module: str, runs: int, top: int) -> dict:
+    """Measure import time over several runs and summarize the median run."""
+    measure_once(module)  # warm-up: compile .pyc files
+
+    samples = [measure_once(module) for _ in range(runs)]
+    totals = [
+        next(r.cumulative_us for r in records if r.module == module and r.depth == 0)
+        for records in samples
+    ]
+    median_total = statistics.median(totals)
+    median_run = samples[totals.index(min(totals, key=lambda t: abs(t - median_total)))]
+
+    slowest = sorted(
+        direct_children(median_run, module),
+        key=lambda r: r.cumulative_us,
+        reverse=True,
+    )
+
+    return {
+        "module": module,
+        "runs": runs,
+        "median_ms": round(median_total / 1000, 1),
+        "min_ms": round(min(totals) / 1000, 1),
+        "max_ms": round(max(totals) / 1000, 1),
+        "imported_modules": sorted({r.module for r in median_run}),
+        "slowest_imports": [
+            {"module": r.module, "cumulative_ms": round(r.cumulative_us / 1000, 1)}
+            for r in slowest[:top]
+        ],
+    }
+
+
+def check_budget(result: dict, budget: dict) -> list[str]:
+    """Return budget violations (empty if within budget)."""
+    violations = []
+    if result["median_ms"] > budget["budget_ms"]:
+        violations.append(
+            f"median import time {result['median_ms']}ms exceeds "
+            f"budget {budget['budget_ms']}ms"
+        )
+
+    imported = set(result["imported_modules"])
+    for forbidden in budget.get("forbidden_modules", []):
+        if forbidden in imported:
+            violations.append(f"'{forbidden}' is imported at startup")
+    return violations
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description="Measure cold-start import time")
+    parser.add_argument("--runs", type=int, default=5, help="Measured runs")
+    parser.add_argument("--top", type=int, default=10, help="Slowest imports shown")
+    parser.add_argument(
+        "--check", action="store_true", help="Exit 1 if the budget is exceeded"
+    )
+    parser.add_argument("--json", action="store_true", help="Print JSON output")
+    args = parser.parse_args()
+
+    budget = json.loads(BUDGET_PATH.read_text())
+    result = run_benchmark(budget["module"], args.runs, args.top)
+    violations = check_budget(result, budget)
+
+    if args.json:
+        output = {k: v for k, v in result.items() if k != "imported_modules"}
+        print(json.dumps({**output, "budget": budget, "violations": violations}))
+    else:
+        print("\n" + "=" * 60)
+        print(f"Cold-start import: {result['module']}")
+        print("=" * 60)
+        print(
+            f"Median: {result['median_ms']}ms "
+            f"(min {result['min_ms']}ms, max {result['max_ms']}ms, "
+            f"{result['runs']} runs) - budget {budget['budget_ms']}ms"
+        )
+        print("-" * 60)
+        for entry in result["slowest_imports"]:
+            print(f"  {entry['module']:<45} {entry['cumulative_ms']:>8}ms")
+        print("=" * 60)
+        for violation in violations:
+            print(f"❌ {violation}")
+        if not violations:
+            print("✅ Within startup budget")
+
+    if args.check and violations:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
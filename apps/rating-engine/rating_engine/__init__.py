@@ -4,8 +4,18 @@ Riichi Mahjong Rating Engine Package
 OpenSkill-based rating calculations for mahjong games.
 """
 
-__version__ = "0.1.0"
+from typing import Any
 
-from .materialization import MaterializationEngine, materialize_data_for_config
+__version__ = "0.1.0"
 
 __all__ = ["MaterializationEngine", "materialize_data_for_config"]
+
+
+def __getattr__(name: str) -> Any:
+    # Resolve exports lazily so importing a light submodule (events, caches)
+    # does not pull in the whole materialization module at startup.
+    if name in __all__:
+        from . import materialization
+
+        return getattr(materialization, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
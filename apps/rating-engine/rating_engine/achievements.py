@@ -0,0 +1,171 @@
+"""
+Achievements
+
+Rule-based achievement grants evaluated after an official configuration is
+materialized. Every rule looks at the in-memory PlayerRating states from the
+rating pass, so one loop over the players evaluates all rules; grants are then
+upserted into ``player_achievements`` in a single request (see
+MaterializationEngine._grant_achievements).
+
+Grants are keyed by (player, achievement, season name). Only the most
+recently registered official configuration of a season grants, and its grants
+replace the engine's earlier ones for that season; re-running a
+materialization never duplicates or re-dates an existing grant.
+"""
+
+from collections.abc import Callable
+from dataclasses import dataclass
+from datetime import UTC, datetime
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from .materialization import MaterializationConfig, PlayerRating
+
+FIRST_PLACE_STREAK = 3
+FOURTH_FREE_STREAK = 10
+GAMES_PLAYED_MILESTONES = (50, 100)
+
+
+@dataclass(frozen=True)
+class SeasonContext:
+    """Facts shared by all rules for one configuration."""
+
+    config: "MaterializationConfig"
+    season_over: bool
+    champion_id: str | None
+
+
+@dataclass(frozen=True)
+class AchievementRule:
+    """An achievement code and the predicate that grants it.
+
+    ``evaluate`` returns grant metadata, or None when the player does not
+    qualify.
+    """
+
+    code: str
+    evaluate: Callable[["PlayerRating", SeasonContext], dict[str, Any] | None]
+
+
+@dataclass(frozen=True)
+class AchievementGrant:
+    """One achievement earned by one player in one season."""
+
+    player_id: str
+    code: str
+    metadata: dict[str, Any]
+
+
+def _season_champion(
+    rating: "PlayerRating", context: SeasonContext
+) -> dict[str, Any] | None:
+    if not context.season_over or rating.player_id != context.champion_id:
+        return None
+    return {
+        "display_rating": round(rating.display_rating, 2),
+        "games_played": rating.games_played,
+    }
+
+
+def _first_place_streak(
+    rating: "PlayerRating", context: SeasonContext
+) -> dict[str, Any] | None:
+    if rating.longest_first_streak < FIRST_PLACE_STREAK:
+        return None
+    return {"streak": rating.longest_first_streak}
+
+
+def _fourth_free_streak(
+    rating: "PlayerRating", context: SeasonContext
+) -> dict[str, Any] | None:
+    if rating.longest_fourth_free_streak < FOURTH_FREE_STREAK:
+        return None
+    return {"streak": rating.longest_fourth_free_streak}
+
+
+def _games_played(
+    milestone: int,
+) -> Callable[["PlayerRating", SeasonContext], dict[str, Any] | None]:
+    def evaluate(
+        rating: "PlayerRating", context: SeasonContext
+    ) -> dict[str, Any] | None:
+        if rating.games_played < milestone:
+            return None
+        return {"games_played": rating.games_played}
+
+    return evaluate
+
+
+RULES: tuple[AchievementRule, ...] = (
+    AchievementRule("regular_season_champion", _season_champion),
+    AchievementRule("first_place_streak", _first_place_streak),
+    AchievementRule("fourth_free_streak", _fourth_free_streak),
+    *(
+        AchievementRule(f"games_played_{milestone}", _games_played(milestone))
+        for milestone in GAMES_PLAYED_MILESTONES
+    ),
+)
+
+
+def season_context(
+    config: "MaterializationConfig",
+    player_ratings: dict[str, "PlayerRating"],
+    now: datetime | None = None,
+) -> SeasonContext:
+    """
+    Evaluate the configuration-wide facts once.
+
+    The champion is the highest display rating among players with at least
+    ``config.min_games`` games (ties go to the lower player id); it is only
+    awarded once the configuration's time range has ended.
+    """
+    end = datetime.fromisoformat(config.end_date.replace("Z", "+00:00"))
+    if end.tzinfo is None:
+        end = end.replace(tzinfo=UTC)
+    qualified = [
+        rating for rating in player_ratings.values() if rating.is_qualified(config)
+    ]
+    champion = min(
+        qualified,
+        key=lambda rating: (-rating.display_rating, rating.player_id),
+        default=None,
+    )
+    return SeasonContext(
+        config=config,
+        season_over=end < (now or datetime.now(UTC)),
+        champion_id=champion.player_id if champion else None,
+    )
+
+
+def evaluate_achievements(
+    config: "MaterializationConfig",
+    player_ratings: dict[str, "PlayerRating"],
+    rules: tuple[AchievementRule, ...] = RULES,
+    now: datetime | None = None,
+) -> list[AchievementGrant]:
+    """
+    Evaluate every rule for every player in one pass.
+
+    Args:
+        config: Materialized configuration (its name is the season name)
+        player_ratings: Final player states from the rating pass
+        rules: Rules to evaluate (defaults to RULES)
+        now: Current time, for deciding whether the season is over
+
+    Returns:
+        Grants with metadata, in player then rule order
+    """
+    context = season_context(config, player_ratings, now)
+    grants = []
+    for player_id, rating in player_ratings.items():
+        for rule in rules:
+            metadata = rule.evaluate(rating, context)
+            if metadata is not None:
+                grants.append(
+                    AchievementGrant(
+                        player_id=player_id,
+                        code=rule.code,
+                        metadata={**metadata, "config_hash": config.config_hash},
+                    )
+                )
+    return grants
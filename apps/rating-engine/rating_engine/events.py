@@ -0,0 +1,60 @@
+"""
+Materialization Events
+
+Progress events emitted by MaterializationEngine while it works through a
+materialization. Hooks receive every event synchronously, which lets callers
+stream progress to clients, record metrics or collect phase timings without
+the engine knowing about any of them.
+
+Phase events carry ``elapsed_ms`` (duration of the phase that just finished);
+progress events such as ``games_processed`` do not.
+"""
+
+import time
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from datetime import UTC, datetime
+from typing import Any
+
+# Event names, in the order a full materialization emits them
+STARTED = "started"
+CONFIG_LOADED = "config_loaded"
+GAMES_LOADED = "games_loaded"
+SCORES_RECONCILED = "scores_reconciled"
+HASH_COMPUTED = "hash_computed"
+CACHE_HIT = "cache_hit"
+CACHE_MISS = "cache_miss"
+HAND_STATS_COMPUTED = "hand_stats_computed"
+GAMES_PROCESSED = "games_processed"
+RATINGS_COMPUTED = "ratings_computed"
+ROWS_WRITTEN = "rows_written"
+CACHE_CLEARED = "cache_cleared"
+ACHIEVEMENTS_GRANTED = "achievements_granted"
+COMPLETED = "completed"
+FAILED = "failed"
+
+
+@dataclass(frozen=True)
+class MaterializationEvent:
+    """A single progress event from the materialization engine."""
+
+    event: str
+    config_hash: str | None
+    timestamp: float = field(default_factory=time.time)
+    elapsed_ms: float | None = None
+    data: dict[str, Any] = field(default_factory=dict)
+
+    def to_dict(self) -> dict[str, Any]:
+        """JSON-serializable representation for streaming to clients."""
+        return {
+            "event": self.event,
+            "config_hash": self.config_hash,
+            "timestamp": datetime.fromtimestamp(self.timestamp, UTC).isoformat(),
+            "elapsed_ms": round(self.elapsed_ms, 2)
+            if self.elapsed_ms is not None
+            else None,
+            **self.data,
+        }
+
+
+MaterializationHook = Callable[[MaterializationEvent], None]
@@ -0,0 +1,135 @@
+"""
+Hand Statistics
+
+Per-player hand-level rates aggregated from ``hand_events`` rows (one row per
+seat per hand), stored in the ``tsumo_rate``, ``ron_rate``, ``riichi_rate``
+and ``deal_in_rate`` columns of ``cached_player_ratings``.
+
+Wins and deal-ins are identified like the web app's playerStatistics.ts:
+- win: ``tsumo``/``ron`` event where the seat is in ``details.winnerSeats``
+  (or is ``details.winnerSeat``)
+- deal-in: ``ron`` event where the seat is ``details.loserSeat``
+Rows without winner/loser details fall back to the sign of ``points_delta``
+(ignoring the seat's own riichi bet).
+
+All four rates are fractions of the player's hands (numeric(5,4) columns), so
+``tsumo_rate + ron_rate`` is the win rate; the web's "tsumo % of wins" is
+``tsumo_rate / (tsumo_rate + ron_rate)``.
+"""
+
+from collections.abc import Iterable
+from dataclasses import dataclass
+from typing import Any
+
+# Columns needed from hand_events
+HAND_EVENT_COLUMNS = (
+    "game_id, hand_seq, seat, event_type, riichi_declared, points_delta, "
+    "round_kanji, kyoku, details"
+)
+
+RIICHI_BET = 1000
+WIN_EVENTS = frozenset({"tsumo", "ron"})
+
+
+@dataclass
+class HandStatistics:
+    """Hand counts for one player."""
+
+    hands: int = 0
+    tsumo_wins: int = 0
+    ron_wins: int = 0
+    deal_ins: int = 0
+    riichi_hands: int = 0
+
+    def add_hand(self, row: dict[str, Any]) -> tuple[bool, bool]:
+        """Count one hand_events row; returns (won, dealt_in)."""
+        won = is_win(row)
+        dealt_in = not won and is_deal_in(row)
+        self.hands += 1
+        if row.get("riichi_declared"):
+            self.riichi_hands += 1
+        if won:
+            if row["event_type"] == "tsumo":
+                self.tsumo_wins += 1
+            else:
+                self.ron_wins += 1
+        elif dealt_in:
+            self.deal_ins += 1
+        return won, dealt_in
+
+    def _rate(self, count: int) -> float | None:
+        return round(count / self.hands, 4) if self.hands else None
+
+    @property
+    def tsumo_rate(self) -> float | None:
+        return self._rate(self.tsumo_wins)
+
+    @property
+    def ron_rate(self) -> float | None:
+        return self._rate(self.ron_wins)
+
+    @property
+    def riichi_rate(self) -> float | None:
+        return self._rate(self.riichi_hands)
+
+    @property
+    def deal_in_rate(self) -> float | None:
+        return self._rate(self.deal_ins)
+
+
+def is_win(row: dict[str, Any]) -> bool:
+    """Whether this seat won the hand."""
+    if row["event_type"] not in WIN_EVENTS:
+        return False
+    details = row.get("details") or {}
+    winner_seats = details.get("winnerSeats")
+    if winner_seats:
+        return row["seat"] in winner_seats
+    if details.get("winnerSeat"):
+        return row["seat"] == details["winnerSeat"]
+    return row["points_delta"] > 0
+
+
+def is_deal_in(row: dict[str, Any]) -> bool:
+    """Whether this seat dealt into a ron."""
+    if row["event_type"] != "ron":
+        return False
+    details = row.get("details") or {}
+    if details.get("loserSeat"):
+        return row["seat"] == details["loserSeat"]
+    own_bet = RIICHI_BET if row.get("riichi_declared") else 0
+    return row["points_delta"] + own_bet < 0
+
+
+def aggregate_hand_events(
+    rows: Iterable[dict[str, Any]],
+    seats_by_game: dict[str, dict[str, dict[str, Any]]],
+    statistics: dict[str, HandStatistics] | None = None,
+) -> dict[str, HandStatistics]:
+    """
+    Add hand event rows to per-player counts in a single pass.
+
+    Args:
+        rows: hand_events rows (HAND_EVENT_COLUMNS)
+        seats_by_game: game_id -> seat -> {player_id, ...} (GameData.seats);
+            rows for other games are ignored
+        statistics: Counts to add to, so pages can be aggregated as they arrive
+            (entries may be subclasses, e.g. PlayerStatistics)
+
+    Returns:
+        player_id -> HandStatistics
+    """
+    if statistics is None:
+        statistics = {}
+
+    for row in rows:
+        seats = seats_by_game.get(row["game_id"])
+        if seats is None or row["seat"] not in seats:
+            continue
+        player_id = seats[row["seat"]]["player_id"]
+        counts = statistics.get(player_id)
+        if counts is None:
+            counts = statistics[player_id] = HandStatistics()
+        counts.add_hand(row)
+
+    return statistics
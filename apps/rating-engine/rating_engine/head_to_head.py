@@ -0,0 +1,86 @@
+"""
+Head-to-Head
+
+Pairwise records for every two players who shared a table, accumulated in
+the rating pass and stored in ``cached_head_to_head``.
+
+Each unordered pair is kept once, keyed with ``player_a < player_b``; every
+figure is from player_a's point of view (negate differences for player_b).
+Only pairs that actually met get a row, so the table stays sparse.
+"""
+
+from dataclasses import dataclass
+from datetime import datetime
+from itertools import combinations
+from typing import Any
+
+
+@dataclass
+class PairRecord:
+    """Running totals for one pair, from player_a's side."""
+
+    games: int = 0
+    a_finished_above: int = 0
+    placement_diff_total: int = 0
+    plus_minus_diff: int = 0
+    last_played_at: datetime | None = None
+
+    @property
+    def b_finished_above(self) -> int:
+        # Placements within a game are unique (ties break by seat order)
+        return self.games - self.a_finished_above
+
+    @property
+    def avg_placement_diff(self) -> float | None:
+        """Mean of placement_a - placement_b; negative means a usually wins."""
+        return round(self.placement_diff_total / self.games, 2) if self.games else None
+
+
+class HeadToHead:
+    """Sparse pairwise table built one game at a time."""
+
+    def __init__(self) -> None:
+        self.pairs: dict[tuple[str, str], PairRecord] = {}
+
+    def add_game(self, played_at: datetime, results: list[dict[str, Any]]) -> None:
+        """
+        Add one game.
+
+        Args:
+            played_at: When the game was played
+            results: One entry per seat with player_id, placement, plus_minus
+        """
+        ordered = sorted(results, key=lambda result: result["player_id"])
+        for a, b in combinations(ordered, 2):
+            key = (a["player_id"], b["player_id"])
+            record = self.pairs.get(key)
+            if record is None:
+                record = self.pairs[key] = PairRecord()
+            record.games += 1
+            if a["placement"] < b["placement"]:
+                record.a_finished_above += 1
+            record.placement_diff_total += a["placement"] - b["placement"]
+            record.plus_minus_diff += a["plus_minus"] - b["plus_minus"]
+            record.last_played_at = played_at
+
+    def __len__(self) -> int:
+        return len(self.pairs)
+
+    def records(self, config_hash: str) -> list[dict[str, Any]]:
+        """cached_head_to_head rows (without cache metadata)."""
+        return [
+            {
+                "config_hash": config_hash,
+                "player_a": player_a,
+                "player_b": player_b,
+                "games_together": record.games,
+                "a_finished_above": record.a_finished_above,
+                "b_finished_above": record.b_finished_above,
+                "avg_placement_diff": record.avg_placement_diff,
+                "plus_minus_diff": record.plus_minus_diff,
+                "last_played_at": record.last_played_at.isoformat()
+                if record.last_played_at
+                else None,
+            }
+            for (player_a, player_b), record in self.pairs.items()
+        ]
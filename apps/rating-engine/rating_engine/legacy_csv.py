@@ -0,0 +1,92 @@
+"""
+Legacy CSV Logs
+
+Parses the league's legacy CSV game logs (one row per game: ``Timestamp``,
+``date``, then ``<Seat> player`` / ``<Seat> points`` for each seat) into
+GameData without touching the database.
+
+Game and player IDs are the same deterministic UUID5 values that
+scripts/migrate_legacy_data.py writes, so offline results line up with a
+database import of the same file.
+"""
+
+import csv
+import uuid
+from dataclasses import dataclass
+from datetime import UTC, datetime
+from pathlib import Path
+
+from .materialization import GameData
+
+SEATS = ("east", "south", "west", "north")
+DATE_FORMAT = "%m/%d/%Y %H:%M:%S"
+
+_NAMESPACE = uuid.uuid5(uuid.NAMESPACE_DNS, "mahjong.league")
+
+
+def deterministic_uuid(namespace: str, name: str) -> str:
+    """UUID5 for ``namespace:name``; stable across runs and machines."""
+    return str(uuid.uuid5(_NAMESPACE, f"{namespace}:{name}"))
+
+
+def legacy_game_id(row: dict[str, str]) -> str:
+    """Deterministic game ID from the play time, record time and players."""
+    player_names = [row[f"{seat.title()} player"] for seat in SEATS]
+    # Include both played_at and record timestamp to handle duplicate game times
+    game_key = f"{row['date']}_{row['Timestamp']}_{'_'.join(sorted(player_names))}"
+    return deterministic_uuid("game", game_key)
+
+
+@dataclass
+class LegacyLog:
+    """Games parsed from a legacy CSV, with display names by player ID."""
+
+    games: list[GameData]
+    player_names: dict[str, str]
+
+
+def read_legacy_games(path: Path) -> LegacyLog:
+    """
+    Parse a legacy CSV log into games sorted by start time.
+
+    Rows without a ``date`` (e.g. trailing blank lines) are skipped; play
+    times are read as UTC, as the import stores them.
+
+    Raises:
+        ValueError: On a malformed date or score, naming the CSV line
+    """
+    games = []
+    player_names: dict[str, str] = {}
+    with open(path, newline="", encoding="utf-8") as csvfile:
+        reader = csv.DictReader(csvfile)
+        for row in reader:
+            if not row.get("date"):
+                continue
+            try:
+                played_at = datetime.strptime(row["date"], DATE_FORMAT).replace(
+                    tzinfo=UTC
+                )
+                seats = {}
+                for seat in SEATS:
+                    name = row[f"{seat.title()} player"].strip()
+                    player_id = deterministic_uuid("player", name)
+                    player_names[player_id] = name
+                    seats[seat] = {
+                        "player_id": player_id,
+                        "final_score": int(row[f"{seat.title()} points"]),
+                    }
+            except ValueError as e:
+                raise ValueError(f"{path}:{reader.line_num}: {e}") from e
+
+            games.append(
+                GameData(
+                    game_id=legacy_game_id(row),
+                    started_at=played_at,
+                    finished_at=played_at,
+                    status="finished",
+                    seats=seats,
+                )
+            )
+
+    games.sort(key=lambda game: game.started_at)
+    return LegacyLog(games=games, player_names=player_names)
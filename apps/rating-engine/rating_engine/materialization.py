@@ -11,19 +11,72 @@ This module can be called from:
 """
 
 import hashlib
+import heapq
+import itertools
 import json
 import logging
-from dataclasses import dataclass
+import time
+from collections import defaultdict
+from collections.abc import Iterator, Mapping
+from dataclasses import dataclass, field
 from datetime import UTC, datetime
-from typing import Any
-
-from openskill.models import PlackettLuce
-from supabase import Client
+from functools import cache
+from operator import itemgetter
+from typing import TYPE_CHECKING, Any
+
+from . import events, server_timing
+from .achievements import RULES as ACHIEVEMENT_RULES
+from .achievements import evaluate_achievements
+from .events import MaterializationEvent, MaterializationHook
+from .hand_statistics import HAND_EVENT_COLUMNS, HandStatistics
+from .head_to_head import HeadToHead
+from .metrics import record_materialization_event
+from .player_statistics import (
+    HAND_EVENT_ORDER,
+    PlayerStatistics,
+    add_game_hands,
+    start_player_statistics,
+)
+from .result_cache import ResultCache
+from .validation import GameReconciliation, ReconciliationReport, reconcile_games
+
+if TYPE_CHECKING:
+    from openskill.models import PlackettLuce
+    from supabase import Client
 
 logger = logging.getLogger(__name__)
 
-# Create global OpenSkill model instance
-openskill_model = PlackettLuce()
+
+@cache
+def get_openskill_model() -> "PlackettLuce":
+    """Shared OpenSkill model, imported on first use to keep cold starts fast."""
+    from openskill.models import PlackettLuce
+
+    return PlackettLuce()
+
+
+# Sections of a configuration that affect results (metadata is excluded)
+CONFIG_HASH_SECTIONS = ("timeRange", "rating", "scoring", "weights", "qualification")
+
+
+def compute_config_hash(config_data: dict[str, Any]) -> str:
+    """
+    Calculate the canonical SHA-256 hash of a rating configuration.
+
+    Matches the hashing used by scripts/register_configs.py, so a posted
+    configuration hashes to the same value as its registered counterpart.
+    """
+    db_config = {section: config_data[section] for section in CONFIG_HASH_SECTIONS}
+    config_json = json.dumps(db_config, sort_keys=True)
+    return hashlib.sha256(config_json.encode()).hexdigest()
+
+
+def _parse_time_bound(value: str) -> datetime:
+    """Parse a date or timestamp bound as an aware UTC datetime."""
+    bound = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    if bound.tzinfo is None:
+        bound = bound.replace(tzinfo=UTC)
+    return bound
 
 
 @dataclass
@@ -56,6 +109,9 @@ class MaterializationConfig:
     min_games: int = 8
     drop_worst: int = 2
 
+    # Official (season) configurations also grant achievements
+    is_official: bool = False
+
     def __post_init__(self) -> None:
         """Validate configuration after initialization."""
         if self.uma is None:
@@ -81,6 +137,34 @@ class MaterializationConfig:
         if self.confidence_factor <= 0:
             raise ValueError("Confidence factor must be positive")
 
+    @classmethod
+    def from_config_data(
+        cls,
+        config_hash: str,
+        name: str,
+        config_data: dict[str, Any],
+        is_official: bool = False,
+    ) -> "MaterializationConfig":
+        """Build a configuration from its stored JSON representation."""
+        return cls(
+            config_hash=config_hash,
+            name=name,
+            is_official=is_official,
+            start_date=config_data["timeRange"]["startDate"],
+            end_date=config_data["timeRange"]["endDate"],
+            initial_mu=config_data["rating"]["initialMu"],
+            initial_sigma=config_data["rating"]["initialSigma"],
+            confidence_factor=config_data["rating"]["confidenceFactor"],
+            decay_rate=config_data["rating"]["decayRate"],
+            oka=config_data["scoring"]["oka"],
+            uma=config_data["scoring"]["uma"],
+            weight_divisor=config_data["weights"]["divisor"],
+            weight_min=config_data["weights"]["min"],
+            weight_max=config_data["weights"]["max"],
+            min_games=config_data["qualification"]["minGames"],
+            drop_worst=config_data["qualification"]["dropWorst"],
+        )
+
 
 @dataclass
 class GameData:
@@ -113,8 +197,14 @@ class PlayerRating:
     # Streak tracking
     longest_first_streak: int = 0
     longest_fourth_free_streak: int = 0
+    current_first_streak: int = 0
+    current_fourth_free_streak: int = 0
+
+    # Worst ``drop_worst`` plus-minus results, negated so heap[0] is the best
+    # of them (the next one to give back when a worse result comes in)
+    worst_results: list[int] = field(default_factory=list)
 
-    # Performance stats (will be calculated from hand data in Phase 1)
+    # Hand-level rates as fractions of hands played (see hand_statistics)
     tsumo_rate: float | None = None
     ron_rate: float | None = None
     riichi_rate: float | None = None
@@ -122,6 +212,199 @@ class PlayerRating:
 
     last_game_date: datetime | None = None
 
+    @property
+    def adjusted_total_plus_minus(self) -> int:
+        """Total plus-minus with the ``drop_worst`` worst results dropped."""
+        return self.total_plus_minus + sum(self.worst_results)
+
+    def is_qualified(self, config: "MaterializationConfig") -> bool:
+        return self.games_played >= config.min_games
+
+
+# Rows per cached_game_results insert while streaming a rating pass
+GAME_RESULTS_CHUNK_SIZE = 1000
+
+# Rows per games page; matches PostgREST's default max-rows
+GAMES_PAGE_SIZE = 1000
+
+# Rows per hand_events page; matches PostgREST's default max-rows
+HAND_EVENTS_PAGE_SIZE = 1000
+
+# Games per lookup of previously cached seatings (four rows each, so a lookup
+# stays within PostgREST's default max-rows)
+SEATING_LOOKUP_GAMES = 250
+
+
+class GameResultSink:
+    """
+    Streams per-seat game result rows to ``cached_game_results`` in chunks.
+
+    The rating pass appends one row per seat per game; rows are written every
+    ``chunk_size`` appends, so at most one chunk is held in memory instead of
+    the whole history. Upserting replaces the previous run's row for the same
+    game and player in place, so the cache is never emptied while the pass
+    runs. A corrected seating (players swapped or replaced) would clash with
+    the previous rows on ``(config_hash, game_id, seat)`` or on the primary
+    key, so before each upsert the chunk's games' cached seatings are looked
+    up and only the rows whose seat or player changed are deleted. It has
+    ``append`` and ``len`` like the list ``_process_single_game`` used to
+    fill.
+    """
+
+    def __init__(self, supabase: "Client", chunk_size: int = GAME_RESULTS_CHUNK_SIZE):
+        self.supabase = supabase
+        self.chunk_size = max(1, chunk_size)
+        self.computed_at = datetime.now(UTC).isoformat()
+        self.rows_written = 0
+        self.chunks_written = 0
+        self.flush_seconds = 0.0
+        self._buffer: list[dict[str, Any]] = []
+
+    def append(self, record: dict[str, Any]) -> None:
+        record["computed_at"] = self.computed_at
+        self._buffer.append(record)
+        if len(self._buffer) >= self.chunk_size:
+            self.flush()
+
+    def flush(self) -> None:
+        """Upsert buffered rows (no-op when empty)."""
+        if not self._buffer:
+            return
+        start = time.perf_counter()
+        self._delete_reseated_rows()
+        self.supabase.table("cached_game_results").upsert(self._buffer).execute()
+        self.flush_seconds += time.perf_counter() - start
+        self.rows_written += len(self._buffer)
+        self.chunks_written += 1
+        self._buffer = []
+
+    def __len__(self) -> int:
+        return self.rows_written + len(self._buffer)
+
+    def _delete_reseated_rows(self) -> None:
+        """Delete earlier rows of the buffered games whose seating changed."""
+        player_at: dict[tuple[str, str, str], str] = {}
+        seat_of: dict[tuple[str, str, str], str] = {}
+        games: dict[str, set[str]] = defaultdict(set)
+        for record in self._buffer:
+            game = (record["config_hash"], record["game_id"])
+            player_at[(*game, record["seat"])] = record["player_id"]
+            seat_of[(*game, record["player_id"])] = record["seat"]
+            games[record["config_hash"]].add(record["game_id"])
+
+        stale: dict[tuple[str, str], list[str]] = defaultdict(list)
+        for config_hash, game_ids in games.items():
+            ordered = sorted(game_ids)
+            for start in range(0, len(ordered), SEATING_LOOKUP_GAMES):
+                # Rows written by this run (a game split across chunks) are kept
+                result = (
+                    self.supabase.table("cached_game_results")
+                    .select("game_id, seat, player_id")
+                    .eq("config_hash", config_hash)
+                    .in_("game_id", ordered[start : start + SEATING_LOOKUP_GAMES])
+                    .lt("computed_at", self.computed_at)
+                    .execute()
+                )
+                for row in result.data:
+                    game = (config_hash, row["game_id"])
+                    seat, player_id = row["seat"], row["player_id"]
+                    if (
+                        player_at.get((*game, seat), player_id) != player_id
+                        or seat_of.get((*game, player_id), seat) != seat
+                    ):
+                        stale[game].append(player_id)
+
+        for (config_hash, game_id), player_ids in stale.items():
+            self.supabase.table("cached_game_results").delete().eq(
+                "config_hash", config_hash
+            ).eq("game_id", game_id).in_("player_id", player_ids).execute()
+
+
+def _games_range(games: list[GameData]) -> tuple[str, str]:
+    """The [first, last] ``started_at`` of non-empty games, as ISO bounds."""
+    started = [game.started_at for game in games]
+    return min(started).isoformat(), max(started).isoformat()
+
+
+class HandEventPass:
+    """
+    One read of hand_events shared by the configurations of a batch.
+
+    On first use, pages through the hand events of finished games over the
+    union of the slices' time ranges once, folding each game's rows into the
+    statistics of every slice that contains the game, so a batch never pages
+    hand_events per configuration, and a batch whose configurations are all
+    cached never pages them at all. With ``validate_scores``, each game is
+    reconciled from the same rows (see rating_engine.validation), and with
+    ``exclude_mismatched_games`` mismatched games are left out of the
+    statistics as they are read.
+    """
+
+    def __init__(
+        self, engine: "MaterializationEngine", slices: Mapping[str, list[GameData]]
+    ):
+        self.engine = engine
+        self.slices = slices
+        self._read_done = False
+        self._statistics: dict[str, dict[str, PlayerStatistics]] = {
+            config_hash: {} for config_hash in slices
+        }
+        self._games_with_hands: dict[str, int] = defaultdict(int)
+        self._mismatches: dict[str, list[GameReconciliation]] = defaultdict(list)
+
+    async def statistics(self, config_hash: str) -> dict[str, PlayerStatistics]:
+        """Hand-level statistics of one slice (games are not counted yet)."""
+        self._ensure_read()
+        return self._statistics.pop(config_hash, {})
+
+    async def reconciliation(self, config_hash: str) -> ReconciliationReport:
+        """Score reconciliation of one slice's games (needs validate_scores)."""
+        self._ensure_read()
+        games_checked = len(self.slices[config_hash])
+        return ReconciliationReport(
+            games_checked=games_checked,
+            games_without_hands=games_checked - self._games_with_hands[config_hash],
+            mismatches=self._mismatches.pop(config_hash, []),
+        )
+
+    def _ensure_read(self) -> None:
+        if not self._read_done:
+            self._read_done = True
+            self._read()
+
+    def _read(self) -> None:
+        games_by_id: dict[str, GameData] = {}
+        slices_by_game: dict[str, list[str]] = defaultdict(list)
+        for config_hash, games in self.slices.items():
+            for game in games:
+                games_by_id[game.game_id] = game
+                slices_by_game[game.game_id].append(config_hash)
+        if not games_by_id:
+            return
+
+        validate = self.engine.validate_scores
+        exclude = self.engine.exclude_mismatched_games
+        columns = HAND_EVENT_COLUMNS + (", pot_delta" if validate else "")
+        pages = self.engine._iter_hand_event_pages(
+            *_games_range(list(games_by_id.values())), columns
+        )
+        rows = (row for page in pages for row in page)
+        for game_id, group in itertools.groupby(rows, key=itemgetter("game_id")):
+            game = games_by_id.get(game_id)
+            if game is None:
+                continue
+            game_rows = list(group)
+            mismatches = []
+            if validate:
+                mismatches = reconcile_games([game], game_rows).mismatches
+                for config_hash in slices_by_game[game_id]:
+                    self._games_with_hands[config_hash] += 1
+                    self._mismatches[config_hash].extend(mismatches)
+            if exclude and mismatches:
+                continue
+            for config_hash in slices_by_game[game_id]:
+                add_game_hands(self._statistics[config_hash], game, game_rows)
+
 
 class MaterializationEngine:
     """
@@ -132,10 +415,58 @@ class MaterializationEngine:
     2. Computing OpenSkill ratings
     3. Calculating statistics and performance metrics
     4. Storing results in cache tables (idempotent)
+
+    Hooks are called with a MaterializationEvent at each phase boundary
+    (see rating_engine.events), and with a ``games_processed`` progress event
+    every ``progress_interval`` games during the rating pass. Game result rows
+    are written in chunks of ``game_results_chunk_size`` while the pass runs.
+
+    With ``validate_scores``, final scores are reconciled against hand_events
+    before rating (see rating_engine.validation); ``exclude_mismatched_games``
+    also leaves games that do not add up out of ratings and statistics.
     """
 
-    def __init__(self, supabase: Client):
+    def __init__(
+        self,
+        supabase: "Client",
+        hooks: list[MaterializationHook] | None = None,
+        progress_interval: int = 100,
+        game_results_chunk_size: int = GAME_RESULTS_CHUNK_SIZE,
+        validate_scores: bool = False,
+        exclude_mismatched_games: bool = False,
+    ):
         self.supabase = supabase
+        self.game_results_chunk_size = game_results_chunk_size
+        self.validate_scores = validate_scores or exclude_mismatched_games
+        self.exclude_mismatched_games = exclude_mismatched_games
+        # Phase timings always feed /metrics and, inside a request, the
+        # Server-Timing header
+        self.hooks: list[MaterializationHook] = [
+            record_materialization_event,
+            server_timing.record_materialization_event,
+            *(hooks or []),
+        ]
+        self.progress_interval = max(1, progress_interval)
+
+    def _emit(
+        self,
+        event: str,
+        config_hash: str | None,
+        started: float | None = None,
+        **data: Any,
+    ) -> None:
+        """Send an event to all hooks; hook failures never break materialization."""
+        elapsed_ms = (
+            (time.perf_counter() - started) * 1000 if started is not None else None
+        )
+        materialization_event = MaterializationEvent(
+            event=event, config_hash=config_hash, elapsed_ms=elapsed_ms, data=data
+        )
+        for hook in self.hooks:
+            try:
+                hook(materialization_event)
+            except Exception:
+                logger.exception(f"Materialization hook failed on '{event}'")
 
     async def materialize_for_config(
         self, config_hash: str, force_refresh: bool = False
@@ -151,40 +482,334 @@ class MaterializationEngine:
             Dictionary with materialization results and metadata
         """
         logger.info(f"🚀 Starting materialization for config: {config_hash[:8]}...")
+        run_start = time.perf_counter()
+        self._emit(events.STARTED, config_hash, force_refresh=force_refresh)
+
+        try:
+            # 1. Load configuration
+            phase_start = time.perf_counter()
+            config = await self._load_configuration(config_hash)
+            logger.info(f"📋 Loaded config: {config.name}")
+            self._emit(events.CONFIG_LOADED, config_hash, phase_start, name=config.name)
+
+            # 2. Load source game data
+            phase_start = time.perf_counter()
+            games = await self._load_source_games(config)
+            logger.info(f"🎮 Loaded {len(games)} games in time range")
+            self._emit(
+                events.GAMES_LOADED, config_hash, phase_start, games_count=len(games)
+            )
 
-        # 1. Load configuration
-        config = await self._load_configuration(config_hash)
-        logger.info(f"📋 Loaded config: {config.name}")
+            result = await self._materialize_games(config, games, force_refresh)
+        except Exception as e:
+            self._emit(events.FAILED, config_hash, run_start, error=str(e))
+            raise
 
-        # 2. Load source game data
-        games = await self._load_source_games(config)
-        logger.info(f"🎮 Loaded {len(games)} games in time range")
+        self._emit(events.COMPLETED, config_hash, run_start, status=result["status"])
+        return result
+
+    async def materialize_batch(
+        self, config_hashes: list[str], force_refresh: bool = False
+    ) -> dict[str, Any]:
+        """
+        Materialize several configurations from a single shared game load.
 
-        # 3. Check if recalculation needed
+        Loads all configurations in one query and the games for the union of
+        their time ranges in another, then slices the games per configuration
+        in memory; hand events are read in one pass shared by the whole batch
+        (see HandEventPass). Each configuration is cached/computed/stored independently,
+        so one failing configuration does not abort the rest of the batch.
+
+        Args:
+            config_hashes: Configuration hashes to materialize
+            force_refresh: If True, recalculates even if cache exists
+
+        Returns:
+            Dictionary with batch status, shared load timing and per-config results
+        """
+        batch_start = time.perf_counter()
+        unique_hashes = list(dict.fromkeys(config_hashes))
+        logger.info(
+            f"🚀 Starting batch materialization for {len(unique_hashes)} configs"
+        )
+
+        # 1. Load all configurations in one round trip
+        configs = await self._load_configurations(unique_hashes)
+
+        # 2. Load games for the union of all time ranges once
+        load_start = time.perf_counter()
+        all_games: list[GameData] = []
+        if configs:
+            all_games = await self._load_games_in_range(
+                min(config.start_date for config in configs.values()),
+                max(config.end_date for config in configs.values()),
+            )
+        load_ms = (time.perf_counter() - load_start) * 1000
+        logger.info(f"🎮 Loaded {len(all_games)} games for union time range")
+        self._emit(events.GAMES_LOADED, None, load_start, games_count=len(all_games))
+
+        # 3. Slice, compute and store per configuration; hand events are read
+        # once for the whole batch, when the first configuration needs them
+        slices = {
+            config_hash: self._slice_games(all_games, config)
+            for config_hash, config in configs.items()
+        }
+        hand_events = HandEventPass(self, slices)
+        results = []
+        for config_hash in unique_hashes:
+            config_start = time.perf_counter()
+            config = configs.get(config_hash)
+
+            if config is None:
+                result: dict[str, Any] = {
+                    "status": "error",
+                    "config_hash": config_hash,
+                    "error": f"Configuration not found: {config_hash}",
+                }
+            else:
+                try:
+                    result = await self._materialize_games(
+                        config, slices[config_hash], force_refresh, hand_events
+                    )
+                except (ValueError, KeyError) as e:
+                    result = {
+                        "status": "error",
+                        "config_hash": config_hash,
+                        "error": str(e),
+                    }
+                except Exception:
+                    logger.exception(f"Batch materialization failed for {config_hash}")
+                    result = {
+                        "status": "error",
+                        "config_hash": config_hash,
+                        "error": "Internal server error - check logs",
+                    }
+
+            result["duration_ms"] = round(
+                (time.perf_counter() - config_start) * 1000, 2
+            )
+            results.append(result)
+
+        failed = sum(1 for result in results if result["status"] == "error")
+        if failed == 0:
+            status = "completed"
+        elif failed == len(results):
+            status = "error"
+        else:
+            status = "partial"
+
+        return {
+            "status": status,
+            "games_loaded": len(all_games),
+            "load_ms": round(load_ms, 2),
+            "duration_ms": round((time.perf_counter() - batch_start) * 1000, 2),
+            "results": results,
+        }
+
+    async def _materialize_games(
+        self,
+        config: MaterializationConfig,
+        games: list[GameData],
+        force_refresh: bool,
+        hand_events: HandEventPass | None = None,
+    ) -> dict[str, Any]:
+        """Check the cache, then compute and store ratings for loaded games.
+
+        ``hand_events`` is a batch's shared pass; by default the games' hand
+        events are read on their own.
+        """
+        config_hash = config.config_hash
+        if hand_events is None:
+            hand_events = HandEventPass(self, {config_hash: games})
+
+        # 3. Optionally reconcile final scores with hand_events, from the same
+        # pass as the hand statistics; before hashing, so the source data hash
+        # covers exactly the games that are rated
+        reconciliation = None
+        if self.validate_scores:
+            phase_start = time.perf_counter()
+            reconciliation = await hand_events.reconciliation(config_hash)
+            excluded = reconciliation.mismatched_game_ids
+            if self.exclude_mismatched_games and excluded:
+                games = [game for game in games if game.game_id not in excluded]
+            self._emit(
+                events.SCORES_RECONCILED,
+                config_hash,
+                phase_start,
+                excluded=self.exclude_mismatched_games,
+                **reconciliation.summary(),
+            )
+            if reconciliation.mismatches:
+                logger.warning(
+                    f"⚠️ {len(reconciliation.mismatches)} games with final scores "
+                    "that do not match their hand events"
+                )
+
+        # 4. Check if recalculation needed
+        phase_start = time.perf_counter()
         source_data_hash = self._calculate_source_data_hash(games)
-        if not force_refresh and await self._is_cache_valid(
-            config_hash, source_data_hash
-        ):
-            logger.info("✅ Cache is valid, skipping recalculation")
-            return {"status": "cache_hit", "config_hash": config_hash}
+        self._emit(
+            events.HASH_COMPUTED,
+            config_hash,
+            phase_start,
+            source_data_hash=source_data_hash,
+        )
+
+        if not force_refresh:
+            phase_start = time.perf_counter()
+            cache_valid = await self._is_cache_valid(config_hash, source_data_hash)
+            self._emit(
+                events.CACHE_HIT if cache_valid else events.CACHE_MISS,
+                config_hash,
+                phase_start,
+            )
+            if cache_valid:
+                logger.info("✅ Cache is valid, skipping recalculation")
+                return self._with_reconciliation(
+                    {"status": "cache_hit", "config_hash": config_hash},
+                    reconciliation,
+                )
 
-        # 4. Calculate ratings and statistics
-        player_ratings, game_results = await self._calculate_ratings(config, games)
+        # 5. Aggregate player statistics from games and hand_events
+        phase_start = time.perf_counter()
+        player_statistics = await self._load_player_statistics(
+            config, games, hand_events
+        )
+        self._emit(
+            events.HAND_STATS_COMPUTED,
+            config_hash,
+            phase_start,
+            players_count=len(player_statistics),
+        )
+
+        # 6. Calculate ratings, streaming game results over the cached rows
+        sink = GameResultSink(self.supabase, self.game_results_chunk_size)
+        head_to_head = HeadToHead()
+        phase_start = time.perf_counter()
+        player_ratings, _ = await self._calculate_ratings(
+            config, games, sink, head_to_head
+        )
+        self._apply_hand_statistics(player_ratings, player_statistics)
         logger.info(f"📊 Calculated ratings for {len(player_ratings)} players")
+        # Time spent writing chunks is reported with rows_written instead
+        self._emit(
+            events.RATINGS_COMPUTED,
+            config_hash,
+            phase_start + sink.flush_seconds,
+            players_count=len(player_ratings),
+        )
 
-        # 5. Store results (replace existing cache)
+        # 7. Store player ratings (last, as they carry the source data hash),
+        # statistics, head-to-head records and the last game result chunk
         await self._store_materialized_data(
-            config_hash, config, player_ratings, game_results, source_data_hash
+            config_hash,
+            config,
+            player_ratings,
+            sink,
+            source_data_hash,
+            player_statistics,
+            head_to_head,
         )
         logger.info("💾 Stored materialized data")
 
-        return {
-            "status": "materialized",
-            "config_hash": config_hash,
-            "players_count": len(player_ratings),
-            "games_count": len(games),
+        # 8. Only now remove the previous run's rows that were not replaced
+        # (e.g. a player or game no longer in the range)
+        phase_start = time.perf_counter()
+        await self._clear_stale_cache(config_hash, sink.computed_at)
+        self._emit(events.CACHE_CLEARED, config_hash, phase_start)
+
+        # 9. Grant achievements for official (season) configurations
+        if config.is_official:
+            phase_start = time.perf_counter()
+            granted = await self._grant_achievements(config, player_ratings)
+            self._emit(events.ACHIEVEMENTS_GRANTED, config_hash, phase_start, **granted)
+
+        return self._with_reconciliation(
+            {
+                "status": "materialized",
+                "config_hash": config_hash,
+                "players_count": len(player_ratings),
+                "games_count": len(games),
+                "source_data_hash": source_data_hash,
+            },
+            reconciliation,
+        )
+
+    def _with_reconciliation(
+        self, result: dict[str, Any], reconciliation: ReconciliationReport | None
+    ) -> dict[str, Any]:
+        """Add the score reconciliation report, if scores were validated."""
+        if reconciliation is not None:
+            result["score_reconciliation"] = {
+                **reconciliation.to_dict(),
+                "excluded": self.exclude_mismatched_games,
+            }
+        return result
+
+    async def calculate_for_config(
+        self, config: MaterializationConfig, cache: ResultCache | None = None
+    ) -> dict[str, Any]:
+        """
+        Calculate ratings for a configuration without writing cache tables.
+
+        Used for ad-hoc (playground) configurations. Results are memoized in
+        ``cache`` keyed by (config_hash, source_data_hash), so repeated requests
+        only pay for loading and hashing the source games.
+
+        Args:
+            config: Configuration to calculate (need not be registered)
+            cache: Optional in-memory result cache
+
+        Returns:
+            Dictionary with status, hashes, games_count and player_ratings
+        """
+        config_hash = config.config_hash
+
+        phase_start = time.perf_counter()
+        games = await self._load_source_games(config)
+        self._emit(
+            events.GAMES_LOADED, config_hash, phase_start, games_count=len(games)
+        )
+
+        phase_start = time.perf_counter()
+        source_data_hash = self._calculate_source_data_hash(games)
+        self._emit(
+            events.HASH_COMPUTED,
+            config_hash,
+            phase_start,
+            source_data_hash=source_data_hash,
+        )
+        cache_key = (config_hash, source_data_hash)
+
+        if cache is not None:
+            cached = cache.get(cache_key)
+            self._emit(
+                events.CACHE_MISS if cached is None else events.CACHE_HIT, config_hash
+            )
+            if cached is not None:
+                logger.info(f"⚡ In-memory cache hit for {config_hash[:8]}...")
+                return {**cached, "status": "cache_hit"}
+
+        phase_start = time.perf_counter()
+        player_ratings, _ = await self._calculate_ratings(config, games)
+        logger.info(f"📊 Calculated ratings for {len(player_ratings)} players")
+        self._emit(
+            events.RATINGS_COMPUTED,
+            config_hash,
+            phase_start,
+            players_count=len(player_ratings),
+        )
+
+        result = {
+            "config_hash": config.config_hash,
             "source_data_hash": source_data_hash,
+            "games_count": len(games),
+            "player_ratings": list(player_ratings.values()),
         }
+        if cache is not None:
+            cache.put(cache_key, result)
+
+        return {**result, "status": "calculated"}
 
     async def _load_configuration(self, config_hash: str) -> MaterializationConfig:
         """Load configuration from database."""
@@ -203,52 +828,115 @@ class MaterializationEngine:
 
         # Parse JSON if it's a string
         if isinstance(config_data, str):
-            import json
-
             config_data = json.loads(config_data)
 
-        return MaterializationConfig(
-            config_hash=config_hash,
-            name=config_row["name"],
-            start_date=config_data["timeRange"]["startDate"],
-            end_date=config_data["timeRange"]["endDate"],
-            initial_mu=config_data["rating"]["initialMu"],
-            initial_sigma=config_data["rating"]["initialSigma"],
-            confidence_factor=config_data["rating"]["confidenceFactor"],
-            decay_rate=config_data["rating"]["decayRate"],
-            oka=config_data["scoring"]["oka"],
-            uma=config_data["scoring"]["uma"],
-            weight_divisor=config_data["weights"]["divisor"],
-            weight_min=config_data["weights"]["min"],
-            weight_max=config_data["weights"]["max"],
-            min_games=config_data["qualification"]["minGames"],
-            drop_worst=config_data["qualification"]["dropWorst"],
+        return MaterializationConfig.from_config_data(
+            config_hash,
+            config_row["name"],
+            config_data,
+            is_official=bool(config_row.get("is_official")),
         )
 
-    async def _load_source_games(self, config: MaterializationConfig) -> list[GameData]:
-        """Load games within configuration time range."""
-        # Query games with seats in one go using JOIN
+    async def _load_configurations(
+        self, config_hashes: list[str]
+    ) -> dict[str, MaterializationConfig]:
+        """Load several configurations in one query, keyed by hash."""
+        if not config_hashes:
+            return {}
+
         result = (
-            self.supabase.table("games")
-            .select("""
-            id,
-            started_at,
-            finished_at,
-            status,
-            game_seats (
-                seat,
-                player_id,
-                final_score
-            )
-        """)
-            .eq("status", "finished")
-            .gte("started_at", config.start_date)
-            .lte("started_at", config.end_date)
+            self.supabase.table("rating_configurations")
+            .select("*")
+            .in_("config_hash", config_hashes)
             .execute()
         )
 
+        configs = {}
+        for config_row in result.data:
+            config_data = config_row["config_data"]
+            if isinstance(config_data, str):
+                config_data = json.loads(config_data)
+
+            configs[config_row["config_hash"]] = MaterializationConfig.from_config_data(
+                config_row["config_hash"],
+                config_row["name"],
+                config_data,
+                is_official=bool(config_row.get("is_official")),
+            )
+
+        return configs
+
+    async def _load_source_games(self, config: MaterializationConfig) -> list[GameData]:
+        """Load games within configuration time range."""
+        return await self._load_games_in_range(config.start_date, config.end_date)
+
+    @staticmethod
+    def _slice_games(
+        games: list[GameData], config: MaterializationConfig
+    ) -> list[GameData]:
+        """Select the games in a configuration's time range from a larger load.
+
+        Mirrors the database filter (``gte``/``lte`` on ``started_at``), where a
+        bare date bound compares as midnight UTC.
+        """
+        start = _parse_time_bound(config.start_date)
+        end = _parse_time_bound(config.end_date)
+        return [game for game in games if start <= game.started_at <= end]
+
+    async def _load_games_in_range(
+        self, start_date: str, end_date: str
+    ) -> list[GameData]:
+        """Load finished games started within [start_date, end_date].
+
+        Games come with their seats in one query per ``GAMES_PAGE_SIZE``
+        games, paged on ``id`` (keyset), so a range larger than PostgREST's
+        max-rows is never silently truncated.
+        """
+        games = []
+        for page in self._iter_game_pages(start_date, end_date):
+            games.extend(self._parse_game_rows(page))
+
+        # Sort by start time to ensure chronological processing
+        games.sort(key=lambda g: g.started_at)
+        return games
+
+    def _iter_game_pages(
+        self, start_date: str, end_date: str
+    ) -> Iterator[list[dict[str, Any]]]:
+        """Yield pages of finished games (with game_seats) in id order."""
+        last_id = None
+        while True:
+            # Query games with seats in one go using JOIN
+            query = (
+                self.supabase.table("games")
+                .select("""
+                id,
+                started_at,
+                finished_at,
+                status,
+                game_seats (
+                    seat,
+                    player_id,
+                    final_score
+                )
+            """)
+                .eq("status", "finished")
+                .gte("started_at", start_date)
+                .lte("started_at", end_date)
+            )
+            if last_id is not None:
+                query = query.gt("id", last_id)
+            page = query.order("id").limit(GAMES_PAGE_SIZE).execute()
+            yield page.data
+            if len(page.data) < GAMES_PAGE_SIZE:
+                return
+            last_id = page.data[-1]["id"]
+
+    @staticmethod
+    def _parse_game_rows(rows: list[dict[str, Any]]) -> list[GameData]:
+        """Complete games from games rows with embedded game_seats."""
         games = []
-        for game_row in result.data:
+        for game_row in rows:
             # Skip games without complete data
             if not game_row.get("game_seats") or len(game_row["game_seats"]) != 4:
                 logger.warning(f"Skipping incomplete game: {game_row['id']}")
@@ -283,24 +971,93 @@ class MaterializationEngine:
                         seats=seats,
                     )
                 )
-
-        # Sort by start time to ensure chronological processing
-        games.sort(key=lambda g: g.started_at)
         return games
 
+    def _iter_hand_event_pages(
+        self, start: str, end: str, columns: str
+    ) -> Iterator[list[dict[str, Any]]]:
+        """Yield hand_events pages for finished games started in [start, end].
+
+        One query shape (hand_events joined to games), ``HAND_EVENTS_PAGE_SIZE``
+        rows per round trip in HAND_EVENT_ORDER. Pages continue after the last
+        row's (game_id, hand_seq, seat) key instead of at an offset, so each
+        page is an index range scan and rows written meanwhile cannot shift
+        the pages.
+        """
+        last = None
+        while True:
+            query = (
+                self.supabase.table("hand_events")
+                .select(f"{columns}, games!inner(status, started_at)")
+                .eq("games.status", "finished")
+                .gte("games.started_at", start)
+                .lte("games.started_at", end)
+            )
+            if last is not None:
+                game_id, hand_seq, seat = (last[column] for column in HAND_EVENT_ORDER)
+                query = query.or_(
+                    f"game_id.gt.{game_id},"
+                    f"and(game_id.eq.{game_id},hand_seq.gt.{hand_seq}),"
+                    f"and(game_id.eq.{game_id},hand_seq.eq.{hand_seq},seat.gt.{seat})"
+                )
+            for column in HAND_EVENT_ORDER:
+                query = query.order(column)
+            page = query.limit(HAND_EVENTS_PAGE_SIZE).execute()
+            yield page.data
+            if len(page.data) < HAND_EVENTS_PAGE_SIZE:
+                return
+            last = page.data[-1]
+
+    async def _load_player_statistics(
+        self,
+        config: MaterializationConfig,
+        games: list[GameData],
+        hand_events: HandEventPass | None = None,
+    ) -> dict[str, PlayerStatistics]:
+        """Build per-player statistics for the loaded games.
+
+        Hand events come from ``hand_events`` (a batch's shared pass), or
+        from a pass over just these games.
+        """
+        if hand_events is None:
+            hand_events = HandEventPass(self, {config.config_hash: games})
+        statistics = await hand_events.statistics(config.config_hash)
+        return start_player_statistics(games, statistics)
+
+    @staticmethod
+    def _apply_hand_statistics(
+        player_ratings: dict[str, PlayerRating],
+        hand_statistics: Mapping[str, HandStatistics],
+    ) -> None:
+        """Copy hand-level rates onto the matching player ratings."""
+        for player_id, counts in hand_statistics.items():
+            rating = player_ratings.get(player_id)
+            if rating is None:
+                continue
+            rating.tsumo_rate = counts.tsumo_rate
+            rating.ron_rate = counts.ron_rate
+            rating.riichi_rate = counts.riichi_rate
+            rating.deal_in_rate = counts.deal_in_rate
+
     def _calculate_source_data_hash(self, games: list[GameData]) -> str:
-        """Calculate hash of source game data for cache invalidation."""
-        game_data = [
-            {
+        """Calculate hash of source game data for cache invalidation.
+
+        Hashes ``json.dumps([...], sort_keys=True)`` of the games one element
+        at a time, so the whole document is never held in memory.
+        """
+        encoder = json.JSONEncoder(sort_keys=True)
+        digest = hashlib.sha256(b"[")
+        for index, game in enumerate(games):
+            if index:
+                digest.update(b", ")
+            game_data = {
                 "id": game.game_id,
                 "started_at": game.started_at.isoformat(),
                 "seats": game.seats,
             }
-            for game in games
-        ]
-
-        data_str = json.dumps(game_data, sort_keys=True)
-        return hashlib.sha256(data_str.encode()).hexdigest()
+            digest.update(encoder.encode(game_data).encode())
+        digest.update(b"]")
+        return digest.hexdigest()
 
     async def _is_cache_valid(self, config_hash: str, source_data_hash: str) -> bool:
         """Check if cached data is still valid."""
@@ -318,13 +1075,23 @@ class MaterializationEngine:
         return bool(result.data[0]["source_data_hash"] == source_data_hash)
 
     async def _calculate_ratings(
-        self, config: MaterializationConfig, games: list[GameData]
-    ) -> tuple[dict[str, PlayerRating], list[dict[str, Any]]]:
-        """Calculate OpenSkill ratings and game results."""
+        self,
+        config: MaterializationConfig,
+        games: list[GameData],
+        game_results: "GameResultSink | list[dict[str, Any]] | None" = None,
+        head_to_head: HeadToHead | None = None,
+    ) -> tuple[dict[str, PlayerRating], "GameResultSink | list[dict[str, Any]]"]:
+        """Calculate OpenSkill ratings; game result rows go to ``game_results``.
+
+        Pass a GameResultSink to stream rows to the database during the pass;
+        by default they are collected in a list. Pairwise records are added to
+        ``head_to_head`` when given.
+        """
 
         # Initialize player ratings
         player_ratings: dict[str, PlayerRating] = {}
-        game_results: list[dict[str, Any]] = []
+        if game_results is None:
+            game_results = []
 
         # Get all unique players
         all_players = set()
@@ -334,29 +1101,48 @@ class MaterializationEngine:
 
         # Initialize ratings for all players
         for player_id in all_players:
-            player_ratings[player_id] = PlayerRating(
-                player_id=player_id,
-                mu=config.initial_mu,
-                sigma=config.initial_sigma,
-                display_rating=config.initial_mu
-                - config.confidence_factor * config.initial_sigma,
-            )
+            player_ratings[player_id] = self._initial_rating(config, player_id)
 
         # Process games chronologically
-        for game in games:
-            await self._process_single_game(config, game, player_ratings, game_results)
+        total_games = len(games)
+        for processed, game in enumerate(games, start=1):
+            await self._process_single_game(
+                config, game, player_ratings, game_results, head_to_head
+            )
+
+            if processed % self.progress_interval == 0 or processed == total_games:
+                self._emit(
+                    events.GAMES_PROCESSED,
+                    config.config_hash,
+                    processed=processed,
+                    total=total_games,
+                )
 
         return player_ratings, game_results
 
+    @staticmethod
+    def _initial_rating(config: MaterializationConfig, player_id: str) -> PlayerRating:
+        """Rating state of a player before their first game."""
+        return PlayerRating(
+            player_id=player_id,
+            mu=config.initial_mu,
+            sigma=config.initial_sigma,
+            display_rating=config.initial_mu
+            - config.confidence_factor * config.initial_sigma,
+        )
+
     async def _process_single_game(
         self,
         config: MaterializationConfig,
         game: GameData,
         player_ratings: dict[str, PlayerRating],
-        game_results: list[dict[str, Any]],
+        game_results: "GameResultSink | list[dict[str, Any]]",
+        head_to_head: HeadToHead | None = None,
     ) -> None:
         """Process a single game and update ratings."""
 
+        openskill_model = get_openskill_model()
+
         # Prepare OpenSkill teams (each player is their own team)
         teams = []
         players_in_game = []
@@ -402,6 +1188,9 @@ class MaterializationEngine:
             player_data["plus_minus"] = plus_minus
             player_data["weight"] = self._calculate_weight(plus_minus, config)
 
+        if head_to_head is not None:
+            head_to_head.add_game(game.started_at, placements_data)
+
         # Update OpenSkill ratings based on placements
         # IMPORTANT: Match the order of teams (created in seat order)
         # Create a mapping from player_id to placement/weight
@@ -428,6 +1217,24 @@ class MaterializationEngine:
                 p for p in placements_data if p["player_id"] == player_id
             )
 
+            first_streak = (
+                old_rating.current_first_streak + 1
+                if player_data["placement"] == 1
+                else 0
+            )
+            fourth_free_streak = (
+                old_rating.current_fourth_free_streak + 1
+                if player_data["placement"] != 4
+                else 0
+            )
+
+            # Keep the worst results in a bounded heap: O(log drop_worst)
+            worst_results = old_rating.worst_results
+            if len(worst_results) < config.drop_worst:
+                heapq.heappush(worst_results, -player_data["plus_minus"])
+            elif worst_results and -player_data["plus_minus"] > worst_results[0]:
+                heapq.heapreplace(worst_results, -player_data["plus_minus"])
+
             # Update player rating
             player_ratings[player_id] = PlayerRating(
                 player_id=player_id,
@@ -448,6 +1255,13 @@ class MaterializationEngine:
                 )
                 if player_data["plus_minus"] < 0
                 else old_rating.worst_game_minus,
+                longest_first_streak=max(old_rating.longest_first_streak, first_streak),
+                longest_fourth_free_streak=max(
+                    old_rating.longest_fourth_free_streak, fourth_free_streak
+                ),
+                current_first_streak=first_streak,
+                current_fourth_free_streak=fourth_free_streak,
+                worst_results=worst_results,
                 last_game_date=game.started_at,
             )
 
@@ -476,23 +1290,43 @@ class MaterializationEngine:
         weight = 1.0 + plus_minus / config.weight_divisor
         return max(config.weight_min, min(config.weight_max, weight))
 
-    async def _store_materialized_data(
-        self,
-        config_hash: str,
+    @staticmethod
+    def _qualified_ranks(
+        config: MaterializationConfig, player_ratings: dict[str, PlayerRating]
+    ) -> dict[str, int]:
+        """
+        Rank qualified players (``min_games`` or more games) for the standings.
+
+        Ordered by adjusted total plus-minus, then display rating, then player
+        id; unqualified players get no rank.
+        """
+        qualified = sorted(
+            (
+                rating
+                for rating in player_ratings.values()
+                if rating.is_qualified(config)
+            ),
+            key=lambda rating: (
+                -rating.adjusted_total_plus_minus,
+                -rating.display_rating,
+                rating.player_id,
+            ),
+        )
+        return {rating.player_id: rank for rank, rating in enumerate(qualified, 1)}
+
+    @classmethod
+    def _player_rating_records(
+        cls,
         config: MaterializationConfig,
         player_ratings: dict[str, PlayerRating],
-        game_results: list[dict[str, Any]],
         source_data_hash: str,
-    ) -> None:
-        """Store materialized data in cache tables (idempotent)."""
-
-        # Delete existing cache for this config (idempotent replacement)
-        await self._clear_cache_for_config(config_hash)
-
-        # Prepare player ratings records
-        rating_records = [
+        computed_at: str,
+    ) -> list[dict[str, Any]]:
+        """cached_player_ratings rows for the final player states."""
+        qualified_ranks = cls._qualified_ranks(config, player_ratings)
+        return [
             {
-                "config_hash": config_hash,
+                "config_hash": config.config_hash,
                 "player_id": rating.player_id,
                 "games_start_date": config.start_date,
                 "games_end_date": config.end_date,
@@ -505,6 +1339,9 @@ class MaterializationEngine:
                 "worst_game_minus": rating.worst_game_minus,
                 "longest_first_streak": rating.longest_first_streak,
                 "longest_fourth_free_streak": rating.longest_fourth_free_streak,
+                "qualified": rating.is_qualified(config),
+                "adjusted_total_plus_minus": rating.adjusted_total_plus_minus,
+                "qualified_rank": qualified_ranks.get(rating.player_id),
                 "tsumo_rate": rating.tsumo_rate,
                 "ron_rate": rating.ron_rate,
                 "riichi_rate": rating.riichi_rate,
@@ -513,41 +1350,203 @@ class MaterializationEngine:
                 if rating.last_game_date
                 else None,
                 "source_data_hash": source_data_hash,
-                "computed_at": datetime.now(UTC).isoformat(),
+                "computed_at": computed_at,
             }
             for rating in player_ratings.values()
         ]
 
-        # Insert player ratings
+    async def _store_materialized_data(
+        self,
+        config_hash: str,
+        config: MaterializationConfig,
+        player_ratings: dict[str, PlayerRating],
+        game_results: GameResultSink,
+        source_data_hash: str,
+        player_statistics: dict[str, PlayerStatistics] | None = None,
+        head_to_head: HeadToHead | None = None,
+    ) -> None:
+        """Store ratings, statistics and pair records; flush remaining game results.
+
+        Rows are upserted over the previous run's and stamped with the
+        ``computed_at`` of ``game_results``, which already streamed most game
+        result rows during the rating pass. Player ratings go last: their
+        ``source_data_hash`` is what marks the cache valid, so a run that
+        fails before them is recomputed by the next one.
+        """
+        streamed_seconds = game_results.flush_seconds
+        phase_start = time.perf_counter()
+        computed_at = game_results.computed_at
+
+        # Upsert the statistics bundle shown on player profiles
+        statistics_records = [
+            {
+                "config_hash": config_hash,
+                "player_id": player_id,
+                "games_played": statistics.games_played,
+                "total_hands": statistics.hands,
+                "statistics": statistics.to_bundle(),
+                "source_data_hash": source_data_hash,
+                "computed_at": computed_at,
+            }
+            for player_id, statistics in (player_statistics or {}).items()
+        ]
+        if statistics_records:
+            self.supabase.table("cached_player_statistics").upsert(
+                statistics_records
+            ).execute()
+
+        # Upsert head-to-head records in chunks (up to one row per pair)
+        pair_records = head_to_head.records(config_hash) if head_to_head else []
+        for start in range(0, len(pair_records), self.game_results_chunk_size):
+            chunk = pair_records[start : start + self.game_results_chunk_size]
+            for record in chunk:
+                record["source_data_hash"] = source_data_hash
+                record["computed_at"] = computed_at
+            self.supabase.table("cached_head_to_head").upsert(chunk).execute()
+
+        # Upsert the last partial chunk of game results
+        game_results.flush()
+
+        # Upsert player ratings
+        rating_records = self._player_rating_records(
+            config, player_ratings, source_data_hash, computed_at
+        )
         if rating_records:
-            self.supabase.table("cached_player_ratings").insert(
+            self.supabase.table("cached_player_ratings").upsert(
                 rating_records
             ).execute()
 
-        # Insert game results
-        if game_results:
-            # Add computed_at timestamp to all records
-            for result in game_results:
-                result["computed_at"] = datetime.now(UTC).isoformat()
+        # Include chunks inserted during the rating pass in the write phase
+        self._emit(
+            events.ROWS_WRITTEN,
+            config_hash,
+            phase_start - streamed_seconds,
+            player_rows=len(rating_records),
+            statistics_rows=len(statistics_records),
+            head_to_head_rows=len(pair_records),
+            game_rows=game_results.rows_written,
+            game_chunks=game_results.chunks_written,
+        )
 
-            self.supabase.table("cached_game_results").insert(game_results).execute()
+    async def _grant_achievements(
+        self, config: MaterializationConfig, player_ratings: dict[str, PlayerRating]
+    ) -> dict[str, int]:
+        """Evaluate achievement rules and upsert the grants.
+
+        Grants are keyed by season name, and several official configurations
+        can share one (e.g. a corrected season-4-v2.yaml), so only the most
+        recently registered of them grants. Its results replace the engine's
+        earlier grants for the season: a grant it no longer produces (such as
+        a champion under a superseded configuration) is deleted, while kept
+        grants retain their original ``earned_at``. Only the engine's own
+        grants (no ``granted_by``, ``config_hash`` in their metadata) are ever
+        replaced or deleted; grants recorded by an admin or inserted by hand
+        are never touched.
+        """
+        current = (
+            self.supabase.table("rating_configurations")
+            .select("config_hash")
+            .eq("name", config.name)
+            .eq("is_official", True)
+            .order("created_at", desc=True)
+            .order("config_hash")
+            .limit(1)
+            .execute()
+        )
+        if current.data and current.data[0]["config_hash"] != config.config_hash:
+            logger.info(
+                f"🏅 Skipping achievements: '{config.name}' is granted by "
+                f"{current.data[0]['config_hash'][:8]}..."
+            )
+            return {"evaluated_players": 0, "grants": 0, "revoked": 0}
 
-    async def _clear_cache_for_config(self, config_hash: str) -> None:
-        """Clear existing cache data for configuration."""
-        # Delete player ratings
-        self.supabase.table("cached_player_ratings").delete().eq(
-            "config_hash", config_hash
-        ).execute()
+        grants = evaluate_achievements(config, player_ratings)
+        codes = sorted({rule.code for rule in ACHIEVEMENT_RULES})
+        result = (
+            self.supabase.table("achievements")
+            .select("id, code")
+            .in_("code", codes)
+            .execute()
+        )
+        achievement_ids = {row["code"]: row["id"] for row in result.data}
+        missing = {grant.code for grant in grants} - set(achievement_ids)
+        if missing:
+            logger.warning(f"⚠️ Achievements not defined: {', '.join(sorted(missing))}")
+        if not achievement_ids:
+            return {"evaluated_players": len(player_ratings), "grants": 0, "revoked": 0}
+
+        existing = (
+            self.supabase.table("player_achievements")
+            .select("id, player_id, achievement_id, granted_by, metadata")
+            .eq("season_name", config.name)
+            .in_("achievement_id", list(achievement_ids.values()))
+            .execute()
+        )
+        engine_grants = [
+            row
+            for row in existing.data
+            if row["granted_by"] is None and "config_hash" in (row["metadata"] or {})
+        ]
+        engine_ids = {row["id"] for row in engine_grants}
+        granted_by_hand = {
+            (row["player_id"], row["achievement_id"])
+            for row in existing.data
+            if row["id"] not in engine_ids
+        }
+        rows = [
+            {
+                "player_id": grant.player_id,
+                "achievement_id": achievement_ids[grant.code],
+                "season_name": config.name,
+                "metadata": grant.metadata,
+            }
+            for grant in grants
+            if grant.code in achievement_ids
+            and (grant.player_id, achievement_ids[grant.code]) not in granted_by_hand
+        ]
+        kept = {(row["player_id"], row["achievement_id"]) for row in rows}
+        stale = [
+            row["id"]
+            for row in engine_grants
+            if (row["player_id"], row["achievement_id"]) not in kept
+        ]
+        if stale:
+            self.supabase.table("player_achievements").delete().in_(
+                "id", stale
+            ).execute()
+        if rows:
+            # earned_at is not sent, so an existing grant keeps its date and
+            # only its metadata is refreshed
+            self.supabase.table("player_achievements").upsert(
+                rows, on_conflict="player_id,achievement_id,season_name"
+            ).execute()
+        return {
+            "evaluated_players": len(player_ratings),
+            "grants": len(rows),
+            "revoked": len(stale),
+        }
 
-        # Delete game results
-        self.supabase.table("cached_game_results").delete().eq(
-            "config_hash", config_hash
-        ).execute()
+    async def _clear_stale_cache(self, config_hash: str, computed_at: str) -> None:
+        """Delete a configuration's cached rows written before ``computed_at``."""
+        for table in (
+            "cached_game_results",
+            "cached_player_statistics",
+            "cached_head_to_head",
+            "cached_player_ratings",
+        ):
+            self.supabase.table(table).delete().eq("config_hash", config_hash).lt(
+                "computed_at", computed_at
+            ).execute()
 
 
 # Convenience function for external usage
 async def materialize_data_for_config(
-    supabase: Client, config_hash: str, force_refresh: bool = False
+    supabase: "Client",
+    config_hash: str,
+    force_refresh: bool = False,
+    hooks: list[MaterializationHook] | None = None,
+    validate_scores: bool = False,
+    exclude_mismatched_games: bool = False,
 ) -> dict[str, Any]:
     """
     Main entry point for data materialization.
@@ -556,9 +1555,67 @@ async def materialize_data_for_config(
         supabase: Connected Supabase client
         config_hash: SHA-256 hash of configuration to materialize
         force_refresh: If True, recalculates even if cache exists
+        hooks: Optional callbacks receiving progress events
+        validate_scores: Reconcile final scores with hand_events first
+        exclude_mismatched_games: Also leave mismatched games out of ratings
 
     Returns:
         Materialization results and metadata
     """
-    engine = MaterializationEngine(supabase)
+    engine = MaterializationEngine(
+        supabase,
+        hooks=hooks,
+        validate_scores=validate_scores,
+        exclude_mismatched_games=exclude_mismatched_games,
+    )
     return await engine.materialize_for_config(config_hash, force_refresh)
+
+
+async def materialize_games_offline(
+    config: MaterializationConfig, games: list[GameData]
+) -> dict[str, list[dict[str, Any]]]:
+    """
+    Run the rating pass over in-memory games, without a database.
+
+    Games outside the configuration's time range are dropped, as the database
+    query would. Hand-level rates stay empty (there are no hand events).
+
+    Returns:
+        ``player_ratings`` (cached_player_ratings rows) and ``game_results``
+        (cached_game_results rows)
+    """
+    engine = MaterializationEngine(supabase=None)
+    games = engine._slice_games(games, config)
+    source_data_hash = engine._calculate_source_data_hash(games)
+    player_ratings, game_results = await engine._calculate_ratings(config, games)
+    return {
+        "player_ratings": engine._player_rating_records(
+            config, player_ratings, source_data_hash, datetime.now(UTC).isoformat()
+        ),
+        "game_results": game_results,
+    }
+
+
+def truncate_rating_engine_data(
+    supabase: "Client", include_games: bool = False, include_players: bool = False
+) -> list[str]:
+    """
+    Empty the rating-engine tables with one server-side TRUNCATE.
+
+    Calls the ``truncate_rating_engine_data`` database function (service role
+    only), which runs in a single transaction and takes the same time however
+    many rows the tables hold.
+
+    Args:
+        supabase: Connected Supabase client (secret key)
+        include_games: Also empty games, game_seats and hand_events
+        include_players: Also empty players (implies include_games)
+
+    Returns:
+        Names of the emptied tables
+    """
+    result = supabase.rpc(
+        "truncate_rating_engine_data",
+        {"include_games": include_games, "include_players": include_players},
+    ).execute()
+    return list(result.data or [])
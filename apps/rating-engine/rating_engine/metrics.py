@@ -0,0 +1,463 @@
+"""
+Prometheus Metrics
+
+Minimal in-process counters, gauges and histograms rendered in the Prometheus
+text exposition format, so the API can serve ``/metrics`` without adding
+prometheus_client to the function bundle.
+
+Three sources feed the default registry:
+1. ``record_materialization_event`` - engine hook timing each materialization
+   phase (config load, game load, hash, cache check, compute, clear, insert)
+2. ``MetricsMiddleware`` - per-route request counts and latency
+3. ``instrument_client`` - Supabase round trips per table and operation
+
+Metrics are per process (one warm serverless instance) and reset on cold start.
+"""
+
+import threading
+import time
+from collections.abc import Iterable
+from typing import TYPE_CHECKING, Any
+
+from . import events, server_timing
+from .events import MaterializationEvent
+
+if TYPE_CHECKING:
+    from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+# Prometheus client defaults, in seconds
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+LabelValues = tuple[str, ...]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Iterable[str], values: Iterable[str]) -> str:
+    pairs = [
+        f'{name}="{_escape(value)}"' for name, value in zip(names, values, strict=True)
+    ]
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value))
+
+
+class _Metric:
+    """Base class for labelled metrics."""
+
+    kind = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _label_values(self, labels: dict[str, Any]) -> LabelValues:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(
+                f"{self.name} expects labels {self.labelnames}, got {tuple(labels)}"
+            )
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def samples(self) -> list[tuple[str, LabelValues, tuple[str, ...], float]]:
+        """(sample name, label values, extra label names, value) tuples."""
+        raise NotImplementedError
+
+    def clear(self) -> None:
+        raise NotImplementedError
+
+    def render(self) -> list[str]:
+        lines = [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} {self.kind}",
+        ]
+        for sample_name, values, extra_names, value in self.samples():
+            names = self.labelnames + extra_names
+            lines.append(
+                f"{sample_name}{_format_labels(names, values)} {_format_value(value)}"
+            )
+        return lines
+
+
+class Counter(_Metric):
+    """Monotonically increasing count."""
+
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: dict[LabelValues, float] = {}
+
+    def inc(self, amount: float = 1.0, **labels: Any) -> None:
+        if amount < 0:
+            raise ValueError("Counters can only increase")
+        key = self._label_values(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels: Any) -> float:
+        return self._values.get(self._label_values(labels), 0.0)
+
+    def samples(self):
+        with self._lock:
+            items = sorted(self._values.items())
+        return [(self.name, values, (), value) for values, value in items]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._values.clear()
+
+
+class Gauge(_Metric):
+    """Value that can go up and down (set at scrape time)."""
+
+    kind = "gauge"
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: dict[LabelValues, float] = {}
+
+    def set(self, value: float, **labels: Any) -> None:
+        key = self._label_values(labels)
+        with self._lock:
+            self._values[key] = float(value)
+
+    def value(self, **labels: Any) -> float:
+        return self._values.get(self._label_values(labels), 0.0)
+
+    def samples(self):
+        with self._lock:
+            items = sorted(self._values.items())
+        return [(self.name, values, (), value) for values, value in items]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._values.clear()
+
+
+class Histogram(_Metric):
+    """Distribution of observed values (seconds) in cumulative buckets."""
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Iterable[str] = (),
+        buckets: Iterable[float] = DEFAULT_BUCKETS,
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets)) + (float("inf"),)
+        # label values -> (per-bucket counts, sum, count)
+        self._values: dict[LabelValues, tuple[list[int], float, int]] = {}
+
+    def observe(self, value: float, **labels: Any) -> None:
+        key = self._label_values(labels)
+        with self._lock:
+            counts, total, count = self._values.get(
+                key, ([0] * len(self.buckets), 0.0, 0)
+            )
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    counts[i] += 1
+                    break
+            self._values[key] = (counts, total + value, count + 1)
+
+    def count(self, **labels: Any) -> int:
+        entry = self._values.get(self._label_values(labels))
+        return entry[2] if entry else 0
+
+    def sum(self, **labels: Any) -> float:
+        entry = self._values.get(self._label_values(labels))
+        return entry[1] if entry else 0.0
+
+    def samples(self):
+        with self._lock:
+            items = sorted(
+                (values, (list(counts), total, count))
+                for values, (counts, total, count) in self._values.items()
+            )
+
+        samples = []
+        for values, (counts, total, count) in items:
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets, counts, strict=True):
+                cumulative += bucket_count
+                samples.append(
+                    (
+                        f"{self.name}_bucket",
+                        values + (_format_value(bound),),
+                        ("le",),
+                        cumulative,
+                    )
+                )
+            samples.append((f"{self.name}_sum", values, (), total))
+            samples.append((f"{self.name}_count", values, (), count))
+        return samples
+
+    def clear(self) -> None:
+        with self._lock:
+            self._values.clear()
+
+
+class MetricsRegistry:
+    """Collection of metrics rendered together on /metrics."""
+
+    def __init__(self):
+        self._metrics: dict[str, _Metric] = {}
+
+    def _register(self, metric: _Metric) -> Any:
+        if metric.name in self._metrics:
+            raise ValueError(f"Metric already registered: {metric.name}")
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(
+        self, name: str, documentation: str, labelnames: Iterable[str] = ()
+    ) -> Counter:
+        return self._register(Counter(name, documentation, labelnames))
+
+    def gauge(
+        self, name: str, documentation: str, labelnames: Iterable[str] = ()
+    ) -> Gauge:
+        return self._register(Gauge(name, documentation, labelnames))
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Iterable[str] = (),
+        buckets: Iterable[float] = DEFAULT_BUCKETS,
+    ) -> Histogram:
+        return self._register(Histogram(name, documentation, labelnames, buckets))
+
+    def render(self) -> str:
+        """All metrics in Prometheus text exposition format."""
+        lines = []
+        for metric in self._metrics.values():
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+    def clear(self) -> None:
+        """Reset all recorded values (metrics stay registered)."""
+        for metric in self._metrics.values():
+            metric.clear()
+
+
+REGISTRY = MetricsRegistry()
+
+materialization_phase_seconds = REGISTRY.histogram(
+    "rating_engine_materialization_phase_seconds",
+    "Duration of each materialization phase",
+    ["phase"],
+)
+materializations_total = REGISTRY.counter(
+    "rating_engine_materializations_total",
+    "Materializations finished, by result status",
+    ["status"],
+)
+materialization_cache_total = REGISTRY.counter(
+    "rating_engine_materialization_cache_total",
+    "Cache checks during materialization, by result",
+    ["result"],
+)
+games_processed_total = REGISTRY.counter(
+    "rating_engine_games_processed_total",
+    "Games replayed through the rating model",
+)
+http_requests_total = REGISTRY.counter(
+    "rating_engine_http_requests_total",
+    "HTTP requests handled, by route and status code",
+    ["method", "route", "status"],
+)
+http_request_duration_seconds = REGISTRY.histogram(
+    "rating_engine_http_request_duration_seconds",
+    "HTTP request latency",
+    ["method", "route"],
+)
+supabase_requests_total = REGISTRY.counter(
+    "rating_engine_supabase_requests_total",
+    "Supabase (PostgREST) round trips, by table and operation",
+    ["table", "operation"],
+)
+supabase_request_duration_seconds = REGISTRY.histogram(
+    "rating_engine_supabase_request_duration_seconds",
+    "Supabase (PostgREST) round-trip latency",
+    ["operation"],
+)
+result_cache_entries = REGISTRY.gauge(
+    "rating_engine_result_cache_entries",
+    "Entries in the in-memory configuration result cache",
+)
+result_cache_bytes = REGISTRY.gauge(
+    "rating_engine_result_cache_bytes",
+    "Estimated bytes held by the in-memory configuration result cache",
+)
+result_cache_requests = REGISTRY.gauge(
+    "rating_engine_result_cache_requests",
+    "In-memory configuration result cache lookups since process start",
+    ["result"],
+)
+
+# Event -> phase label; every phase event carries elapsed_ms
+PHASES = {
+    events.CONFIG_LOADED: "config_load",
+    events.GAMES_LOADED: "game_load",
+    events.HASH_COMPUTED: "hash",
+    events.CACHE_HIT: "cache_check",
+    events.CACHE_MISS: "cache_check",
+    events.SCORES_RECONCILED: "reconcile",
+    events.HAND_STATS_COMPUTED: "hand_stats",
+    events.RATINGS_COMPUTED: "compute",
+    events.CACHE_CLEARED: "clear",
+    events.ROWS_WRITTEN: "insert",
+    events.ACHIEVEMENTS_GRANTED: "achievements",
+    events.COMPLETED: "total",
+}
+
+
+def record_materialization_event(event: MaterializationEvent) -> None:
+    """Engine hook recording phase durations and outcomes in the registry."""
+    phase = PHASES.get(event.event)
+    if phase is not None and event.elapsed_ms is not None:
+        materialization_phase_seconds.observe(event.elapsed_ms / 1000, phase=phase)
+
+    if event.event == events.CACHE_HIT:
+        materialization_cache_total.inc(result="hit")
+    elif event.event == events.CACHE_MISS:
+        materialization_cache_total.inc(result="miss")
+    elif event.event == events.GAMES_PROCESSED:
+        # Progress events are cumulative; only count the final one
+        if event.data.get("processed") == event.data.get("total"):
+            games_processed_total.inc(event.data.get("total", 0))
+    elif event.event == events.COMPLETED:
+        materializations_total.inc(status=event.data.get("status", "unknown"))
+    elif event.event == events.FAILED:
+        materializations_total.inc(status="failed")
+
+
+def record_result_cache_stats(stats: dict[str, int]) -> None:
+    """Copy ResultCache.stats() into gauges (called at scrape time)."""
+    result_cache_entries.set(stats["entries"])
+    result_cache_bytes.set(stats["bytes"])
+    result_cache_requests.set(stats["hits"], result="hit")
+    result_cache_requests.set(stats["misses"], result="miss")
+
+
+class MetricsMiddleware:
+    """
+    ASGI middleware recording request counts and latency per route.
+
+    Requests are labelled with the route template (``/players/{player_id}``)
+    rather than the raw path, so label cardinality stays bounded.
+    """
+
+    def __init__(self, app: "ASGIApp"):
+        self.app = app
+
+    async def __call__(self, scope: "Scope", receive: "Receive", send: "Send"):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        status_code = 500
+
+        async def send_wrapper(message: "Message") -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            route = scope.get("route")
+            route_path = getattr(route, "path", None) or "unmatched"
+            method = scope.get("method", "")
+            http_request_duration_seconds.observe(
+                time.perf_counter() - start, method=method, route=route_path
+            )
+            http_requests_total.inc(
+                method=method, route=route_path, status=str(status_code)
+            )
+
+
+# PostgREST builder methods that determine the kind of round trip
+_OPERATIONS = frozenset({"select", "insert", "upsert", "update", "delete"})
+
+
+class _InstrumentedQuery:
+    """Query builder proxy counting and timing ``execute()`` calls."""
+
+    def __init__(self, builder: Any, table: str, operation: str | None):
+        self._builder = builder
+        self._table = table
+        self._operation = operation
+
+    def __getattr__(self, name: str) -> Any:
+        attr = getattr(self._builder, name)
+        if not callable(attr):
+            return attr
+
+        if name == "execute":
+            return self._timed(attr)
+
+        operation = self._operation
+        if operation is None and name in _OPERATIONS:
+            operation = name
+
+        def chained(*args: Any, **kwargs: Any) -> Any:
+            return _InstrumentedQuery(attr(*args, **kwargs), self._table, operation)
+
+        return chained
+
+    def _timed(self, execute: Any) -> Any:
+        def timed_execute(*args: Any, **kwargs: Any) -> Any:
+            operation = self._operation or "select"
+            start = time.perf_counter()
+            try:
+                return execute(*args, **kwargs)
+            finally:
+                elapsed = time.perf_counter() - start
+                supabase_request_duration_seconds.observe(elapsed, operation=operation)
+                supabase_requests_total.inc(table=self._table, operation=operation)
+                server_timing.record("db", elapsed * 1000, f"{operation} {self._table}")
+
+        return timed_execute
+
+
+class InstrumentedClient:
+    """Supabase client proxy; ``table()``/``rpc()`` queries are instrumented."""
+
+    def __init__(self, client: Any):
+        self._client = client
+
+    def table(self, table_name: str) -> _InstrumentedQuery:
+        return _InstrumentedQuery(self._client.table(table_name), table_name, None)
+
+    def from_(self, table_name: str) -> _InstrumentedQuery:
+        return self.table(table_name)
+
+    def rpc(self, fn: str, *args: Any, **kwargs: Any) -> _InstrumentedQuery:
+        return _InstrumentedQuery(self._client.rpc(fn, *args, **kwargs), fn, "rpc")
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._client, name)
+
+
+def instrument_client(client: Any) -> InstrumentedClient:
+    """Wrap a Supabase client so every round trip is recorded."""
+    if isinstance(client, InstrumentedClient):
+        return client
+    return InstrumentedClient(client)
@@ -0,0 +1,433 @@
+"""
+Player Statistics
+
+The full statistics bundle shown on player profiles, computed per player per
+configuration during materialization and stored as one JSONB row in
+``cached_player_statistics``.
+
+Mirrors ``calculatePlayerStatistics`` in
+apps/web/src/features/players/playerStatistics.ts (same camelCase keys,
+percentages in percent, same definitions), except that:
+- only the configuration's games and their hand events are counted
+- wins and deal-ins use hand_statistics.is_win/is_deal_in, so rows without
+  winner/loser details fall back to the sign of points_delta
+
+Built in a single pass without keeping per-game state: games are folded in
+play order (placements as in the rating pass) into running game figures, and
+each game's hand_events rows are folded when they arrive, in (game_id,
+hand_seq) order, with a PlayerGame that only lives while its game is read.
+"""
+
+import itertools
+import math
+from collections import Counter
+from collections.abc import Iterable, Mapping
+from dataclasses import dataclass, field
+from operator import itemgetter
+from typing import TYPE_CHECKING, Any
+
+from .hand_statistics import HandStatistics
+
+if TYPE_CHECKING:
+    from .materialization import GameData
+
+SEATS = ("east", "south", "west", "north")
+STARTING_SCORE = 25000
+
+# hand_events ordering that keeps each game's hands together and in sequence
+HAND_EVENT_ORDER = ("game_id", "hand_seq", "seat")
+
+
+def _percent(numerator: float, denominator: float) -> float | None:
+    return numerator / denominator * 100 if denominator > 0 else None
+
+
+def _average(values: list[float]) -> float | None:
+    return sum(values) / len(values) if values else None
+
+
+def _median(values: list[float]) -> float | None:
+    if not values:
+        return None
+    ordered = sorted(values)
+    mid = len(ordered) // 2
+    if len(ordered) % 2:
+        return ordered[mid]
+    return (ordered[mid - 1] + ordered[mid]) / 2
+
+
+def _number(value: Any) -> float | None:
+    """A finite number from hand details, else None."""
+    if isinstance(value, bool) or not isinstance(value, int | float):
+        return None
+    return value if math.isfinite(value) else None
+
+
+@dataclass
+class PlayerGame:
+    """Running state of one player's game while its hands are read."""
+
+    final_score: int
+    placement: int
+    hands: int = 0
+    running_score: int = STARTING_SCORE
+    lowest_running_score: int = STARTING_SCORE
+    dealt_in: bool = False
+    last_win_seq: int | None = None
+    win_run: int = 0
+    longest_win_run: int = 0
+
+
+@dataclass
+class PlayerStatistics(HandStatistics):
+    """Game and hand accumulators for one player."""
+
+    # Game figures, folded in play order by add_game
+    games_played: int = 0
+    placements: Counter[int] = field(default_factory=Counter)
+    seats: Counter[str] = field(default_factory=Counter)
+    busted_games: int = 0
+    score_total: int = 0
+    score_mean: float = 0.0
+    score_m2: float = 0.0  # Welford sum of squared deviations
+    highest_score: dict[str, Any] | None = None
+    lowest_score: dict[str, Any] | None = None
+    current_streak: int = 0  # +n after n firsts, -n after n other placements
+    longest_first_streak: int = 0
+    longest_losing_streak: int = 0
+
+    # Per-game hand figures, folded by finish_game
+    perfect_games: int = 0
+    comebacks: int = 0
+    comeback_total: int = 0
+    longest_hand_win_run: int = 0
+
+    wins_with_riichi: int = 0
+    riichi_sticks: float = 0
+
+    # Hands, wins and deal-ins by situation: seat, "dealer"/"non_dealer",
+    # "round_E"/"round_S", "south_4" and "early" (hand_seq 1-2)
+    hands_by: Counter[str] = field(default_factory=Counter)
+    wins_by: Counter[str] = field(default_factory=Counter)
+    deal_ins_by: Counter[str] = field(default_factory=Counter)
+
+    win_values: list[float] = field(default_factory=list)
+    tsumo_values: list[float] = field(default_factory=list)
+    ron_values: list[float] = field(default_factory=list)
+    deal_in_values: list[float] = field(default_factory=list)
+    han_values: list[float] = field(default_factory=list)
+    fu_values: list[float] = field(default_factory=list)
+    biggest_win: dict[str, Any] | None = None
+    biggest_loss: dict[str, Any] | None = None
+    highest_han: dict[str, Any] | None = None
+
+    def add_game(
+        self, game_id: str, seat: str, final_score: int, placement: int
+    ) -> None:
+        """Count one game; games must be added in play order."""
+        self.games_played += 1
+        self.placements[placement] += 1
+        self.seats[seat] += 1
+        self.busted_games += final_score < 0
+        self.score_total += final_score
+
+        delta = final_score - self.score_mean
+        self.score_mean += delta / self.games_played
+        self.score_m2 += delta * (final_score - self.score_mean)
+
+        if self.highest_score is None or final_score > self.highest_score["score"]:
+            self.highest_score = {"gameId": game_id, "score": final_score}
+        if self.lowest_score is None or final_score < self.lowest_score["score"]:
+            self.lowest_score = {"gameId": game_id, "score": final_score}
+
+        if placement == 1:
+            self.current_streak = max(self.current_streak, 0) + 1
+            self.longest_first_streak = max(
+                self.longest_first_streak, self.current_streak
+            )
+        else:
+            self.current_streak = min(self.current_streak, 0) - 1
+            self.longest_losing_streak = max(
+                self.longest_losing_streak, -self.current_streak
+            )
+
+    def add_game_hand(self, row: dict[str, Any], game: PlayerGame) -> tuple[bool, bool]:
+        """Count one hand_events row of ``game``; returns (won, dealt_in)."""
+        won, dealt_in = self.add_hand(row)
+        details = row.get("details") or {}
+        hand_seq = row["hand_seq"]
+
+        situations = [row["seat"]]
+        dealer_seat = details.get("dealerSeat")
+        if dealer_seat:
+            situations.append("dealer" if row["seat"] == dealer_seat else "non_dealer")
+        round_kanji = row.get("round_kanji")
+        if round_kanji in ("E", "S"):
+            situations.append(f"round_{round_kanji}")
+        if round_kanji == "S" and row.get("kyoku") == 4:
+            situations.append("south_4")
+        if hand_seq in (1, 2):
+            situations.append("early")
+        self.hands_by.update(situations)
+
+        game.hands += 1
+        game.running_score += row["points_delta"]
+        game.lowest_running_score = min(game.lowest_running_score, game.running_score)
+
+        if won:
+            self._add_win(row, details, game, situations)
+        elif dealt_in:
+            self.deal_ins_by.update(situations)
+            game.dealt_in = True
+            value = abs(row["points_delta"])
+            if value > 0:
+                self.deal_in_values.append(value)
+                if self.biggest_loss is None or value > self.biggest_loss["value"]:
+                    self.biggest_loss = {
+                        "gameId": row["game_id"],
+                        "handSeq": hand_seq,
+                        "value": value,
+                    }
+        return won, dealt_in
+
+    def _add_win(
+        self,
+        row: dict[str, Any],
+        details: dict[str, Any],
+        game: PlayerGame,
+        situations: list[str],
+    ) -> None:
+        hand_seq = row["hand_seq"]
+        self.wins_by.update(situations)
+        if row.get("riichi_declared"):
+            self.wins_with_riichi += 1
+
+        points_won = _number(details.get("pointsWon"))
+        value = points_won if points_won is not None else row["points_delta"]
+        if value > 0:
+            self.win_values.append(value)
+            if row["event_type"] == "tsumo":
+                self.tsumo_values.append(value)
+            else:
+                self.ron_values.append(value)
+            if self.biggest_win is None or value > self.biggest_win["value"]:
+                self.biggest_win = {
+                    "gameId": row["game_id"],
+                    "handSeq": hand_seq,
+                    "value": value,
+                }
+
+        han = _number(details.get("han"))
+        if han is not None:
+            self.han_values.append(han)
+            if han > 0 and (self.highest_han is None or han > self.highest_han["han"]):
+                self.highest_han = {
+                    "gameId": row["game_id"],
+                    "handSeq": hand_seq,
+                    "han": han,
+                }
+        fu = _number(details.get("fu"))
+        if fu is not None:
+            self.fu_values.append(fu)
+        sticks = _number(details.get("riichiSticks"))
+        if sticks is not None and sticks >= 0:
+            self.riichi_sticks += sticks
+
+        if game.last_win_seq is not None and hand_seq == game.last_win_seq + 1:
+            game.win_run += 1
+        else:
+            game.win_run = 1
+        game.last_win_seq = hand_seq
+        game.longest_win_run = max(game.longest_win_run, game.win_run)
+
+    def finish_game(self, game: PlayerGame) -> None:
+        """Fold a game's hand figures in once all its hands are added."""
+        if game.hands > 0 and not game.dealt_in:
+            self.perfect_games += 1
+        if game.placement == 1 and game.lowest_running_score < STARTING_SCORE:
+            self.comebacks += 1
+            self.comeback_total += game.final_score - game.lowest_running_score
+        self.longest_hand_win_run = max(self.longest_hand_win_run, game.longest_win_run)
+
+    def to_bundle(self) -> dict[str, Any]:
+        """The PlayerStatisticsResult shape used by the web app."""
+        games_played = self.games_played
+        wins = self.tsumo_wins + self.ron_wins
+
+        seat_win_rates = {
+            seat: _percent(self.wins_by[seat], self.hands_by[seat]) for seat in SEATS
+        }
+        rated_seats = [seat for seat in SEATS if seat_win_rates[seat] is not None]
+
+        def situation_win_rate(situation: str) -> float | None:
+            return _percent(self.wins_by[situation], self.hands_by[situation])
+
+        def situation_deal_in_rate(situation: str) -> float | None:
+            return _percent(self.deal_ins_by[situation], self.hands_by[situation])
+
+        non_riichi_hands = self.hands - self.riichi_hands
+
+        return {
+            "totals": {
+                "gamesPlayed": games_played,
+                "totalHands": self.hands,
+                "totalWins": wins,
+                "totalDealIns": self.deal_ins,
+            },
+            "gameStats": {
+                "bustedGameRate": _percent(self.busted_games, games_played),
+                "averageFinalScore": self.score_total / games_played
+                if games_played
+                else None,
+                "placementRates": {
+                    str(place): _percent(self.placements[place], games_played)
+                    for place in (1, 2, 3, 4)
+                },
+                "seatAssignmentRates": {
+                    seat: _percent(self.seats[seat], games_played) for seat in SEATS
+                },
+                "longestGameWinStreak": self.longest_first_streak,
+                "comebackRate": _percent(self.comebacks, games_played),
+                "perfectGames": self.perfect_games,
+                "currentStreak": self.current_streak,
+                "longestLosingStreak": self.longest_losing_streak,
+                "scoreConsistency": math.sqrt(self.score_m2 / games_played)
+                if games_played >= 2
+                else None,
+                "highestFinalScore": self.highest_score,
+                "lowestFinalScore": self.lowest_score,
+                "comebackFactor": self.comeback_total / self.comebacks
+                if self.comebacks
+                else None,
+            },
+            "handStats": {
+                "winRate": _percent(wins, self.hands),
+                "tsumoRate": _percent(self.tsumo_wins, wins),
+                "dealInRate": _percent(self.deal_ins, self.hands),
+                "riichiRate": _percent(self.riichi_hands, self.hands),
+                "winWithRiichiRate": _percent(self.wins_with_riichi, wins),
+                "winWithoutRiichiRate": _percent(wins - self.wins_with_riichi, wins),
+                "dealerWinRate": situation_win_rate("dealer"),
+                "nonDealerWinRate": situation_win_rate("non_dealer"),
+                "seatWinRates": seat_win_rates,
+                "bestSeatByWinRate": max(rated_seats, key=seat_win_rates.__getitem__)
+                if rated_seats
+                else None,
+                "worstSeatByWinRate": min(rated_seats, key=seat_win_rates.__getitem__)
+                if rated_seats
+                else None,
+                "longestHandWinStreakInSingleGame": self.longest_hand_win_run,
+                "biggestWinningHand": self.biggest_win,
+                "biggestLosingHand": self.biggest_loss,
+                "averageWinValue": _average(self.win_values),
+                "medianWinValue": _median(self.win_values),
+                "averageDealInValue": _average(self.deal_in_values),
+                "medianDealInValue": _median(self.deal_in_values),
+                "averageHanOnWins": _average(self.han_values),
+                "averageFuOnWins": _average(self.fu_values),
+                "highestHanAchieved": self.highest_han,
+                "riichiEfficiencyWinRate": _percent(
+                    self.wins_with_riichi, self.riichi_hands
+                ),
+                "riichiEfficiencyNoRiichiWinRate": _percent(
+                    wins - self.wins_with_riichi, non_riichi_hands
+                ),
+                "riichiSticksCollectedPerGame": self.riichi_sticks / games_played
+                if games_played
+                else None,
+                "dealerRetentionRate": situation_win_rate("dealer"),
+                "averagePointsPerTsumo": _average(self.tsumo_values),
+                "averagePointsPerRon": _average(self.ron_values),
+                "dealInRateEastRound": situation_deal_in_rate("round_E"),
+                "dealInRateSouthRound": situation_deal_in_rate("round_S"),
+                "winRateEastRound": situation_win_rate("round_E"),
+                "winRateSouthRound": situation_win_rate("round_S"),
+                "clutchFactor": situation_win_rate("south_4"),
+                "earlyGameDominance": situation_win_rate("early"),
+                "comebackSpecialist": seat_win_rates["east"],
+            },
+        }
+
+
+def _placements(game: "GameData") -> list[tuple[str, dict[str, Any], int]]:
+    """(seat, seat data, placement) in placement order.
+
+    Placements follow the rating pass: final score descending, ties broken by
+    seat order.
+    """
+    seated = [(seat, game.seats[seat]) for seat in SEATS if seat in game.seats]
+    seated.sort(key=lambda entry: entry[1]["final_score"], reverse=True)
+    return [
+        (seat, seat_data, placement)
+        for placement, (seat, seat_data) in enumerate(seated, start=1)
+    ]
+
+
+def start_player_statistics(
+    games: Iterable["GameData"],
+    statistics: dict[str, PlayerStatistics] | None = None,
+) -> dict[str, PlayerStatistics]:
+    """
+    Per-player accumulators with their games counted, in play order.
+
+    Hand events are added separately (before or after) with add_hand_events or
+    add_game_hands.
+
+    Args:
+        games: The configuration's games
+        statistics: Accumulators to add to, e.g. ones hand events went into
+
+    Returns:
+        player_id -> PlayerStatistics
+    """
+    if statistics is None:
+        statistics = {}
+    for game in sorted(games, key=lambda game: game.finished_at or game.started_at):
+        for seat, seat_data, placement in _placements(game):
+            player_id = seat_data["player_id"]
+            player = statistics.get(player_id)
+            if player is None:
+                player = statistics[player_id] = PlayerStatistics()
+            player.add_game(game.game_id, seat, seat_data["final_score"], placement)
+    return statistics
+
+
+def add_game_hands(
+    statistics: dict[str, PlayerStatistics],
+    game: "GameData",
+    rows: Iterable[dict[str, Any]],
+) -> None:
+    """Add all hand_events rows of one game, in hand order, then fold the game."""
+    seated = {
+        seat: (seat_data["player_id"], PlayerGame(seat_data["final_score"], placement))
+        for seat, seat_data, placement in _placements(game)
+    }
+    for row in rows:
+        if row["seat"] not in seated:
+            continue
+        player_id, player_game = seated[row["seat"]]
+        player = statistics.get(player_id)
+        if player is None:
+            player = statistics[player_id] = PlayerStatistics()
+        player.add_game_hand(row, player_game)
+
+    for player_id, player_game in seated.values():
+        if player_game.hands:
+            statistics[player_id].finish_game(player_game)
+
+
+def add_hand_events(
+    statistics: dict[str, PlayerStatistics],
+    games_by_id: Mapping[str, "GameData"],
+    rows: Iterable[dict[str, Any]],
+) -> None:
+    """
+    Add hand_events rows in HAND_EVENT_ORDER, one game at a time.
+
+    Each game's rows must be contiguous; rows for games not in ``games_by_id``
+    are ignored.
+    """
+    for game_id, game_rows in itertools.groupby(rows, key=itemgetter("game_id")):
+        game = games_by_id.get(game_id)
+        if game is not None:
+            add_game_hands(statistics, game, game_rows)
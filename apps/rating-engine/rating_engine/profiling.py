@@ -0,0 +1,185 @@
+"""
+Materialization Profiling
+
+Helpers behind ``scripts/materialize_data.py --profile``:
+
+- ``PhaseTimer`` - engine hook collecting wall-clock time per phase
+- ``StackSampler`` - background thread sampling a thread's Python stack and
+  writing collapsed stacks (``a;b;c count``) for flamegraph.pl / speedscope
+- ``profile_call`` - runs a callable under cProfile and tracemalloc
+
+These are development tools; nothing here is imported by the API.
+"""
+
+import cProfile
+import io
+import pstats
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from pathlib import Path
+from types import FrameType
+from typing import Any
+
+from .events import MaterializationEvent
+from .metrics import PHASES
+
+
+class PhaseTimer:
+    """Engine hook accumulating elapsed time per materialization phase."""
+
+    def __init__(self):
+        self.phases: dict[str, float] = {}
+
+    def __call__(self, event: MaterializationEvent) -> None:
+        phase = PHASES.get(event.event)
+        if phase is not None and event.elapsed_ms is not None:
+            self.phases[phase] = self.phases.get(phase, 0.0) + event.elapsed_ms
+
+    def report(self) -> str:
+        """Phase timings as an aligned table (total last)."""
+        total = self.phases.get("total")
+        lines = []
+        for phase, elapsed_ms in self.phases.items():
+            if phase == "total":
+                continue
+            share = f"{elapsed_ms / total:>6.1%}" if total else ""
+            lines.append(f"  {phase:<15} {elapsed_ms:>10.1f}ms {share}")
+        if total is not None:
+            lines.append(f"  {'total':<15} {total:>10.1f}ms")
+        return "\n".join(lines)
+
+
+def _frame_label(frame: FrameType) -> str:
+    code = frame.f_code
+    return f"{Path(code.co_filename).stem}:{code.co_name}"
+
+
+class StackSampler:
+    """
+    Sample one thread's Python stack at a fixed interval.
+
+    Samples are aggregated as collapsed stacks (root first, ``;``-separated),
+    the input format for flamegraph.pl, inferno and speedscope.
+    """
+
+    def __init__(self, thread_id: int | None = None, interval: float = 0.005):
+        self.thread_id = thread_id or threading.get_ident()
+        self.interval = interval
+        self.stacks: Counter[str] = Counter()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def _sample(self) -> None:
+        frame = sys._current_frames().get(self.thread_id)
+        labels = []
+        while frame is not None:
+            labels.append(_frame_label(frame))
+            frame = frame.f_back
+        if labels:
+            self.stacks[";".join(reversed(labels))] += 1
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            self._sample()
+
+    def start(self) -> None:
+        self._thread = threading.Thread(
+            target=self._run, name="stack-sampler", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def __enter__(self) -> "StackSampler":
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.stop()
+
+    def collapsed(self) -> str:
+        """Collapsed stack lines, most frequent first."""
+        return "".join(
+            f"{stack} {count}\n" for stack, count in self.stacks.most_common()
+        )
+
+    def write(self, path: Path) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(self.collapsed())
+
+
+@dataclass
+class ProfileResult:
+    """Outcome of ``profile_call``."""
+
+    value: Any
+    wall_ms: float
+    peak_memory_bytes: int
+    stats: pstats.Stats
+    top_allocations: list[tracemalloc.StatisticDiff] = field(default_factory=list)
+
+    def summary(self, top: int = 25) -> str:
+        """Top functions by cumulative time."""
+        stream = io.StringIO()
+        self.stats.stream = stream
+        self.stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(top)
+        return stream.getvalue()
+
+
+def profile_call(
+    func: Callable[[], Any],
+    pstats_path: Path | None = None,
+    trace_memory: bool = True,
+) -> ProfileResult:
+    """
+    Run ``func`` under cProfile (and tracemalloc unless disabled).
+
+    Note that tracemalloc adds noticeable overhead, so wall time under
+    ``trace_memory`` overstates the unprofiled run.
+
+    Args:
+        func: Zero-argument callable to profile
+        pstats_path: Where to dump raw profile data (for snakeviz, pstats)
+        trace_memory: Record peak traced memory and top allocation sites
+
+    Returns:
+        ProfileResult with the return value, timings and statistics
+    """
+    if trace_memory:
+        tracemalloc.start()
+        baseline = tracemalloc.take_snapshot()
+
+    profiler = cProfile.Profile()
+    start = time.perf_counter()
+    try:
+        value = profiler.runcall(func)
+    finally:
+        wall_ms = (time.perf_counter() - start) * 1000
+        peak = 0
+        top_allocations = []
+        if trace_memory:
+            _, peak = tracemalloc.get_traced_memory()
+            top_allocations = tracemalloc.take_snapshot().compare_to(
+                baseline, "lineno"
+            )[:10]
+            tracemalloc.stop()
+        # Dump even when func raises: failed runs are the ones worth profiling
+        if pstats_path is not None:
+            pstats_path.parent.mkdir(parents=True, exist_ok=True)
+            profiler.dump_stats(pstats_path)
+
+    return ProfileResult(
+        value=value,
+        wall_ms=wall_ms,
+        peak_memory_bytes=peak,
+        stats=pstats.Stats(profiler),
+        top_allocations=top_allocations,
+    )
@@ -0,0 +1,65 @@
+"""
+Fast JSON Responses
+
+Default response class for the FastAPI app. Serializes with orjson when it is
+installed (several times faster than the stdlib encoder on the large per-player
+and per-game payloads) and falls back to a compact stdlib encoding otherwise.
+
+Debug-only fields (e.g. ``debug``) are trimmed from top-level payloads in
+production. Set RATING_ENGINE_INCLUDE_DEBUG=1/0 to override the default, which
+keeps them everywhere except VERCEL_ENV=production.
+"""
+
+import json
+import os
+from typing import Any
+
+from fastapi.responses import JSONResponse
+
+from . import server_timing
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - exercised only without orjson
+    orjson = None  # type: ignore[assignment]
+
+# Top-level payload fields that are only useful while debugging
+DEBUG_FIELDS = frozenset({"debug"})
+
+
+def include_debug_fields() -> bool:
+    """Whether debug-only fields should be sent to clients."""
+    override = os.getenv("RATING_ENGINE_INCLUDE_DEBUG")
+    if override is not None:
+        return override.lower() in ("1", "true", "yes")
+    return os.getenv("VERCEL_ENV") != "production"
+
+
+def trim_debug_fields(content: Any) -> Any:
+    """Drop debug-only fields from a top-level dict payload."""
+    if isinstance(content, dict) and not DEBUG_FIELDS.isdisjoint(content):
+        return {k: v for k, v in content.items() if k not in DEBUG_FIELDS}
+    return content
+
+
+def dumps(content: Any) -> bytes:
+    """Serialize content to compact UTF-8 JSON."""
+    if orjson is not None:
+        return orjson.dumps(content, default=str, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(
+        content,
+        ensure_ascii=False,
+        allow_nan=False,
+        separators=(",", ":"),
+        default=str,
+    ).encode("utf-8")
+
+
+class FastJSONResponse(JSONResponse):
+    """JSONResponse using orjson (when available) and production field trimming."""
+
+    def render(self, content: Any) -> bytes:
+        with server_timing.timer("serialize"):
+            if not include_debug_fields():
+                content = trim_debug_fields(content)
+            return dumps(content)
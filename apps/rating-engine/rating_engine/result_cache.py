@@ -0,0 +1,135 @@
+"""
+In-Memory Result Cache
+
+Bounded LRU cache for on-demand rating calculations. Entries are keyed by
+(config_hash, source_data_hash), so a cached result is only reused while the
+source games it was computed from are unchanged.
+
+The cache lives for the lifetime of the process (one warm serverless instance),
+which is what makes repeated playground requests cheap.
+"""
+
+import json
+import threading
+from collections import OrderedDict
+from dataclasses import asdict, is_dataclass
+from typing import Any
+
+CacheKey = tuple[str, str]
+
+
+def estimate_size(value: Any) -> int:
+    """Approximate the memory footprint of a cached value in bytes.
+
+    Uses the length of the JSON encoding, which tracks the real footprint
+    closely enough for eviction decisions without walking object graphs.
+    """
+
+    def _default(obj: Any) -> Any:
+        if is_dataclass(obj) and not isinstance(obj, type):
+            return asdict(obj)
+        return str(obj)
+
+    return len(json.dumps(value, default=_default))
+
+
+class ResultCache:
+    """
+    Thread-safe LRU cache with both entry-count and memory-based eviction.
+
+    Least recently used entries are evicted until the cache is within both
+    ``max_entries`` and ``max_bytes``. Values larger than ``max_bytes`` on their
+    own are never stored.
+    """
+
+    def __init__(self, max_entries: int = 64, max_bytes: int = 32 * 1024 * 1024):
+        if max_entries <= 0:
+            raise ValueError("max_entries must be positive")
+        if max_bytes <= 0:
+            raise ValueError("max_bytes must be positive")
+
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+
+        self._entries: OrderedDict[CacheKey, tuple[Any, int]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._total_bytes = 0
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: CacheKey) -> Any | None:
+        """Return the cached value for key (marking it recently used) or None."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key: CacheKey, value: Any, size: int | None = None) -> bool:
+        """
+        Store a value, evicting least recently used entries as needed.
+
+        Args:
+            key: (config_hash, source_data_hash)
+            value: Result to cache
+            size: Precomputed size in bytes (estimated if omitted)
+
+        Returns:
+            True if the value was stored, False if it exceeds max_bytes
+        """
+        if size is None:
+            size = estimate_size(value)
+
+        if size > self.max_bytes:
+            return False
+
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._total_bytes -= previous[1]
+
+            self._entries[key] = (value, size)
+            self._total_bytes += size
+
+            while (
+                len(self._entries) > self.max_entries
+                or self._total_bytes > self.max_bytes
+            ):
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self._total_bytes -= evicted_size
+                self.evictions += 1
+
+        return True
+
+    def clear(self) -> None:
+        """Drop all entries (statistics are kept)."""
+        with self._lock:
+            self._entries.clear()
+            self._total_bytes = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._entries
+
+    @property
+    def total_bytes(self) -> int:
+        """Estimated bytes currently held by the cache."""
+        return self._total_bytes
+
+    def stats(self) -> dict[str, int]:
+        """Snapshot of cache usage counters."""
+        return {
+            "entries": len(self._entries),
+            "bytes": self._total_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
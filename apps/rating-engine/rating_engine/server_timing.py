@@ -0,0 +1,144 @@
+"""
+Server-Timing Headers
+
+Per-request timing breakdown sent as a ``Server-Timing`` response header, so
+the PWA's network panel (and Vercel logs) show where a request spent its time.
+
+Enabled with SERVER_TIMING=1. Entries are collected in a context variable
+that ``ServerTimingMiddleware`` sets for each request:
+
+- ``db-setup`` - Supabase client creation
+- ``db`` - one entry per PostgREST round trip (``desc`` names the query)
+- ``hash`` / ``compute`` - engine phases, via ``record_materialization_event``
+- ``serialize`` - JSON rendering in FastJSONResponse
+- ``app`` - remaining handler time; ``total`` - until response headers
+
+Recording is a no-op outside a request or when disabled.
+"""
+
+import logging
+import os
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import TYPE_CHECKING, NamedTuple
+
+from . import events
+from .events import MaterializationEvent
+
+if TYPE_CHECKING:
+    from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+logger = logging.getLogger(__name__)
+
+
+class TimingEntry(NamedTuple):
+    name: str
+    duration_ms: float
+    description: str | None = None
+
+
+_timings: ContextVar[list[TimingEntry] | None] = ContextVar(
+    "server_timings", default=None
+)
+
+# Engine phases that are pure computation (DB phases are timed per query)
+ENGINE_PHASES = {
+    events.HASH_COMPUTED: "hash",
+    events.RATINGS_COMPUTED: "compute",
+}
+
+# Entries subtracted from the request total to derive ``app``
+_ACCOUNTED = frozenset({"db-setup", "db", "hash", "compute", "serialize"})
+
+
+def enabled() -> bool:
+    """Whether SERVER_TIMING is switched on."""
+    return os.getenv("SERVER_TIMING", "").lower() in ("1", "true", "yes")
+
+
+def record(name: str, duration_ms: float, description: str | None = None) -> None:
+    """Add an entry to the current request's timings (if collecting)."""
+    timings = _timings.get()
+    if timings is not None:
+        timings.append(TimingEntry(name, duration_ms, description))
+
+
+@contextmanager
+def timer(name: str, description: str | None = None) -> Iterator[None]:
+    """Time a block and record it for the current request."""
+    if _timings.get() is None:
+        yield
+        return
+
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        record(name, (time.perf_counter() - start) * 1000, description)
+
+
+def record_materialization_event(event: MaterializationEvent) -> None:
+    """Engine hook adding computation phases to the current request."""
+    name = ENGINE_PHASES.get(event.event)
+    if name is not None and event.elapsed_ms is not None:
+        record(name, event.elapsed_ms, event.config_hash and event.config_hash[:8])
+
+
+def _quote(description: str) -> str:
+    return '"' + description.replace("\\", "\\\\").replace('"', '\\"') + '"'
+
+
+def format_header(entries: list[TimingEntry]) -> str:
+    """Format entries as a Server-Timing header value."""
+    parts = []
+    for entry in entries:
+        part = f"{entry.name};dur={entry.duration_ms:.1f}"
+        if entry.description:
+            part += f";desc={_quote(entry.description)}"
+        parts.append(part)
+    return ", ".join(parts)
+
+
+class ServerTimingMiddleware:
+    """ASGI middleware attaching collected timings as a Server-Timing header."""
+
+    def __init__(self, app: "ASGIApp"):
+        self.app = app
+
+    async def __call__(self, scope: "Scope", receive: "Receive", send: "Send"):
+        if scope["type"] != "http" or not enabled():
+            await self.app(scope, receive, send)
+            return
+
+        entries: list[TimingEntry] = []
+        token = _timings.set(entries)
+        start = time.perf_counter()
+
+        async def send_wrapper(message: "Message") -> None:
+            if message["type"] == "http.response.start":
+                total_ms = (time.perf_counter() - start) * 1000
+                accounted = sum(e.duration_ms for e in entries if e.name in _ACCOUNTED)
+                header = format_header(
+                    [
+                        *entries,
+                        TimingEntry("app", max(total_ms - accounted, 0.0)),
+                        TimingEntry("total", total_ms),
+                    ]
+                )
+                message["headers"] = [
+                    *message.get("headers", []),
+                    (b"server-timing", header.encode("latin-1")),
+                    # Lets the cross-origin PWA read timings from JavaScript
+                    (b"timing-allow-origin", b"*"),
+                ]
+                logger.info(
+                    f"Server-Timing {scope.get('method')} {scope.get('path')}: {header}"
+                )
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _timings.reset(token)
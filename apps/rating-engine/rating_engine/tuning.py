@@ -0,0 +1,309 @@
+"""
+Parameter Tuning
+
+Searches rating parameters for the configuration whose ratings best predict
+game results.
+
+Each candidate replays the game history through the same rating pass as
+materialization. Before every game it scores the placements that actually
+happened under the players' pre-game ratings, using the Plackett-Luce
+likelihood that OpenSkill's model is built on. A candidate's score is the
+mean negative log-likelihood per game (log-loss; lower is better). A model
+that knows nothing scores ``UNINFORMED_LOG_LOSS`` = log(4!) ≈ 3.18; a
+candidate that does no better is not worth registering.
+
+Only parameters that can change the pre-game ratings are searched. In
+particular, the margin-of-victory weights and uma are left out. Each player
+is their own team, and openskill rescales every team's weights to [1, 2]; a
+lone weight always lands on the same value, so weight settings (and uma,
+which only feeds the weight) give identical ratings. ``initial_mu`` shifts
+every player equally, and Plackett-Luce depends on mu differences only.
+
+Per-game losses are never negative, so a replay stops as soon as its running
+total passes the best complete candidate's total. Candidates run in a process
+pool that receives the game snapshot once per worker. The search itself stops
+after ``patience`` consecutive candidates without an improvement.
+"""
+
+import asyncio
+import copy
+import itertools
+import json
+import math
+import multiprocessing
+import random
+from collections.abc import Iterator
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+
+from .materialization import (
+    GameData,
+    MaterializationConfig,
+    MaterializationEngine,
+    compute_config_hash,
+    get_openskill_model,
+)
+
+# Tunable parameters that can change predictions: name -> (section, key)
+PARAMETERS = {
+    "initial_sigma": ("rating", "initialSigma"),
+}
+
+# Default search space
+SEARCH_SPACE: dict[str, list[Any]] = {
+    "initial_sigma": [0.5, 1.0, 1.5, 2.0, 3.0, 4.0, 5.0, 6.0, 7.0, 8.33, 10.0],
+}
+
+# Log-loss of a uniform guess over the 4! finishing orders
+UNINFORMED_LOG_LOSS = math.log(math.factorial(4))
+
+
+@dataclass
+class TuningResult:
+    """One evaluated candidate."""
+
+    params: dict[str, Any]
+    config_data: dict[str, Any]
+    log_loss: float
+    games_scored: int
+    complete: bool
+
+    @property
+    def config_hash(self) -> str:
+        return compute_config_hash(self.config_data)
+
+    @property
+    def beats_uninformed(self) -> bool:
+        """Whether the ratings predict better than a uniform guess."""
+        return self.complete and self.log_loss < UNINFORMED_LOG_LOSS
+
+
+def apply_params(config_data: dict[str, Any], params: dict[str, Any]) -> dict[str, Any]:
+    """Copy of a configuration (YAML/JSON shape) with parameters overridden."""
+    tuned = copy.deepcopy(config_data)
+    for name, value in params.items():
+        section, key = PARAMETERS[name]
+        tuned[section][key] = value
+    return tuned
+
+
+def grid_candidates(space: dict[str, list[Any]]) -> Iterator[dict[str, Any]]:
+    """Every combination of the search space, in order."""
+    names = list(space)
+    for values in itertools.product(*(space[name] for name in names)):
+        yield dict(zip(names, values, strict=True))
+
+
+def random_candidates(
+    space: dict[str, list[Any]], count: int, seed: int = 0
+) -> Iterator[dict[str, Any]]:
+    """Up to ``count`` distinct random picks from the search space."""
+    rng = random.Random(seed)
+    total = math.prod(len(values) for values in space.values())
+    seen: set[str] = set()
+    while len(seen) < min(count, total):
+        params = {name: rng.choice(values) for name, values in space.items()}
+        key = json.dumps(params, sort_keys=True)
+        if key not in seen:
+            seen.add(key)
+            yield params
+
+
+def placement_log_loss(
+    ratings: list[tuple[float, float]], placements: list[int], beta: float
+) -> float:
+    """
+    Negative log-likelihood of a finishing order under Plackett-Luce.
+
+    Args:
+        ratings: Pre-game (mu, sigma) per player
+        placements: 1-based placement per player, in the same order
+        beta: The model's performance variance parameter
+    """
+    c = math.sqrt(sum(sigma**2 + beta**2 for _, sigma in ratings))
+    order = sorted(range(len(ratings)), key=lambda i: placements[i])
+    strengths = [math.exp(ratings[i][0] / c) for i in order]
+    return -sum(math.log(strengths[k] / sum(strengths[k:])) for k in range(len(order)))
+
+
+async def score_config(
+    config: MaterializationConfig,
+    games: list[GameData],
+    bound: float = math.inf,
+) -> tuple[float, int, bool]:
+    """
+    Replay games under a configuration and score its pre-game predictions.
+
+    Stops once the summed loss reaches ``bound`` (the best total so far).
+
+    Returns:
+        Mean log-loss over the games scored, games scored, and whether the
+        replay finished
+    """
+    engine = MaterializationEngine(supabase=None)
+    games = engine._slice_games(games, config)
+    beta = get_openskill_model().beta
+    player_ratings = {
+        player_id: engine._initial_rating(config, player_id)
+        for game in games
+        for player_id in (seat["player_id"] for seat in game.seats.values())
+    }
+
+    total = 0.0
+    for scored, game in enumerate(games, start=1):
+        rows: list[dict[str, Any]] = []
+        await engine._process_single_game(config, game, player_ratings, rows)
+        total += placement_log_loss(
+            [(row["mu_before"], row["sigma_before"]) for row in rows],
+            [row["placement"] for row in rows],
+            beta,
+        )
+        if total >= bound and scored < len(games):
+            return total / scored, scored, False
+
+    return (total / len(games) if games else 0.0), len(games), True
+
+
+# Games for the current pool worker, set once by the pool initializer
+_worker_games: list[GameData] = []
+
+
+def _set_worker_games(games: list[GameData]) -> None:
+    global _worker_games
+    _worker_games = games
+
+
+def _evaluate(
+    name: str, config_data: dict[str, Any], bound: float
+) -> tuple[float, int, bool]:
+    config = MaterializationConfig.from_config_data(
+        compute_config_hash(config_data), name, config_data
+    )
+    return asyncio.run(score_config(config, _worker_games, bound))
+
+
+def tune(
+    base_config_data: dict[str, Any],
+    games: list[GameData],
+    candidates: Iterator[dict[str, Any]],
+    workers: int = 4,
+    patience: int | None = None,
+) -> list[TuningResult]:
+    """
+    Evaluate the base configuration and candidates; best first.
+
+    Candidates that fail configuration validation (e.g. a non-positive sigma)
+    are skipped. Replays stopped early rank after every complete one; equal
+    scores rank by how few parameters differ from the base.
+
+    Args:
+        base_config_data: Configuration (YAML/JSON shape) the candidates vary
+        games: Game snapshot; each candidate uses its time range slice
+        candidates: Parameter overrides, e.g. from grid_candidates
+        workers: Processes evaluating candidates in parallel
+        patience: Stop after this many candidates without an improvement
+    """
+    name = base_config_data.get("name", "tuning")
+    queue = itertools.chain([{}], candidates)
+    results: list[TuningResult] = []
+    best_total = math.inf
+    since_improvement = 0
+
+    def next_candidate() -> tuple[dict[str, Any], dict[str, Any]] | None:
+        for params in queue:
+            config_data = apply_params(base_config_data, params)
+            try:
+                MaterializationConfig.from_config_data("", name, config_data)
+            except ValueError:
+                continue
+            return params, config_data
+        return None
+
+    # Spawned workers: forking a process that runs threads can deadlock
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=_set_worker_games,
+        initargs=(games,),
+    ) as pool:
+        running: dict[Future, tuple[dict[str, Any], dict[str, Any]]] = {}
+
+        def submit() -> bool:
+            candidate = next_candidate()
+            if candidate is None:
+                return False
+            running[pool.submit(_evaluate, name, candidate[1], best_total)] = candidate
+            return True
+
+        while len(running) < workers and submit():
+            pass
+
+        while running:
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                params, config_data = running.pop(future)
+                log_loss, games_scored, complete = future.result()
+                results.append(
+                    TuningResult(params, config_data, log_loss, games_scored, complete)
+                )
+                if complete and log_loss * games_scored < best_total:
+                    best_total = log_loss * games_scored
+                    since_improvement = 0
+                else:
+                    since_improvement += 1
+
+            if patience is not None and since_improvement >= patience:
+                for future in running:
+                    future.cancel()
+                break
+            while len(running) < workers and submit():
+                pass
+
+    # Among equal scores, prefer the candidate closest to the base configuration
+    base = {
+        name: base_config_data[section][key]
+        for name, (section, key) in PARAMETERS.items()
+    }
+    results.sort(
+        key=lambda result: (
+            not result.complete,
+            result.log_loss,
+            sum(base[name] != value for name, value in result.params.items()),
+        )
+    )
+    return results
+
+
+def save_snapshot(games: list[GameData], path: Path) -> None:
+    """Write games to a local JSON snapshot."""
+    rows = [
+        {
+            **asdict(game),
+            "started_at": game.started_at.isoformat(),
+            "finished_at": game.finished_at.isoformat() if game.finished_at else None,
+        }
+        for game in games
+    ]
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(rows))
+
+
+def load_snapshot(path: Path) -> list[GameData]:
+    """Read games written by save_snapshot, sorted by start time."""
+    games = [
+        GameData(
+            **{
+                **row,
+                "started_at": datetime.fromisoformat(row["started_at"]),
+                "finished_at": datetime.fromisoformat(row["finished_at"])
+                if row["finished_at"]
+                else None,
+            }
+        )
+        for row in json.loads(path.read_text())
+    ]
+    games.sort(key=lambda game: game.started_at)
+    return games
@@ -0,0 +1,171 @@
+"""
+Score Validation
+
+Reconciles ``game_seats.final_score`` against the hand-by-hand
+``hand_events`` log for a whole range of games in one pass over the rows.
+
+For every game with hand events:
+- seat totals: ``STARTING_SCORE + sum(points_delta)`` per seat must equal the
+  seat's final score (the web app keeps running scores the same way)
+- hand balance: within each hand, points change hands only through riichi
+  sticks, so ``sum(points_delta) == sum(pot_delta)`` over the four seats
+- table total: final scores plus the riichi sticks left on the table
+  (``-sum(pot_delta)``) add up to four starting scores
+
+Games without hand events (e.g. imported from the legacy logs) cannot be
+reconciled; they are counted but never reported as mismatched.
+"""
+
+from collections import defaultdict
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from .materialization import GameData
+
+STARTING_SCORE = 25000
+
+# Columns needed from hand_events
+RECONCILIATION_COLUMNS = "game_id, hand_seq, seat, points_delta, pot_delta"
+
+
+@dataclass
+class GameReconciliation:
+    """Hand-log totals for one game next to its recorded final scores."""
+
+    game_id: str
+    final_scores: dict[str, int]
+    points: dict[str, int] = field(default_factory=lambda: defaultdict(int))
+    pot_delta: int = 0
+    hands: int = 0
+    unbalanced_hands: list[int] = field(default_factory=list)
+
+    @property
+    def expected_scores(self) -> dict[str, int]:
+        """Final scores implied by the hand log."""
+        return {
+            seat: STARTING_SCORE + self.points.get(seat, 0)
+            for seat in self.final_scores
+        }
+
+    @property
+    def seat_differences(self) -> dict[str, int]:
+        """Recorded minus expected final score, for seats that disagree."""
+        expected = self.expected_scores
+        return {
+            seat: score - expected[seat]
+            for seat, score in self.final_scores.items()
+            if score != expected[seat]
+        }
+
+    @property
+    def table_difference(self) -> int:
+        """Final scores plus leftover riichi sticks, minus four starting scores."""
+        return (
+            sum(self.final_scores.values())
+            - self.pot_delta
+            - STARTING_SCORE * len(self.final_scores)
+        )
+
+    @property
+    def is_consistent(self) -> bool:
+        return (
+            not self.seat_differences
+            and not self.unbalanced_hands
+            and self.table_difference == 0
+        )
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "game_id": self.game_id,
+            "hands": self.hands,
+            "final_scores": self.final_scores,
+            "expected_scores": self.expected_scores,
+            "seat_differences": self.seat_differences,
+            "table_difference": self.table_difference,
+            "unbalanced_hands": self.unbalanced_hands,
+        }
+
+
+@dataclass
+class ReconciliationReport:
+    """Outcome of reconciling a range of games."""
+
+    games_checked: int
+    games_without_hands: int
+    mismatches: list[GameReconciliation]
+
+    @property
+    def mismatched_game_ids(self) -> set[str]:
+        return {game.game_id for game in self.mismatches}
+
+    def summary(self) -> dict[str, Any]:
+        """Counts plus the ids of mismatched games."""
+        return {
+            "games_checked": self.games_checked,
+            "games_without_hands": self.games_without_hands,
+            "mismatched_games": len(self.mismatches),
+            "mismatched_game_ids": sorted(self.mismatched_game_ids),
+        }
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            **self.summary(),
+            "mismatches": [game.to_dict() for game in self.mismatches],
+        }
+
+
+def reconcile_games(
+    games: Iterable["GameData"], hand_rows: Iterable[dict[str, Any]]
+) -> ReconciliationReport:
+    """
+    Reconcile final scores with hand events for many games at once.
+
+    Args:
+        games: Games with final scores (GameData.seats)
+        hand_rows: hand_events rows (RECONCILIATION_COLUMNS) in any order, e.g.
+            a generator over query pages; rows for other games are ignored
+
+    Returns:
+        ReconciliationReport listing the games that do not add up
+    """
+    games_by_id = {
+        game.game_id: GameReconciliation(
+            game_id=game.game_id,
+            final_scores={
+                seat: data["final_score"] for seat, data in game.seats.items()
+            },
+        )
+        for game in games
+    }
+    # (game_id, hand_seq) -> sum(points_delta) - sum(pot_delta)
+    hand_balance: dict[tuple[str, int], int] = defaultdict(int)
+
+    for row in hand_rows:
+        game = games_by_id.get(row["game_id"])
+        if game is None:
+            continue
+        pot_delta = row.get("pot_delta") or 0
+        game.points[row["seat"]] += row["points_delta"]
+        game.pot_delta += pot_delta
+        hand_balance[(row["game_id"], row["hand_seq"])] += (
+            row["points_delta"] - pot_delta
+        )
+
+    for (game_id, hand_seq), balance in hand_balance.items():
+        game = games_by_id[game_id]
+        game.hands += 1
+        if balance != 0:
+            game.unbalanced_hands.append(hand_seq)
+
+    reconciled = [game for game in games_by_id.values() if game.hands]
+    mismatches = [game for game in reconciled if not game.is_consistent]
+    for game in mismatches:
+        game.unbalanced_hands.sort()
+
+    return ReconciliationReport(
+        games_checked=len(games_by_id),
+        games_without_hands=len(games_by_id) - len(reconciled),
+        mismatches=mismatches,
+    )
@@ -21,6 +21,21 @@ Usage:
     # Force refresh (ignore cache)
     uv run python scripts/materialize_data.py --config-hash abc123... --force-refresh
 
+    # Check final scores against hand events; leave mismatched games out
+    uv run python scripts/materialize_data.py --config "Season 5" --force-refresh \
+        --exclude-mismatched
+
+    # Profile a run (cProfile .pstats, phase timings, peak memory, flamegraph)
+    uv run python scripts/materialize_data.py --config "Season 5" --force-refresh \
+        --profile --flamegraph profiles/season5.folded
+
+    # Empty every cache table (all configurations) with one server-side TRUNCATE
+    uv run python scripts/materialize_data.py --env dev --reset-cache
+
+    # Offline: rate a legacy CSV with a season YAML, no database involved
+    uv run python scripts/materialize_data.py --from-csv ../../legacy_logs.csv \
+        --config-file configs/season-5.yaml --output out/season-5
+
 Features:
     - Idempotent - safe to run multiple times
     - Smart caching - skips recalculation if data is unchanged
@@ -34,11 +49,16 @@ Requirements:
 
 import argparse
 import asyncio
+import csv
 import logging
 import os
 import sys
+import time
+from contextlib import nullcontext
+from datetime import datetime
 from pathlib import Path
 
+import yaml
 from dotenv import load_dotenv
 from supabase import create_client
 
@@ -46,11 +66,27 @@ from supabase import create_client
 # This assumes the script is run from the rating-engine directory with proper Python path
 # or using uv run which handles the environment
 try:
-    from rating_engine.materialization import materialize_data_for_config
+    from rating_engine.legacy_csv import read_legacy_games
+    from rating_engine.materialization import (
+        MaterializationConfig,
+        compute_config_hash,
+        materialize_data_for_config,
+        materialize_games_offline,
+        truncate_rating_engine_data,
+    )
+    from rating_engine.profiling import PhaseTimer, StackSampler, profile_call
 except ImportError:
     # Fallback: add parent directory to path
     sys.path.insert(0, str(Path(__file__).parent.parent))
-    from rating_engine.materialization import materialize_data_for_config
+    from rating_engine.legacy_csv import read_legacy_games
+    from rating_engine.materialization import (
+        MaterializationConfig,
+        compute_config_hash,
+        materialize_data_for_config,
+        materialize_games_offline,
+        truncate_rating_engine_data,
+    )
+    from rating_engine.profiling import PhaseTimer, StackSampler, profile_call
 
 # Configure logging
 logging.basicConfig(
@@ -152,7 +188,11 @@ def get_config_hash_by_name(supabase, config_name: str) -> str | None:
 
 
 async def run_materialization(
-    config_hash: str, force_refresh: bool = False
+    config_hash: str,
+    force_refresh: bool = False,
+    hooks: list | None = None,
+    validate_scores: bool = False,
+    exclude_mismatched_games: bool = False,
 ) -> dict:
     """Run materialization for a given config hash."""
     supabase = get_supabase_client()
@@ -161,7 +201,12 @@ async def run_materialization(
 
     try:
         result = await materialize_data_for_config(
-            supabase, config_hash, force_refresh=force_refresh
+            supabase,
+            config_hash,
+            force_refresh=force_refresh,
+            hooks=hooks,
+            validate_scores=validate_scores,
+            exclude_mismatched_games=exclude_mismatched_games,
         )
 
         # Print results
@@ -181,6 +226,8 @@ async def run_materialization(
                 print(f"Games processed: {result['games_count']}")
             if "source_data_hash" in result:
                 print(f"Source data hash: {result['source_data_hash'][:16]}...")
+        if "score_reconciliation" in result:
+            print_reconciliation(result["score_reconciliation"])
 
         if result.get("error"):
             logger.error(f"❌ Error: {result['error']}")
@@ -194,7 +241,163 @@ async def run_materialization(
         import traceback
 
         traceback.print_exc()
-        sys.exit(1)
+        # Returned rather than exiting, so --profile still writes its output
+        return {"status": "error", "config_hash": config_hash, "error": str(e)}
+
+
+def print_reconciliation(report: dict) -> None:
+    """Print the score reconciliation summary and mismatched games."""
+    print(
+        f"Score check: {report['games_checked']} games, "
+        f"{report['games_without_hands']} without hand events, "
+        f"{report['mismatched_games']} mismatched"
+        + (" (excluded from ratings)" if report["excluded"] else "")
+    )
+    for game in report["mismatches"]:
+        details = []
+        if game["seat_differences"]:
+            details.append(f"seats off by {game['seat_differences']}")
+        if game["table_difference"]:
+            details.append(f"table total off by {game['table_difference']}")
+        if game["unbalanced_hands"]:
+            details.append(f"unbalanced hands {game['unbalanced_hands']}")
+        print(f"  ❌ {game['game_id']}: {'; '.join(details)}")
+
+
+def load_config_file(config_path: Path) -> MaterializationConfig:
+    """Build a configuration from a season YAML file (same hash as registering it)."""
+    with open(config_path) as file:
+        config_data = yaml.safe_load(file)
+    return MaterializationConfig.from_config_data(
+        compute_config_hash(config_data),
+        config_data["name"],
+        config_data,
+        is_official=config_data.get("isOfficial", False),
+    )
+
+
+def write_rows(rows: list[dict], path: Path, output_format: str) -> Path:
+    """Write rows as Parquet (needs pandas with pyarrow) or CSV.
+
+    ``auto`` writes Parquet when the analysis tooling is installed and falls
+    back to CSV otherwise.
+    """
+    if output_format in ("auto", "parquet"):
+        try:
+            import pandas as pd
+
+            parquet_path = path.with_suffix(".parquet")
+            pd.DataFrame(rows).to_parquet(parquet_path, index=False)
+            return parquet_path
+        except ImportError:
+            if output_format == "parquet":
+                raise
+            logger.info("💡 Parquet needs pandas and pyarrow, writing CSV instead")
+
+    csv_path = path.with_suffix(".csv")
+    with open(csv_path, "w", newline="", encoding="utf-8") as file:
+        writer = csv.DictWriter(file, fieldnames=list(rows[0]) if rows else [])
+        writer.writeheader()
+        writer.writerows(rows)
+    return csv_path
+
+
+def run_offline(
+    csv_path: Path, config_path: Path, output_dir: Path, output_format: str = "auto"
+) -> dict[str, Path]:
+    """Rate a legacy CSV with a season YAML locally and write the results.
+
+    Writes ``player_ratings`` (with display names) and ``game_results`` to
+    ``output_dir``; no database is involved.
+    """
+    start = time.perf_counter()
+    config = load_config_file(config_path)
+    log = read_legacy_games(csv_path)
+    logger.info(
+        f"📋 {config.name} ({config.config_hash[:16]}...): "
+        f"{len(log.games)} games in {csv_path.name}"
+    )
+
+    results = asyncio.run(materialize_games_offline(config, log.games))
+    for row in results["player_ratings"]:
+        row["display_name"] = log.player_names.get(row["player_id"])
+    results["player_ratings"].sort(key=lambda row: -row["display_rating"])
+
+    output_dir.mkdir(parents=True, exist_ok=True)
+    written = {
+        name: write_rows(rows, output_dir / name, output_format)
+        for name, rows in results.items()
+    }
+    logger.info(
+        f"✅ Rated {len({r['game_id'] for r in results['game_results']})} games, "
+        f"{len(results['player_ratings'])} players in "
+        f"{(time.perf_counter() - start) * 1000:.0f}ms"
+    )
+    for path in written.values():
+        logger.info(f"💾 Wrote {path}")
+    return written
+
+
+def run_profiled_materialization(
+    config_hash: str, force_refresh: bool, args: argparse.Namespace
+) -> dict:
+    """Run materialization under cProfile/tracemalloc and print a report."""
+    pstats_path = args.profile_output or Path("profiles") / (
+        f"materialize-{config_hash[:8]}-{datetime.now():%Y%m%d-%H%M%S}.pstats"
+    )
+    timer = PhaseTimer()
+    sampler = (
+        StackSampler(interval=args.sample_interval / 1000) if args.flamegraph else None
+    )
+
+    try:
+        with sampler or nullcontext():
+            profiled = profile_call(
+                lambda: asyncio.run(
+                    run_materialization(
+                        config_hash,
+                        force_refresh,
+                        hooks=[timer],
+                        validate_scores=args.validate_scores,
+                        exclude_mismatched_games=args.exclude_mismatched,
+                    )
+                ),
+                pstats_path=pstats_path,
+            )
+    finally:
+        # Keep whatever was sampled even if the run was interrupted
+        if sampler is not None:
+            sampler.write(args.flamegraph)
+
+    print("\n" + "=" * 80)
+    print(f"Profile (top {args.profile_top} by cumulative time)")
+    print("=" * 80)
+    print(profiled.summary(args.profile_top))
+
+    print("=" * 80)
+    print("Engine Phases (wall clock)")
+    print("=" * 80)
+    print(timer.report() or "  No phase events recorded")
+
+    print("=" * 80)
+    print("Memory (tracemalloc)")
+    print("=" * 80)
+    print(f"Peak traced memory: {profiled.peak_memory_bytes / 1024 / 1024:.1f} MiB")
+    for stat in profiled.top_allocations[:5]:
+        print(f"  {stat}")
+
+    print("=" * 80)
+    print(f"Wall time (profiled): {profiled.wall_ms:.0f}ms")
+    print(f"Profile data: {pstats_path}  (view with snakeviz or python -m pstats)")
+    if sampler is not None:
+        print(
+            f"Collapsed stacks: {args.flamegraph}  "
+            f"({sum(sampler.stacks.values())} samples; "
+            "flamegraph.pl, inferno or speedscope)"
+        )
+    print("=" * 80)
+
+    return profiled.value
 
 
 def main():
@@ -216,6 +419,21 @@ Examples:
   # Force refresh (ignore cache)
   uv run python scripts/materialize_data.py --config-hash abc123... --force-refresh
 
+  # Reconcile final scores with hand events (report only / also exclude)
+  uv run python scripts/materialize_data.py --config "Season 5" --validate-scores
+  uv run python scripts/materialize_data.py --config "Season 5" --exclude-mismatched
+
+  # Profile a run and write a collapsed-stack file for flamegraphs
+  uv run python scripts/materialize_data.py --config "Season 5" --force-refresh \\
+      --profile --flamegraph profiles/season5.folded
+
+  # Empty all cache tables before re-materializing from scratch
+  uv run python scripts/materialize_data.py --env dev --reset-cache
+
+  # Offline: rate a legacy CSV with a season YAML and write Parquet/CSV
+  uv run python scripts/materialize_data.py --from-csv ../../legacy_logs.csv \
+      --config-file configs/season-5.yaml --output out/season-5
+
   # Use specific environment
   uv run python scripts/materialize_data.py --env prod --config "Season 5"
   uv run python scripts/materialize_data.py --env dev --config "Season 5"
@@ -242,6 +460,21 @@ Examples:
         action="store_true",
         help="Force recalculation even if cache is valid",
     )
+    parser.add_argument(
+        "--validate-scores",
+        action="store_true",
+        help="Reconcile final scores with hand events and report mismatches",
+    )
+    parser.add_argument(
+        "--exclude-mismatched",
+        action="store_true",
+        help="Like --validate-scores, and leave mismatched games out of ratings",
+    )
+    parser.add_argument(
+        "--reset-cache",
+        action="store_true",
+        help="Empty the cache tables for all configurations (server-side TRUNCATE)",
+    )
     parser.add_argument(
         "--env",
         choices=["dev", "prod"],
@@ -249,7 +482,71 @@ Examples:
         help="Environment to use (dev or prod). Defaults to .env or .env.dev",
     )
 
+    offline = parser.add_argument_group("offline (no database)")
+    offline.add_argument(
+        "--from-csv",
+        type=Path,
+        default=None,
+        help="Rate games from a legacy CSV log instead of the database",
+    )
+    offline.add_argument(
+        "--config-file",
+        type=Path,
+        default=None,
+        help="Season YAML to rate with (required with --from-csv)",
+    )
+    offline.add_argument(
+        "--output",
+        type=Path,
+        default=Path("out"),
+        help="Directory for player_ratings and game_results (default: out)",
+    )
+    offline.add_argument(
+        "--format",
+        choices=["auto", "parquet", "csv"],
+        default="auto",
+        help="Output format; auto writes Parquet when pandas/pyarrow are installed",
+    )
+
+    profiling = parser.add_argument_group("profiling")
+    profiling.add_argument(
+        "--profile",
+        action="store_true",
+        help="Run under cProfile and tracemalloc; print phase timings",
+    )
+    profiling.add_argument(
+        "--profile-output",
+        type=Path,
+        default=None,
+        help="Where to write the .pstats file (default: profiles/materialize-*.pstats)",
+    )
+    profiling.add_argument(
+        "--profile-top",
+        type=int,
+        default=25,
+        help="Functions shown in the cumulative-time summary (default: 25)",
+    )
+    profiling.add_argument(
+        "--flamegraph",
+        type=Path,
+        default=None,
+        help="Also sample stacks and write collapsed stacks here (implies --profile)",
+    )
+    profiling.add_argument(
+        "--sample-interval",
+        type=float,
+        default=5.0,
+        help="Stack sampling interval in milliseconds (default: 5)",
+    )
+
     args = parser.parse_args()
+
+    # Offline pipeline needs no environment or database
+    if args.from_csv:
+        if not args.config_file:
+            parser.error("--from-csv requires --config-file")
+        run_offline(args.from_csv, args.config_file, args.output, args.format)
+        return
     
     # Load environment variables based on --env flag
     load_environment(args.env)
@@ -260,6 +557,11 @@ Examples:
         list_configurations(supabase)
         return
 
+    if args.reset_cache:
+        emptied = truncate_rating_engine_data(get_supabase_client())
+        logger.info(f"🗑️  Truncated {', '.join(emptied)}")
+        return
+
     # Determine config hash
     config_hash = None
 
@@ -285,7 +587,17 @@ Examples:
         logger.info(f"📋 Using default config 'Season 3': {config_hash[:16]}...")
 
     # Run materialization
-    result = asyncio.run(run_materialization(config_hash, args.force_refresh))
+    if args.profile or args.flamegraph:
+        result = run_profiled_materialization(config_hash, args.force_refresh, args)
+    else:
+        result = asyncio.run(
+            run_materialization(
+                config_hash,
+                args.force_refresh,
+                validate_scores=args.validate_scores,
+                exclude_mismatched_games=args.exclude_mismatched,
+            )
+        )
 
     # Exit with error code if materialization failed
     if result.get("status") == "error":
@@ -7,6 +7,8 @@ Clean, modern implementation with proper error handling and idempotency.
 
 Usage:
     uv run python scripts/migrate_legacy_data.py
+    uv run python scripts/migrate_legacy_data.py --bulk
+    uv run python scripts/migrate_legacy_data.py --csv path/to/other_logs.csv
 
 Features:
     - Uses official Supabase Python client
@@ -14,20 +16,23 @@ Features:
     - Deterministic UUIDs for consistent game IDs
     - Proper enum handling for database schema
     - Comprehensive error handling and logging
+    - Bulk mode: one players lookup, one players upsert and chunked
+      games/game_seats upserts instead of several requests per CSV row,
+      written concurrently
+    - Resumable in both modes from a checkpoint file next to the CSV
 
 Requirements:
     - SUPABASE_URL and SUPABASE_SECRET_KEY in environment
-    - CSV file: legacy_logs.csv in project root
+    - CSV file: legacy_logs.csv in project root (or --csv)
     - Season 3 configuration: configs/season-3.yaml
 """
 
 import csv
-import hashlib
 import json
 import logging
 import os
 import sys
-import uuid
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
 from pathlib import Path
 
@@ -35,6 +40,23 @@ import yaml
 from dotenv import load_dotenv
 from supabase import Client, create_client
 
+try:
+    from rating_engine.legacy_csv import deterministic_uuid, legacy_game_id
+    from rating_engine.materialization import (
+        CONFIG_HASH_SECTIONS,
+        compute_config_hash,
+        truncate_rating_engine_data,
+    )
+except ImportError:
+    # Fallback: add parent directory to path
+    sys.path.insert(0, str(Path(__file__).parent.parent))
+    from rating_engine.legacy_csv import deterministic_uuid, legacy_game_id
+    from rating_engine.materialization import (
+        CONFIG_HASH_SECTIONS,
+        compute_config_hash,
+        truncate_rating_engine_data,
+    )
+
 # Load environment variables
 load_dotenv()
 
@@ -47,6 +69,69 @@ CSV_PATH = Path(__file__).parent.parent.parent.parent / "legacy_logs.csv"
 SEASON_3_CONFIG_PATH = Path(__file__).parent.parent / "configs" / "season-3.yaml"
 SEASON_4_CONFIG_PATH = Path(__file__).parent.parent / "configs" / "season-4.yaml"
 
+# Games per batch in bulk mode (each batch is one games and one game_seats
+# upsert) and batches in flight at once
+BULK_CHUNK_SIZE = 250
+BULK_WORKERS = 4
+
+# PostgREST error code for an RPC whose function does not exist
+MISSING_FUNCTION_CODE = "PGRST202"
+
+
+class MigrationCheckpoint:
+    """Migration progress, stored as JSON next to the CSV.
+
+    Records how many parsed games (in CSV order) are committed and the
+    deterministic ID of the last one, so a rerun can check it is reading the
+    same CSV before skipping ahead.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+
+    @classmethod
+    def for_csv(cls, csv_path: Path) -> "MigrationCheckpoint":
+        """Checkpoint for a CSV: ``<name>.checkpoint.json`` beside it."""
+        return cls(csv_path.with_suffix(".checkpoint.json"))
+
+    def exists(self) -> bool:
+        return self.path.exists()
+
+    def load(self) -> dict[str, any] | None:
+        if not self.path.exists():
+            return None
+        return json.loads(self.path.read_text())
+
+    def resume_offset(self, games: list[dict[str, any]]) -> int:
+        """Number of games to skip, or 0 when the checkpoint does not match."""
+        state = self.load()
+        if not state:
+            return 0
+        offset = state["games_committed"]
+        if 0 < offset <= len(games) and (
+            games[offset - 1]["game_id"] == state["last_game_id"]
+        ):
+            return offset
+        logger.warning("⚠️  Checkpoint does not match the CSV, starting over")
+        return 0
+
+    def save(self, games_committed: int, last_game_id: str) -> None:
+        # Write then rename, so an interruption never leaves a partial file
+        tmp_path = self.path.with_suffix(".tmp")
+        tmp_path.write_text(
+            json.dumps(
+                {
+                    "games_committed": games_committed,
+                    "last_game_id": last_game_id,
+                    "updated_at": datetime.now().isoformat(),
+                }
+            )
+        )
+        tmp_path.replace(self.path)
+
+    def clear(self) -> None:
+        self.path.unlink(missing_ok=True)
+
 
 class SupabaseLegacyDataMigrator:
     """Migrates legacy CSV data to Supabase using the official Python client."""
@@ -79,6 +164,24 @@ class SupabaseLegacyDataMigrator:
         """
         logger.info("🗑️  Truncating tables for clean migration...")
 
+        # One server-side TRUNCATE (see truncate_rating_engine_data migration)
+        try:
+            emptied = truncate_rating_engine_data(
+                self.supabase, include_games=True, include_players=not keep_players
+            )
+            logger.info(f"  ✅ Truncated {', '.join(emptied)}")
+            logger.info("✅ Table truncation complete")
+            return
+        except Exception as e:
+            # Only a function that is not deployed (PostgREST PGRST202) falls
+            # back; permission or constraint errors are real failures
+            if getattr(e, "code", None) != MISSING_FUNCTION_CODE:
+                raise
+            logger.warning(
+                f"  ⚠️  truncate_rating_engine_data unavailable ({e}), "
+                "falling back to filtered deletes"
+            )
+
         # Tables to truncate in dependency order
         # Must delete in order to respect foreign key constraints
         tables_to_truncate = [
@@ -116,6 +219,13 @@ class SupabaseLegacyDataMigrator:
                         "player_id", "00000000-0000-0000-0000-000000000000"
                     ).execute()
                 else:
+                    if table == "players":
+                        # rating_configurations.created_by references players
+                        self.supabase.table("rating_configurations").update(
+                            {"created_by": None}
+                        ).gte(
+                            "created_by", "00000000-0000-0000-0000-000000000000"
+                        ).execute()
                     # For tables with id column (games, players)
                     self.supabase.table(table).delete().neq(
                         "id", "00000000-0000-0000-0000-000000000000"
@@ -141,18 +251,11 @@ class SupabaseLegacyDataMigrator:
         """Ensure season configuration exists in database and return its hash."""
         config = self.load_season_config(config_path)
 
-        # Convert to database format (remove metadata)
-        db_config = {
-            "timeRange": config["timeRange"],
-            "rating": config["rating"],
-            "scoring": config["scoring"],
-            "weights": config["weights"],
-            "qualification": config["qualification"],
-        }
-
-        # Calculate deterministic hash
+        # Convert to database format (remove metadata); the hash is the one
+        # the rating engine computes for the same configuration
+        db_config = {section: config[section] for section in CONFIG_HASH_SECTIONS}
         config_json = json.dumps(db_config, sort_keys=True)
-        config_hash = hashlib.sha256(config_json.encode()).hexdigest()
+        config_hash = compute_config_hash(config)
 
         # Upsert configuration
         record = {
@@ -172,9 +275,7 @@ class SupabaseLegacyDataMigrator:
 
     def generate_deterministic_uuid(self, namespace: str, name: str) -> str:
         """Generate deterministic UUID for consistent migrations."""
-        # Use UUID5 with a custom namespace for deterministic generation
-        namespace_uuid = uuid.uuid5(uuid.NAMESPACE_DNS, "mahjong.league")
-        return str(uuid.uuid5(namespace_uuid, f"{namespace}:{name}"))
+        return deterministic_uuid(namespace, name)
 
     def get_or_create_player(self, name: str) -> str:
         """Get existing player or create new one with deterministic UUID."""
@@ -194,10 +295,16 @@ class SupabaseLegacyDataMigrator:
             return existing_id
 
         # Create new player with deterministic UUID
-        player_id = self.generate_deterministic_uuid("player", name)
+        player_record = self.build_player_record(name)
+
+        self.supabase.table("players").insert(player_record).execute()
+        logger.info(f"👤 Created player: {name}")
+        return player_record["id"]
 
-        player_record = {
-            "id": player_id,
+    def build_player_record(self, name: str) -> dict[str, any]:
+        """Build a players row for a legacy name with a deterministic UUID."""
+        return {
+            "id": self.generate_deterministic_uuid("player", name),
             "display_name": name,
             "auth_user_id": None,  # Legacy players don't have auth accounts
             "email": None,
@@ -206,15 +313,13 @@ class SupabaseLegacyDataMigrator:
             "notification_preferences": {},
         }
 
-        self.supabase.table("players").insert(player_record).execute()
-        logger.info(f"👤 Created player: {name}")
-        return player_id
+    def parse_csv_game(self, row: dict[str, str]) -> dict[str, any]:
+        """Parse a single CSV row into game data, without player IDs.
 
-    def process_csv_game(self, row: dict[str, str]) -> dict[str, any]:
-        """Process a single CSV row into game and game_seats data."""
+        Shared by the row-by-row and bulk paths; needs no database access.
+        """
         # Parse CSV data
         played_at_str = row["date"]  # CSV column is "date" not "played_at"
-        timestamp_str = row["Timestamp"]  # Use this to ensure uniqueness
 
         # Convert played_at timestamp for game start/finish times
         try:
@@ -226,15 +331,8 @@ class SupabaseLegacyDataMigrator:
         # Generate deterministic game ID based on played_at,
         # record timestamp, and players.
         # This ensures idempotency - same game data always gets same ID
-        player_names = [
-            row["East player"],
-            row["South player"],
-            row["West player"],
-            row["North player"],
-        ]
-        # Include both played_at and record timestamp to handle duplicate game times
-        game_key = f"{played_at_str}_{timestamp_str}_{'_'.join(sorted(player_names))}"
-        game_id = self.generate_deterministic_uuid("game", game_key)
+        # (shared with the offline pipeline in rating_engine.legacy_csv)
+        game_id = legacy_game_id(row)
 
         # Process players and scores
         players_data = []
@@ -250,11 +348,8 @@ class SupabaseLegacyDataMigrator:
                 logger.error(f"❌ Invalid points for {player_name}: {points_str}")
                 raise
 
-            player_id = self.get_or_create_player(player_name)
-
             players_data.append(
                 {
-                    "player_id": player_id,
                     "player_name": player_name,
                     "seat_wind": position.lower(),
                     "final_score": final_score,
@@ -268,18 +363,19 @@ class SupabaseLegacyDataMigrator:
             "players_data": players_data,
         }
 
-    def create_game_and_seats(self, game_data: dict[str, any]) -> None:
-        """Create game record and associated game_seats records."""
-        game_id = game_data["game_id"]
-
-        # Check if game already exists
-        result = self.supabase.table("games").select("id").eq("id", game_id).execute()
-
-        if result.data:
-            logger.debug(f"🎮 Game {game_id[:8]}... already exists")
-            return
+    def assign_player_ids(self, game_data: dict[str, any]) -> dict[str, any]:
+        """Look up or create each seat's player, one query per seat."""
+        for player_data in game_data["players_data"]:
+            player_data["player_id"] = self.get_or_create_player(
+                player_data["player_name"]
+            )
+        return game_data
 
-        # Create game record
+    def build_game_records(
+        self, game_data: dict[str, any]
+    ) -> tuple[dict[str, any], list[dict[str, any]]]:
+        """Build the games row and its game_seats rows for one parsed game."""
+        game_id = game_data["game_id"]
         game_record = {
             "id": game_id,
             "started_at": game_data["game_datetime"].isoformat(),
@@ -289,60 +385,234 @@ class SupabaseLegacyDataMigrator:
             "location": "Legacy Import",
             "notes": "Imported from legacy CSV data",
         }
-
-        self.supabase.table("games").insert(game_record).execute()
-        logger.info(f"🎮 Created game: {game_id[:8]}...")
-
-        # Create game_seats records
-        game_seats = []
-        for player_data in game_data["players_data"]:
-            seat_record = {
+        seat_records = [
+            {
                 "game_id": game_id,
                 "player_id": player_data["player_id"],
                 "seat": player_data["seat_wind"],
                 "final_score": player_data["final_score"],
             }
-            game_seats.append(seat_record)
+            for player_data in game_data["players_data"]
+        ]
+        return game_record, seat_records
 
-        self.supabase.table("game_seats").insert(game_seats).execute()
-        logger.info(f"💺 Created {len(game_seats)} game seats")
+    def create_game_and_seats(self, game_data: dict[str, any]) -> None:
+        """Create game record and associated game_seats records.
 
-    def migrate_csv_data(self) -> None:
-        """Main migration process for CSV data."""
-        if not CSV_PATH.exists():
-            raise FileNotFoundError(f"CSV file not found: {CSV_PATH}")
+        Seats are written even when the game already exists, so a rerun
+        completes a game whose seats failed after its row was inserted.
+        """
+        game_id = game_data["game_id"]
+        game_record, game_seats = self.build_game_records(game_data)
 
-        logger.info(f"📁 Reading CSV data from: {CSV_PATH}")
+        # Check if game already exists
+        result = self.supabase.table("games").select("id").eq("id", game_id).execute()
 
-        games_processed = 0
-        with open(CSV_PATH, newline="", encoding="utf-8") as csvfile:
-            reader = csv.DictReader(csvfile)
+        if result.data:
+            logger.debug(f"🎮 Game {game_id[:8]}... already exists")
+        else:
+            self.supabase.table("games").insert(game_record).execute()
+            logger.info(f"🎮 Created game: {game_id[:8]}...")
 
-            for row in reader:
+        # Create game_seats records (existing seats are left as they are)
+        self.supabase.table("game_seats").upsert(
+            game_seats, on_conflict="game_id,seat", ignore_duplicates=True
+        ).execute()
+        logger.info(f"💺 Wrote {len(game_seats)} game seats")
+
+    def migrate_csv_data(
+        self,
+        csv_path: Path | None = None,
+        checkpoint: "MigrationCheckpoint | None" = None,
+    ) -> int:
+        """Row-by-row migration: each game is checked and inserted on its own.
+
+        With a checkpoint, progress is saved after every game and a rerun
+        skips the games already committed.
+
+        Returns:
+            Number of games in the CSV
+        """
+        games = self.read_csv_games(csv_path or CSV_PATH)
+
+        committed = checkpoint.resume_offset(games) if checkpoint else 0
+        if committed:
+            logger.info(f"⏯️  Resuming after {committed} committed games")
+
+        for index in range(committed, len(games)):
+            game_data = games[index]
+            try:
+                self.create_game_and_seats(self.assign_player_ids(game_data))
+            except Exception as e:
+                logger.error(f"❌ Failed to process game: {e}")
+                logger.error(f"   Game data: {game_data}")
+                raise
+            if checkpoint:
+                checkpoint.save(index + 1, game_data["game_id"])
+
+        if checkpoint:
+            checkpoint.clear()
+        logger.info(f"✅ Migration completed: {len(games)} games processed")
+        return len(games)
+
+    def read_csv_games(self, csv_path: Path = CSV_PATH) -> list[dict[str, any]]:
+        """Parse the whole CSV up front (no database access)."""
+        if not csv_path.exists():
+            raise FileNotFoundError(f"CSV file not found: {csv_path}")
+
+        logger.info(f"📁 Reading CSV data from: {csv_path}")
+
+        games = []
+        with open(csv_path, newline="", encoding="utf-8") as csvfile:
+            for row in csv.DictReader(csvfile):
                 try:
-                    game_data = self.process_csv_game(row)
-                    self.create_game_and_seats(game_data)
-                    games_processed += 1
+                    games.append(self.parse_csv_game(row))
                 except Exception as e:
-                    logger.error(f"❌ Failed to process game: {e}")
+                    logger.error(f"❌ Failed to parse game: {e}")
                     logger.error(f"   Row data: {row}")
                     raise
+        return games
+
+    def resolve_players(self, names: list[str]) -> dict[str, str]:
+        """Map display names to player IDs, creating missing players.
+
+        One select for all names and one upsert for the missing ones.
+        """
+        names = sorted(set(names))
+        result = (
+            self.supabase.table("players")
+            .select("id, display_name")
+            .in_("display_name", names)
+            .execute()
+        )
+        player_ids: dict[str, str] = {}
+        for row in result.data:
+            player_ids.setdefault(row["display_name"], row["id"])
+
+        missing = [
+            self.build_player_record(name) for name in names if name not in player_ids
+        ]
+        if missing:
+            self.supabase.table("players").upsert(missing, on_conflict="id").execute()
+            for record in missing:
+                player_ids[record["display_name"]] = record["id"]
+            logger.info(f"👤 Created {len(missing)} players")
+
+        return player_ids
 
-        logger.info(f"✅ Migration completed: {games_processed} games processed")
+    def write_batch(self, batch: list[dict[str, any]]) -> None:
+        """Upsert one batch of games, then their seats.
 
-    def run_migration(self, keep_players: bool = False) -> None:
+        Upserts go on the deterministic keys with ``ignore_duplicates``, so a
+        batch re-sent after an interruption leaves existing rows untouched.
+        """
+        game_records = []
+        seat_records = []
+        for game_data in batch:
+            game_record, seats = self.build_game_records(game_data)
+            game_records.append(game_record)
+            seat_records.extend(seats)
+
+        self.supabase.table("games").upsert(
+            game_records, on_conflict="id", ignore_duplicates=True
+        ).execute()
+        self.supabase.table("game_seats").upsert(
+            seat_records, on_conflict="game_id,seat", ignore_duplicates=True
+        ).execute()
+
+    def migrate_csv_data_bulk(
+        self,
+        csv_path: Path = CSV_PATH,
+        chunk_size: int = BULK_CHUNK_SIZE,
+        workers: int = BULK_WORKERS,
+        checkpoint: "MigrationCheckpoint | None" = None,
+    ) -> int:
+        """Bulk migration: parse everything, then write batches concurrently.
+
+        Games are written in batches of ``chunk_size`` (games first, then their
+        seats), with up to ``workers`` batches in flight. With a checkpoint,
+        progress is saved after every contiguous run of finished batches and a
+        rerun skips the games already committed.
+
+        Returns:
+            Number of games in the CSV
+        """
+        games = self.read_csv_games(csv_path)
+        player_ids = self.resolve_players(
+            [p["player_name"] for game in games for p in game["players_data"]]
+        )
+        for game_data in games:
+            for player_data in game_data["players_data"]:
+                player_data["player_id"] = player_ids[player_data["player_name"]]
+
+        committed = checkpoint.resume_offset(games) if checkpoint else 0
+        if committed:
+            logger.info(f"⏯️  Resuming after {committed} committed games")
+
+        batches = [
+            (start, games[start : start + chunk_size])
+            for start in range(committed, len(games), chunk_size)
+        ]
+        finished: set[int] = set()
+        with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+            futures = {
+                executor.submit(self.write_batch, batch): start
+                for start, batch in batches
+            }
+            for future in as_completed(futures):
+                if future.exception():
+                    # Stop queued batches; the checkpoint stays behind the failure
+                    for pending in futures:
+                        pending.cancel()
+                    raise future.exception()
+                finished.add(futures[future])
+                while committed in finished:
+                    finished.discard(committed)
+                    committed = min(committed + chunk_size, len(games))
+                    if checkpoint:
+                        checkpoint.save(committed, games[committed - 1]["game_id"])
+                logger.info(f"🎮 {committed}/{len(games)} games committed")
+
+        if checkpoint:
+            checkpoint.clear()
+        logger.info(f"✅ Migration completed: {len(games)} games upserted")
+        return len(games)
+
+    def run_migration(
+        self,
+        keep_players: bool = False,
+        bulk: bool = False,
+        workers: int = BULK_WORKERS,
+        restart: bool = False,
+        csv_path: Path | None = None,
+    ) -> None:
         """Execute the complete migration process.
 
         Args:
             keep_players: If True, preserve existing player records
+            bulk: If True, use the bulk path (migrate_csv_data_bulk)
+            workers: Concurrent batches in bulk mode
+            restart: If True, discard the checkpoint instead of resuming
+            csv_path: Legacy CSV to migrate (default: legacy_logs.csv at the
+                workspace root)
         """
+        csv_path = csv_path or CSV_PATH
+        checkpoint = MigrationCheckpoint.for_csv(csv_path)
+        if restart:
+            checkpoint.clear()
+        resuming = checkpoint.exists()
+
         logger.info("🚀 Starting legacy data migration with Supabase client")
 
         # Connect to Supabase
         self.connect_to_supabase()
 
-        # Truncate tables for clean migration
-        self.truncate_tables(keep_players=keep_players)
+        # Truncate tables for clean migration (never when resuming: the
+        # checkpoint describes rows already written)
+        if resuming:
+            logger.info(f"⏯️  Found checkpoint {checkpoint.path}, skipping truncation")
+        else:
+            self.truncate_tables(keep_players=keep_players)
 
         # Ensure both Season 3 and Season 4 configurations exist
         self.season_3_config_hash = self.ensure_season_config_in_db(
@@ -353,7 +623,10 @@ class SupabaseLegacyDataMigrator:
         )
 
         # Migrate CSV data
-        self.migrate_csv_data()
+        if bulk:
+            self.migrate_csv_data_bulk(csv_path, workers=workers, checkpoint=checkpoint)
+        else:
+            self.migrate_csv_data(csv_path, checkpoint=checkpoint)
 
         logger.info("🎉 Migration completed successfully!")
 
@@ -371,12 +644,42 @@ def main():
         help="Keep existing player records (default: delete and recreate all players)",
     )
 
+    parser.add_argument(
+        "--bulk",
+        action="store_true",
+        help="Parse the whole CSV first and write players, games and seats in bulk",
+    )
+
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=BULK_WORKERS,
+        help=f"Concurrent batches in bulk mode (default: {BULK_WORKERS})",
+    )
+    parser.add_argument(
+        "--restart",
+        action="store_true",
+        help="Ignore the CSV's checkpoint and start over (truncating as usual)",
+    )
+    parser.add_argument(
+        "--csv",
+        type=Path,
+        default=CSV_PATH,
+        help="Legacy CSV to migrate (default: legacy_logs.csv at the workspace root)",
+    )
+
     args = parser.parse_args()
 
     migrator = SupabaseLegacyDataMigrator()
 
     try:
-        migrator.run_migration(keep_players=args.keep_players)
+        migrator.run_migration(
+            keep_players=args.keep_players,
+            bulk=args.bulk,
+            workers=args.workers,
+            restart=args.restart,
+            csv_path=args.csv,
+        )
     except Exception as e:
         logger.error(f"❌ Migration failed: {e}")
         sys.exit(1)
@@ -27,7 +27,6 @@ Requirements:
 """
 
 import argparse
-import hashlib
 import json
 import logging
 import os
@@ -38,6 +37,13 @@ import yaml
 from dotenv import load_dotenv
 from supabase import Client, create_client
 
+try:
+    from rating_engine.materialization import CONFIG_HASH_SECTIONS, compute_config_hash
+except ImportError:
+    # Fallback: add parent directory to path
+    sys.path.insert(0, str(Path(__file__).parent.parent))
+    from rating_engine.materialization import CONFIG_HASH_SECTIONS, compute_config_hash
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -114,18 +120,11 @@ class ConfigRegistrar:
         """Register season configuration in database and return its hash."""
         config = self.load_season_config(config_path)
 
-        # Convert to database format (remove metadata)
-        db_config = {
-            "timeRange": config["timeRange"],
-            "rating": config["rating"],
-            "scoring": config["scoring"],
-            "weights": config["weights"],
-            "qualification": config["qualification"],
-        }
-
-        # Calculate deterministic hash
+        # Convert to database format (remove metadata); the hash is the one
+        # the rating engine computes for the same configuration
+        db_config = {section: config[section] for section in CONFIG_HASH_SECTIONS}
         config_json = json.dumps(db_config, sort_keys=True)
-        config_hash = hashlib.sha256(config_json.encode()).hexdigest()
+        config_hash = compute_config_hash(config)
 
         # Upsert configuration
         record = {
@@ -0,0 +1,356 @@
+#!/usr/bin/env python3
+"""
+Tune Rating Parameters
+
+Searches the rating parameters of a season YAML (initial sigma; see
+rating_engine/tuning.py for why weights and uma are not searched) for the
+values whose pre-game ratings best predict placements (Plackett-Luce
+log-loss). Candidates are replayed in a process pool against a local game
+snapshot, so the database is read at most once.
+
+Usage:
+    # Full grid over the games of a legacy CSV
+    uv run python scripts/tune_config.py --config-file configs/season-3.yaml \
+        --from-csv ../../legacy_logs.csv
+
+    # Over a snapshot of the database games, 8 processes
+    uv run python scripts/tune_config.py --config-file configs/season-5.yaml \
+        --workers 8
+
+    # Random sample of 5 candidates; stop after 3 without an improvement
+    uv run python scripts/tune_config.py --config-file configs/season-5.yaml \
+        --search random --trials 5 --patience 3
+
+Outputs (in --output, default out/tuning):
+    - report.csv: every candidate, best first
+    - <config>-tuned.yaml: the best candidate, ready for register_configs.py;
+      only written when it predicts better than a uniform guess and better
+      than the base configuration
+
+Requirements:
+    - SUPABASE_URL and SUPABASE_SECRET_KEY in environment, unless --from-csv
+      is given or the snapshot already exists
+"""
+
+import argparse
+import asyncio
+import csv
+import json
+import logging
+import os
+import sys
+import time
+from pathlib import Path
+
+import yaml
+from dotenv import load_dotenv
+
+try:
+    from rating_engine.legacy_csv import read_legacy_games
+    from rating_engine.materialization import GameData, MaterializationEngine
+    from rating_engine.tuning import (
+        PARAMETERS,
+        SEARCH_SPACE,
+        UNINFORMED_LOG_LOSS,
+        TuningResult,
+        grid_candidates,
+        load_snapshot,
+        random_candidates,
+        save_snapshot,
+        tune,
+    )
+except ImportError:
+    # Fallback: add parent directory to path
+    sys.path.insert(0, str(Path(__file__).parent.parent))
+    from rating_engine.legacy_csv import read_legacy_games
+    from rating_engine.materialization import GameData, MaterializationEngine
+    from rating_engine.tuning import (
+        PARAMETERS,
+        SEARCH_SPACE,
+        UNINFORMED_LOG_LOSS,
+        TuningResult,
+        grid_candidates,
+        load_snapshot,
+        random_candidates,
+        save_snapshot,
+        tune,
+    )
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(levelname)s: %(message)s",
+)
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_PATH = Path(__file__).parent.parent / ".cache" / "games-snapshot.json"
+
+
+def load_environment(env: str | None = None) -> None:
+    """Load environment variables from appropriate .env file."""
+    rating_engine_dir = Path(__file__).parent.parent
+
+    if env == "prod":
+        env_file = rating_engine_dir / ".env.prod"
+    elif env == "dev":
+        env_file = rating_engine_dir / ".env.dev"
+    else:
+        # Default: try .env first, fallback to .env.dev
+        env_file = rating_engine_dir / ".env"
+        if not env_file.exists():
+            env_file = rating_engine_dir / ".env.dev"
+
+    if not env_file.exists():
+        raise FileNotFoundError(
+            f"Environment file not found: {env_file}\n"
+            f"Create {env_file} with SUPABASE_URL and SUPABASE_SECRET_KEY"
+        )
+
+    load_dotenv(env_file)
+    logger.info(f"📁 Loaded environment from: {env_file.name}")
+
+
+def load_games(
+    config_data: dict,
+    snapshot_path: Path,
+    csv_path: Path | None = None,
+    refresh: bool = False,
+    env: str | None = None,
+) -> list[GameData]:
+    """Games to tune against: a legacy CSV, the snapshot, or a fresh download.
+
+    Downloads the configuration's time range from Supabase when there is no
+    snapshot yet (or ``refresh`` is set) and saves it for later runs.
+    """
+    if csv_path:
+        return read_legacy_games(csv_path).games
+    if snapshot_path.exists() and not refresh:
+        games = load_snapshot(snapshot_path)
+        logger.info(f"📦 Loaded {len(games)} games from {snapshot_path}")
+        return games
+
+    from supabase import create_client
+
+    load_environment(env)
+    url = os.getenv("SUPABASE_URL")
+    key = os.getenv("SUPABASE_SECRET_KEY") or os.getenv("SUPABASE_SERVICE_ROLE_KEY")
+    if not url or not key:
+        raise ValueError(
+            "SUPABASE_URL and SUPABASE_SECRET_KEY "
+            "(or SUPABASE_SERVICE_ROLE_KEY) must be set"
+        )
+
+    engine = MaterializationEngine(create_client(url, key))
+    time_range = config_data["timeRange"]
+    games = asyncio.run(
+        engine._load_games_in_range(time_range["startDate"], time_range["endDate"])
+    )
+    save_snapshot(games, snapshot_path)
+    logger.info(f"💾 Saved {len(games)} games to {snapshot_path}")
+    return games
+
+
+def write_report(results: list[TuningResult], path: Path) -> None:
+    """Write every candidate, best first, as CSV."""
+    with open(path, "w", newline="", encoding="utf-8") as file:
+        writer = csv.DictWriter(
+            file,
+            fieldnames=[
+                "rank",
+                *PARAMETERS,
+                "log_loss",
+                "vs_uninformed",
+                "games_scored",
+                "complete",
+                "config_hash",
+            ],
+        )
+        writer.writeheader()
+        for rank, result in enumerate(results, start=1):
+            params = {
+                name: result.config_data[section][key]
+                for name, (section, key) in PARAMETERS.items()
+            }
+            writer.writerow(
+                {
+                    "rank": rank,
+                    **{
+                        name: json.dumps(value) if isinstance(value, list) else value
+                        for name, value in params.items()
+                    },
+                    "log_loss": result.log_loss,
+                    "vs_uninformed": result.log_loss - UNINFORMED_LOG_LOSS,
+                    "games_scored": result.games_scored,
+                    "complete": result.complete,
+                    "config_hash": result.config_hash,
+                }
+            )
+
+
+def write_tuned_config(
+    result: TuningResult, baseline: TuningResult, config_path: Path, path: Path
+) -> None:
+    """Write the best candidate as a season YAML for register_configs.py.
+
+    Raises:
+        ValueError: The candidate predicts no better than a uniform guess
+    """
+    if not result.beats_uninformed:
+        raise ValueError(
+            f"Best log-loss {result.log_loss:.4f} is no better than a uniform "
+            f"guess ({UNINFORMED_LOG_LOSS:.4f}); not writing a tuned config"
+        )
+    config_data = {
+        **result.config_data,
+        "name": f"{result.config_data['name']} (tuned)",
+        "description": (
+            f"Tuned from {config_path.name}: log-loss {result.log_loss:.4f} "
+            f"(was {baseline.log_loss:.4f}) over {result.games_scored} games"
+        ),
+        "isOfficial": False,
+    }
+    with open(path, "w", encoding="utf-8") as file:
+        file.write(f"# Generated by scripts/tune_config.py from {config_path.name}\n\n")
+        yaml.safe_dump(config_data, file, sort_keys=False)
+
+
+def print_report(results: list[TuningResult], baseline: TuningResult, top: int):
+    """Print the best candidates next to the base configuration."""
+    print(f"\n{'rank':>4}  {'log-loss':>8}  parameters")
+    for rank, result in enumerate(results[:top], start=1):
+        marker = "  (base)" if result is baseline else ""
+        params = ", ".join(f"{name}={value}" for name, value in result.params.items())
+        print(f"{rank:>4}  {result.log_loss:>8.4f}  {params or 'base'}{marker}")
+    print(
+        f"\nBase configuration: {baseline.log_loss:.4f}; "
+        f"uniform guess: {UNINFORMED_LOG_LOSS:.4f}"
+    )
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(
+        description="Tune rating parameters by how well ratings predict placements",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  # Full grid over a legacy CSV
+  uv run python scripts/tune_config.py --config-file configs/season-3.yaml \\
+      --from-csv ../../legacy_logs.csv
+
+  # Over the database games (downloaded once to the snapshot), 8 processes
+  uv run python scripts/tune_config.py --config-file configs/season-5.yaml \\
+      --workers 8
+
+  # Re-download the snapshot first
+  uv run python scripts/tune_config.py --config-file configs/season-5.yaml \\
+      --refresh-snapshot --env prod
+        """,
+    )
+
+    parser.add_argument(
+        "--config-file",
+        type=Path,
+        required=True,
+        help="Season YAML whose parameters are tuned (time range and the rest kept)",
+    )
+    parser.add_argument(
+        "--from-csv",
+        type=Path,
+        help="Tune against a legacy CSV log instead of the database snapshot",
+    )
+    parser.add_argument(
+        "--snapshot",
+        type=Path,
+        default=SNAPSHOT_PATH,
+        help="Local game snapshot (default: .cache/games-snapshot.json)",
+    )
+    parser.add_argument(
+        "--refresh-snapshot",
+        action="store_true",
+        help="Download the games again even if the snapshot exists",
+    )
+    parser.add_argument(
+        "--search",
+        choices=["grid", "random"],
+        default="grid",
+        help="Try every combination or a random sample (default: grid)",
+    )
+    parser.add_argument(
+        "--trials",
+        type=int,
+        default=5,
+        help="Candidates for random search (default: 5)",
+    )
+    parser.add_argument("--seed", type=int, default=0, help="Random search seed")
+    parser.add_argument(
+        "--patience",
+        type=int,
+        help="Stop after this many candidates without an improvement",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="Candidate processes (default: one per CPU)",
+    )
+    parser.add_argument(
+        "--top", type=int, default=10, help="Candidates to print (default: 10)"
+    )
+    parser.add_argument(
+        "--output",
+        type=Path,
+        default=Path("out/tuning"),
+        help="Directory for report.csv and the tuned YAML (default: out/tuning)",
+    )
+    parser.add_argument(
+        "--env",
+        choices=["dev", "prod"],
+        help="Environment for downloading the snapshot",
+    )
+
+    args = parser.parse_args()
+
+    with open(args.config_file) as file:
+        config_data = yaml.safe_load(file)
+    games = load_games(
+        config_data, args.snapshot, args.from_csv, args.refresh_snapshot, args.env
+    )
+
+    if args.search == "grid":
+        candidates = grid_candidates(SEARCH_SPACE)
+    else:
+        candidates = random_candidates(SEARCH_SPACE, args.trials, args.seed)
+
+    start = time.perf_counter()
+    results = tune(config_data, games, candidates, args.workers, args.patience)
+    baseline = next(result for result in results if not result.params)
+    logger.info(
+        f"✅ Evaluated {len(results)} candidates in "
+        f"{time.perf_counter() - start:.1f}s "
+        f"({sum(not result.complete for result in results)} stopped early)"
+    )
+
+    args.output.mkdir(parents=True, exist_ok=True)
+    report_path = args.output / "report.csv"
+    config_path = args.output / f"{args.config_file.stem}-tuned.yaml"
+    write_report(results, report_path)
+    print_report(results, baseline, args.top)
+    logger.info(f"💾 Wrote {report_path}")
+
+    if results[0] is baseline:
+        logger.info("✅ The base configuration is already the best candidate")
+        return
+    try:
+        write_tuned_config(results[0], baseline, args.config_file, config_path)
+    except ValueError as e:
+        logger.error(f"❌ {e}")
+        sys.exit(1)
+    logger.info(f"💾 Wrote {config_path}")
+    logger.info(
+        f"💡 Register with: uv run python scripts/register_configs.py {config_path}"
+    )
+
+
+if __name__ == "__main__":
+    main()
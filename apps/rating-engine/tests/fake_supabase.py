@@ -0,0 +1,699 @@
+"""
+In-Memory Supabase Stand-In
+
+A fake Supabase client implementing the subset of the PostgREST query builder
+used by ``rating_engine`` and ``api/index.py``, backed by in-memory tables.
+Unlike MagicMock chains it actually filters, orders, embeds and pages rows, so
+tests can check query shapes and round-trip counts, and benchmarks can inject
+per-call latency to make I/O-bound changes measurable offline.
+
+Supported:
+    table/from_, select (columns, ``*``, nested embeds, ``!inner``,
+    ``count="exact"``), eq/neq/gt/gte/lt/lte/in_/is_ (also on embedded
+    columns, e.g. ``.gte("games.started_at", ...)``), or_ (conditions and
+    ``and(...)`` groups on the table's own columns), order, limit, range,
+    single/maybe_single, insert, upsert (on_conflict, ignore_duplicates),
+    update, delete, rpc
+
+Behaviour matching PostgREST:
+    - Responses are capped at ``max_rows`` (Supabase default 1000)
+    - Timestamps compare as timestamps; a date bound means midnight UTC
+    - Primary keys are enforced on insert, and the unique constraints in
+      ``UNIQUE_KEYS`` on insert and upsert (duplicate -> FakeAPIError 23505)
+    - Embeds follow the foreign keys in ``FOREIGN_KEYS``
+    - Views in ``VIEWS`` (``current_leaderboard``) are read-only and computed
+      from the current tables
+
+Usage:
+    fake = FakeSupabase(latency=0.02)
+    fake.seed(generate_league(games=500).tables())
+    await materialize_data_for_config(fake, config_hash)
+    assert fake.call_counts[("games", "select")] == 1
+"""
+
+import threading
+import time
+import uuid
+from collections import Counter
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass, field
+from datetime import UTC, date, datetime
+from functools import lru_cache
+from typing import Any
+
+# (table, column) -> (referenced table, referenced column)
+FOREIGN_KEYS: dict[tuple[str, str], tuple[str, str]] = {
+    ("game_seats", "game_id"): ("games", "id"),
+    ("game_seats", "player_id"): ("players", "id"),
+    ("hand_events", "game_id"): ("games", "id"),
+    ("cached_player_ratings", "player_id"): ("players", "id"),
+    ("cached_game_results", "game_id"): ("games", "id"),
+    ("cached_game_results", "player_id"): ("players", "id"),
+    ("player_achievements", "player_id"): ("players", "id"),
+    ("player_achievements", "achievement_id"): ("achievements", "id"),
+}
+
+# Primary keys from supabase/migrations; ``id`` keys are generated on insert
+PRIMARY_KEYS: dict[str, tuple[str, ...]] = {
+    "players": ("id",),
+    "games": ("id",),
+    "game_seats": ("game_id", "seat"),
+    "hand_events": ("id",),
+    "rating_configurations": ("config_hash",),
+    "cached_player_ratings": (
+        "config_hash",
+        "player_id",
+        "games_start_date",
+        "games_end_date",
+    ),
+    "cached_game_results": ("config_hash", "game_id", "player_id"),
+    "cached_player_statistics": ("config_hash", "player_id"),
+    "cached_head_to_head": ("config_hash", "player_a", "player_b"),
+    "achievements": ("id",),
+    "player_achievements": ("id",),
+}
+
+# Unique constraints besides the primary key, from supabase/migrations
+UNIQUE_KEYS: dict[str, list[tuple[str, ...]]] = {
+    "cached_game_results": [("config_hash", "game_id", "seat")],
+    "hand_events": [("game_id", "hand_seq", "seat")],
+}
+
+DEFAULT_MAX_ROWS = 1000
+
+
+def _current_leaderboard(tables: dict[str, list[dict[str, Any]]]) -> list[dict]:
+    """``current_leaderboard`` view: official cached ratings with player names."""
+    names = {row["id"]: row.get("display_name") for row in tables.get("players", [])}
+    official = {
+        row["config_hash"]: row.get("config_data") or {}
+        for row in tables.get("rating_configurations", [])
+        if row.get("is_official")
+    }
+
+    rows = []
+    for rating in tables.get("cached_player_ratings", []):
+        config_data = official.get(rating["config_hash"])
+        if config_data is None or rating["player_id"] not in names:
+            continue
+        games_played = rating.get("games_played") or 0
+        total_plus_minus = rating.get("total_plus_minus") or 0
+        min_games = config_data.get("qualification", {}).get("minGames")
+        rows.append(
+            {
+                "display_name": names[rating["player_id"]],
+                "display_rating": rating["display_rating"],
+                "games_played": games_played,
+                "min_games_qualify": min_games,
+                "qualified": min_games is not None and games_played >= min_games,
+                "total_plus_minus": total_plus_minus,
+                "avg_plus_minus": round(total_plus_minus / max(games_played, 1), 1),
+                **{
+                    column: rating.get(column)
+                    for column in (
+                        "tsumo_rate",
+                        "ron_rate",
+                        "riichi_rate",
+                        "deal_in_rate",
+                        "longest_first_streak",
+                        "longest_fourth_free_streak",
+                        "last_game_date",
+                        "config_hash",
+                        "computed_at",
+                    )
+                },
+            }
+        )
+    rows.sort(key=lambda row: row["display_rating"], reverse=True)
+    return rows
+
+
+# Read-only views computed from the current tables on every select
+VIEWS: dict[str, Callable[[dict[str, list[dict[str, Any]]]], list[dict]]] = {
+    "current_leaderboard": _current_leaderboard,
+}
+
+
+class FakeAPIError(Exception):
+    """Mirrors postgrest.APIError closely enough for error-path tests."""
+
+    def __init__(self, message: str, code: str | None = None):
+        super().__init__(message)
+        self.message = message
+        self.code = code
+
+
+@dataclass
+class FakeResponse:
+    """Mirrors postgrest's APIResponse (``data`` and ``count``)."""
+
+    data: Any
+    count: int | None = None
+
+
+@dataclass
+class Call:
+    """One executed round trip."""
+
+    table: str
+    operation: str
+    filters: list[tuple[str, str, Any]] = field(default_factory=list)
+    rows: int = 0
+
+
+@lru_cache(maxsize=65536)
+def _parse_timestamp(value: str) -> datetime | None:
+    try:
+        parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=UTC)
+
+
+def _comparable(left: Any, right: Any) -> tuple[Any, Any]:
+    """Coerce a pair of values the way Postgres would compare them."""
+    if isinstance(left, datetime | date):
+        left = left.isoformat()
+    if isinstance(right, datetime | date):
+        right = right.isoformat()
+    # Filter strings (e.g. from or_) are cast to the column's type
+    if isinstance(left, int | float) and not isinstance(left, bool):
+        if isinstance(right, str):
+            try:
+                right = type(left)(right)
+            except ValueError:
+                pass
+    if isinstance(left, str) and isinstance(right, str):
+        left_ts, right_ts = _parse_timestamp(left), _parse_timestamp(right)
+        if left_ts is not None and right_ts is not None:
+            return left_ts, right_ts
+    return left, right
+
+
+_OPERATORS: dict[str, Callable[[Any, Any], bool]] = {
+    "eq": lambda a, b: a == b,
+    "neq": lambda a, b: a != b,
+    "gt": lambda a, b: a > b,
+    "gte": lambda a, b: a >= b,
+    "lt": lambda a, b: a < b,
+    "lte": lambda a, b: a <= b,
+}
+
+
+def _matches(row: dict[str, Any], filters: list[tuple[str, str, Any]]) -> bool:
+    for column, operator, value in filters:
+        if operator == "or":
+            if not any(_matches(row, branch) for branch in value):
+                return False
+            continue
+        cell = row.get(column)
+        if operator == "in":
+            if cell is None or not any(
+                _OPERATORS["eq"](*_comparable(cell, v)) for v in value
+            ):
+                return False
+        elif operator == "is":
+            if cell is not value:
+                return False
+        else:
+            # SQL comparisons with NULL are never true
+            if cell is None or value is None:
+                return False
+            if not _OPERATORS[operator](*_comparable(cell, value)):
+                return False
+    return True
+
+
+@dataclass
+class _SelectNode:
+    """Parsed select list: plain columns plus nested embeds."""
+
+    columns: list[str] = field(default_factory=list)
+    star: bool = False
+    embeds: list[tuple[str, bool, "_SelectNode"]] = field(default_factory=list)
+
+
+def _split_top_level(text: str) -> list[str]:
+    parts, depth, current = [], 0, []
+    for char in text:
+        if char == "," and depth == 0:
+            parts.append("".join(current))
+            current = []
+            continue
+        depth += char == "("
+        depth -= char == ")"
+        current.append(char)
+    parts.append("".join(current))
+    return [part.strip() for part in parts if part.strip()]
+
+
+def _parse_condition(text: str) -> tuple[str, str, Any]:
+    column, operator, value = text.split(".", 2)
+    return column, operator, value.strip('"')
+
+
+def _parse_logic(text: str) -> list[list[tuple[str, str, Any]]]:
+    """Branches of an ``or`` filter string, each a list of ANDed conditions."""
+    branches = []
+    for item in _split_top_level(text):
+        if item.startswith("and(") and item.endswith(")"):
+            branches.append(
+                [_parse_condition(part) for part in _split_top_level(item[4:-1])]
+            )
+        else:
+            branches.append([_parse_condition(item)])
+    return branches
+
+
+@lru_cache(maxsize=256)
+def _parse_select(text: str) -> _SelectNode:
+    node = _SelectNode()
+    for item in _split_top_level(" ".join(text.split())):
+        if "(" in item:
+            head, inner = item.split("(", 1)
+            name, _, hint = head.strip().partition("!")
+            node.embeds.append(
+                (name.strip(), hint.strip() == "inner", _parse_select(inner[:-1]))
+            )
+        elif item == "*":
+            node.star = True
+        else:
+            node.columns.append(item)
+    return node
+
+
+class FakeQuery:
+    """Query builder; every modifier returns self until ``execute()``."""
+
+    def __init__(self, client: "FakeSupabase", table: str):
+        self._client = client
+        self._table = table
+        self._operation = "select"
+        self._select = "*"
+        self._count: str | None = None
+        self._payload: Any = None
+        self._on_conflict: str | None = None
+        self._ignore_duplicates = False
+        self._filters: list[tuple[str, str, Any]] = []
+        self._order: list[tuple[str, bool, bool | None]] = []
+        self._limit: int | None = None
+        self._offset = 0
+        self._single: str | None = None
+
+    # Operations -----------------------------------------------------------
+
+    def select(self, *columns: str, count: str | None = None) -> "FakeQuery":
+        self._operation = "select"
+        self._select = ",".join(columns) or "*"
+        self._count = count
+        return self
+
+    def insert(self, rows: dict | list[dict], **kwargs: Any) -> "FakeQuery":
+        self._operation = "insert"
+        self._payload = rows
+        return self
+
+    def upsert(
+        self,
+        rows: dict | list[dict],
+        on_conflict: str | None = None,
+        **kwargs: Any,
+    ) -> "FakeQuery":
+        self._operation = "upsert"
+        self._payload = rows
+        self._on_conflict = on_conflict
+        self._ignore_duplicates = kwargs.get("ignore_duplicates", False)
+        return self
+
+    def update(self, values: dict, **kwargs: Any) -> "FakeQuery":
+        self._operation = "update"
+        self._payload = values
+        return self
+
+    def delete(self, **kwargs: Any) -> "FakeQuery":
+        self._operation = "delete"
+        return self
+
+    # Filters and modifiers ------------------------------------------------
+
+    def _filter(self, column: str, operator: str, value: Any) -> "FakeQuery":
+        self._filters.append((column, operator, value))
+        return self
+
+    def eq(self, column: str, value: Any) -> "FakeQuery":
+        return self._filter(column, "eq", value)
+
+    def neq(self, column: str, value: Any) -> "FakeQuery":
+        return self._filter(column, "neq", value)
+
+    def gt(self, column: str, value: Any) -> "FakeQuery":
+        return self._filter(column, "gt", value)
+
+    def gte(self, column: str, value: Any) -> "FakeQuery":
+        return self._filter(column, "gte", value)
+
+    def lt(self, column: str, value: Any) -> "FakeQuery":
+        return self._filter(column, "lt", value)
+
+    def lte(self, column: str, value: Any) -> "FakeQuery":
+        return self._filter(column, "lte", value)
+
+    def in_(self, column: str, values: Iterable[Any]) -> "FakeQuery":
+        return self._filter(column, "in", list(values))
+
+    def or_(self, filters: str) -> "FakeQuery":
+        return self._filter("", "or", _parse_logic(filters))
+
+    def is_(self, column: str, value: Any) -> "FakeQuery":
+        if isinstance(value, str):
+            value = {"null": None, "true": True, "false": False}[value.lower()]
+        return self._filter(column, "is", value)
+
+    def order(
+        self, column: str, *, desc: bool = False, nullsfirst: bool | None = None
+    ) -> "FakeQuery":
+        self._order.append((column, desc, nullsfirst))
+        return self
+
+    def limit(self, size: int) -> "FakeQuery":
+        self._limit = size
+        return self
+
+    def range(self, start: int, end: int) -> "FakeQuery":
+        self._offset = start
+        self._limit = end - start + 1
+        return self
+
+    def single(self) -> "FakeQuery":
+        self._single = "single"
+        return self
+
+    def maybe_single(self) -> "FakeQuery":
+        self._single = "maybe_single"
+        return self
+
+    # Execution ------------------------------------------------------------
+
+    def execute(self) -> FakeResponse:
+        call = Call(self._table, self._operation, list(self._filters))
+        response = self._client._execute(call, self._run)
+        if isinstance(response.data, list):
+            call.rows = len(response.data)
+        else:
+            call.rows = int(response.data is not None)
+        return response
+
+    def _run(self, tables: dict[str, list[dict[str, Any]]]) -> FakeResponse:
+        if self._table in VIEWS:
+            if self._operation != "select":
+                raise FakeAPIError(
+                    f'cannot {self._operation} view "{self._table}"', code="55000"
+                )
+            return self._run_select(VIEWS[self._table](tables), tables)
+
+        rows = tables.setdefault(self._table, [])
+        if self._operation == "select":
+            return self._run_select(rows, tables)
+        if self._operation in ("insert", "upsert"):
+            return FakeResponse(self._run_write(rows))
+        if self._operation == "update":
+            updated = []
+            for row in rows:
+                if _matches(row, self._filters):
+                    row.update(self._payload)
+                    updated.append(dict(row))
+            return FakeResponse(updated)
+
+        # delete: PostgREST refuses unfiltered deletes
+        if not self._filters:
+            raise FakeAPIError("DELETE requires a WHERE clause", code="21000")
+        kept, deleted = [], []
+        for row in rows:
+            (deleted if _matches(row, self._filters) else kept).append(row)
+        rows[:] = kept
+        return FakeResponse(deleted)
+
+    def _run_select(
+        self, rows: list[dict[str, Any]], tables: dict[str, list[dict[str, Any]]]
+    ) -> FakeResponse:
+        node = _parse_select(self._select)
+        # "embed.column" filters apply to embedded rows, like PostgREST
+        local_filters, embed_filters = [], {}
+        for column, operator, value in self._filters:
+            name, dot, embedded_column = column.partition(".")
+            if dot:
+                embed_filters.setdefault(name, []).append(
+                    (embedded_column, operator, value)
+                )
+            else:
+                local_filters.append((column, operator, value))
+        matched = [row for row in rows if _matches(row, local_filters)]
+
+        for column, desc, nullsfirst in reversed(self._order):
+            nulls_first = desc if nullsfirst is None else nullsfirst
+            present = [row for row in matched if row.get(column) is not None]
+            missing = [row for row in matched if row.get(column) is None]
+            present.sort(
+                key=lambda row: _comparable(row[column], row[column])[0],
+                reverse=desc,
+            )
+            matched = missing + present if nulls_first else present + missing
+
+        index = _Index(tables)
+        projected = []
+        for row in matched:
+            result = _project(self._table, row, node, index, embed_filters)
+            if result is not None:
+                projected.append(result)
+
+        count = len(projected) if self._count else None
+        end = None if self._limit is None else self._offset + self._limit
+        data = projected[self._offset : end][: self._client.max_rows]
+
+        if self._single:
+            if len(data) == 1:
+                return FakeResponse(data[0], count)
+            if self._single == "maybe_single" and not data:
+                return FakeResponse(None, count)
+            raise FakeAPIError(
+                "JSON object requested, multiple (or no) rows returned",
+                code="PGRST116",
+            )
+        return FakeResponse(data, count)
+
+    def _run_write(self, rows: list[dict[str, Any]]) -> list[dict[str, Any]]:
+        payload = self._payload if isinstance(self._payload, list) else [self._payload]
+        key_columns = (
+            tuple(c.strip() for c in self._on_conflict.split(","))
+            if self._on_conflict
+            else PRIMARY_KEYS.get(self._table)
+        )
+
+        index = {}
+        if key_columns:
+            index = {tuple(row.get(c) for c in key_columns): row for row in rows}
+        unique_indexes = {
+            columns: {tuple(row.get(c) for c in columns): row for row in rows}
+            for columns in UNIQUE_KEYS.get(self._table, [])
+        }
+
+        written = []
+        for new_row in payload:
+            row = dict(new_row)
+            if key_columns == ("id",) and row.get("id") is None:
+                row["id"] = str(uuid.uuid4())
+
+            key = tuple(row.get(c) for c in key_columns) if key_columns else None
+            existing = index.get(key) if key is not None else None
+            if existing is not None:
+                if self._operation == "insert":
+                    raise FakeAPIError(
+                        f"duplicate key value violates unique constraint on "
+                        f'"{self._table}" {dict(zip(key_columns, key, strict=True))}',
+                        code="23505",
+                    )
+                if not self._ignore_duplicates:
+                    self._check_unique(unique_indexes, {**existing, **row}, existing)
+                    existing.update(row)
+                    written.append(dict(existing))
+                continue
+
+            self._check_unique(unique_indexes, row, row)
+            rows.append(row)
+            if key is not None:
+                index[key] = row
+            written.append(dict(row))
+        return written
+
+    def _check_unique(
+        self,
+        unique_indexes: dict[tuple[str, ...], dict[tuple, dict[str, Any]]],
+        values: dict[str, Any],
+        row: dict[str, Any],
+    ) -> None:
+        """Raise if ``values`` (to be stored in ``row``) clash with another row."""
+        for columns, index in unique_indexes.items():
+            key = tuple(values.get(c) for c in columns)
+            other = index.get(key)
+            if other is not None and other is not row:
+                raise FakeAPIError(
+                    f"duplicate key value violates unique constraint on "
+                    f'"{self._table}" {dict(zip(columns, key, strict=True))}',
+                    code="23505",
+                )
+        for columns, index in unique_indexes.items():
+            old_key = tuple(row.get(c) for c in columns)
+            if index.get(old_key) is row:
+                del index[old_key]
+            index[tuple(values.get(c) for c in columns)] = row
+
+
+class _Index:
+    """Lazily built per-query lookups of rows by column value."""
+
+    def __init__(self, tables: dict[str, list[dict[str, Any]]]):
+        self._tables = tables
+        self._indexes: dict[tuple[str, str], dict[Any, list[dict[str, Any]]]] = {}
+
+    def lookup(self, table: str, column: str, value: Any) -> list[dict[str, Any]]:
+        if value is None:
+            return []
+        index = self._indexes.get((table, column))
+        if index is None:
+            index = {}
+            for row in self._tables.get(table, []):
+                index.setdefault(row.get(column), []).append(row)
+            self._indexes[(table, column)] = index
+        return index.get(value, [])
+
+
+def _relationship(table: str, name: str) -> tuple[str, str, str] | None:
+    """("to_one"|"to_many", local column, remote column) for an embed."""
+    for (source, column), (target, ref_column) in FOREIGN_KEYS.items():
+        if source == table and target == name:
+            return "to_one", column, ref_column
+    for (source, column), (target, ref_column) in FOREIGN_KEYS.items():
+        if source == name and target == table:
+            return "to_many", ref_column, column
+    return None
+
+
+def _project(
+    table: str,
+    row: dict[str, Any],
+    node: _SelectNode,
+    index: _Index,
+    embed_filters: dict[str, list[tuple[str, str, Any]]] | None = None,
+) -> dict[str, Any] | None:
+    """Apply a select list (with embeds) to one row; None drops the row."""
+    result = dict(row) if node.star else {c: row.get(c) for c in node.columns}
+
+    for name, inner, child in node.embeds:
+        relationship = _relationship(table, name)
+        if relationship is None:
+            raise FakeAPIError(
+                f"Could not find a relationship between '{table}' and '{name}'",
+                code="PGRST200",
+            )
+        kind, local_column, remote_column = relationship
+
+        embedded = []
+        filters = (embed_filters or {}).get(name, [])
+        for candidate in index.lookup(name, remote_column, row.get(local_column)):
+            if not _matches(candidate, filters):
+                continue
+            projected = _project(name, candidate, child, index)
+            if projected is not None:
+                embedded.append(projected)
+
+        if inner and not embedded:
+            return None
+        result[name] = embedded if kind == "to_many" else next(iter(embedded), None)
+
+    return result
+
+
+class _FakeRpc:
+    def __init__(self, client: "FakeSupabase", name: str, params: dict[str, Any]):
+        self._client = client
+        self._name = name
+        self._params = params
+
+    def execute(self) -> FakeResponse:
+        function = self._client.functions.get(self._name)
+        if function is None:
+            raise FakeAPIError(
+                f"Could not find the function public.{self._name}", code="PGRST202"
+            )
+        call = Call(self._name, "rpc", [("params", "eq", self._params)])
+        return self._client._execute(
+            call, lambda tables: FakeResponse(function(tables, **self._params))
+        )
+
+
+class FakeSupabase:
+    """
+    In-memory stand-in for ``supabase.Client``.
+
+    Args:
+        tables: Initial rows keyed by table name (copied)
+        max_rows: Response row cap, like PostgREST's ``max-rows``
+        latency: Seconds slept per round trip, or a callable ``(Call) -> seconds``
+    """
+
+    def __init__(
+        self,
+        tables: dict[str, list[dict[str, Any]]] | None = None,
+        max_rows: int = DEFAULT_MAX_ROWS,
+        latency: float | Callable[[Call], float] = 0.0,
+    ):
+        self.tables: dict[str, list[dict[str, Any]]] = {}
+        self.max_rows = max_rows
+        self.latency = latency
+        self.calls: list[Call] = []
+        self.call_counts: Counter[tuple[str, str]] = Counter()
+        self.functions: dict[str, Callable[..., Any]] = {}
+        self._lock = threading.RLock()
+        if tables:
+            self.seed(tables)
+
+    def seed(self, tables: dict[str, list[dict[str, Any]]]) -> None:
+        """Append rows to tables (rows are copied)."""
+        with self._lock:
+            for name, rows in tables.items():
+                self.tables.setdefault(name, []).extend(dict(row) for row in rows)
+
+    def table(self, name: str) -> FakeQuery:
+        return FakeQuery(self, name)
+
+    def from_(self, name: str) -> FakeQuery:
+        return self.table(name)
+
+    def register_rpc(self, name: str, function: Callable[..., Any]) -> None:
+        """Register ``function(tables, **params)`` as a database function."""
+        self.functions[name] = function
+
+    def rpc(self, name: str, params: dict[str, Any] | None = None) -> _FakeRpc:
+        return _FakeRpc(self, name, params or {})
+
+    @property
+    def round_trips(self) -> int:
+        return len(self.calls)
+
+    def reset_calls(self) -> None:
+        self.calls.clear()
+        self.call_counts.clear()
+
+    def _execute(
+        self,
+        call: Call,
+        run: Callable[[dict[str, list[dict[str, Any]]]], FakeResponse],
+    ) -> FakeResponse:
+        delay = self.latency(call) if callable(self.latency) else self.latency
+        if delay:
+            time.sleep(delay)
+
+        with self._lock:
+            self.calls.append(call)
+            self.call_counts[(call.table, call.operation)] += 1
+            return run(self.tables)
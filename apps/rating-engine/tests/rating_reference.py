@@ -0,0 +1,153 @@
+"""
+Reference Rating Replay
+
+A deliberately plain replay of games through ``openskill``'s ``PlackettLuce``,
+written independently of MaterializationEngine. It is the yardstick any faster
+rating path is checked against (tests/test_rating_equivalence.py) and timed
+against (benchmarks/rating_kernel.py).
+
+Rules mirrored from the engine:
+- each player is their own team, teams in seat order (east, south, west, north)
+- placement by final score, ties broken by seat order
+- margin-of-victory weight ``1 + plus_minus / divisor`` clamped to [min, max],
+  passed exactly as the engine does. openskill rescales the weights of each
+  team to [1, 2] before using them; a one-player team's only weight always
+  lands on the same value, so neither the weight settings nor uma (which only
+  feeds the weight) move ratings. Passing weights at all still gives a
+  different update than passing none.
+- leaderboard ordered by display rating ``mu - confidence_factor * sigma``
+
+Tolerance: a faster path may reorder floating-point operations, so mu and
+sigma must agree within ``MU_SIGMA_TOLERANCE`` (absolute) after a full replay,
+and the leaderboard order must be identical.
+"""
+
+import csv
+from datetime import UTC, datetime
+from pathlib import Path
+
+from rating_engine.materialization import (
+    GameData,
+    MaterializationConfig,
+    MaterializationEngine,
+)
+
+# Absolute mu/sigma tolerance; far below the 0.01 the leaderboard displays
+MU_SIGMA_TOLERANCE = 1e-6
+
+SEAT_ORDER = ("east", "south", "west", "north")
+
+# Real league logs checked in at the repository root
+FIXTURE_CSVS = (
+    Path(__file__).parent.parent.parent.parent / "legacy_logs.csv",
+    Path(__file__).parent.parent.parent.parent / "mj (season 3+) - logs (4).csv",
+)
+
+
+def replay_reference(
+    config: MaterializationConfig, games: list[GameData]
+) -> dict[str, tuple[float, float]]:
+    """Replay games in order; returns player_id -> (mu, sigma)."""
+    from openskill.models import PlackettLuce
+
+    assert config.uma is not None
+    model = PlackettLuce()
+    ratings: dict[str, tuple[float, float]] = {}
+
+    for game in games:
+        seated = [
+            (seat, game.seats[seat]["player_id"], game.seats[seat]["final_score"])
+            for seat in SEAT_ORDER
+            if seat in game.seats
+        ]
+        by_score = sorted(range(len(seated)), key=lambda i: seated[i][2], reverse=True)
+        placement = {index: rank + 1 for rank, index in enumerate(by_score)}
+
+        teams, ranks, weights = [], [], []
+        for index, (_seat, player_id, final_score) in enumerate(seated):
+            mu, sigma = ratings.get(
+                player_id, (config.initial_mu, config.initial_sigma)
+            )
+            plus_minus = final_score - config.oka + config.uma[placement[index] - 1]
+            weight = 1.0 + plus_minus / config.weight_divisor
+            teams.append([model.rating(mu=mu, sigma=sigma)])
+            ranks.append(placement[index])
+            weights.append([max(config.weight_min, min(config.weight_max, weight))])
+
+        rated = model.rate(teams, ranks, weights=weights)
+        for (_seat, player_id, _score), team in zip(seated, rated, strict=True):
+            ratings[player_id] = (team[0].mu, team[0].sigma)
+
+    return ratings
+
+
+async def replay_engine(
+    config: MaterializationConfig, games: list[GameData]
+) -> dict[str, tuple[float, float]]:
+    """Run the engine's rating pass alone; returns player_id -> (mu, sigma)."""
+    # The rating pass never touches the database
+    engine = MaterializationEngine(None, progress_interval=max(len(games), 1))  # type: ignore[arg-type]
+    player_ratings, _ = await engine._calculate_ratings(config, games)
+    return {
+        player_id: (rating.mu, rating.sigma)
+        for player_id, rating in player_ratings.items()
+    }
+
+
+def max_difference(
+    actual: dict[str, tuple[float, float]], expected: dict[str, tuple[float, float]]
+) -> float:
+    """Largest absolute mu/sigma difference between two replays."""
+    if actual.keys() != expected.keys():
+        raise AssertionError(
+            f"Player sets differ: {sorted(actual.keys() ^ expected.keys())}"
+        )
+    return max(
+        (
+            max(abs(actual[p][0] - expected[p][0]), abs(actual[p][1] - expected[p][1]))
+            for p in expected
+        ),
+        default=0.0,
+    )
+
+
+def leaderboard_order(
+    ratings: dict[str, tuple[float, float]], confidence_factor: float
+) -> list[str]:
+    """Player ids by display rating, highest first (ties by player id)."""
+    return sorted(
+        ratings,
+        key=lambda player_id: (
+            -(ratings[player_id][0] - confidence_factor * ratings[player_id][1]),
+            player_id,
+        ),
+    )
+
+
+def load_fixture_games(path: Path) -> list[GameData]:
+    """Parse a league log CSV (migrate_legacy_data.py format) into games."""
+    games = []
+    with open(path, newline="", encoding="utf-8") as csvfile:
+        for index, row in enumerate(csv.DictReader(csvfile)):
+            if not row.get("date"):
+                continue
+            played_at = datetime.strptime(row["date"], "%m/%d/%Y %H:%M:%S").replace(
+                tzinfo=UTC
+            )
+            games.append(
+                GameData(
+                    game_id=f"{path.stem}-{index}",
+                    started_at=played_at,
+                    finished_at=played_at,
+                    status="finished",
+                    seats={
+                        seat: {
+                            "player_id": row[f"{seat.title()} player"].strip(),
+                            "final_score": int(row[f"{seat.title()} points"]),
+                        }
+                        for seat in SEAT_ORDER
+                    },
+                )
+            )
+    games.sort(key=lambda game: game.started_at)
+    return games
@@ -0,0 +1,310 @@
+"""
+Synthetic League Generator
+
+Deterministic fake league data for scale tests and benchmarks. The same seed
+always produces the same players, games, seats and hand events, so runs can be
+compared across commits.
+
+Two score models:
+- ``simulate_hands=True`` plays out each hanchan hand by hand (riichi bets,
+  ron/tsumo payments, tenpai payments, honba, dealer repeats, busting) and
+  emits ``hand_events`` rows shaped like the web app writes them
+- ``simulate_hands=False`` draws final scores directly from per-placement
+  distributions; about 4x faster, for 100k+ game benchmarks
+
+Player skill shifts win/deal-in odds, so ratings have a real signal to find.
+
+Usage:
+    league = generate_league(games=1000, players=40, seed=7)
+    games = league.game_data()        # list[GameData] for the engine
+    tables = league.tables()          # rows for players/games/game_seats/...
+"""
+
+import math
+import random
+import uuid
+from dataclasses import dataclass, field
+from datetime import UTC, datetime, timedelta
+from typing import Any
+
+from rating_engine.materialization import GameData
+
+SEATS = ("east", "south", "west", "north")
+STARTING_SCORE = 25000
+RIICHI_BET = 1000
+
+# Winning hand values: han -> (non-dealer ron points, relative frequency)
+HAND_VALUES = {
+    1: (1000, 26),
+    2: (2000, 32),
+    3: (3900, 22),
+    4: (7700, 10),
+    5: (8000, 6),
+    6: (12000, 2.5),
+    8: (16000, 1),
+    11: (24000, 0.3),
+    13: (32000, 0.2),
+}
+
+# (mean, stddev) of final scores by placement when not simulating hands
+PLACEMENT_SCORES = ((42000, 7000), (29500, 4000), (20500, 4000), (8000, 8000))
+
+
+@dataclass
+class SyntheticLeague:
+    """Generated league data as table rows."""
+
+    seed: int
+    players: list[dict[str, Any]] = field(default_factory=list)
+    games: list[dict[str, Any]] = field(default_factory=list)
+    game_seats: list[dict[str, Any]] = field(default_factory=list)
+    hand_events: list[dict[str, Any]] = field(default_factory=list)
+    skills: dict[str, float] = field(default_factory=dict)
+
+    def game_data(self) -> list[GameData]:
+        """Games in the engine's GameData shape, chronologically ordered."""
+        seats_by_game: dict[str, dict[str, dict[str, Any]]] = {}
+        for seat in self.game_seats:
+            seats_by_game.setdefault(seat["game_id"], {})[seat["seat"]] = {
+                "player_id": seat["player_id"],
+                "final_score": seat["final_score"],
+            }
+
+        return [
+            GameData(
+                game_id=game["id"],
+                started_at=datetime.fromisoformat(game["started_at"]),
+                finished_at=datetime.fromisoformat(game["finished_at"]),
+                status=game["status"],
+                seats=seats_by_game[game["id"]],
+            )
+            for game in self.games
+        ]
+
+    def tables(self) -> dict[str, list[dict[str, Any]]]:
+        """Rows keyed by Supabase table name."""
+        return {
+            "players": self.players,
+            "games": self.games,
+            "game_seats": self.game_seats,
+            "hand_events": self.hand_events,
+        }
+
+
+def _uuid(rng: random.Random) -> str:
+    return str(uuid.UUID(int=rng.getrandbits(128), version=4))
+
+
+def _round_up(points: float) -> int:
+    return int(math.ceil(points / 100) * 100)
+
+
+def _pick_table(
+    rng: random.Random, player_ids: list[str], activity: list[float]
+) -> list[str]:
+    """Pick four distinct players, favouring more active ones."""
+    table: list[str] = []
+    while len(table) < 4:
+        player_id = rng.choices(player_ids, weights=activity)[0]
+        if player_id not in table:
+            table.append(player_id)
+    return table
+
+
+def _direct_scores(rng: random.Random, skills: list[float]) -> list[int]:
+    """Final scores per seat drawn from per-placement distributions."""
+    strength = [skill + rng.gauss(0, 1.5) for skill in skills]
+    order = sorted(range(4), key=lambda i: strength[i], reverse=True)
+
+    placement_scores = sorted(
+        (int(round(rng.gauss(mean, sd), -2)) for mean, sd in PLACEMENT_SCORES),
+        reverse=True,
+    )
+    # Leftover riichi sticks aside, a table always sums to 100,000
+    placement_scores[0] += 4 * STARTING_SCORE - sum(placement_scores)
+
+    scores = [0] * 4
+    for placement, seat_index in enumerate(order):
+        scores[seat_index] = placement_scores[placement]
+    return scores
+
+
+def _simulate_hanchan(
+    rng: random.Random, game_id: str, skills: list[float]
+) -> tuple[list[int], list[dict[str, Any]]]:
+    """Play one hanchan; returns final scores per seat and hand event rows."""
+    scores = [STARTING_SCORE] * 4
+    events: list[dict[str, Any]] = []
+    win_weights = [math.exp(0.35 * s) for s in skills]
+    deal_in_weights = [math.exp(-0.35 * s) for s in skills]
+    han_choices = list(HAND_VALUES)
+    han_weights = [frequency for _, frequency in HAND_VALUES.values()]
+
+    round_index, kyoku, honba, pot, hand_seq = 0, 1, 0, 0, 0
+    while round_index < 2 and hand_seq < 20:
+        hand_seq += 1
+        dealer = kyoku - 1
+        hand_honba = honba
+        deltas = [0] * 4
+        pot_deltas = [0] * 4
+
+        riichi = [rng.random() < 0.15 for _ in range(4)]
+        for seat_index, declared in enumerate(riichi):
+            if declared:
+                deltas[seat_index] -= RIICHI_BET
+                pot_deltas[seat_index] -= RIICHI_BET
+                pot += RIICHI_BET
+
+        details: dict[str, Any] = {"dealerSeat": SEATS[dealer], "riichiSticks": 0}
+        roll = rng.random()
+        if roll < 0.15:
+            event_type = "draw"
+            tenpai = [i for i in range(4) if riichi[i] or rng.random() < 0.4]
+            if 0 < len(tenpai) < 4:
+                receive = 3000 // len(tenpai)
+                pay = 3000 // (4 - len(tenpai))
+                for i in range(4):
+                    deltas[i] += receive if i in tenpai else -pay
+            details["tenpaiSeats"] = [SEATS[i] for i in tenpai]
+            dealer_keeps = dealer in tenpai
+            honba += 1
+        else:
+            winner = rng.choices(range(4), weights=win_weights)[0]
+            han = rng.choices(han_choices, weights=han_weights)[0]
+            base = HAND_VALUES[han][0] * (1.5 if winner == dealer else 1)
+
+            if roll < 0.15 + 0.85 * 0.35:
+                event_type = "tsumo"
+                for payer in range(4):
+                    if payer == winner:
+                        continue
+                    if winner == dealer:
+                        share = base / 3
+                    else:
+                        share = base / 2 if payer == dealer else base / 4
+                    payment = _round_up(share) + 100 * honba
+                    deltas[payer] -= payment
+                    deltas[winner] += payment
+            else:
+                event_type = "ron"
+                others = [i for i in range(4) if i != winner]
+                loser = rng.choices(
+                    others, weights=[deal_in_weights[i] for i in others]
+                )[0]
+                payment = _round_up(base) + 300 * honba
+                deltas[loser] -= payment
+                deltas[winner] += payment
+                details["loserSeat"] = SEATS[loser]
+
+            details.update(
+                winnerSeat=SEATS[winner],
+                winnerSeats=[SEATS[winner]],
+                han=han,
+                pointsWon=deltas[winner] + (RIICHI_BET if riichi[winner] else 0),
+                riichiSticks=pot // RIICHI_BET,
+            )
+            deltas[winner] += pot
+            pot_deltas[winner] += pot
+            pot = 0
+            dealer_keeps = winner == dealer
+            honba = honba + 1 if dealer_keeps else 0
+
+        for seat_index in range(4):
+            scores[seat_index] += deltas[seat_index]
+            events.append(
+                {
+                    "game_id": game_id,
+                    "hand_seq": hand_seq,
+                    "seat": SEATS[seat_index],
+                    "event_type": event_type,
+                    "riichi_declared": riichi[seat_index],
+                    "points_delta": deltas[seat_index],
+                    "pot_delta": pot_deltas[seat_index],
+                    "round_kanji": "ES"[round_index],
+                    "kyoku": kyoku,
+                    "honba": hand_honba,
+                    "details": details,
+                }
+            )
+
+        if min(scores) < 0:
+            break
+        if not dealer_keeps:
+            kyoku += 1
+            if kyoku > 4:
+                round_index, kyoku = round_index + 1, 1
+
+    return scores, events
+
+
+def generate_league(
+    games: int = 1000,
+    players: int = 40,
+    seed: int = 0,
+    start: datetime = datetime(2024, 1, 1, tzinfo=UTC),
+    days: int = 365,
+    simulate_hands: bool = True,
+) -> SyntheticLeague:
+    """
+    Generate a deterministic synthetic league.
+
+    Args:
+        games: Number of finished games
+        players: Size of the player pool
+        seed: Random seed; same arguments always give the same league
+        start: Timestamp of the first game
+        days: Games are spread evenly over this many days
+        simulate_hands: Play games hand by hand and emit hand_events rows
+
+    Returns:
+        SyntheticLeague with table rows and each player's latent skill
+    """
+    if players < 4:
+        raise ValueError("A league needs at least 4 players")
+
+    rng = random.Random(seed)
+    league = SyntheticLeague(seed=seed)
+
+    player_ids = []
+    activity = []
+    for i in range(players):
+        player_id = _uuid(rng)
+        player_ids.append(player_id)
+        activity.append(rng.paretovariate(2.0))
+        league.skills[player_id] = rng.gauss(0, 1)
+        league.players.append({"id": player_id, "display_name": f"Player {i + 1:03d}"})
+
+    spacing = days * 86400 / max(games, 1)
+    for game_index in range(games):
+        game_id = _uuid(rng)
+        started_at = start + timedelta(seconds=int(game_index * spacing))
+        finished_at = started_at + timedelta(minutes=rng.randint(75, 180))
+
+        table = _pick_table(rng, player_ids, activity)
+        skills = [league.skills[player_id] for player_id in table]
+        if simulate_hands:
+            scores, hand_events = _simulate_hanchan(rng, game_id, skills)
+            league.hand_events.extend(hand_events)
+        else:
+            scores = _direct_scores(rng, skills)
+
+        league.games.append(
+            {
+                "id": game_id,
+                "started_at": started_at.isoformat(),
+                "finished_at": finished_at.isoformat(),
+                "status": "finished",
+                "game_format": "hanchan",
+            }
+        )
+        league.game_seats.extend(
+            {
+                "game_id": game_id,
+                "seat": SEATS[seat_index],
+                "player_id": player_id,
+                "final_score": scores[seat_index],
+            }
+            for seat_index, player_id in enumerate(table)
+        )
+
+    return league
@@ -0,0 +1,243 @@
+"""
+Tests for achievement evaluation (rating_engine/achievements.py).
+"""
+
+from datetime import UTC, datetime
+
+import pytest
+
+from rating_engine import events
+from rating_engine.achievements import evaluate_achievements, season_context
+from rating_engine.materialization import (
+    MaterializationConfig,
+    PlayerRating,
+    materialize_data_for_config,
+)
+from tests.test_fake_supabase import CONFIG_DATA, seeded_fake
+
+CONFIG = MaterializationConfig(
+    config_hash="abc123",
+    name="Season 5",
+    start_date="2026-01-01",
+    end_date="2026-06-30",
+    min_games=8,
+)
+SEASON_OVER = datetime(2026, 7, 1, tzinfo=UTC)
+
+
+def rating(player_id: str, display_rating: float, games: int, **kwargs):
+    return PlayerRating(
+        player_id=player_id,
+        mu=25.0,
+        sigma=8.33,
+        display_rating=display_rating,
+        games_played=games,
+        **kwargs,
+    )
+
+
+def codes(grants, player_id: str) -> set[str]:
+    return {grant.code for grant in grants if grant.player_id == player_id}
+
+
+class TestAchievementRules:
+    """Test the built-in rules on in-memory player states."""
+
+    def test_champion_needs_qualification(self):
+        ratings = {
+            "p1": rating("p1", 40.0, 7),
+            "p2": rating("p2", 30.0, 8),
+            "p3": rating("p3", 20.0, 30),
+        }
+
+        context = season_context(CONFIG, ratings, now=SEASON_OVER)
+
+        assert context.champion_id == "p2"
+
+    def test_champion_only_after_season_ends(self):
+        ratings = {"p1": rating("p1", 40.0, 10)}
+
+        during = evaluate_achievements(
+            CONFIG, ratings, now=datetime(2026, 3, 1, tzinfo=UTC)
+        )
+        after = evaluate_achievements(CONFIG, ratings, now=SEASON_OVER)
+
+        assert "regular_season_champion" not in codes(during, "p1")
+        assert "regular_season_champion" in codes(after, "p1")
+
+    def test_streak_and_milestone_thresholds(self):
+        ratings = {
+            "p1": rating(
+                "p1",
+                10.0,
+                50,
+                longest_first_streak=3,
+                longest_fourth_free_streak=9,
+            ),
+            "p2": rating(
+                "p2",
+                9.0,
+                49,
+                longest_first_streak=2,
+                longest_fourth_free_streak=10,
+            ),
+        }
+
+        grants = evaluate_achievements(
+            CONFIG, ratings, now=datetime(2026, 3, 1, tzinfo=UTC)
+        )
+
+        assert codes(grants, "p1") == {"first_place_streak", "games_played_50"}
+        assert codes(grants, "p2") == {"fourth_free_streak"}
+        streak = next(g for g in grants if g.code == "first_place_streak")
+        assert streak.metadata == {"streak": 3, "config_hash": "abc123"}
+
+
+class TestAchievementGrants:
+    """Test granting against the in-memory Supabase."""
+
+    def official_fake(self):
+        fake, config_hash = seeded_fake()
+        fake.tables["rating_configurations"][0]["is_official"] = True
+        fake.seed(
+            {
+                "achievements": [
+                    {"id": f"a-{code}", "code": code}
+                    for code in (
+                        "regular_season_champion",
+                        "first_place_streak",
+                        "fourth_free_streak",
+                        "games_played_50",
+                        "games_played_100",
+                    )
+                ]
+            }
+        )
+        return fake, config_hash
+
+    @pytest.mark.asyncio
+    async def test_unofficial_configs_grant_nothing(self):
+        fake, config_hash = seeded_fake()
+
+        await materialize_data_for_config(fake, config_hash)
+
+        assert fake.tables.get("player_achievements", []) == []
+
+    @pytest.mark.asyncio
+    async def test_grants_from_computed_streaks(self):
+        fake, config_hash = self.official_fake()
+        emitted = []
+
+        await materialize_data_for_config(fake, config_hash, hooks=[emitted.append])
+
+        grants = fake.tables["player_achievements"]
+        ratings = {
+            row["player_id"]: row for row in fake.tables["cached_player_ratings"]
+        }
+        champions = [
+            g for g in grants if g["achievement_id"] == "a-regular_season_champion"
+        ]
+        assert len(champions) == 1
+        assert {g["season_name"] for g in grants} == {"Synthetic"}
+        for grant in grants:
+            if grant["achievement_id"] == "a-first_place_streak":
+                streak = ratings[grant["player_id"]]["longest_first_streak"]
+                assert grant["metadata"]["streak"] == streak >= 3
+        assert any(row["longest_fourth_free_streak"] > 0 for row in ratings.values())
+        event = next(e for e in emitted if e.event == events.ACHIEVEMENTS_GRANTED)
+        assert event.data["grants"] == len(grants)
+        assert fake.call_counts[("player_achievements", "upsert")] == 1
+
+    @pytest.mark.asyncio
+    async def test_rerun_keeps_existing_grants(self):
+        fake, config_hash = self.official_fake()
+
+        await materialize_data_for_config(fake, config_hash)
+        before = [dict(row) for row in fake.tables["player_achievements"]]
+        await materialize_data_for_config(fake, config_hash, force_refresh=True)
+
+        assert fake.tables["player_achievements"] == before
+
+    @pytest.mark.asyncio
+    async def test_superseded_official_config_grants_nothing(self):
+        fake, config_hash = self.official_fake()
+        fake.tables["rating_configurations"][0]["created_at"] = "2026-01-01T00:00:00"
+        fake.seed(
+            {
+                "rating_configurations": [
+                    {
+                        "config_hash": "v2",
+                        "name": "Synthetic",
+                        "config_data": CONFIG_DATA,
+                        "is_official": True,
+                        "created_at": "2026-02-01T00:00:00",
+                    }
+                ]
+            }
+        )
+        emitted = []
+
+        await materialize_data_for_config(fake, config_hash, hooks=[emitted.append])
+
+        assert fake.tables.get("player_achievements", []) == []
+        event = next(e for e in emitted if e.event == events.ACHIEVEMENTS_GRANTED)
+        assert event.data["grants"] == 0
+
+    @pytest.mark.asyncio
+    async def test_manual_grant_survives_rematerialization(self):
+        fake, config_hash = self.official_fake()
+        manual = {
+            "id": "g1",
+            "player_id": "p-manual",
+            "achievement_id": "a-regular_season_champion",
+            "season_name": "Synthetic",
+            "earned_at": "2026-01-01T00:00:00",
+            "granted_by": None,
+            "metadata": {"note": "awarded at the season party"},
+        }
+        fake.seed({"player_achievements": [dict(manual)]})
+
+        await materialize_data_for_config(fake, config_hash)
+        await materialize_data_for_config(fake, config_hash, force_refresh=True)
+
+        assert manual in fake.tables["player_achievements"]
+
+    @pytest.mark.asyncio
+    async def test_current_config_replaces_stale_engine_grants(self):
+        fake, config_hash = self.official_fake()
+        champion = {
+            "season_name": "Synthetic",
+            "achievement_id": "a-regular_season_champion",
+            "earned_at": "2026-01-01T00:00:00",
+        }
+        fake.seed(
+            {
+                "player_achievements": [
+                    {
+                        **champion,
+                        "id": "g1",
+                        "player_id": "p-stale",
+                        "granted_by": None,
+                        "metadata": {"config_hash": "old-hash"},
+                    },
+                    {
+                        **champion,
+                        "id": "g2",
+                        "player_id": "p-admin",
+                        "granted_by": "u1",
+                    },
+                ]
+            }
+        )
+
+        await materialize_data_for_config(fake, config_hash)
+
+        champions = {
+            row["player_id"]: row
+            for row in fake.tables["player_achievements"]
+            if row["achievement_id"] == "a-regular_season_champion"
+        }
+        assert "p-stale" not in champions
+        assert champions.pop("p-admin")["granted_by"] == "u1"
+        [engine_champion] = champions.values()
+        assert engine_champion["metadata"]["config_hash"] == config_hash
@@ -4,7 +4,7 @@ Tests HTTP endpoints with mock dependencies.
 """
 
 import os
-from unittest.mock import MagicMock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 from fastapi.testclient import TestClient
@@ -68,7 +68,11 @@ class TestMaterializationEndpoint:
         # Verify mocks were called
         mock_create_client.assert_called_once()
         mock_materialize.assert_called_once_with(
-            mock_create_client.return_value, "test_hash_123", force_refresh=False
+            mock_create_client.return_value,
+            "test_hash_123",
+            force_refresh=False,
+            validate_scores=False,
+            exclude_mismatched_games=False,
         )
 
     @patch.dict(
@@ -91,9 +95,39 @@ class TestMaterializationEndpoint:
 
         # Verify force_refresh was passed correctly
         mock_materialize.assert_called_once_with(
-            mock_create_client.return_value, "test_hash_123", force_refresh=True
+            mock_create_client.return_value,
+            "test_hash_123",
+            force_refresh=True,
+            validate_scores=False,
+            exclude_mismatched_games=False,
         )
 
+    @patch.dict(
+        os.environ,
+        {"SUPABASE_URL": "https://test.supabase.co", "SUPABASE_SECRET_KEY": "test-key"},
+    )
+    @patch("api.index.create_client")
+    @patch("api.index.materialize_data_for_config")
+    def test_materialize_with_score_validation(
+        self, mock_materialize, mock_create_client
+    ):
+        """Test score validation options and report are passed through."""
+        report = {"games_checked": 10, "mismatched_game_ids": ["g1"]}
+        mock_materialize.return_value = {
+            "status": "materialized",
+            "config_hash": "test_hash_123",
+            "score_reconciliation": report,
+        }
+
+        request_data = {
+            "config_hash": "test_hash_123",
+            "exclude_mismatched_games": True,
+        }
+
+        response = client.post("/materialize", json=request_data)
+        assert response.json()["score_reconciliation"] == report
+        assert mock_materialize.call_args.kwargs["exclude_mismatched_games"] is True
+
     def test_materialize_missing_env_vars(self):
         """Test materialization fails without environment variables."""
         with patch.dict(os.environ, {}, clear=True):
@@ -125,6 +159,178 @@ class TestMaterializationEndpoint:
         assert "Internal server error - check logs" in data["error"]
 
 
+class TestMaterializationStreamEndpoint:
+    """Test streamed materialization progress."""
+
+    config_row = {
+        "config_hash": "test_hash_123",
+        "name": "Test Season",
+        "config_data": {
+            "timeRange": {"startDate": "2024-01-01", "endDate": "2024-12-31"},
+            "rating": {
+                "initialMu": 25.0,
+                "initialSigma": 8.33,
+                "confidenceFactor": 2.0,
+                "decayRate": 0.02,
+            },
+            "scoring": {"oka": 20000, "uma": [10000, 5000, -5000, -10000]},
+            "weights": {"divisor": 40, "min": 0.5, "max": 1.5},
+            "qualification": {"minGames": 8, "dropWorst": 2},
+        },
+    }
+
+    def _mock_supabase(self):
+        mock_supabase = MagicMock()
+        games = [
+            {
+                "id": "game_1",
+                "started_at": "2024-01-15T19:00:00+00:00",
+                "finished_at": None,
+                "status": "finished",
+                "game_seats": [
+                    {"seat": "east", "player_id": "p1", "final_score": 45000},
+                    {"seat": "south", "player_id": "p2", "final_score": 30000},
+                    {"seat": "west", "player_id": "p3", "final_score": 20000},
+                    {"seat": "north", "player_id": "p4", "final_score": 5000},
+                ],
+            }
+        ]
+
+        def table_mock(table_name):
+            table = MagicMock()
+            if table_name == "rating_configurations":
+                table.select.return_value.eq.return_value.execute.return_value.data = [
+                    self.config_row
+                ]
+            elif table_name == "games":
+                (
+                    table.select.return_value.eq.return_value.gte.return_value.lte.return_value.order.return_value.limit.return_value.execute.return_value.data
+                ) = games
+            return table
+
+        mock_supabase.table.side_effect = table_mock
+        return mock_supabase
+
+    @patch.dict(
+        os.environ,
+        {"SUPABASE_URL": "https://test.supabase.co", "SUPABASE_SECRET_KEY": "test-key"},
+    )
+    @patch("api.index.create_client")
+    def test_ndjson_phase_events(self, mock_create_client):
+        """Every phase is reported, in order, before the final result."""
+        import json
+
+        mock_create_client.return_value = self._mock_supabase()
+
+        response = client.post(
+            "/materialize/stream?format=ndjson",
+            json={"config_hash": "test_hash_123", "force_refresh": True},
+        )
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("application/x-ndjson")
+
+        events = [json.loads(line) for line in response.text.splitlines()]
+        assert [e["event"] for e in events] == [
+            "started",
+            "config_loaded",
+            "games_loaded",
+            "hash_computed",
+            "hand_stats_computed",
+            "games_processed",
+            "ratings_computed",
+            "rows_written",
+            "cache_cleared",
+            "completed",
+            "result",
+        ]
+        assert events[2]["games_count"] == 1
+        assert events[5]["processed"] == events[5]["total"] == 1
+        assert events[7]["player_rows"] == 4
+        assert all(e["timestamp"] for e in events[:-1])
+        assert events[-1]["status"] == "materialized"
+
+    @patch.dict(
+        os.environ,
+        {"SUPABASE_URL": "https://test.supabase.co", "SUPABASE_SECRET_KEY": "test-key"},
+    )
+    @patch("api.index.create_client")
+    def test_sse_reports_errors_as_result(self, mock_create_client):
+        mock_supabase = MagicMock()
+        select = mock_supabase.table.return_value.select.return_value
+        select.eq.return_value.execute.return_value.data = []
+        mock_create_client.return_value = mock_supabase
+
+        response = client.post("/materialize/stream", json={"config_hash": "missing"})
+        assert response.headers["content-type"].startswith("text/event-stream")
+
+        body = response.text
+        assert "event: failed" in body
+        assert "event: result" in body
+        assert "Configuration not found: missing" in body
+
+    def test_invalid_format(self):
+        response = client.post(
+            "/materialize/stream?format=xml", json={"config_hash": "abc"}
+        )
+        assert response.status_code == 400
+
+
+class TestBatchMaterializationEndpoint:
+    """Test the batch materialization endpoint."""
+
+    @patch.dict(
+        os.environ,
+        {"SUPABASE_URL": "https://test.supabase.co", "SUPABASE_SECRET_KEY": "test-key"},
+    )
+    @patch("api.index.create_client")
+    @patch("api.index.MaterializationEngine")
+    def test_batch_returns_per_config_results(self, mock_engine, mock_create_client):
+        mock_engine.return_value.materialize_batch = AsyncMock(
+            return_value={
+                "status": "partial",
+                "games_loaded": 10,
+                "load_ms": 12.5,
+                "duration_ms": 40.0,
+                "results": [
+                    {
+                        "status": "materialized",
+                        "config_hash": "hash1",
+                        "players_count": 8,
+                        "games_count": 10,
+                        "duration_ms": 20.0,
+                    },
+                    {
+                        "status": "error",
+                        "config_hash": "hash2",
+                        "error": "Configuration not found: hash2",
+                        "duration_ms": 0.1,
+                    },
+                ],
+            }
+        )
+
+        response = client.post(
+            "/materialize/batch",
+            json={"config_hashes": ["hash1", "hash2"], "force_refresh": True},
+        )
+        assert response.status_code == 200
+        data = response.json()
+
+        assert data["status"] == "partial"
+        assert data["games_loaded"] == 10
+        assert [r["status"] for r in data["results"]] == ["materialized", "error"]
+        mock_engine.return_value.materialize_batch.assert_called_once_with(
+            ["hash1", "hash2"], force_refresh=True
+        )
+
+    def test_batch_missing_env_vars(self):
+        with patch.dict(os.environ, {}, clear=True):
+            response = client.post("/materialize/batch", json={"config_hashes": ["a"]})
+
+            assert response.status_code == 200
+            assert response.json()["status"] == "error"
+
+
 class TestConfigurationsEndpoint:
     """Test the configurations listing endpoint."""
 
@@ -200,6 +406,122 @@ class TestConfigurationsEndpoint:
         assert response.status_code == 500
 
 
+class TestConfigurationRatingsEndpoint:
+    """Test on-demand ratings for custom configurations."""
+
+    configuration = {
+        "timeRange": {
+            "startDate": "2024-01-01",
+            "endDate": "2024-12-31",
+            "name": "Playground",
+        },
+        "rating": {
+            "initialMu": 25.0,
+            "initialSigma": 8.33,
+            "confidenceFactor": 3.0,
+            "decayRate": 0.02,
+        },
+        "scoring": {"oka": 20000, "uma": [10000, 5000, -5000, -10000]},
+        "weights": {"divisor": 40, "min": 0.5, "max": 1.5},
+        "qualification": {"minGames": 8, "dropWorst": 2},
+    }
+
+    games_data = [
+        {
+            "id": "game_1",
+            "started_at": "2024-01-15T19:00:00+00:00",
+            "finished_at": "2024-01-15T22:00:00+00:00",
+            "status": "finished",
+            "game_seats": [
+                {"seat": "east", "player_id": "p1", "final_score": 45000},
+                {"seat": "south", "player_id": "p2", "final_score": 30000},
+                {"seat": "west", "player_id": "p3", "final_score": 20000},
+                {"seat": "north", "player_id": "p4", "final_score": 5000},
+            ],
+        }
+    ]
+
+    def _mock_supabase(self):
+        mock_supabase = MagicMock()
+
+        def table_mock(table_name):
+            table = MagicMock()
+            if table_name == "games":
+                (
+                    table.select.return_value.eq.return_value.gte.return_value.lte.return_value.order.return_value.limit.return_value.execute.return_value.data
+                ) = self.games_data
+            elif table_name == "players":
+                table.select.return_value.in_.return_value.execute.return_value.data = [
+                    {"id": f"p{i}", "display_name": f"Player {i}"} for i in range(1, 5)
+                ]
+            return table
+
+        mock_supabase.table.side_effect = table_mock
+        return mock_supabase
+
+    def setup_method(self):
+        from api.index import configuration_ratings_cache
+
+        configuration_ratings_cache.clear()
+
+    @patch.dict(
+        os.environ,
+        {"SUPABASE_URL": "https://test.supabase.co", "SUPABASE_SECRET_KEY": "test-key"},
+    )
+    @patch("api.index.create_client")
+    def test_calculates_with_posted_configuration(self, mock_create_client):
+        """Ratings come from the engine using the config's confidence factor."""
+        mock_create_client.return_value = self._mock_supabase()
+
+        response = client.post(
+            "/ratings/configuration", json={"configuration": self.configuration}
+        )
+        assert response.status_code == 200
+        data = response.json()
+
+        assert data["seasonName"] == "Playground"
+        assert data["totalGames"] == 1
+        assert data["cacheHit"] is False
+        assert [p["name"] for p in data["players"]] == [
+            "Player 1",
+            "Player 2",
+            "Player 3",
+            "Player 4",
+        ]
+        for player in data["players"]:
+            assert player["rating"] == pytest.approx(
+                player["mu"] - 3.0 * player["sigma"]
+            )
+        assert data["players"][0]["totalPlusMinus"] == 35000
+
+    @patch.dict(
+        os.environ,
+        {"SUPABASE_URL": "https://test.supabase.co", "SUPABASE_SECRET_KEY": "test-key"},
+    )
+    @patch("api.index.create_client")
+    def test_repeated_request_hits_result_cache(self, mock_create_client):
+        """Unchanged source data reuses the cached calculation."""
+        mock_create_client.return_value = self._mock_supabase()
+        body = {"configuration": self.configuration}
+
+        first = client.post("/ratings/configuration", json=body).json()
+        with patch(
+            "rating_engine.materialization.MaterializationEngine._calculate_ratings"
+        ) as mock_calculate:
+            second = client.post("/ratings/configuration", json=body).json()
+            mock_calculate.assert_not_called()
+
+        assert second["cacheHit"] is True
+        assert second["players"] == first["players"]
+
+    def test_invalid_configuration(self):
+        """Incomplete configurations are rejected before touching the database."""
+        response = client.post(
+            "/ratings/configuration", json={"configuration": {"rating": {}}}
+        )
+        assert response.status_code == 400
+
+
 class TestRequestValidation:
     """Test request validation for POST endpoints."""
 
@@ -0,0 +1,310 @@
+"""
+Tests for the in-memory Supabase stand-in, and end-to-end materialization
+against it using synthetic league data.
+"""
+
+import time
+
+import pytest
+
+from rating_engine.materialization import (
+    MaterializationEngine,
+    compute_config_hash,
+    materialize_data_for_config,
+)
+from tests.fake_supabase import FakeAPIError, FakeSupabase
+from tests.synthetic import generate_league
+
+CONFIG_DATA = {
+    "timeRange": {"startDate": "2024-01-01", "endDate": "2024-12-31"},
+    "rating": {
+        "initialMu": 25.0,
+        "initialSigma": 8.33,
+        "confidenceFactor": 2.0,
+        "decayRate": 0.02,
+    },
+    "scoring": {"oka": 20000, "uma": [10000, 5000, -5000, -10000]},
+    "weights": {"divisor": 40, "min": 0.5, "max": 1.5},
+    "qualification": {"minGames": 8, "dropWorst": 2},
+}
+
+
+def seeded_fake(games: int = 120, **kwargs) -> tuple[FakeSupabase, str]:
+    """Fake client holding a synthetic league and one registered config."""
+    config_hash = compute_config_hash(CONFIG_DATA)
+    fake = FakeSupabase(**kwargs)
+    fake.seed(generate_league(games=games, players=12, seed=5, days=300).tables())
+    fake.seed(
+        {
+            "rating_configurations": [
+                {
+                    "config_hash": config_hash,
+                    "name": "Synthetic",
+                    "config_data": CONFIG_DATA,
+                }
+            ]
+        }
+    )
+    return fake, config_hash
+
+
+class TestQueryBuilder:
+    """Test PostgREST query semantics."""
+
+    def setup_method(self):
+        self.fake = FakeSupabase(
+            {
+                "players": [
+                    {"id": "p1", "display_name": "Alice"},
+                    {"id": "p2", "display_name": "Bob"},
+                    {"id": "p3", "display_name": "Cara"},
+                ],
+                "games": [
+                    {"id": "g1", "started_at": "2024-01-01T19:00:00+00:00"},
+                    {"id": "g2", "started_at": "2024-03-01T19:00:00Z"},
+                    {"id": "g3", "started_at": "2024-12-31T19:00:00+00:00"},
+                ],
+                "game_seats": [
+                    {"game_id": "g1", "seat": "east", "player_id": "p1"},
+                    {"game_id": "g1", "seat": "south", "player_id": "p2"},
+                    {"game_id": "g2", "seat": "east", "player_id": "p3"},
+                ],
+            }
+        )
+
+    def test_filters_and_order(self):
+        result = (
+            self.fake.table("players")
+            .select("id")
+            .neq("id", "p2")
+            .order("display_name", desc=True)
+            .execute()
+        )
+        assert result.data == [{"id": "p3"}, {"id": "p1"}]
+
+    def test_date_bounds_compare_as_timestamps(self):
+        """A bare end date means midnight, so the evening game is excluded."""
+        result = (
+            self.fake.table("games")
+            .select("id")
+            .gte("started_at", "2024-01-01")
+            .lte("started_at", "2024-12-31")
+            .execute()
+        )
+        assert [row["id"] for row in result.data] == ["g1", "g2"]
+
+    def test_one_to_many_and_many_to_one_embeds(self):
+        result = (
+            self.fake.table("games")
+            .select("id, game_seats(seat, players!inner(display_name))")
+            .eq("id", "g1")
+            .execute()
+        )
+        assert result.data == [
+            {
+                "id": "g1",
+                "game_seats": [
+                    {"seat": "east", "players": {"display_name": "Alice"}},
+                    {"seat": "south", "players": {"display_name": "Bob"}},
+                ],
+            }
+        ]
+
+    def test_inner_embed_drops_parents_without_children(self):
+        result = self.fake.table("games").select("id, game_seats!inner(seat)").execute()
+        assert [row["id"] for row in result.data] == ["g1", "g2"]
+
+    def test_filters_on_embedded_columns(self):
+        result = (
+            self.fake.table("game_seats")
+            .select("game_id, seat, games!inner(started_at)")
+            .gte("games.started_at", "2024-02-01")
+            .execute()
+        )
+        assert [row["game_id"] for row in result.data] == ["g2"]
+
+    def test_or_filter_with_and_groups(self):
+        """A keyset condition: after (g1, east), in (game_id, seat) order."""
+        result = (
+            self.fake.table("game_seats")
+            .select("game_id, seat")
+            .or_("game_id.gt.g1,and(game_id.eq.g1,seat.gt.east)")
+            .order("game_id")
+            .order("seat")
+            .execute()
+        )
+        assert result.data == [
+            {"game_id": "g1", "seat": "south"},
+            {"game_id": "g2", "seat": "east"},
+        ]
+
+    def test_row_cap_range_and_count(self):
+        fake = FakeSupabase(
+            {"games": [{"id": f"g{i:03d}"} for i in range(25)]}, max_rows=10
+        )
+
+        capped = fake.table("games").select("id", count="exact").execute()
+        page = fake.table("games").select("id").order("id").range(20, 29).execute()
+
+        assert len(capped.data) == 10
+        assert capped.count == 25
+        assert [row["id"] for row in page.data] == [f"g{i:03d}" for i in range(20, 25)]
+
+    def test_insert_upsert_update_delete(self):
+        players = self.fake.table("players")
+        with pytest.raises(FakeAPIError) as error:
+            players.insert({"id": "p1", "display_name": "Dup"}).execute()
+        assert error.value.code == "23505"
+
+        self.fake.table("players").upsert({"id": "p1", "display_name": "Al"}).execute()
+        self.fake.table("players").update({"display_name": "B"}).eq(
+            "id", "p2"
+        ).execute()
+        deleted = self.fake.table("players").delete().in_("id", ["p3"]).execute()
+
+        names = self.fake.table("players").select("display_name").order("id").execute()
+        assert [row["display_name"] for row in names.data] == ["Al", "B"]
+        assert deleted.data == [{"id": "p3", "display_name": "Cara"}]
+
+    def test_unique_constraints_are_enforced_on_upsert(self):
+        results = self.fake.table("cached_game_results")
+        row = {"config_hash": "c", "game_id": "g", "seat": "east", "player_id": "p1"}
+        results.upsert(row).execute()
+
+        with pytest.raises(FakeAPIError) as error:
+            self.fake.table("cached_game_results").upsert(
+                {**row, "player_id": "p2"}
+            ).execute()
+
+        assert error.value.code == "23505"
+        assert self.fake.tables["cached_game_results"] == [row]
+
+    def test_unfiltered_delete_is_rejected(self):
+        with pytest.raises(FakeAPIError):
+            self.fake.table("players").delete().execute()
+
+    def test_single(self):
+        row = self.fake.table("players").select("*").eq("id", "p1").single().execute()
+        assert row.data["display_name"] == "Alice"
+
+        with pytest.raises(FakeAPIError):
+            self.fake.table("players").select("*").single().execute()
+
+    def test_rpc(self):
+        self.fake.register_rpc("count_rows", lambda tables, name: len(tables[name]))
+        assert self.fake.rpc("count_rows", {"name": "games"}).execute().data == 3
+
+
+class TestCallAccounting:
+    """Test round-trip counting and latency injection."""
+
+    def test_counts_calls_by_table_and_operation(self):
+        fake = FakeSupabase({"players": [{"id": "p1"}]})
+        fake.table("players").select("*").execute()
+        fake.table("players").select("*").eq("id", "p1").execute()
+        fake.table("players").delete().eq("id", "p1").execute()
+
+        assert fake.round_trips == 3
+        assert fake.call_counts[("players", "select")] == 2
+        assert fake.calls[1].filters == [("id", "eq", "p1")]
+        assert fake.calls[1].rows == 1
+
+    def test_injected_latency(self):
+        fake = FakeSupabase(latency=lambda call: 0.02 * (call.operation == "select"))
+
+        start = time.perf_counter()
+        fake.table("players").select("*").execute()
+        fake.table("players").insert({"id": "p1"}).execute()
+
+        assert 0.02 <= time.perf_counter() - start < 0.2
+
+
+class TestMaterializationAgainstFake:
+    """End-to-end materialization with real query semantics."""
+
+    @pytest.mark.asyncio
+    async def test_materializes_and_then_hits_cache(self):
+        fake, config_hash = seeded_fake()
+
+        result = await materialize_data_for_config(fake, config_hash)
+        round_trips = fake.call_counts.copy()
+        cached = await materialize_data_for_config(fake, config_hash)
+
+        assert result["status"] == "materialized"
+        assert result["games_count"] == len(fake.tables["games"])
+        assert len(fake.tables["cached_player_ratings"]) == result["players_count"]
+        assert len(fake.tables["cached_game_results"]) == 4 * result["games_count"]
+        assert round_trips[("games", "select")] == 1
+        assert round_trips[("cached_player_ratings", "upsert")] == 1
+        assert cached["status"] == "cache_hit"
+
+    @pytest.mark.asyncio
+    async def test_force_refresh_replaces_cached_rows(self):
+        fake, config_hash = seeded_fake()
+
+        await materialize_data_for_config(fake, config_hash)
+        players = len(fake.tables["cached_player_ratings"])
+        await materialize_data_for_config(fake, config_hash, force_refresh=True)
+
+        assert len(fake.tables["cached_player_ratings"]) == players
+
+    @pytest.mark.asyncio
+    async def test_rematerializes_after_a_seat_swap(self):
+        fake, config_hash = seeded_fake()
+        await materialize_data_for_config(fake, config_hash)
+        game_id = fake.tables["games"][0]["id"]
+        east, south = (
+            seat
+            for seat in fake.tables["game_seats"]
+            if seat["game_id"] == game_id and seat["seat"] in ("east", "south")
+        )
+        east["player_id"], south["player_id"] = south["player_id"], east["player_id"]
+
+        result = await materialize_data_for_config(fake, config_hash)
+
+        assert result["status"] == "materialized"
+        rows = fake.tables["cached_game_results"]
+        assert len(rows) == 4 * len(fake.tables["games"])
+        seats = {
+            row["seat"]: row["player_id"] for row in rows if row["game_id"] == game_id
+        }
+        assert seats["east"] == east["player_id"]
+        assert seats["south"] == south["player_id"]
+
+    @pytest.mark.asyncio
+    async def test_batch_makes_one_game_query(self):
+        fake, config_hash = seeded_fake()
+        engine = MaterializationEngine(fake)
+
+        result = await engine.materialize_batch([config_hash, "missing"])
+
+        assert result["status"] == "partial"
+        assert fake.call_counts[("games", "select")] == 1
+        assert fake.call_counts[("rating_configurations", "select")] == 1
+
+    @pytest.mark.asyncio
+    async def test_batch_pages_games_past_max_rows(self, monkeypatch):
+        monkeypatch.setattr("rating_engine.materialization.GAMES_PAGE_SIZE", 25)
+        fake, config_hash = seeded_fake(max_rows=25)
+        engine = MaterializationEngine(fake)
+
+        result = await engine.materialize_batch([config_hash])
+
+        assert result["games_loaded"] == len(fake.tables["games"]) == 120
+        assert fake.call_counts[("games", "select")] == 120 // 25 + 1
+
+    @pytest.mark.asyncio
+    async def test_current_leaderboard_view_shows_official_ratings(self):
+        fake, config_hash = seeded_fake()
+        await materialize_data_for_config(fake, config_hash)
+        assert fake.table("current_leaderboard").select("*").execute().data == []
+
+        fake.table("rating_configurations").update({"is_official": True}).eq(
+            "config_hash", config_hash
+        ).execute()
+        rows = fake.table("current_leaderboard").select("*").execute().data
+
+        assert len(rows) == len(fake.tables["cached_player_ratings"])
+        ratings = [row["display_rating"] for row in rows]
+        assert ratings == sorted(ratings, reverse=True)
+        assert rows[0]["display_name"].startswith("Player ")
@@ -0,0 +1,242 @@
+"""
+Tests for hand-level rate statistics (rating_engine/hand_statistics.py) and
+their materialization from hand_events.
+"""
+
+import pytest
+
+from rating_engine.hand_statistics import (
+    HandStatistics,
+    aggregate_hand_events,
+    is_deal_in,
+    is_win,
+)
+from rating_engine.materialization import (
+    HAND_EVENTS_PAGE_SIZE,
+    MaterializationEngine,
+    compute_config_hash,
+    materialize_data_for_config,
+)
+from tests.test_fake_supabase import CONFIG_DATA, seeded_fake
+
+SEATS_BY_GAME = {
+    "g1": {
+        "east": {"player_id": "p1"},
+        "south": {"player_id": "p2"},
+        "west": {"player_id": "p3"},
+        "north": {"player_id": "p4"},
+    }
+}
+
+
+def hand(seat, event_type, points_delta, riichi=False, details=None, game="g1"):
+    return {
+        "game_id": game,
+        "hand_seq": 1,
+        "seat": seat,
+        "event_type": event_type,
+        "riichi_declared": riichi,
+        "points_delta": points_delta,
+        "details": details,
+    }
+
+
+class TestWinAndDealIn:
+    """Test win/deal-in detection."""
+
+    def test_uses_winner_and_loser_seats(self):
+        details = {"winnerSeats": ["east"], "loserSeat": "south"}
+
+        assert is_win(hand("east", "ron", 8000, details=details))
+        assert not is_win(hand("south", "ron", -8000, details=details))
+        assert is_deal_in(hand("south", "ron", -8000, details=details))
+        assert not is_deal_in(hand("west", "ron", 0, details=details))
+
+    def test_double_ron_has_two_winners(self):
+        details = {"winnerSeats": ["east", "west"], "loserSeat": "south"}
+
+        assert is_win(hand("east", "ron", 3900, details=details))
+        assert is_win(hand("west", "ron", 2000, details=details))
+
+    def test_falls_back_to_points_delta(self):
+        """Bare rows: only the sign of points_delta, ignoring own riichi bet."""
+        assert is_win(hand("east", "tsumo", 4000))
+        assert not is_win(hand("south", "tsumo", -2000))
+        assert is_deal_in(hand("south", "ron", -3900))
+        assert not is_deal_in(hand("west", "ron", -1000, riichi=True))
+
+    def test_draws_are_neither(self):
+        row = hand("east", "draw", 3000, details={"tenpaiSeats": ["east"]})
+
+        assert not is_win(row)
+        assert not is_deal_in(row)
+
+
+class TestAggregateHandEvents:
+    """Test per-player aggregation."""
+
+    def test_counts_and_rates(self):
+        ron = {"winnerSeats": ["east"], "loserSeat": "south"}
+        rows = [
+            hand("east", "ron", 8000, details=ron),
+            hand("south", "ron", -9000, riichi=True, details=ron),
+            hand("east", "tsumo", 4000, details={"winnerSeats": ["east"]}),
+            hand("south", "tsumo", -2000, details={"winnerSeats": ["east"]}),
+            hand("east", "draw", -1500, riichi=True),
+            hand("south", "draw", 1500),
+            hand("east", "abortive_draw", 0),
+            hand("south", "abortive_draw", 0),
+        ]
+
+        statistics = aggregate_hand_events(rows, SEATS_BY_GAME)
+
+        assert statistics["p1"] == HandStatistics(
+            hands=4, tsumo_wins=1, ron_wins=1, deal_ins=0, riichi_hands=1
+        )
+        assert statistics["p1"].tsumo_rate == 0.25
+        assert statistics["p1"].ron_rate == 0.25
+        assert statistics["p2"].deal_in_rate == 0.25
+        assert statistics["p2"].riichi_rate == 0.25
+
+    def test_ignores_rows_for_other_games(self):
+        rows = [hand("east", "tsumo", 4000), hand("east", "tsumo", 4000, game="g9")]
+
+        statistics = aggregate_hand_events(rows, SEATS_BY_GAME)
+
+        assert statistics["p1"].hands == 1
+
+    def test_adds_pages_to_existing_counts(self):
+        statistics = aggregate_hand_events([hand("east", "draw", 0)], SEATS_BY_GAME)
+        aggregate_hand_events([hand("east", "draw", 0)], SEATS_BY_GAME, statistics)
+
+        assert statistics["p1"].hands == 2
+
+    def test_no_hands_means_no_rates(self):
+        assert HandStatistics().tsumo_rate is None
+        assert HandStatistics().deal_in_rate is None
+
+
+class TestHandStatisticsMaterialization:
+    """Test hand rates end to end against the in-memory Supabase."""
+
+    @pytest.mark.asyncio
+    async def test_rates_are_stored_with_ratings(self):
+        fake, config_hash = seeded_fake()
+        hand_rows = len(fake.tables["hand_events"])
+        assert hand_rows > HAND_EVENTS_PAGE_SIZE
+
+        await materialize_data_for_config(fake, config_hash)
+
+        expected = aggregate_hand_events(
+            fake.tables["hand_events"],
+            {
+                game["id"]: {
+                    seat["seat"]: seat
+                    for seat in fake.tables["game_seats"]
+                    if seat["game_id"] == game["id"]
+                }
+                for game in fake.tables["games"]
+            },
+        )
+        stored = {row["player_id"]: row for row in fake.tables["cached_player_ratings"]}
+        assert set(stored) == set(expected)
+        for player_id, counts in expected.items():
+            assert stored[player_id]["tsumo_rate"] == counts.tsumo_rate
+            assert stored[player_id]["ron_rate"] == counts.ron_rate
+            assert stored[player_id]["riichi_rate"] == counts.riichi_rate
+            assert stored[player_id]["deal_in_rate"] == counts.deal_in_rate
+        assert fake.call_counts[("hand_events", "select")] == (
+            hand_rows // HAND_EVENTS_PAGE_SIZE + 1
+        )
+
+    @pytest.mark.asyncio
+    async def test_games_without_hand_events_have_no_rates(self):
+        fake, config_hash = seeded_fake()
+        fake.tables["hand_events"] = []
+
+        await materialize_data_for_config(fake, config_hash)
+
+        rows = fake.tables["cached_player_ratings"]
+        assert rows
+        assert all(row["tsumo_rate"] is None for row in rows)
+        assert fake.call_counts[("hand_events", "select")] == 1
+
+    @pytest.mark.asyncio
+    async def test_batch_reads_hand_events_once(self):
+        fake, config_hash = seeded_fake()
+        spring = {
+            **CONFIG_DATA,
+            "timeRange": {"startDate": "2024-03-01", "endDate": "2024-06-30"},
+        }
+        spring_hash = compute_config_hash(spring)
+        fake.seed(
+            {
+                "rating_configurations": [
+                    {
+                        "config_hash": spring_hash,
+                        "name": "Spring",
+                        "config_data": spring,
+                    }
+                ]
+            }
+        )
+        hand_rows = len(fake.tables["hand_events"])
+
+        result = await MaterializationEngine(fake).materialize_batch(
+            [config_hash, spring_hash]
+        )
+
+        assert result["status"] == "completed"
+        assert fake.call_counts[("hand_events", "select")] == (
+            hand_rows // HAND_EVENTS_PAGE_SIZE + 1
+        )
+        batch = {
+            (row["config_hash"], row["player_id"]): row["deal_in_rate"]
+            for row in fake.tables["cached_player_ratings"]
+        }
+        for alone in (config_hash, spring_hash):
+            await materialize_data_for_config(fake, alone, force_refresh=True)
+        assert batch == {
+            (row["config_hash"], row["player_id"]): row["deal_in_rate"]
+            for row in fake.tables["cached_player_ratings"]
+        }
+
+    @pytest.mark.asyncio
+    async def test_keyset_pages_past_max_rows(self, monkeypatch):
+        fake, config_hash = seeded_fake()
+        await materialize_data_for_config(fake, config_hash)
+        expected = {
+            row["player_id"]: row["tsumo_rate"]
+            for row in fake.tables["cached_player_ratings"]
+        }
+        monkeypatch.setattr("rating_engine.materialization.HAND_EVENTS_PAGE_SIZE", 97)
+        monkeypatch.setattr("rating_engine.materialization.GAMES_PAGE_SIZE", 97)
+        fake, config_hash = seeded_fake(max_rows=97)
+
+        await materialize_data_for_config(fake, config_hash)
+
+        stored = {
+            row["player_id"]: row["tsumo_rate"]
+            for row in fake.tables["cached_player_ratings"]
+        }
+        assert stored == expected
+        assert fake.call_counts[("hand_events", "select")] == (
+            len(fake.tables["hand_events"]) // 97 + 1
+        )
+
+    def test_reads_hands_of_finished_games_only(self):
+        fake, _ = seeded_fake()
+        unfinished = fake.tables["games"][0]
+        unfinished["status"] = "ongoing"
+        engine = MaterializationEngine(fake)
+
+        pages = engine._iter_hand_event_pages(
+            "2024-01-01", "2024-12-31", "game_id, hand_seq, seat"
+        )
+        rows = [row for page in pages for row in page]
+
+        assert rows
+        assert unfinished["id"] not in {row["game_id"] for row in rows}
+        keys = [(row["game_id"], row["hand_seq"], row["seat"]) for row in rows]
+        assert keys == sorted(keys)
+        assert len(set(keys)) == len(keys)
@@ -0,0 +1,101 @@
+"""
+Tests for head-to-head records (rating_engine/head_to_head.py).
+"""
+
+from datetime import UTC, datetime
+
+import pytest
+
+from rating_engine.head_to_head import HeadToHead
+from rating_engine.materialization import materialize_data_for_config
+from tests.test_fake_supabase import seeded_fake
+
+PLAYED_AT = datetime(2024, 3, 1, tzinfo=UTC)
+
+
+def results(*rows: tuple[str, int, int]) -> list[dict]:
+    return [
+        {"player_id": player_id, "placement": placement, "plus_minus": plus_minus}
+        for player_id, placement, plus_minus in rows
+    ]
+
+
+class TestHeadToHead:
+    """Test pairwise accumulation."""
+
+    def test_pairs_are_keyed_in_id_order(self):
+        h2h = HeadToHead()
+        h2h.add_game(
+            PLAYED_AT,
+            results(("d", 1, 40), ("b", 2, 5), ("c", 3, -15), ("a", 4, -30)),
+        )
+
+        assert len(h2h) == 6
+        assert all(a < b for a, b in h2h.pairs)
+        record = h2h.pairs[("a", "d")]
+        assert record.a_finished_above == 0
+        assert record.b_finished_above == 1
+        assert record.plus_minus_diff == -70
+        assert record.avg_placement_diff == 3
+
+    def test_accumulates_over_games(self):
+        h2h = HeadToHead()
+        h2h.add_game(PLAYED_AT, results(("a", 1, 30), ("b", 4, -30)))
+        later = datetime(2024, 3, 8, tzinfo=UTC)
+        h2h.add_game(later, results(("a", 3, -10), ("b", 2, 10)))
+
+        [row] = h2h.records("cfg")
+        assert row == {
+            "config_hash": "cfg",
+            "player_a": "a",
+            "player_b": "b",
+            "games_together": 2,
+            "a_finished_above": 1,
+            "b_finished_above": 1,
+            "avg_placement_diff": -1,
+            "plus_minus_diff": 40,
+            "last_played_at": later.isoformat(),
+        }
+
+
+class TestHeadToHeadMaterialization:
+    """Test the head-to-head table against the in-memory Supabase."""
+
+    @pytest.mark.asyncio
+    async def test_rows_match_game_results(self):
+        fake, config_hash = seeded_fake()
+
+        await materialize_data_for_config(fake, config_hash)
+
+        by_game: dict[str, dict[str, dict]] = {}
+        for row in fake.tables["cached_game_results"]:
+            by_game.setdefault(row["game_id"], {})[row["player_id"]] = row
+        rows = fake.tables["cached_head_to_head"]
+        assert rows
+        assert sum(row["games_together"] for row in rows) == 6 * len(by_game)
+
+        row = max(rows, key=lambda r: r["games_together"])
+        shared = [
+            game
+            for game in by_game.values()
+            if row["player_a"] in game and row["player_b"] in game
+        ]
+        a_rows = [game[row["player_a"]] for game in shared]
+        b_rows = [game[row["player_b"]] for game in shared]
+        assert row["games_together"] == len(shared)
+        assert row["a_finished_above"] == sum(
+            a["placement"] < b["placement"] for a, b in zip(a_rows, b_rows, strict=True)
+        )
+        assert row["plus_minus_diff"] == sum(r["plus_minus"] for r in a_rows) - sum(
+            r["plus_minus"] for r in b_rows
+        )
+
+    @pytest.mark.asyncio
+    async def test_force_refresh_replaces_rows(self):
+        fake, config_hash = seeded_fake()
+
+        await materialize_data_for_config(fake, config_hash)
+        count = len(fake.tables["cached_head_to_head"])
+        await materialize_data_for_config(fake, config_hash, force_refresh=True)
+
+        assert len(fake.tables["cached_head_to_head"]) == count
@@ -127,7 +127,7 @@ class TestDatabaseIntegration:
             elif table_name == "games":
                 # Mock game data query
                 (
-                    table.select.return_value.eq.return_value.gte.return_value.lte.return_value.execute.return_value.data
+                    table.select.return_value.eq.return_value.gte.return_value.lte.return_value.order.return_value.limit.return_value.execute.return_value.data
                 ) = self.mock_games_data
 
             elif table_name == "cached_player_ratings":
@@ -175,6 +175,66 @@ class TestDatabaseIntegration:
         self.mock_supabase.table.assert_any_call("cached_player_ratings")
         self.mock_supabase.table.assert_any_call("cached_game_results")
 
+    @pytest.mark.asyncio
+    async def test_batch_materialization_shares_game_load(self):
+        """Batch mode loads games once and slices them per configuration."""
+        late_config = {
+            **self.mock_config_data,
+            "config_hash": "late_january_hash",
+            "name": "Late January",
+            "config_data": {
+                **self.mock_config_data["config_data"],
+                "timeRange": {
+                    "startDate": "2024-01-20",
+                    "endDate": "2024-01-31",
+                    "name": "Late January",
+                },
+            },
+        }
+
+        tables: dict[str, MagicMock] = {}
+
+        def table_mock(table_name):
+            if table_name in tables:
+                return tables[table_name]
+            table = MagicMock()
+            if table_name == "rating_configurations":
+                table.select.return_value.in_.return_value.execute.return_value.data = [
+                    self.mock_config_data,
+                    late_config,
+                ]
+            elif table_name == "games":
+                (
+                    table.select.return_value.eq.return_value.gte.return_value.lte.return_value.order.return_value.limit.return_value.execute.return_value.data
+                ) = self.mock_games_data
+            elif table_name == "cached_player_ratings":
+                (
+                    table.select.return_value.eq.return_value.limit.return_value.execute.return_value.data
+                ) = []
+            tables[table_name] = table
+            return table
+
+        self.mock_supabase.table.side_effect = table_mock
+
+        result = await self.engine.materialize_batch(
+            ["season3_official_hash", "late_january_hash", "missing_hash"]
+        )
+
+        assert result["status"] == "partial"
+        assert result["games_loaded"] == 2
+        by_hash = {r["config_hash"]: r for r in result["results"]}
+        assert by_hash["season3_official_hash"]["games_count"] == 2
+        assert by_hash["late_january_hash"]["games_count"] == 1
+        assert by_hash["missing_hash"]["status"] == "error"
+        assert all("duration_ms" in r for r in result["results"])
+
+        # One games query for the union range, not one per configuration
+        games_select = tables["games"].select.return_value.eq.return_value
+        games_select.gte.assert_called_once_with("started_at", "2022-02-16")
+        games_select.gte.return_value.lte.assert_called_once_with(
+            "started_at", "2025-07-22"
+        )
+
     @pytest.mark.asyncio
     async def test_cache_hit_scenario(self):
         """Test behavior when valid cache exists."""
@@ -187,7 +247,7 @@ class TestDatabaseIntegration:
         # Setup games table
         games_table = MagicMock()
         (
-            games_table.select.return_value.eq.return_value.gte.return_value.lte.return_value.execute.return_value.data
+            games_table.select.return_value.eq.return_value.gte.return_value.lte.return_value.order.return_value.limit.return_value.execute.return_value.data
         ) = self.mock_games_data
 
         # Setup cache table to return matching hash
@@ -250,7 +310,7 @@ class TestDatabaseIntegration:
 
         games_table = MagicMock()
         (
-            games_table.select.return_value.eq.return_value.gte.return_value.lte.return_value.execute.return_value.data
+            games_table.select.return_value.eq.return_value.gte.return_value.lte.return_value.order.return_value.limit.return_value.execute.return_value.data
         ) = incomplete_games
 
         cache_table = MagicMock()
@@ -0,0 +1,136 @@
+"""
+Tests for legacy CSV parsing and the offline rating pipeline.
+"""
+
+import csv
+
+import pytest
+
+from rating_engine.legacy_csv import read_legacy_games
+from rating_engine.materialization import (
+    MaterializationConfig,
+    compute_config_hash,
+    materialize_data_for_config,
+    materialize_games_offline,
+)
+from scripts.materialize_data import load_config_file, run_offline
+from scripts.migrate_legacy_data import SupabaseLegacyDataMigrator
+from tests.fake_supabase import FakeSupabase
+from tests.test_fake_supabase import CONFIG_DATA
+from tests.test_migrate_legacy_data import write_legacy_csv
+
+
+@pytest.fixture
+def legacy_csv(tmp_path):
+    return write_legacy_csv(tmp_path / "legacy_logs.csv")
+
+
+class TestReadLegacyGames:
+    """Test parsing into GameData."""
+
+    def test_ids_match_the_database_import(self, legacy_csv):
+        fake = FakeSupabase()
+        migrator = SupabaseLegacyDataMigrator()
+        migrator.supabase = fake
+        migrator.migrate_csv_data_bulk(legacy_csv)
+
+        log = read_legacy_games(legacy_csv)
+
+        assert {g.game_id for g in log.games} == {
+            row["id"] for row in fake.tables["games"]
+        }
+        assert log.player_names == {
+            row["id"]: row["display_name"] for row in fake.tables["players"]
+        }
+        assert [g.started_at for g in log.games] == sorted(
+            g.started_at for g in log.games
+        )
+
+    def test_blank_rows_are_skipped(self, legacy_csv):
+        with open(legacy_csv, "a", newline="") as file:
+            file.write(",,,,,,,,,\n")
+
+        assert len(read_legacy_games(legacy_csv).games) == 30
+
+    def test_bad_score_names_the_line(self, legacy_csv):
+        with open(legacy_csv, newline="") as file:
+            rows = list(csv.DictReader(file))
+        rows[4]["West points"] = "n/a"
+        with open(legacy_csv, "w", newline="") as file:
+            writer = csv.DictWriter(file, fieldnames=list(rows[0]))
+            writer.writeheader()
+            writer.writerows(rows)
+
+        with pytest.raises(ValueError, match=r"legacy_logs.csv:6"):
+            read_legacy_games(legacy_csv)
+
+
+class TestOfflinePipeline:
+    """Test offline ratings against a database materialization."""
+
+    @pytest.mark.asyncio
+    async def test_matches_database_materialization(self, legacy_csv):
+        config_data = {
+            **CONFIG_DATA,
+            "timeRange": {"startDate": "2023-01-01", "endDate": "2023-12-31"},
+        }
+        config_hash = compute_config_hash(config_data)
+        fake = FakeSupabase(
+            {
+                "rating_configurations": [
+                    {
+                        "config_hash": config_hash,
+                        "name": "Legacy",
+                        "config_data": config_data,
+                    }
+                ]
+            }
+        )
+        migrator = SupabaseLegacyDataMigrator()
+        migrator.supabase = fake
+        migrator.migrate_csv_data_bulk(legacy_csv)
+        await materialize_data_for_config(fake, config_hash)
+
+        config = MaterializationConfig.from_config_data(
+            config_hash, "Legacy", config_data
+        )
+        results = await materialize_games_offline(
+            config, read_legacy_games(legacy_csv).games
+        )
+
+        database = {
+            row["player_id"]: row for row in fake.tables["cached_player_ratings"]
+        }
+        offline = {row["player_id"]: row for row in results["player_ratings"]}
+        assert offline.keys() == database.keys()
+        for player_id, row in offline.items():
+            assert row["mu"] == pytest.approx(database[player_id]["mu"])
+            assert row["sigma"] == pytest.approx(database[player_id]["sigma"])
+            assert row["qualified_rank"] == database[player_id]["qualified_rank"]
+        assert len(results["game_results"]) == 4 * 30
+
+    def test_run_offline_writes_csv(self, legacy_csv, tmp_path):
+        config_path = tmp_path / "season.yaml"
+        config_path.write_text(
+            "name: Legacy\n"
+            "timeRange: {startDate: '2023-01-01', endDate: '2023-12-31'}\n"
+            "rating: {initialMu: 25.0, initialSigma: 8.33, confidenceFactor: 2.0,"
+            " decayRate: 0.02}\n"
+            "scoring: {oka: 20000, uma: [10000, 5000, -5000, -10000]}\n"
+            "weights: {divisor: 40, min: 0.5, max: 1.5}\n"
+            "qualification: {minGames: 8, dropWorst: 2}\n"
+        )
+
+        written = run_offline(legacy_csv, config_path, tmp_path / "out", "csv")
+
+        with open(written["player_ratings"], newline="") as file:
+            ratings = list(csv.DictReader(file))
+        assert written["game_results"].suffix == ".csv"
+        assert {row["display_name"] for row in ratings} == {
+            "Alice",
+            "Bob",
+            "Cara",
+            "Dan",
+            "Eve",
+        }
+        assert ratings[0]["config_hash"] == load_config_file(config_path).config_hash
@@ -0,0 +1,172 @@
+"""
+Tests for table matchmaking and the /matchmaking endpoint.
+"""
+
+import os
+import random
+import time
+from itertools import combinations
+from unittest.mock import patch
+
+import pytest
+from fastapi.testclient import TestClient
+
+from api.index import app
+from rating_engine.matchmaking import (
+    Attendee,
+    _table_cost_function,
+    assign_tables,
+)
+from rating_engine.materialization import materialize_data_for_config
+from tests.test_fake_supabase import seeded_fake
+
+client = TestClient(app)
+
+
+def attendees(count: int, seed: int = 0) -> list[Attendee]:
+    rng = random.Random(seed)
+    return [
+        Attendee(f"p{i}", rng.uniform(15, 35), rng.uniform(2, 8)) for i in range(count)
+    ]
+
+
+def brute_force_cost(players: list[Attendee], objective: str) -> float:
+    """Cheapest split by enumerating every partition into tables of four."""
+    cost = _table_cost_function(players, objective)
+
+    def best(remaining: tuple[int, ...]) -> float:
+        if not remaining:
+            return 0.0
+        anchor, rest = remaining[0], remaining[1:]
+        return min(
+            cost((anchor, *others)) + best(tuple(i for i in rest if i not in others))
+            for others in combinations(rest, 3)
+        )
+
+    return best(tuple(range(len(players))))
+
+
+class TestAssignTables:
+    """Test the table search."""
+
+    @pytest.mark.parametrize("objective", ["balance", "competitive"])
+    def test_exact_search_finds_the_optimum(self, objective):
+        players = attendees(12, seed=4)
+
+        assignment = assign_tables(players, objective)
+
+        assert assignment.exact
+        assert assignment.cost == pytest.approx(brute_force_cost(players, objective))
+        seated = [a.player_id for table in assignment.tables for a in table]
+        assert sorted(seated) == sorted(a.player_id for a in players)
+
+    def test_competitive_groups_similar_players(self):
+        players = [Attendee(f"p{i}", mu, 3.0) for i, mu in enumerate([10, 40] * 4)]
+
+        assignment = assign_tables(players, "competitive")
+
+        assert sorted({a.mu for a in table} for table in assignment.tables) == [
+            {10},
+            {40},
+        ]
+
+    @pytest.mark.parametrize("objective", ["balance", "competitive"])
+    def test_twenty_attendees_within_budget(self, objective):
+        players = attendees(20, seed=1)
+
+        started = time.perf_counter()
+        assignment = assign_tables(players, objective)
+        elapsed = time.perf_counter() - started
+
+        assert not assignment.exact
+        assert len(assignment.tables) == 5
+        assert elapsed < 0.1
+        if objective == "balance":
+            sums = [sum(a.mu for a in table) for table in assignment.tables]
+            assert max(sums) - min(sums) < 2.0
+
+    def test_last_arrivals_sit_out(self):
+        players = attendees(10)
+
+        assignment = assign_tables(players)
+
+        assert assignment.sitting_out == players[8:]
+        assert len(assignment.tables) == 2
+
+    def test_rejects_bad_input(self):
+        with pytest.raises(ValueError, match="at least 4"):
+            assign_tables(attendees(3))
+        with pytest.raises(ValueError, match="Unknown objective"):
+            assign_tables(attendees(4), "random")
+
+
+class TestMatchmakingEndpoint:
+    """Test POST /matchmaking against materialized ratings."""
+
+    @pytest.fixture
+    async def materialized(self):
+        fake, config_hash = seeded_fake(games=30)
+        await materialize_data_for_config(fake, config_hash)
+        return fake, config_hash
+
+    def post(self, fake, payload):
+        with (
+            patch.dict(
+                os.environ,
+                {
+                    "SUPABASE_URL": "https://test.supabase.co",
+                    "SUPABASE_SECRET_KEY": "k",
+                },
+            ),
+            patch("api.index.create_client", return_value=fake),
+        ):
+            return client.post("/matchmaking", json=payload)
+
+    def test_assigns_tables_from_cached_ratings(self, materialized):
+        fake, config_hash = materialized
+        player_ids = [row["id"] for row in fake.tables["players"]][:8]
+        fake.tables["players"].append({"id": "newcomer", "display_name": "New"})
+
+        response = self.post(
+            fake,
+            {
+                "config_hash": config_hash,
+                "player_ids": [*player_ids, "newcomer"],
+                "objective": "competitive",
+            },
+        )
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["exact"] is True
+        assert data["sittingOut"] == [{"id": "newcomer", "name": "New"}]
+        assert len(data["tables"]) == 2
+        cached = {
+            row["player_id"]: row["mu"] for row in fake.tables["cached_player_ratings"]
+        }
+        for table in data["tables"]:
+            assert sum(p["winProbability"] for p in table["players"]) == pytest.approx(
+                1.0
+            )
+            for player in table["players"]:
+                assert player["mu"] == pytest.approx(cached[player["id"]])
+
+    def test_validation_errors(self, materialized):
+        fake, config_hash = materialized
+        player_ids = [row["id"] for row in fake.tables["players"]][:4]
+
+        duplicate = self.post(
+            fake, {"config_hash": config_hash, "player_ids": player_ids * 2}
+        )
+        unknown = self.post(
+            fake,
+            {"config_hash": config_hash, "player_ids": [*player_ids[:3], "ghost"]},
+        )
+        missing_config = self.post(
+            fake, {"config_hash": "nope", "player_ids": player_ids}
+        )
+
+        assert duplicate.status_code == 400
+        assert unknown.status_code == 400
+        assert "ghost" in unknown.json()["detail"]
+        assert missing_config.status_code == 404
@@ -27,6 +27,7 @@ Why Mocks? Tests should be:
 Real database testing happens during deployment verification.
 """
 
+from dataclasses import replace
 from datetime import UTC, datetime
 from unittest.mock import MagicMock
 
@@ -34,10 +35,13 @@ import pytest
 
 from rating_engine.materialization import (
     GameData,
+    GameResultSink,
     MaterializationConfig,
     MaterializationEngine,
     PlayerRating,
+    compute_config_hash,
 )
+from tests.fake_supabase import FakeSupabase
 
 
 class TestMaterializationConfig:
@@ -97,6 +101,45 @@ class TestMaterializationConfig:
             )
 
 
+class TestConfigHashing:
+    """Test canonical configuration hashing."""
+
+    config_data = {
+        "timeRange": {"startDate": "2024-01-01", "endDate": "2024-12-31"},
+        "rating": {
+            "initialMu": 25.0,
+            "initialSigma": 8.33,
+            "confidenceFactor": 2.0,
+            "decayRate": 0.02,
+        },
+        "scoring": {"oka": 20000, "uma": [10000, 5000, -5000, -10000]},
+        "weights": {"divisor": 40, "min": 0.5, "max": 1.5},
+        "qualification": {"minGames": 8, "dropWorst": 2},
+    }
+
+    def test_hash_ignores_metadata(self):
+        """Metadata like name and description must not change the hash."""
+        with_metadata = {**self.config_data, "name": "Season X", "isOfficial": True}
+        assert compute_config_hash(with_metadata) == compute_config_hash(
+            self.config_data
+        )
+
+    def test_hash_changes_with_parameters(self):
+        changed = {
+            **self.config_data,
+            "scoring": {"oka": 0, "uma": [15000, 5000, -5000, -15000]},
+        }
+        assert compute_config_hash(changed) != compute_config_hash(self.config_data)
+
+    def test_from_config_data(self):
+        config = MaterializationConfig.from_config_data(
+            "hash", "Season X", self.config_data
+        )
+        assert config.start_date == "2024-01-01"
+        assert config.confidence_factor == 2.0
+        assert config.drop_worst == 2
+
+
 class TestWeightCalculation:
     """Test weight calculation logic."""
 
@@ -352,6 +395,254 @@ class TestEdgeCases:
         assert len(player_ratings) == 4  # Verify ratings dict is populated
 
 
+class TestProgressHooks:
+    """Test progress events emitted to engine hooks."""
+
+    def setup_method(self):
+        self.config = MaterializationConfig(
+            config_hash="test",
+            name="test",
+            start_date="2024-01-01",
+            end_date="2024-12-31",
+        )
+        self.games = [
+            GameData(
+                game_id=f"game_{i}",
+                started_at=datetime(2024, 1, i + 1, 19, 0, 0, tzinfo=UTC),
+                finished_at=None,
+                status="finished",
+                seats={
+                    "east": {"player_id": "p1", "final_score": 40000},
+                    "south": {"player_id": "p2", "final_score": 30000},
+                    "west": {"player_id": "p3", "final_score": 20000},
+                    "north": {"player_id": "p4", "final_score": 10000},
+                },
+            )
+            for i in range(5)
+        ]
+
+    @pytest.mark.asyncio
+    async def test_games_processed_at_intervals(self):
+        received = []
+        engine = MaterializationEngine(
+            MagicMock(), hooks=[received.append], progress_interval=2
+        )
+
+        await engine._calculate_ratings(self.config, self.games)
+
+        progress = [(e.data["processed"], e.data["total"]) for e in received]
+        assert progress == [(2, 5), (4, 5), (5, 5)]
+
+    @pytest.mark.asyncio
+    async def test_failing_hook_does_not_break_calculation(self):
+        def broken_hook(event):
+            raise RuntimeError("hook failure")
+
+        engine = MaterializationEngine(MagicMock(), hooks=[broken_hook])
+        player_ratings, game_results = await engine._calculate_ratings(
+            self.config, self.games
+        )
+
+        assert len(player_ratings) == 4
+        assert len(game_results) == 20
+
+
+class TestGameResultStreaming:
+    """Test chunked game result writes during the rating pass."""
+
+    def setup_method(self):
+        self.config = MaterializationConfig(
+            config_hash="test",
+            name="test",
+            start_date="2024-01-01",
+            end_date="2024-12-31",
+        )
+        self.games = [
+            GameData(
+                game_id=f"game_{i}",
+                started_at=datetime(2024, 1 + i // 28, i % 28 + 1, 19, tzinfo=UTC),
+                finished_at=None,
+                status="finished",
+                seats={
+                    seat: {"player_id": f"p{(i + n) % 6}", "final_score": score}
+                    for n, (seat, score) in enumerate(
+                        [
+                            ("east", 40000),
+                            ("south", 30000),
+                            ("west", 20000),
+                            ("north", 10000),
+                        ]
+                    )
+                },
+            )
+            for i in range(30)
+        ]
+
+    def test_sink_flushes_full_chunks(self):
+        fake = FakeSupabase()
+        sink = GameResultSink(fake, chunk_size=4)
+
+        for i in range(10):
+            sink.append(
+                {
+                    "config_hash": "test",
+                    "game_id": f"g{i}",
+                    "seat": "east",
+                    "player_id": "p",
+                }
+            )
+        flushed = len(fake.tables["cached_game_results"])
+        sink.flush()
+
+        assert flushed == 8
+        assert sink.rows_written == len(sink) == 10
+        assert (
+            sink.chunks_written
+            == fake.call_counts[("cached_game_results", "upsert")]
+            == 3
+        )
+        assert {r["computed_at"] for r in fake.tables["cached_game_results"]} == {
+            sink.computed_at
+        }
+
+    def test_sink_replaces_a_corrected_seating_across_chunks(self):
+        def row(seat, player_id, computed_at=None):
+            return {
+                "config_hash": "test",
+                "game_id": "g1",
+                "seat": seat,
+                "player_id": player_id,
+                "computed_at": computed_at,
+            }
+
+        old = "2024-01-01T00:00:00+00:00"
+        fake = FakeSupabase(
+            {
+                "cached_game_results": [
+                    row("east", "p1", old),
+                    row("south", "p2", old),
+                    row("west", "p3", old),
+                    row("north", "p4", old),
+                ]
+            }
+        )
+        sink = GameResultSink(fake, chunk_size=2)
+
+        # p1 and p2 swapped, p3 replaced by p5; the game spans two chunks
+        for seat, player_id in [
+            ("east", "p2"),
+            ("south", "p1"),
+            ("west", "p5"),
+            ("north", "p4"),
+        ]:
+            sink.append(row(seat, player_id))
+        sink.flush()
+
+        seating = {
+            r["seat"]: r["player_id"] for r in fake.tables["cached_game_results"]
+        }
+        assert seating == {"east": "p2", "south": "p1", "west": "p5", "north": "p4"}
+        assert len(fake.tables["cached_game_results"]) == 4
+
+    @pytest.mark.asyncio
+    async def test_rows_are_written_during_the_pass(self):
+        fake = FakeSupabase()
+        sink = GameResultSink(fake, chunk_size=16)
+        engine = MaterializationEngine(fake)
+
+        _, game_results = await engine._calculate_ratings(self.config, self.games, sink)
+
+        assert game_results is sink
+        assert sink.rows_written == 112  # 7 full chunks of the 120 rows
+        sink.flush()
+        assert len(fake.tables["cached_game_results"]) == 120
+
+    @pytest.mark.asyncio
+    async def test_materialization_replaces_stale_rows_after_writing(self):
+        fake = FakeSupabase(
+            {
+                "cached_game_results": [
+                    {
+                        "config_hash": "test",
+                        "game_id": "stale",
+                        "player_id": "p1",
+                        "computed_at": "2024-01-01T00:00:00+00:00",
+                    }
+                ]
+            }
+        )
+        received = []
+        engine = MaterializationEngine(
+            fake, hooks=[received.append], game_results_chunk_size=50
+        )
+
+        await engine._materialize_games(self.config, self.games, force_refresh=True)
+
+        rows = fake.tables["cached_game_results"]
+        assert len(rows) == 120
+        assert "stale" not in {row["game_id"] for row in rows}
+        written = next(e for e in received if e.event == "rows_written")
+        assert written.data["game_rows"] == 120
+        assert written.data["game_chunks"] == 3
+        order = [e.event for e in received]
+        assert order.index("cache_cleared") > order.index("rows_written")
+
+    @pytest.mark.asyncio
+    async def test_failed_pass_keeps_the_previous_cache(self):
+        fake = FakeSupabase()
+        engine = MaterializationEngine(fake, game_results_chunk_size=50)
+        await engine._materialize_games(self.config, self.games, force_refresh=True)
+        ratings = [dict(row) for row in fake.tables["cached_player_ratings"]]
+
+        def fail_after_one_chunk(call):
+            chunks = fake.call_counts[("cached_game_results", "upsert")]
+            if call.table == "cached_game_results" and chunks >= 1:
+                raise RuntimeError("connection lost")
+            return 0.0
+
+        fake.reset_calls()
+        fake.latency = fail_after_one_chunk
+        changed = [
+            replace(game, seats={**game.seats, "east": {**game.seats["east"]}})
+            for game in self.games
+        ]
+        changed[0].seats["east"]["final_score"] += 100
+        with pytest.raises(RuntimeError):
+            await engine._materialize_games(self.config, changed, force_refresh=True)
+
+        assert fake.tables["cached_player_ratings"] == ratings
+        assert len(fake.tables["cached_game_results"]) == 120
+        fake.latency = 0.0
+        assert not await engine._is_cache_valid(
+            "test", engine._calculate_source_data_hash(changed)
+        )
+
+    def test_source_hash_matches_whole_document_hash(self):
+        """Streaming the hash must not invalidate existing caches."""
+        import hashlib
+        import json
+
+        document = json.dumps(
+            [
+                {
+                    "id": game.game_id,
+                    "started_at": game.started_at.isoformat(),
+                    "seats": game.seats,
+                }
+                for game in self.games
+            ],
+            sort_keys=True,
+        )
+        engine = MaterializationEngine(MagicMock())
+
+        assert engine._calculate_source_data_hash(self.games) == (
+            hashlib.sha256(document.encode()).hexdigest()
+        )
+        assert engine._calculate_source_data_hash([]) == (
+            hashlib.sha256(b"[]").hexdigest()
+        )
+
+
 class TestIntegrationWithMockSupabase:
     """Integration tests with mock Supabase client."""
 
@@ -0,0 +1,140 @@
+"""
+Tests for Prometheus metrics collection and the /metrics endpoint.
+"""
+
+from unittest.mock import MagicMock
+
+import pytest
+from fastapi.testclient import TestClient
+
+from api.index import app
+from rating_engine import events, metrics
+from rating_engine.events import MaterializationEvent
+from rating_engine.metrics import MetricsRegistry, instrument_client
+
+
+@pytest.fixture(autouse=True)
+def clear_registry():
+    metrics.REGISTRY.clear()
+    yield
+    metrics.REGISTRY.clear()
+
+
+class TestRegistry:
+    """Test metric types and text exposition format."""
+
+    def test_counter_render(self):
+        registry = MetricsRegistry()
+        counter = registry.counter("jobs_total", "Jobs run", ["status"])
+        counter.inc(status="ok")
+        counter.inc(2, status="ok")
+
+        assert registry.render() == (
+            "# HELP jobs_total Jobs run\n"
+            "# TYPE jobs_total counter\n"
+            'jobs_total{status="ok"} 3.0\n'
+        )
+
+    def test_histogram_buckets_are_cumulative(self):
+        registry = MetricsRegistry()
+        histogram = registry.histogram("latency_seconds", "Latency", buckets=(0.1, 1))
+        for value in (0.05, 0.5, 5):
+            histogram.observe(value)
+
+        text = registry.render()
+        assert 'latency_seconds_bucket{le="0.1"} 1' in text
+        assert 'latency_seconds_bucket{le="1.0"} 2' in text
+        assert 'latency_seconds_bucket{le="+Inf"} 3' in text
+        assert "latency_seconds_count 3" in text
+        assert "latency_seconds_sum 5.55" in text
+
+    def test_label_values_are_escaped(self):
+        registry = MetricsRegistry()
+        registry.counter("errors_total", "Errors", ["message"]).inc(message='a "b"')
+
+        assert 'errors_total{message="a \\"b\\""} 1.0' in registry.render()
+
+    def test_rejects_wrong_labels(self):
+        counter = MetricsRegistry().counter("jobs_total", "Jobs run", ["status"])
+        with pytest.raises(ValueError):
+            counter.inc(result="ok")
+
+
+class TestMaterializationHook:
+    """Test engine events are recorded per phase."""
+
+    def test_phase_durations(self):
+        metrics.record_materialization_event(
+            MaterializationEvent(events.GAMES_LOADED, "abc", elapsed_ms=120.0)
+        )
+        metrics.record_materialization_event(
+            MaterializationEvent(events.CACHE_MISS, "abc", elapsed_ms=4.0)
+        )
+        metrics.record_materialization_event(
+            MaterializationEvent(
+                events.COMPLETED, "abc", elapsed_ms=300.0, data={"status": "ok"}
+            )
+        )
+
+        phases = metrics.materialization_phase_seconds
+        assert phases.count(phase="game_load") == 1
+        assert phases.sum(phase="game_load") == pytest.approx(0.12)
+        assert phases.count(phase="cache_check") == 1
+        assert metrics.materialization_cache_total.value(result="miss") == 1
+        assert metrics.materializations_total.value(status="ok") == 1
+
+    def test_only_final_progress_event_counts_games(self):
+        for processed in (100, 200, 250):
+            metrics.record_materialization_event(
+                MaterializationEvent(
+                    events.GAMES_PROCESSED,
+                    "abc",
+                    data={"processed": processed, "total": 250},
+                )
+            )
+
+        assert metrics.games_processed_total.value() == 250
+
+
+class TestInstrumentedClient:
+    """Test Supabase round trips are counted per table and operation."""
+
+    def test_counts_execute_calls(self):
+        client = instrument_client(MagicMock())
+
+        client.table("games").select("*").eq("status", "finished").execute()
+        client.table("games").select("*").execute()
+        client.table("cached_player_ratings").delete().eq("x", 1).execute()
+        client.rpc("refresh_stats", {}).execute()
+
+        requests = metrics.supabase_requests_total
+        assert requests.value(table="games", operation="select") == 2
+        assert requests.value(table="cached_player_ratings", operation="delete") == 1
+        assert requests.value(table="refresh_stats", operation="rpc") == 1
+
+    def test_returns_underlying_results(self):
+        raw = MagicMock()
+        raw.table.return_value.select.return_value.execute.return_value.data = [1]
+
+        client = instrument_client(raw)
+
+        assert client.table("games").select("*").execute().data == [1]
+        assert instrument_client(client) is client
+
+
+class TestMetricsEndpoint:
+    """Test the /metrics endpoint."""
+
+    def test_exposes_request_metrics_by_route(self):
+        client = TestClient(app)
+        client.get("/")
+
+        response = client.get("/metrics")
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/plain")
+        assert (
+            'rating_engine_http_requests_total{method="GET",route="/",status="200"} 1.0'
+            in response.text
+        )
+        assert "rating_engine_result_cache_entries 0.0" in response.text
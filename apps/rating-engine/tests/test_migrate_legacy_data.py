@@ -0,0 +1,277 @@
+"""
+Tests for the legacy CSV migrator (scripts/migrate_legacy_data.py).
+"""
+
+import csv
+
+import pytest
+
+from scripts.migrate_legacy_data import MigrationCheckpoint, SupabaseLegacyDataMigrator
+from tests.fake_supabase import FakeAPIError, FakeSupabase
+
+SEATS = ("East", "South", "West", "North")
+NAMES = ("Alice", "Bob", "Cara", "Dan", "Eve")
+
+
+def write_legacy_csv(path, games: int = 30):
+    """Write a small legacy log: five players rotating through the seats."""
+    columns = ["Timestamp", "date"]
+    for seat in SEATS:
+        columns += [f"{seat} player", f"{seat} points"]
+    with open(path, "w", newline="", encoding="utf-8") as csvfile:
+        writer = csv.DictWriter(csvfile, fieldnames=columns)
+        writer.writeheader()
+        for index in range(games):
+            row = {
+                "Timestamp": f"1/{index % 28 + 1}/2023 12:00:{index % 60:02d}",
+                "date": f"1/{index % 28 + 1}/2023 19:{index % 60:02d}:00",
+            }
+            for offset, seat in enumerate(SEATS):
+                name = NAMES[(index + offset) % len(NAMES)]
+                # Trailing whitespace is stripped for players, as before
+                row[f"{seat} player"] = f"{name} " if offset == 0 else name
+                row[f"{seat} points"] = str(25000 + (offset - 1) * 1000)
+            writer.writerow(row)
+    return path
+
+
+@pytest.fixture
+def legacy_csv(tmp_path):
+    return write_legacy_csv(tmp_path / "legacy_logs.csv")
+
+
+def migrator_for(fake: FakeSupabase) -> SupabaseLegacyDataMigrator:
+    migrator = SupabaseLegacyDataMigrator()
+    migrator.supabase = fake
+    return migrator
+
+
+class TestBulkMigration:
+    """Test the bulk path against the row-by-row path."""
+
+    def test_bulk_matches_row_by_row(self, legacy_csv, monkeypatch):
+        row_fake = FakeSupabase()
+        monkeypatch.setattr("scripts.migrate_legacy_data.CSV_PATH", legacy_csv)
+        migrator_for(row_fake).migrate_csv_data()
+
+        bulk_fake = FakeSupabase()
+        migrator_for(bulk_fake).migrate_csv_data_bulk(legacy_csv, chunk_size=50)
+
+        for table in ("players", "games", "game_seats"):
+            assert sorted(map(repr, bulk_fake.tables[table])) == sorted(
+                map(repr, row_fake.tables[table])
+            )
+        assert bulk_fake.call_counts == {
+            ("players", "select"): 1,
+            ("players", "upsert"): 1,
+            ("games", "upsert"): 1,
+            ("game_seats", "upsert"): 1,
+        }
+
+    def test_bulk_reuses_existing_players_and_games(self, legacy_csv):
+        fake = FakeSupabase({"players": [{"id": "p-alice", "display_name": "Alice"}]})
+        migrator = migrator_for(fake)
+
+        migrator.migrate_csv_data_bulk(legacy_csv)
+        games = [dict(row) for row in fake.tables["games"]]
+        migrator.migrate_csv_data_bulk(legacy_csv)
+
+        assert len(fake.tables["players"]) == len(NAMES)
+        assert fake.tables["games"] == games
+        assert len(fake.tables["game_seats"]) == 4 * len(games)
+        alice_seats = [
+            seat for seat in fake.tables["game_seats"] if seat["player_id"] == "p-alice"
+        ]
+        assert alice_seats
+
+
+class TestResumableMigration:
+    """Test checkpoints and concurrent batches."""
+
+    def fail_on_batch(self, migrator, failing_index: int):
+        write_batch = migrator.write_batch
+        batches = []
+
+        def flaky(batch):
+            batches.append(batch)
+            if len(batches) == failing_index + 1:
+                raise RuntimeError("connection reset")
+            write_batch(batch)
+
+        migrator.write_batch = flaky
+        return batches
+
+    def test_resumes_after_last_committed_batch(self, legacy_csv, tmp_path):
+        fake = FakeSupabase()
+        checkpoint = MigrationCheckpoint(tmp_path / "progress.json")
+        migrator = migrator_for(fake)
+        self.fail_on_batch(migrator, failing_index=2)
+
+        with pytest.raises(RuntimeError):
+            migrator.migrate_csv_data_bulk(
+                legacy_csv, chunk_size=5, workers=1, checkpoint=checkpoint
+            )
+        # Batches after the failure may have landed; they are past the
+        # checkpoint and simply re-sent
+        assert checkpoint.load()["games_committed"] == 10
+        assert 10 <= len(fake.tables["games"]) < 30
+
+        resumed = migrator_for(fake)
+        sent = self.fail_on_batch(resumed, failing_index=-1)
+        resumed.migrate_csv_data_bulk(
+            legacy_csv, chunk_size=5, workers=3, checkpoint=checkpoint
+        )
+
+        # Only the 20 uncommitted games are sent again
+        assert sum(len(batch) for batch in sent) == 20
+        assert len(fake.tables["games"]) == 30
+        assert len(fake.tables["game_seats"]) == 120
+        assert not checkpoint.exists()
+
+    def test_checkpoint_for_another_csv_starts_over(self, legacy_csv, tmp_path):
+        fake = FakeSupabase()
+        checkpoint = MigrationCheckpoint(tmp_path / "progress.json")
+        checkpoint.save(10, "not-a-game-from-this-csv")
+        migrator = migrator_for(fake)
+        sent = self.fail_on_batch(migrator, failing_index=-1)
+
+        migrator.migrate_csv_data_bulk(legacy_csv, chunk_size=5, checkpoint=checkpoint)
+
+        assert sum(len(batch) for batch in sent) == 30
+        assert len(fake.tables["games"]) == 30
+
+    def test_row_by_row_resumes_after_last_committed_game(self, legacy_csv):
+        fake = FakeSupabase()
+        checkpoint = MigrationCheckpoint.for_csv(legacy_csv)
+        migrator = migrator_for(fake)
+        create = migrator.create_game_and_seats
+        created = []
+
+        def flaky(game_data):
+            if len(created) == 12:
+                raise RuntimeError("connection reset")
+            created.append(game_data["game_id"])
+            create(game_data)
+
+        migrator.create_game_and_seats = flaky
+        with pytest.raises(RuntimeError):
+            migrator.migrate_csv_data(legacy_csv, checkpoint=checkpoint)
+        assert checkpoint.load()["games_committed"] == 12
+
+        resumed = migrator_for(fake)
+        resumed_create = resumed.create_game_and_seats
+        created.clear()
+
+        def counted(game_data):
+            created.append(game_data["game_id"])
+            resumed_create(game_data)
+
+        resumed.create_game_and_seats = counted
+        resumed.migrate_csv_data(legacy_csv, checkpoint=checkpoint)
+
+        assert len(created) == 18
+        assert len(fake.tables["games"]) == 30
+        assert len(fake.tables["game_seats"]) == 120
+        assert not checkpoint.exists()
+
+    def test_resume_completes_a_game_whose_seats_failed(self, legacy_csv):
+        fake = FakeSupabase()
+        checkpoint = MigrationCheckpoint.for_csv(legacy_csv)
+
+        def fail_fifth_seats(call):
+            if call.table == "game_seats" and len(fake.tables["games"]) == 5:
+                raise RuntimeError("connection reset")
+            return 0.0
+
+        fake.latency = fail_fifth_seats
+        with pytest.raises(RuntimeError):
+            migrator_for(fake).migrate_csv_data(legacy_csv, checkpoint=checkpoint)
+        assert checkpoint.load()["games_committed"] == 4
+        assert len(fake.tables["games"]) == 5
+        assert len(fake.tables["game_seats"]) == 16
+
+        fake.latency = 0.0
+        migrator_for(fake).migrate_csv_data(legacy_csv, checkpoint=checkpoint)
+
+        assert len(fake.tables["games"]) == 30
+        assert len(fake.tables["game_seats"]) == 120
+
+    def test_checkpoint_follows_the_migrated_csv(self, legacy_csv, tmp_path):
+        other_csv = write_legacy_csv(tmp_path / "other_logs.csv", games=5)
+        MigrationCheckpoint.for_csv(legacy_csv).save(10, "from-legacy-logs")
+        fake = FakeSupabase()
+        migrator = migrator_for(fake)
+        migrator.connect_to_supabase = lambda: None
+
+        migrator.run_migration(csv_path=other_csv)
+
+        # The other CSV's run truncated and migrated everything, and left the
+        # checkpoint of legacy_logs.csv alone
+        assert len(fake.tables["games"]) == 5
+        assert not MigrationCheckpoint.for_csv(other_csv).exists()
+        assert MigrationCheckpoint.for_csv(legacy_csv).load()["games_committed"] == 10
+
+
+class TestTruncateTables:
+    """Test the server-side truncate and its fallback."""
+
+    def fake_with_rows(self, legacy_csv) -> FakeSupabase:
+        fake = FakeSupabase()
+        migrator_for(fake).migrate_csv_data_bulk(legacy_csv)
+        fake.reset_calls()
+        return fake
+
+    def test_uses_one_rpc(self, legacy_csv):
+        fake = self.fake_with_rows(legacy_csv)
+        received = []
+
+        def truncate(tables, include_games, include_players):
+            received.append((include_games, include_players))
+            emptied = ["cached_game_results", "game_seats", "games"]
+            for name in emptied:
+                tables[name] = []
+            return emptied
+
+        fake.register_rpc("truncate_rating_engine_data", truncate)
+
+        migrator_for(fake).truncate_tables(keep_players=True)
+
+        assert received == [(True, False)]
+        assert fake.call_counts == {("truncate_rating_engine_data", "rpc"): 1}
+        assert fake.tables["games"] == []
+        assert len(fake.tables["players"]) == len(NAMES)
+
+    def test_falls_back_to_deletes_without_the_function(self, legacy_csv):
+        fake = self.fake_with_rows(legacy_csv)
+
+        migrator_for(fake).truncate_tables(keep_players=True)
+
+        assert fake.call_counts[("games", "delete")] == 1
+        assert fake.tables["games"] == []
+        assert fake.tables["game_seats"] == []
+
+    def test_real_rpc_errors_are_not_hidden(self, legacy_csv):
+        fake = self.fake_with_rows(legacy_csv)
+
+        def truncate(tables, include_games, include_players):
+            raise FakeAPIError("permission denied for function", code="42501")
+
+        fake.register_rpc("truncate_rating_engine_data", truncate)
+
+        with pytest.raises(FakeAPIError, match="permission denied"):
+            migrator_for(fake).truncate_tables(keep_players=False)
+
+        assert ("games", "delete") not in fake.call_counts
+        assert len(fake.tables["games"]) == 30
+
+    def test_fallback_clears_config_creator_before_players(self, legacy_csv):
+        fake = self.fake_with_rows(legacy_csv)
+        creator = fake.tables["players"][0]["id"]
+        fake.tables["rating_configurations"] = [
+            {"config_hash": "abc123", "name": "Season 3", "created_by": creator}
+        ]
+
+        migrator_for(fake).truncate_tables(keep_players=False)
+
+        assert fake.tables["players"] == []
+        assert fake.tables["rating_configurations"][0]["created_by"] is None
@@ -0,0 +1,276 @@
+"""
+Tests for the player statistics bundle (rating_engine/player_statistics.py).
+
+The first cases mirror apps/web/src/features/players/playerStatistics.test.ts,
+so the cached bundle matches what profile pages computed in the browser.
+"""
+
+from datetime import UTC, datetime
+
+import pytest
+
+from rating_engine.materialization import GameData, materialize_data_for_config
+from rating_engine.player_statistics import add_hand_events, start_player_statistics
+from tests.test_fake_supabase import seeded_fake
+
+
+def game(game_id: str, day: int, scores: dict[str, tuple[str, int]]) -> GameData:
+    started_at = datetime(2026, 1, day, tzinfo=UTC)
+    return GameData(
+        game_id=game_id,
+        started_at=started_at,
+        finished_at=started_at.replace(hour=1),
+        status="finished",
+        seats={
+            seat: {"player_id": player_id, "final_score": score}
+            for seat, (player_id, score) in scores.items()
+        },
+    )
+
+
+def hand(game_id, hand_seq, seat, event_type, points_delta, riichi=False, **details):
+    return {
+        "game_id": game_id,
+        "hand_seq": hand_seq,
+        "seat": seat,
+        "event_type": event_type,
+        "riichi_declared": riichi,
+        "points_delta": points_delta,
+        "round_kanji": details.pop("round_kanji", None),
+        "kyoku": details.pop("kyoku", None),
+        "details": details,
+    }
+
+
+def bundle_for(player_id: str, games: list[GameData], rows: list[dict]) -> dict:
+    statistics = start_player_statistics(games)
+    add_hand_events(statistics, {g.game_id: g for g in games}, rows)
+    return statistics[player_id].to_bundle()
+
+
+GAMES = [
+    game(
+        "g1",
+        1,
+        {
+            "east": ("p1", 25000),
+            "south": ("p2", 24000),
+            "west": ("p3", 23000),
+            "north": ("p4", 22000),
+        },
+    ),
+    game(
+        "g2",
+        2,
+        {
+            "east": ("p2", 40000),
+            "south": ("p1", -1200),
+            "west": ("p3", 35000),
+            "north": ("p4", 26200),
+        },
+    ),
+]
+
+HANDS = [
+    hand(
+        "g1",
+        1,
+        "east",
+        "ron",
+        8000,
+        riichi=True,
+        winnerSeat="east",
+        loserSeat="south",
+        dealerSeat="east",
+        pointsWon=8000,
+    ),
+    hand("g1", 2, "east", "draw", 0, riichi=True, dealerSeat="south"),
+    hand(
+        "g2",
+        1,
+        "south",
+        "ron",
+        -12000,
+        winnerSeat="east",
+        loserSeat="south",
+        dealerSeat="west",
+        pointsWon=12000,
+    ),
+    hand(
+        "g2",
+        2,
+        "south",
+        "tsumo",
+        4000,
+        winnerSeat="south",
+        dealerSeat="east",
+        pointsWon=4000,
+    ),
+]
+
+
+class TestPlayerStatisticsBundle:
+    """Test parity with calculatePlayerStatistics."""
+
+    def test_game_and_hand_rates(self):
+        bundle = bundle_for("p1", GAMES, HANDS)
+        totals, game_stats, hand_stats = (
+            bundle["totals"],
+            bundle["gameStats"],
+            bundle["handStats"],
+        )
+
+        assert totals == {
+            "gamesPlayed": 2,
+            "totalHands": 4,
+            "totalWins": 2,
+            "totalDealIns": 1,
+        }
+        assert game_stats["bustedGameRate"] == pytest.approx(50)
+        assert game_stats["placementRates"] == {"1": 50, "2": 0, "3": 0, "4": 50}
+        assert game_stats["seatAssignmentRates"]["east"] == pytest.approx(50)
+        assert hand_stats["winRate"] == pytest.approx(50)
+        assert hand_stats["tsumoRate"] == pytest.approx(50)
+        assert hand_stats["dealInRate"] == pytest.approx(25)
+        assert hand_stats["riichiRate"] == pytest.approx(50)
+        assert hand_stats["winWithRiichiRate"] == pytest.approx(50)
+        assert hand_stats["winWithoutRiichiRate"] == pytest.approx(50)
+        assert hand_stats["biggestWinningHand"] == {
+            "gameId": "g1",
+            "handSeq": 1,
+            "value": 8000,
+        }
+        assert hand_stats["biggestLosingHand"] == {
+            "gameId": "g2",
+            "handSeq": 1,
+            "value": 12000,
+        }
+        assert hand_stats["averageWinValue"] == pytest.approx(6000)
+        assert hand_stats["medianWinValue"] == pytest.approx(6000)
+        assert hand_stats["medianDealInValue"] == pytest.approx(12000)
+
+        assert game_stats["perfectGames"] == 1
+        assert game_stats["currentStreak"] == -1
+        assert game_stats["longestLosingStreak"] == 1
+        assert game_stats["comebackRate"] == 0
+        assert game_stats["highestFinalScore"] == {"gameId": "g1", "score": 25000}
+        assert game_stats["lowestFinalScore"] == {"gameId": "g2", "score": -1200}
+        assert game_stats["scoreConsistency"] is not None
+
+    def test_player_without_hands(self):
+        bundle = bundle_for("p4", GAMES, HANDS)
+
+        assert bundle["totals"]["gamesPlayed"] == 2
+        assert bundle["totals"]["totalHands"] == 0
+        assert bundle["gameStats"]["perfectGames"] == 0
+        assert bundle["handStats"]["winRate"] is None
+        assert bundle["handStats"]["biggestWinningHand"] is None
+        assert bundle["handStats"]["bestSeatByWinRate"] is None
+        assert bundle["handStats"]["highestHanAchieved"] is None
+        assert bundle["handStats"]["riichiSticksCollectedPerGame"] == 0
+
+    def test_double_ron_counts_for_both_winners(self):
+        games = [
+            game(
+                "g1",
+                3,
+                {
+                    "east": ("p1", 20000),
+                    "south": ("p2", 29000),
+                    "west": ("p3", 27000),
+                    "north": ("p4", 24000),
+                },
+            )
+        ]
+        rows = [
+            hand(
+                "g1",
+                1,
+                seat,
+                "ron",
+                delta,
+                winnerSeats=["south", "west"],
+                loserSeat="east",
+                dealerSeat="north",
+            )
+            for seat, delta in (("south", 7700), ("west", 2000), ("east", -9700))
+        ]
+
+        assert bundle_for("p2", games, rows)["handStats"]["winRate"] == 100
+        assert bundle_for("p3", games, rows)["handStats"]["winRate"] == 100
+        assert bundle_for("p1", games, rows)["totals"]["totalDealIns"] == 1
+
+
+class TestPlayerStatisticsStreaks:
+    """Test running-score and streak statistics."""
+
+    def test_comeback_and_hand_win_streak(self):
+        games = [
+            game(
+                "g1",
+                1,
+                {
+                    "east": ("p1", 41000),
+                    "south": ("p2", 24000),
+                    "west": ("p3", 20000),
+                    "north": ("p4", 15000),
+                },
+            )
+        ]
+        rows = [
+            hand("g1", 1, "east", "ron", -8000, loserSeat="east", winnerSeat="west"),
+            hand("g1", 2, "east", "tsumo", 6000, winnerSeat="east", han=3, fu=30),
+            hand("g1", 3, "east", "ron", 12000, winnerSeat="east", han=5),
+            hand("g1", 5, "east", "tsumo", 6000, winnerSeat="east", riichiSticks=2),
+        ]
+
+        bundle = bundle_for("p1", games, rows)
+
+        assert bundle["gameStats"]["comebackRate"] == 100
+        assert bundle["gameStats"]["comebackFactor"] == 41000 - 17000
+        assert bundle["gameStats"]["currentStreak"] == 1
+        assert bundle["handStats"]["longestHandWinStreakInSingleGame"] == 2
+        assert bundle["handStats"]["averageHanOnWins"] == 4
+        assert bundle["handStats"]["highestHanAchieved"] == {
+            "gameId": "g1",
+            "handSeq": 3,
+            "han": 5,
+        }
+        assert bundle["handStats"]["riichiSticksCollectedPerGame"] == 2
+
+
+class TestPlayerStatisticsMaterialization:
+    """Test the statistics table against the in-memory Supabase."""
+
+    @pytest.mark.asyncio
+    async def test_one_row_per_player_with_matching_totals(self):
+        fake, config_hash = seeded_fake()
+
+        await materialize_data_for_config(fake, config_hash)
+
+        ratings = {
+            row["player_id"]: row for row in fake.tables["cached_player_ratings"]
+        }
+        rows = fake.tables["cached_player_statistics"]
+        assert {row["player_id"] for row in rows} == set(ratings)
+        for row in rows:
+            rating = ratings[row["player_id"]]
+            totals = row["statistics"]["totals"]
+            assert row["config_hash"] == config_hash
+            assert row["games_played"] == totals["gamesPlayed"]
+            assert totals["gamesPlayed"] == rating["games_played"]
+            assert totals["totalHands"] == row["total_hands"]
+            win_rate = row["statistics"]["handStats"]["winRate"]
+            assert win_rate / 100 == pytest.approx(
+                rating["tsumo_rate"] + rating["ron_rate"], abs=2e-4
+            )
+
+    @pytest.mark.asyncio
+    async def test_force_refresh_replaces_statistics(self):
+        fake, config_hash = seeded_fake()
+
+        await materialize_data_for_config(fake, config_hash)
+        count = len(fake.tables["cached_player_statistics"])
+        await materialize_data_for_config(fake, config_hash, force_refresh=True)
+
+        assert len(fake.tables["cached_player_statistics"]) == count
@@ -0,0 +1,104 @@
+"""
+Tests for materialization profiling helpers.
+"""
+
+import argparse
+import time
+
+import pytest
+
+from rating_engine import events
+from rating_engine.events import MaterializationEvent
+from rating_engine.profiling import PhaseTimer, StackSampler, profile_call
+from scripts import materialize_data
+
+
+def _busy_wait(seconds: float) -> int:
+    deadline = time.perf_counter() + seconds
+    iterations = 0
+    while time.perf_counter() < deadline:
+        iterations += 1
+    return iterations
+
+
+class TestPhaseTimer:
+    """Test per-phase wall-clock accumulation."""
+
+    def test_accumulates_phase_events(self):
+        timer = PhaseTimer()
+        timer(MaterializationEvent(events.GAMES_LOADED, "abc", elapsed_ms=40.0))
+        timer(MaterializationEvent(events.CACHE_CLEARED, "abc", elapsed_ms=5.0))
+        timer(MaterializationEvent(events.CACHE_CLEARED, "abc", elapsed_ms=5.0))
+        timer(MaterializationEvent(events.GAMES_PROCESSED, "abc", data={}))
+        timer(MaterializationEvent(events.COMPLETED, "abc", elapsed_ms=100.0))
+
+        assert timer.phases == {"game_load": 40.0, "clear": 10.0, "total": 100.0}
+        assert timer.report().splitlines()[-1].split() == ["total", "100.0ms"]
+
+
+class TestStackSampler:
+    """Test collapsed stack sampling."""
+
+    def test_samples_calling_thread(self, tmp_path):
+        with StackSampler(interval=0.001) as sampler:
+            _busy_wait(0.05)
+
+        assert sampler.stacks
+        assert any("test_profiling:_busy_wait" in s for s in sampler.stacks)
+
+        output = tmp_path / "stacks.folded"
+        sampler.write(output)
+        stack, count = output.read_text().splitlines()[0].rsplit(" ", 1)
+        assert ";" in stack
+        assert int(count) >= 1
+
+
+class TestProfileCall:
+    """Test cProfile and tracemalloc wrapping."""
+
+    def test_profiles_and_dumps_stats(self, tmp_path):
+        pstats_path = tmp_path / "run.pstats"
+
+        result = profile_call(lambda: [bytes(1024) for _ in range(1000)], pstats_path)
+
+        assert len(result.value) == 1000
+        assert pstats_path.exists()
+        assert result.peak_memory_bytes >= 1000 * 1024
+        assert "cumulative" in result.summary(5)
+
+    def test_dumps_stats_when_the_call_raises(self, tmp_path):
+        pstats_path = tmp_path / "failed.pstats"
+
+        def fail():
+            raise RuntimeError("boom")
+
+        with pytest.raises(RuntimeError):
+            profile_call(fail, pstats_path)
+
+        assert pstats_path.exists()
+
+
+class TestProfiledMaterialization:
+    """Test --profile output when materialization fails."""
+
+    def test_failed_run_still_writes_profile_and_stacks(self, tmp_path, monkeypatch):
+        async def fail(*args, **kwargs):
+            raise RuntimeError("connection reset")
+
+        monkeypatch.setattr(materialize_data, "get_supabase_client", lambda: None)
+        monkeypatch.setattr(materialize_data, "materialize_data_for_config", fail)
+        args = argparse.Namespace(
+            profile_output=tmp_path / "run.pstats",
+            flamegraph=tmp_path / "run.folded",
+            sample_interval=1.0,
+            profile_top=5,
+            validate_scores=False,
+            exclude_mismatched=False,
+        )
+
+        result = materialize_data.run_profiled_materialization("abc123", False, args)
+
+        assert result["status"] == "error"
+        assert "connection reset" in result["error"]
+        assert (tmp_path / "run.pstats").exists()
+        assert (tmp_path / "run.folded").exists()
@@ -0,0 +1,74 @@
+"""
+Tests for qualified standings (drop-worst totals and qualified rank).
+"""
+
+import pytest
+
+from rating_engine.materialization import (
+    MaterializationConfig,
+    MaterializationEngine,
+    materialize_data_for_config,
+)
+from tests.fake_supabase import FakeSupabase
+from tests.synthetic import generate_league
+from tests.test_fake_supabase import seeded_fake
+
+
+class TestDropWorst:
+    """Test the bounded worst-results heap in the rating pass."""
+
+    @pytest.mark.asyncio
+    async def test_heap_matches_sorted_results(self):
+        fake, config_hash = seeded_fake()
+
+        await materialize_data_for_config(fake, config_hash)
+
+        results: dict[str, list[int]] = {}
+        for row in fake.tables["cached_game_results"]:
+            results.setdefault(row["player_id"], []).append(row["plus_minus"])
+        for row in fake.tables["cached_player_ratings"]:
+            plus_minus = sorted(results[row["player_id"]])
+            assert row["total_plus_minus"] == sum(plus_minus)
+            assert row["adjusted_total_plus_minus"] == sum(plus_minus[2:])
+
+    @pytest.mark.asyncio
+    async def test_drop_worst_zero_keeps_total(self):
+        config = MaterializationConfig(
+            config_hash="abc123",
+            name="No drops",
+            start_date="2024-01-01",
+            end_date="2024-12-31",
+            drop_worst=0,
+        )
+        games = generate_league(games=20, players=6, seed=3).game_data()
+
+        ratings, _ = await MaterializationEngine(FakeSupabase())._calculate_ratings(
+            config, games
+        )
+
+        for rating in ratings.values():
+            assert rating.worst_results == []
+            assert rating.adjusted_total_plus_minus == rating.total_plus_minus
+
+
+class TestQualifiedRank:
+    """Test the qualification flag and rank written to the cache."""
+
+    @pytest.mark.asyncio
+    async def test_ranks_are_dense_over_qualified_players(self):
+        fake, config_hash = seeded_fake(games=30)
+
+        await materialize_data_for_config(fake, config_hash)
+
+        rows = fake.tables["cached_player_ratings"]
+        qualified = [row for row in rows if row["qualified"]]
+        assert 0 < len(qualified) < len(rows)
+        for row in rows:
+            assert row["qualified"] == (row["games_played"] >= 8)
+            assert (row["qualified_rank"] is None) == (not row["qualified"])
+        ranked = sorted(qualified, key=lambda row: row["qualified_rank"])
+        assert [row["qualified_rank"] for row in ranked] == list(
+            range(1, len(ranked) + 1)
+        )
+        totals = [row["adjusted_total_plus_minus"] for row in ranked]
+        assert totals == sorted(totals, reverse=True)
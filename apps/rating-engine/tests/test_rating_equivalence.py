@@ -0,0 +1,119 @@
+"""
+Rating equivalence tests.
+
+The engine's rating pass must reproduce a plain openskill PlackettLuce replay
+(tests/rating_reference.py) on synthetic and real league game sets: mu/sigma
+within MU_SIGMA_TOLERANCE and an identical leaderboard order. Any faster
+rating path has to keep these green; benchmarks/rating_kernel.py covers speed.
+"""
+
+import pytest
+
+from rating_engine.materialization import GameData, MaterializationConfig
+from tests.rating_reference import (
+    FIXTURE_CSVS,
+    MU_SIGMA_TOLERANCE,
+    leaderboard_order,
+    load_fixture_games,
+    max_difference,
+    replay_engine,
+    replay_reference,
+)
+from tests.synthetic import generate_league
+
+DEFAULT_CONFIG = MaterializationConfig(
+    config_hash="equivalence",
+    name="equivalence",
+    start_date="2000-01-01",
+    end_date="2100-01-01",
+)
+
+# Non-default parameters, so a path that hardcodes defaults is caught
+TUNED_CONFIG = MaterializationConfig(
+    config_hash="equivalence-tuned",
+    name="equivalence-tuned",
+    start_date="2000-01-01",
+    end_date="2100-01-01",
+    initial_mu=1500.0,
+    initial_sigma=350.0,
+    confidence_factor=3.0,
+    oka=30000,
+    uma=[30000, 10000, -10000, -30000],
+    weight_divisor=40000.0,
+    weight_min=0.25,
+    weight_max=2.0,
+)
+
+
+async def assert_equivalent(config: MaterializationConfig, games: list[GameData]):
+    expected = replay_reference(config, games)
+    actual = await replay_engine(config, games)
+
+    assert max_difference(actual, expected) <= MU_SIGMA_TOLERANCE
+    assert leaderboard_order(actual, config.confidence_factor) == leaderboard_order(
+        expected, config.confidence_factor
+    )
+
+
+@pytest.mark.parametrize(
+    "config", [DEFAULT_CONFIG, TUNED_CONFIG], ids=["default", "tuned"]
+)
+@pytest.mark.parametrize("seed", [0, 1, 2])
+async def test_synthetic_leagues_match_reference(config, seed):
+    league = generate_league(games=1500, players=60, seed=seed, simulate_hands=False)
+
+    await assert_equivalent(config, league.game_data())
+
+
+@pytest.mark.parametrize("path", FIXTURE_CSVS, ids=lambda path: path.stem)
+async def test_league_logs_match_reference(path):
+    if not path.exists():
+        pytest.skip(f"{path.name} not checked out")
+
+    await assert_equivalent(DEFAULT_CONFIG, load_fixture_games(path))
+
+
+async def test_tied_scores_match_reference():
+    """Ties are placed by seat order in both paths."""
+    league = generate_league(games=200, players=8, seed=3, simulate_hands=False)
+    games = league.game_data()
+    for game in games[::3]:
+        for seat in game.seats.values():
+            seat["final_score"] = 25000
+
+    await assert_equivalent(DEFAULT_CONFIG, games)
+
+
+async def test_gate_detects_one_misplaced_game():
+    """Swapping first and second place in a single early game fails the gate."""
+    games = generate_league(games=300, players=12, seed=4).game_data()
+    expected = replay_reference(DEFAULT_CONFIG, games)
+
+    seats = sorted(games[10].seats.values(), key=lambda s: s["final_score"])
+    seats[-1]["final_score"], seats[-2]["final_score"] = (
+        seats[-2]["final_score"],
+        seats[-1]["final_score"],
+    )
+    actual = replay_reference(DEFAULT_CONFIG, games)
+
+    assert max_difference(actual, expected) > MU_SIGMA_TOLERANCE
+
+
+async def test_weight_values_do_not_move_ratings():
+    """openskill rescales each one-player team's weight to the same value."""
+    games = generate_league(games=300, players=12, seed=5).game_data()
+    reweighted = MaterializationConfig(
+        config_hash="equivalence-reweighted",
+        name="equivalence-reweighted",
+        start_date="2000-01-01",
+        end_date="2100-01-01",
+        uma=[30000, 10000, -10000, -30000],
+        weight_divisor=80000.0,
+        weight_min=0.1,
+        weight_max=3.0,
+    )
+
+    actual = await replay_engine(reweighted, games)
+    expected = await replay_engine(DEFAULT_CONFIG, games)
+
+    assert max_difference(actual, expected) <= MU_SIGMA_TOLERANCE
@@ -0,0 +1,33 @@
+"""
+Tests for config registration (scripts/register_configs.py).
+"""
+
+import json
+from pathlib import Path
+
+import pytest
+import yaml
+
+from rating_engine.materialization import compute_config_hash
+from scripts.migrate_legacy_data import SupabaseLegacyDataMigrator
+from scripts.register_configs import ConfigRegistrar, find_all_configs
+from tests.fake_supabase import FakeSupabase
+
+CONFIGS_DIR = Path(__file__).parent.parent / "configs"
+
+
+@pytest.mark.parametrize("config_path", find_all_configs(CONFIGS_DIR), ids=str)
+def test_registered_hash_matches_engine(config_path):
+    with open(config_path) as file:
+        config_data = yaml.safe_load(file)
+    registrar = ConfigRegistrar()
+    registrar.supabase = FakeSupabase()
+    migrator = SupabaseLegacyDataMigrator()
+    migrator.supabase = FakeSupabase()
+
+    registered = registrar.register_config(config_path)
+    migrated = migrator.ensure_season_config_in_db(config_path)
+
+    assert registered == migrated == compute_config_hash(config_data)
+    row = registrar.supabase.tables["rating_configurations"][0]
+    assert compute_config_hash(json.loads(row["config_data"])) == registered
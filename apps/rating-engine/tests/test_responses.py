@@ -0,0 +1,91 @@
+"""
+Tests for the fast JSON response class and response compression.
+"""
+
+import json
+import os
+from unittest.mock import MagicMock, patch
+
+from fastapi.testclient import TestClient
+
+from api.index import app
+from rating_engine.responses import FastJSONResponse, dumps, trim_debug_fields
+
+client = TestClient(app)
+
+
+class TestFastJSONResponse:
+    """Test serialization and debug field trimming."""
+
+    def test_matches_stdlib_encoding(self):
+        payload = {"players": [{"name": "Ａｌｉｃｅ", "rating": 31.25, "games": 12}]}
+        assert json.loads(dumps(payload)) == payload
+
+    def test_serializes_unknown_types_as_strings(self):
+        from datetime import UTC, datetime
+
+        payload = {"at": datetime(2024, 1, 1, tzinfo=UTC)}
+        assert json.loads(dumps(payload))["at"].startswith("2024-01-01")
+
+    def test_trim_debug_fields(self):
+        assert trim_debug_fields({"players": [], "debug": "x"}) == {"players": []}
+        assert trim_debug_fields([{"debug": "x"}]) == [{"debug": "x"}]
+
+    @patch.dict(os.environ, {"VERCEL_ENV": "production"}, clear=True)
+    def test_production_trims_debug(self):
+        response = FastJSONResponse({"players": [], "debug": "found 0 players"})
+        assert json.loads(response.body) == {"players": []}
+
+    @patch.dict(
+        os.environ,
+        {"VERCEL_ENV": "production", "RATING_ENGINE_INCLUDE_DEBUG": "1"},
+        clear=True,
+    )
+    def test_override_keeps_debug(self):
+        response = FastJSONResponse({"debug": "kept"})
+        assert json.loads(response.body) == {"debug": "kept"}
+
+    @patch.dict(os.environ, {"VERCEL_ENV": "production"}, clear=True)
+    def test_app_default_response_class_trims_debug(self):
+        """The leaderboard's debug string is not sent in production."""
+        response = client.get("/leaderboard")
+        data = response.json()
+
+        assert "players" in data
+        assert "debug" not in data
+
+
+class TestCompression:
+    """Test GZip compression of large payloads."""
+
+    @patch.dict(
+        os.environ,
+        {"SUPABASE_URL": "https://test.supabase.co", "SUPABASE_SECRET_KEY": "test-key"},
+    )
+    @patch("api.index.create_client")
+    def test_large_payloads_are_gzipped(self, mock_create_client):
+        rows = [
+            {
+                "display_name": f"Player {i}",
+                "display_rating": 30.0 - i * 0.01,
+                "games_played": 20,
+                "last_game_date": "2024-06-01T00:00:00Z",
+                "total_plus_minus": 1000,
+                "avg_plus_minus": 50.0,
+            }
+            for i in range(200)
+        ]
+        mock_supabase = MagicMock()
+        select = mock_supabase.table.return_value.select.return_value
+        select.limit.return_value.execute.return_value.data = rows[:1]
+        select.order.return_value.execute.return_value.data = rows
+        mock_create_client.return_value = mock_supabase
+
+        response = client.get("/leaderboard", headers={"Accept-Encoding": "gzip"})
+
+        assert response.headers["content-encoding"] == "gzip"
+        assert len(response.json()["players"]) == 200
+
+    def test_small_payloads_are_not_compressed(self):
+        response = client.get("/", headers={"Accept-Encoding": "gzip"})
+        assert "content-encoding" not in response.headers
@@ -0,0 +1,74 @@
+"""
+Tests for the bounded in-memory result cache.
+"""
+
+import pytest
+
+from rating_engine.result_cache import ResultCache, estimate_size
+
+
+class TestResultCache:
+    """Test LRU ordering and eviction limits."""
+
+    def test_get_returns_stored_value(self):
+        cache = ResultCache()
+        cache.put(("config", "source"), {"players": [1, 2, 3]})
+
+        assert cache.get(("config", "source")) == {"players": [1, 2, 3]}
+        assert cache.hits == 1
+
+    def test_miss_on_changed_source_hash(self):
+        """A new source data hash must not reuse an older result."""
+        cache = ResultCache()
+        cache.put(("config", "source_v1"), {"value": 1})
+
+        assert cache.get(("config", "source_v2")) is None
+        assert cache.misses == 1
+
+    def test_evicts_least_recently_used_entry(self):
+        cache = ResultCache(max_entries=2)
+        cache.put(("a", "1"), "a")
+        cache.put(("b", "1"), "b")
+
+        # Touch "a" so "b" becomes least recently used
+        cache.get(("a", "1"))
+        cache.put(("c", "1"), "c")
+
+        assert ("a", "1") in cache
+        assert ("b", "1") not in cache
+        assert ("c", "1") in cache
+        assert cache.evictions == 1
+
+    def test_evicts_by_memory_budget(self):
+        cache = ResultCache(max_entries=10, max_bytes=100)
+        cache.put(("a", "1"), "a", size=60)
+        cache.put(("b", "1"), "b", size=60)
+
+        assert len(cache) == 1
+        assert ("b", "1") in cache
+        assert cache.total_bytes == 60
+
+    def test_rejects_oversized_values(self):
+        cache = ResultCache(max_bytes=10)
+
+        assert not cache.put(("a", "1"), "x" * 100)
+        assert len(cache) == 0
+
+    def test_replacing_key_updates_size(self):
+        cache = ResultCache()
+        cache.put(("a", "1"), "old", size=50)
+        cache.put(("a", "1"), "new", size=20)
+
+        assert len(cache) == 1
+        assert cache.total_bytes == 20
+        assert cache.get(("a", "1")) == "new"
+
+    def test_invalid_limits(self):
+        with pytest.raises(ValueError, match="max_entries must be positive"):
+            ResultCache(max_entries=0)
+
+
+def test_estimate_size_handles_non_json_values():
+    from datetime import UTC, datetime
+
+    assert estimate_size({"when": datetime(2024, 1, 1, tzinfo=UTC)}) > 0
@@ -0,0 +1,63 @@
+"""
+Tests for Server-Timing response headers.
+"""
+
+import os
+from unittest.mock import MagicMock, patch
+
+from fastapi.testclient import TestClient
+
+from api.index import app
+from rating_engine import server_timing
+from rating_engine.server_timing import TimingEntry, format_header
+
+client = TestClient(app)
+
+SUPABASE_ENV = {
+    "SUPABASE_URL": "https://test.supabase.co",
+    "SUPABASE_SECRET_KEY": "test-key",
+}
+
+
+class TestFormatting:
+    """Test header formatting and recording outside requests."""
+
+    def test_format_header(self):
+        header = format_header(
+            [
+                TimingEntry("db", 12.345, 'select "games"'),
+                TimingEntry("total", 20.0),
+            ]
+        )
+        assert header == 'db;dur=12.3;desc="select \\"games\\"", total;dur=20.0'
+
+    def test_recording_outside_request_is_noop(self):
+        with server_timing.timer("compute"):
+            pass
+        server_timing.record("db", 1.0)
+
+
+class TestServerTimingMiddleware:
+    """Test Server-Timing headers on API responses."""
+
+    @patch.dict(os.environ, {"SERVER_TIMING": ""})
+    def test_disabled_by_default(self):
+        response = client.get("/")
+        assert "server-timing" not in response.headers
+
+    @patch.dict(os.environ, {**SUPABASE_ENV, "SERVER_TIMING": "1"})
+    @patch("supabase.create_client")
+    def test_breaks_down_request(self, mock_create_client):
+        mock_supabase = MagicMock()
+        select = mock_supabase.table.return_value.select.return_value
+        select.limit.return_value.execute.return_value.data = [{"display_name": "A"}]
+        select.order.return_value.execute.return_value.data = []
+        mock_create_client.return_value = mock_supabase
+
+        response = client.get("/leaderboard")
+        header = response.headers["server-timing"]
+        names = [part.split(";")[0] for part in header.split(", ")]
+
+        assert names == ["db-setup", "db", "db", "serialize", "app", "total"]
+        assert 'desc="select current_leaderboard"' in header
+        assert response.headers["timing-allow-origin"] == "*"
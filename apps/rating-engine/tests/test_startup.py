@@ -0,0 +1,46 @@
+"""
+Cold-start regression tests.
+
+Importing the Vercel entry point must not import heavy dependencies that are
+only needed once a handler runs (see benchmarks/startup.py for timings).
+"""
+
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+RATING_ENGINE_DIR = Path(__file__).parent.parent
+BUDGET = json.loads(
+    (RATING_ENGINE_DIR / "benchmarks" / "startup_budget.json").read_text()
+)
+
+
+def _modules_loaded_after_import(module: str) -> set[str]:
+    code = f"import json, sys; import {module}; print(json.dumps(sorted(sys.modules)))"
+    completed = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=RATING_ENGINE_DIR,
+        env={**os.environ, "VERCEL": "1"},
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return set(json.loads(completed.stdout))
+
+
+def test_entry_point_defers_heavy_imports():
+    """api.index must not import the Supabase SDK, OpenSkill or pandas."""
+    loaded = _modules_loaded_after_import("api.index")
+
+    imported = [m for m in BUDGET["forbidden_modules"] if m in loaded]
+    assert imported == []
+
+
+def test_package_import_is_lazy():
+    """Importing rating_engine alone must not pull in materialization."""
+    loaded = _modules_loaded_after_import("rating_engine")
+
+    assert "rating_engine.materialization" not in loaded
+    assert "openskill" not in loaded
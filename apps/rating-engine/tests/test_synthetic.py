@@ -0,0 +1,71 @@
+"""
+Tests for the synthetic league generator used by scale benchmarks.
+"""
+
+from collections import defaultdict
+
+import pytest
+
+from rating_engine.materialization import MaterializationConfig, MaterializationEngine
+from tests.synthetic import STARTING_SCORE, generate_league
+
+
+class TestSyntheticLeague:
+    """Test determinism and internal consistency of generated data."""
+
+    def test_same_seed_same_league(self):
+        first = generate_league(games=50, players=10, seed=3)
+        second = generate_league(games=50, players=10, seed=3)
+        other = generate_league(games=50, players=10, seed=4)
+
+        assert first.tables() == second.tables()
+        assert first.games != other.games
+
+    @pytest.mark.parametrize("simulate_hands", [True, False])
+    def test_games_have_four_distinct_players(self, simulate_hands):
+        league = generate_league(games=100, players=8, simulate_hands=simulate_hands)
+
+        for game in league.game_data():
+            assert set(game.seats) == {"east", "south", "west", "north"}
+            assert len({seat["player_id"] for seat in game.seats.values()}) == 4
+
+    def test_hand_events_add_up_to_final_scores(self):
+        league = generate_league(games=100, players=8, seed=1)
+
+        deltas = defaultdict(int)
+        pots = defaultdict(int)
+        for event in league.hand_events:
+            deltas[(event["game_id"], event["seat"])] += event["points_delta"]
+            pots[event["game_id"]] += event["pot_delta"]
+
+        for seat in league.game_seats:
+            key = (seat["game_id"], seat["seat"])
+            assert seat["final_score"] == STARTING_SCORE + deltas[key]
+
+        # Points only leave the table as unclaimed riichi sticks
+        totals = defaultdict(int)
+        for seat in league.game_seats:
+            totals[seat["game_id"]] += seat["final_score"]
+        for game_id, total in totals.items():
+            assert total == 4 * STARTING_SCORE + pots[game_id]
+
+    def test_games_are_chronological(self):
+        games = generate_league(games=200, players=12).game_data()
+        assert games == sorted(games, key=lambda g: g.started_at)
+
+    @pytest.mark.asyncio
+    async def test_skill_signal_reaches_ratings(self):
+        """Stronger latent skill should mostly mean a higher rating."""
+        league = generate_league(games=600, players=8, seed=2, simulate_hands=False)
+        config = MaterializationConfig(
+            config_hash="synthetic",
+            name="synthetic",
+            start_date="2024-01-01",
+            end_date="2025-12-31",
+        )
+        engine = MaterializationEngine(None)
+
+        ratings, _ = await engine._calculate_ratings(config, league.game_data())
+
+        by_skill = sorted(league.skills, key=league.skills.get)
+        assert ratings[by_skill[-1]].mu > ratings[by_skill[0]].mu
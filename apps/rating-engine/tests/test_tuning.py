@@ -0,0 +1,133 @@
+"""
+Tests for parameter tuning (rating_engine/tuning.py, scripts/tune_config.py).
+"""
+
+import math
+
+import pytest
+
+from rating_engine.materialization import MaterializationConfig
+from rating_engine.tuning import (
+    UNINFORMED_LOG_LOSS,
+    TuningResult,
+    grid_candidates,
+    load_snapshot,
+    placement_log_loss,
+    random_candidates,
+    save_snapshot,
+    score_config,
+    tune,
+)
+from scripts.materialize_data import load_config_file
+from scripts.tune_config import write_tuned_config
+from tests.synthetic import generate_league
+from tests.test_fake_supabase import CONFIG_DATA
+
+BASE_CONFIG = {"name": "Synthetic", **CONFIG_DATA}
+
+
+@pytest.fixture(scope="module")
+def games():
+    return generate_league(games=60, players=8, seed=2, days=300).game_data()
+
+
+def config_for(config_data=BASE_CONFIG) -> MaterializationConfig:
+    return MaterializationConfig.from_config_data("abc123", "Synthetic", config_data)
+
+
+class TestScoring:
+    """Test the placement log-loss and the replay."""
+
+    def test_log_loss(self):
+        equal = [(25.0, 8.33)] * 4
+        ordered = [(40.0, 3.0), (30.0, 3.0), (20.0, 3.0), (10.0, 3.0)]
+
+        assert placement_log_loss(equal, [1, 2, 3, 4], 4.17) == pytest.approx(
+            math.log(24)
+        )
+        assert placement_log_loss(ordered, [1, 2, 3, 4], 4.17) < math.log(24)
+        assert placement_log_loss(ordered, [4, 3, 2, 1], 4.17) > math.log(24)
+
+    @pytest.mark.asyncio
+    async def test_bound_stops_replay(self, games):
+        config = config_for()
+        log_loss, games_scored, complete = await score_config(config, games)
+
+        total = log_loss * games_scored
+        pruned = await score_config(config, games, bound=total / 2)
+
+        assert complete and games_scored == 60
+        assert not pruned[2]
+        assert pruned[1] < games_scored
+        assert pruned[0] * pruned[1] >= total / 2
+
+
+class TestTune:
+    """Test the parallel search."""
+
+    def test_ranks_candidates_in_a_process_pool(self, games):
+        space = {"initial_sigma": [6.0, 0.0, 10.0]}
+
+        results = tune(BASE_CONFIG, games, grid_candidates(space), workers=2)
+
+        # A zero sigma fails validation and is skipped
+        assert len(results) == 3
+        assert [result.params for result in results if not result.params] == [{}]
+        complete = [result for result in results if result.complete]
+        assert complete[0] is results[0]
+        assert [r.log_loss for r in complete] == sorted(r.log_loss for r in complete)
+        assert all(result.games_scored == 60 for result in complete)
+
+    def test_patience_stops_the_search(self, games):
+        # Larger sigmas only get worse here, so nothing improves after 2.0
+        space = {"initial_sigma": [2.0 + step for step in range(20)]}
+
+        results = tune(
+            BASE_CONFIG, games, grid_candidates(space), workers=1, patience=3
+        )
+
+        assert len(results) < 10
+
+    def test_random_candidates_are_distinct(self):
+        space = {"initial_sigma": [6.0, 7.0, 8.0, 9.0]}
+
+        picks = list(random_candidates(space, 10))
+
+        assert len(picks) == 4
+        assert sorted(map(str, picks)) == sorted(map(str, grid_candidates(space)))
+
+
+class TestOutputs:
+    """Test the snapshot and the tuned YAML."""
+
+    def test_snapshot_round_trip(self, games, tmp_path):
+        path = tmp_path / "snapshot.json"
+
+        save_snapshot(games, path)
+
+        assert load_snapshot(path) == games
+
+    def test_tuned_yaml_registers_as_the_best_candidate(self, games, tmp_path):
+        space = {"initial_sigma": [1.0, 2.0]}
+        results = tune(BASE_CONFIG, games, grid_candidates(space), workers=1)
+        baseline = next(result for result in results if not result.params)
+        path = tmp_path / "synthetic-tuned.yaml"
+
+        write_tuned_config(results[0], baseline, tmp_path / "synthetic.yaml", path)
+
+        config = load_config_file(path)
+        assert config.config_hash == results[0].config_hash
+        assert config.name == "Synthetic (tuned)"
+        assert not config.is_official
+
+    def test_refuses_a_config_no_better_than_a_uniform_guess(self, tmp_path):
+        baseline = TuningResult({}, BASE_CONFIG, UNINFORMED_LOG_LOSS + 0.2, 60, True)
+        worse = TuningResult(
+            {"initial_sigma": 6.0}, BASE_CONFIG, UNINFORMED_LOG_LOSS + 0.1, 60, True
+        )
+        path = tmp_path / "synthetic-tuned.yaml"
+
+        with pytest.raises(ValueError, match="uniform guess"):
+            write_tuned_config(worse, baseline, tmp_path / "synthetic.yaml", path)
+
+        assert not path.exists()
@@ -0,0 +1,181 @@
+"""
+Tests for score reconciliation (rating_engine/validation.py).
+"""
+
+import pytest
+
+from rating_engine import events
+from rating_engine.materialization import (
+    HAND_EVENTS_PAGE_SIZE,
+    GameData,
+    materialize_data_for_config,
+)
+from rating_engine.validation import reconcile_games
+from tests.synthetic import generate_league
+from tests.test_fake_supabase import seeded_fake
+
+
+def league_with_hands(games: int = 40):
+    league = generate_league(games=games, players=10, seed=7)
+    return league.game_data(), league.hand_events
+
+
+class TestReconcileGames:
+    """Test seat, hand and table checks."""
+
+    def test_simulated_games_are_consistent(self):
+        games, rows = league_with_hands()
+
+        report = reconcile_games(games, rows)
+
+        assert report.games_checked == len(games)
+        assert report.games_without_hands == 0
+        assert report.mismatches == []
+
+    def test_wrong_final_score_is_reported(self):
+        games, rows = league_with_hands()
+        games[3].seats["west"]["final_score"] += 1000
+
+        report = reconcile_games(games, rows)
+
+        assert report.mismatched_game_ids == {games[3].game_id}
+        mismatch = report.mismatches[0]
+        assert mismatch.seat_differences == {"west": 1000}
+        assert mismatch.table_difference == 1000
+        assert mismatch.unbalanced_hands == []
+
+    def test_unbalanced_hand_is_reported(self):
+        games, rows = league_with_hands()
+        row = next(r for r in rows if r["game_id"] == games[5].game_id)
+        row["points_delta"] += 300
+
+        report = reconcile_games(games, rows)
+
+        mismatch = report.mismatches[0]
+        assert mismatch.game_id == games[5].game_id
+        assert mismatch.unbalanced_hands == [row["hand_seq"]]
+        assert mismatch.seat_differences == {row["seat"]: -300}
+
+    def test_riichi_sticks_left_on_the_table(self):
+        game = GameData(
+            game_id="g1",
+            started_at=None,
+            finished_at=None,
+            status="finished",
+            seats={
+                "east": {"player_id": "p1", "final_score": 24000},
+                "south": {"player_id": "p2", "final_score": 25000},
+                "west": {"player_id": "p3", "final_score": 25000},
+                "north": {"player_id": "p4", "final_score": 25000},
+            },
+        )
+        rows = [
+            {
+                "game_id": "g1",
+                "hand_seq": 1,
+                "seat": seat,
+                "points_delta": -1000 if seat == "east" else 0,
+                "pot_delta": -1000 if seat == "east" else 0,
+            }
+            for seat in game.seats
+        ]
+
+        report = reconcile_games([game], rows)
+
+        assert report.mismatches == []
+
+    def test_games_without_hands_are_not_mismatches(self):
+        games, rows = league_with_hands()
+        skipped = games[0].game_id
+
+        report = reconcile_games(games, [r for r in rows if r["game_id"] != skipped])
+
+        assert report.games_without_hands == 1
+        assert report.mismatches == []
+
+
+class TestReconciliationDuringMaterialization:
+    """Test the validation stage against the in-memory Supabase."""
+
+    def tamper(self, fake, index: int = 0) -> str:
+        seat = fake.tables["game_seats"][index]
+        seat["final_score"] += 5000
+        return seat["game_id"]
+
+    @pytest.mark.asyncio
+    async def test_off_by_default(self):
+        fake, config_hash = seeded_fake()
+        self.tamper(fake)
+
+        result = await materialize_data_for_config(fake, config_hash)
+
+        assert "score_reconciliation" not in result
+
+    @pytest.mark.asyncio
+    async def test_reports_without_excluding(self):
+        fake, config_hash = seeded_fake()
+        game_id = self.tamper(fake)
+        emitted = []
+
+        result = await materialize_data_for_config(
+            fake, config_hash, hooks=[emitted.append], validate_scores=True
+        )
+
+        report = result["score_reconciliation"]
+        assert report["mismatched_game_ids"] == [game_id]
+        assert report["excluded"] is False
+        assert result["games_count"] == len(fake.tables["games"])
+        event = next(e for e in emitted if e.event == events.SCORES_RECONCILED)
+        assert event.data["mismatched_games"] == 1
+        # Reconciliation and statistics share one pass through hand_events
+        pages = len(fake.tables["hand_events"]) // HAND_EVENTS_PAGE_SIZE + 1
+        assert fake.call_counts[("hand_events", "select")] == pages
+
+    @pytest.mark.asyncio
+    async def test_reports_on_a_cache_hit(self):
+        fake, config_hash = seeded_fake()
+        await materialize_data_for_config(fake, config_hash)
+        # A hand log error leaves the rated source data (and its hash) as is
+        hand = fake.tables["hand_events"][0]
+        hand["points_delta"] += 1000
+        game_id = hand["game_id"]
+
+        result = await materialize_data_for_config(
+            fake, config_hash, validate_scores=True
+        )
+
+        assert result["status"] == "cache_hit"
+        assert result["score_reconciliation"]["mismatched_game_ids"] == [game_id]
+
+    @pytest.mark.asyncio
+    async def test_excluding_invalidates_the_cache(self):
+        fake, config_hash = seeded_fake()
+        game_id = self.tamper(fake)
+        await materialize_data_for_config(fake, config_hash)
+
+        result = await materialize_data_for_config(
+            fake, config_hash, exclude_mismatched_games=True
+        )
+
+        assert result["status"] == "materialized"
+        cached_games = {row["game_id"] for row in fake.tables["cached_game_results"]}
+        assert game_id not in cached_games
+        cached = await materialize_data_for_config(
+            fake, config_hash, exclude_mismatched_games=True
+        )
+        assert cached["status"] == "cache_hit"
+
+    @pytest.mark.asyncio
+    async def test_excludes_mismatched_games(self):
+        fake, config_hash = seeded_fake()
+        game_id = self.tamper(fake)
+
+        result = await materialize_data_for_config(
+            fake, config_hash, exclude_mismatched_games=True
+        )
+
+        assert result["score_reconciliation"]["excluded"] is True
+        assert result["games_count"] == len(fake.tables["games"]) - 1
+        cached_games = {row["game_id"] for row in fake.tables["cached_game_results"]}
+        assert game_id not in cached_games
+        assert len(cached_games) == result["games_count"]
@@ -0,0 +1,35 @@
+-- Cached Player Statistics Migration
+-- Stores the player profile statistics bundle computed by the rating engine,
+-- so profile pages read one row instead of recomputing from raw history
+
+CREATE TABLE IF NOT EXISTS "public"."cached_player_statistics" (
+    "config_hash" text NOT NULL,
+    "player_id" uuid NOT NULL,
+    "games_played" integer DEFAULT 0 NOT NULL,
+    "total_hands" integer DEFAULT 0 NOT NULL,
+    "statistics" jsonb NOT NULL,
+    "source_data_hash" text NOT NULL,
+    "computed_at" timestamp with time zone DEFAULT now(),
+    CONSTRAINT "cached_player_statistics_pkey" PRIMARY KEY ("config_hash", "player_id"),
+    CONSTRAINT "cached_player_statistics_config_hash_fkey" FOREIGN KEY ("config_hash") REFERENCES "public"."rating_configurations"("config_hash"),
+    CONSTRAINT "cached_player_statistics_player_id_fkey" FOREIGN KEY ("player_id") REFERENCES "public"."players"("id")
+);
+
+ALTER TABLE "public"."cached_player_statistics" OWNER TO "postgres";
+
+COMMENT ON TABLE "public"."cached_player_statistics" IS 'Player profile statistics per configuration - can be regenerated';
+COMMENT ON COLUMN "public"."cached_player_statistics"."statistics" IS 'PlayerStatisticsResult bundle (totals, gameStats, handStats); rates in percent';
+COMMENT ON COLUMN "public"."cached_player_statistics"."source_data_hash" IS 'Hash of source game data for smart cache invalidation';
+
+CREATE INDEX IF NOT EXISTS "idx_cached_player_statistics_player" ON "public"."cached_player_statistics"("player_id", "computed_at");
+
+-- RLS (rating engine writes with the service_role key)
+ALTER TABLE "public"."cached_player_statistics" ENABLE ROW LEVEL SECURITY;
+
+CREATE POLICY "Cached statistics are viewable by everyone" ON "public"."cached_player_statistics"
+    FOR SELECT USING (true);
+
+-- Grants
+GRANT ALL ON TABLE "public"."cached_player_statistics" TO "anon";
+GRANT ALL ON TABLE "public"."cached_player_statistics" TO "authenticated";
+GRANT ALL ON TABLE "public"."cached_player_statistics" TO "service_role";
@@ -0,0 +1,43 @@
+-- Cached Head-to-Head Migration
+-- Pairwise records per configuration, written by the rating engine, so a
+-- rivalry lookup is a single primary-key read
+
+CREATE TABLE IF NOT EXISTS "public"."cached_head_to_head" (
+    "config_hash" text NOT NULL,
+    "player_a" uuid NOT NULL,
+    "player_b" uuid NOT NULL,
+    "games_together" integer NOT NULL,
+    "a_finished_above" integer NOT NULL,
+    "b_finished_above" integer NOT NULL,
+    "avg_placement_diff" numeric(4,2),
+    "plus_minus_diff" integer NOT NULL,
+    "last_played_at" timestamp with time zone,
+    "source_data_hash" text NOT NULL,
+    "computed_at" timestamp with time zone DEFAULT now(),
+    CONSTRAINT "cached_head_to_head_pkey" PRIMARY KEY ("config_hash", "player_a", "player_b"),
+    CONSTRAINT "cached_head_to_head_player_order" CHECK ("player_a" < "player_b"),
+    CONSTRAINT "cached_head_to_head_config_hash_fkey" FOREIGN KEY ("config_hash") REFERENCES "public"."rating_configurations"("config_hash"),
+    CONSTRAINT "cached_head_to_head_player_a_fkey" FOREIGN KEY ("player_a") REFERENCES "public"."players"("id"),
+    CONSTRAINT "cached_head_to_head_player_b_fkey" FOREIGN KEY ("player_b") REFERENCES "public"."players"("id")
+);
+
+ALTER TABLE "public"."cached_head_to_head" OWNER TO "postgres";
+
+COMMENT ON TABLE "public"."cached_head_to_head" IS 'Pairwise records per configuration, one row per pair that shared a table - can be regenerated';
+COMMENT ON COLUMN "public"."cached_head_to_head"."player_a" IS 'Lower player id of the pair; all figures are from player_a''s side';
+COMMENT ON COLUMN "public"."cached_head_to_head"."avg_placement_diff" IS 'Mean of placement_a - placement_b (negative: player_a usually finishes higher)';
+COMMENT ON COLUMN "public"."cached_head_to_head"."plus_minus_diff" IS 'Cumulative plus_minus_a - plus_minus_b over shared games';
+
+-- Rivals of a player who is the higher id of the pair
+CREATE INDEX IF NOT EXISTS "idx_cached_head_to_head_player_b" ON "public"."cached_head_to_head"("config_hash", "player_b");
+
+-- RLS (rating engine writes with the service_role key)
+ALTER TABLE "public"."cached_head_to_head" ENABLE ROW LEVEL SECURITY;
+
+CREATE POLICY "Cached head-to-head is viewable by everyone" ON "public"."cached_head_to_head"
+    FOR SELECT USING (true);
+
+-- Grants
+GRANT ALL ON TABLE "public"."cached_head_to_head" TO "anon";
+GRANT ALL ON TABLE "public"."cached_head_to_head" TO "authenticated";
+GRANT ALL ON TABLE "public"."cached_head_to_head" TO "service_role";
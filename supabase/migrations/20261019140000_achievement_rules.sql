@@ -0,0 +1,12 @@
+-- Achievement definitions granted by the rating engine
+-- After materializing an official configuration the engine evaluates its rules
+-- (apps/rating-engine/rating_engine/achievements.py) and upserts the grants
+-- into player_achievements, keyed by (player_id, achievement_id, season_name).
+
+INSERT INTO "public"."achievements" ("code", "name", "description", "icon_name", "category")
+VALUES
+    ('first_place_streak', 'On a Roll', 'Finished first in 3 consecutive games', 'flame', 'streak'),
+    ('fourth_free_streak', 'Unsinkable', 'Played 10 consecutive games without finishing fourth', 'shield', 'streak'),
+    ('games_played_50', 'Regular', 'Played 50 games in a season', 'calendar', 'milestone'),
+    ('games_played_100', 'Centurion', 'Played 100 games in a season', 'medal', 'milestone')
+ON CONFLICT ("code") DO NOTHING;
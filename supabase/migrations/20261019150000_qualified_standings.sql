@@ -0,0 +1,15 @@
+-- Qualified standings on cached_player_ratings
+-- The rating engine keeps each player's worst "dropWorst" results in a bounded
+-- heap during the rating pass and writes the qualification outcome alongside
+-- the rating, so standings need no second pass.
+
+ALTER TABLE "public"."cached_player_ratings"
+    ADD COLUMN IF NOT EXISTS "qualified" boolean DEFAULT false NOT NULL,
+    ADD COLUMN IF NOT EXISTS "adjusted_total_plus_minus" integer DEFAULT 0,
+    ADD COLUMN IF NOT EXISTS "qualified_rank" integer;
+
+COMMENT ON COLUMN "public"."cached_player_ratings"."qualified" IS 'games_played >= qualification.minGames of the configuration';
+COMMENT ON COLUMN "public"."cached_player_ratings"."adjusted_total_plus_minus" IS 'total_plus_minus with the qualification.dropWorst worst results dropped';
+COMMENT ON COLUMN "public"."cached_player_ratings"."qualified_rank" IS 'Rank among qualified players by adjusted_total_plus_minus (display_rating breaks ties); NULL when not qualified';
+
+CREATE INDEX IF NOT EXISTS "idx_cached_ratings_qualified_rank" ON "public"."cached_player_ratings" USING "btree" ("config_hash", "qualified_rank") WHERE "qualified_rank" IS NOT NULL;
@@ -0,0 +1,53 @@
+-- Server-side reset for rating-engine tables
+-- Replaces row-by-row filtered PostgREST deletes (slow and WAL-heavy on the
+-- cache tables) with a single TRUNCATE in one transaction, so resetting a dev
+-- database takes the same time regardless of row count. Called via RPC by
+-- scripts/migrate_legacy_data.py and scripts/materialize_data.py --reset-cache.
+
+CREATE OR REPLACE FUNCTION "public"."truncate_rating_engine_data"(
+    "include_games" boolean DEFAULT false,
+    "include_players" boolean DEFAULT false
+) RETURNS "text"[]
+    LANGUAGE "plpgsql" SECURITY DEFINER
+    SET "search_path" TO 'public'
+    AS $$
+DECLARE
+  emptied text[] := ARRAY[
+    'cached_game_results',
+    'cached_player_ratings',
+    'cached_player_statistics',
+    'cached_head_to_head'
+  ];
+BEGIN
+  -- Source data: hand_events and game_seats reference games, so they are
+  -- truncated in the same statement
+  IF include_games OR include_players THEN
+    emptied := emptied || ARRAY['hand_events', 'game_seats', 'games'];
+  END IF;
+
+  EXECUTE 'TRUNCATE TABLE ' || (
+    SELECT string_agg(format('%I.%I', 'public', name), ', ')
+    FROM unnest(emptied) AS name
+  );
+
+  -- players is referenced by tables the engine does not own (achievements,
+  -- rating_configurations.created_by), so it cannot be truncated; with its
+  -- dependents gone the remaining rows are few and a DELETE is cheap
+  IF include_players THEN
+    DELETE FROM "public"."players";
+    emptied := emptied || ARRAY['players'];
+  END IF;
+
+  RETURN emptied;
+END;
+$$;
+
+ALTER FUNCTION "public"."truncate_rating_engine_data"("include_games" boolean, "include_players" boolean) OWNER TO "postgres";
+
+COMMENT ON FUNCTION "public"."truncate_rating_engine_data"("include_games" boolean, "include_players" boolean) IS 'Empties the rating-engine cache tables (and optionally games and players) in one transaction; returns the emptied tables';
+
+-- Destructive: never callable with the anon or authenticated keys
+REVOKE ALL ON FUNCTION "public"."truncate_rating_engine_data"("include_games" boolean, "include_players" boolean) FROM PUBLIC;
+REVOKE ALL ON FUNCTION "public"."truncate_rating_engine_data"("include_games" boolean, "include_players" boolean) FROM "anon";
+REVOKE ALL ON FUNCTION "public"."truncate_rating_engine_data"("include_games" boolean, "include_players" boolean) FROM "authenticated";
+GRANT ALL ON FUNCTION "public"."truncate_rating_engine_data"("include_games" boolean, "include_players" boolean) TO "service_role";
@@ -0,0 +1,60 @@
+-- truncate_rating_engine_data: clear rating_configurations.created_by before
+-- deleting players
+-- rating_configurations.created_by references players without ON DELETE, so
+-- include_players failed with a foreign key violation whenever a registered
+-- configuration recorded its creator. Configurations are kept (the engine
+-- re-materializes them after a reset); only the creator link is cleared.
+-- Every other table referencing players is either emptied by the TRUNCATE
+-- above it or cascades (player_achievements).
+
+CREATE OR REPLACE FUNCTION "public"."truncate_rating_engine_data"(
+    "include_games" boolean DEFAULT false,
+    "include_players" boolean DEFAULT false
+) RETURNS "text"[]
+    LANGUAGE "plpgsql" SECURITY DEFINER
+    SET "search_path" TO 'public'
+    AS $$
+DECLARE
+  emptied text[] := ARRAY[
+    'cached_game_results',
+    'cached_player_ratings',
+    'cached_player_statistics',
+    'cached_head_to_head'
+  ];
+BEGIN
+  -- Source data: hand_events and game_seats reference games, so they are
+  -- truncated in the same statement
+  IF include_games OR include_players THEN
+    emptied := emptied || ARRAY['hand_events', 'game_seats', 'games'];
+  END IF;
+
+  EXECUTE 'TRUNCATE TABLE ' || (
+    SELECT string_agg(format('%I.%I', 'public', name), ', ')
+    FROM unnest(emptied) AS name
+  );
+
+  -- players is referenced by tables the engine does not own, so it cannot be
+  -- truncated; with its dependents gone the remaining rows are few and a
+  -- DELETE is cheap
+  IF include_players THEN
+    UPDATE "public"."rating_configurations"
+    SET "created_by" = NULL
+    WHERE "created_by" IS NOT NULL;
+
+    DELETE FROM "public"."players";
+    emptied := emptied || ARRAY['players'];
+  END IF;
+
+  RETURN emptied;
+END;
+$$;
+
+ALTER FUNCTION "public"."truncate_rating_engine_data"("include_games" boolean, "include_players" boolean) OWNER TO "postgres";
+
+COMMENT ON FUNCTION "public"."truncate_rating_engine_data"("include_games" boolean, "include_players" boolean) IS 'Empties the rating-engine cache tables (and optionally games and players, clearing rating_configurations.created_by) in one transaction; returns the emptied tables';
+
+-- CREATE OR REPLACE keeps the existing grants; restated so this file stands alone
+REVOKE ALL ON FUNCTION "public"."truncate_rating_engine_data"("include_games" boolean, "include_players" boolean) FROM PUBLIC;
+REVOKE ALL ON FUNCTION "public"."truncate_rating_engine_data"("include_games" boolean, "include_players" boolean) FROM "anon";
+REVOKE ALL ON FUNCTION "public"."truncate_rating_engine_data"("include_games" boolean, "include_players" boolean) FROM "authenticated";
+GRANT ALL ON FUNCTION "public"."truncate_rating_engine_data"("include_games" boolean, "include_players" boolean) TO "service_role";